@@ -0,0 +1,448 @@
+#!/usr/bin/env python3
+"""
+Pipeline Benchmarks - timing and memory of the Python pipeline hot paths
+
+Benchmarks (all on a fixed synthetic OWID-shaped dataset, seed SYNTHETIC_SEED):
+- ingest_owid_csv               fetch_data.parse_owid_csv() + owid_cache.save_owid_cache()
+- project_timeseries            ProjectionEngine(s).project_timeseries() for every scenario
+- generate_full_system_costs    calculate_full_system_costs_v25.generate_full_system_costs()
+- process_global_data           calculate_useful_energy_v2.process_global_data()
+- process_all_entities          calculate_useful_energy_v2.process_all_entities()
+- process_regional_data         calculate_regional_useful_energy.process_regional_data()
+- calculate_net_imports         calculate_net_imports.calculate_net_imports() (incl. cache read and JSON write)
+- generate_sectoral_timeseries  generate_sectoral_timeseries.generate_sectoral_timeseries()
+- run_pipeline                  run_pipeline.run_pipeline() (all stages in memory, no writes)
+
+Each benchmark runs in a scratch directory laid out like the repo, so the
+scripts' relative input/output paths resolve there and nothing under
+public/data is touched. The in-process caches (dispatch results, efficiency
+cubes, compiled parameters, VRE profiles, parsed configs) are reset before
+every repeat, so each repeat runs as a fresh process would; the .npz disk
+caches are kept. For every benchmark we record:
+- wall time (time.perf_counter, first, min and median over the repeats)
+- CPU time (time.process_time, min over the repeats)
+- peak memory (tracemalloc peak of one extra, untimed run)
+
+Results are appended to data-pipeline/cache/benchmark_history.json together
+with the git commit, so regressions between commits are visible; each run
+is compared against the previous entry. The history is local-only: cache/
+is git-ignored because timings are specific to the machine that recorded
+them and only comparable between runs on that machine. Deleting the file
+starts a new history.
+
+Usage:
+    python benchmark_pipeline.py                  # run all, append to local history
+    python benchmark_pipeline.py process_global_data calculate_net_imports
+    python benchmark_pipeline.py --repeats 5 --no-save
+"""
+
+import contextlib
+import io
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+PIPELINE_DIR = Path(__file__).resolve().parent
+REPO_ROOT = PIPELINE_DIR.parent
+SERVICES_PIPELINE_DIR = REPO_ROOT / 'global-energy-services' / 'data-pipeline'
+SERVICES_DATA_DIR = REPO_ROOT / 'global-energy-services' / 'public' / 'data'
+
+for path in (PIPELINE_DIR, SERVICES_PIPELINE_DIR):
+    if str(path) not in sys.path:
+        sys.path.insert(0, str(path))
+
+# ============================================================================
+# CONFIGURATION
+# ============================================================================
+
+# Local-only (cache/ is git-ignored): timings are comparable on one machine only
+HISTORY_FILE = PIPELINE_DIR / 'cache' / 'benchmark_history.json'
+DEFAULT_REPEATS = 3
+
+# Slower than the previous run by more than this fraction is flagged
+REGRESSION_THRESHOLD = 0.10
+
+SYNTHETIC_SEED = 20241205
+SYNTHETIC_YEARS = (1900, 2024)
+
+# OWID energy dataset column families
+OWID_FUELS = ['coal', 'oil', 'gas', 'nuclear', 'hydro', 'wind', 'solar', 'biofuel',
+              'other_renewable', 'renewables', 'fossil_fuel', 'low_carbon', 'primary_energy']
+OWID_FUEL_SUFFIXES = ['_consumption', '_share_energy', '_cons_change_pct', '_electricity', '_share_elec']
+OWID_PRODUCTION_FUELS = ['coal', 'oil', 'gas']
+
+# Aggregate entities present in the OWID dataset alongside countries
+OWID_AGGREGATES = ['World', 'Africa', 'Asia', 'Europe', 'North America', 'South America', 'Oceania',
+                   'European Union (27)', 'OECD (BP)', 'Non-OECD (BP)', 'High-income countries',
+                   'Low-income countries', 'Middle East (EI)', 'CIS (EI)']
+
+# ============================================================================
+# SYNTHETIC OWID INPUT
+# ============================================================================
+
+def synthetic_entities():
+    """Countries from the net-imports region lists plus OWID aggregates"""
+    from calculate_net_imports import CONTINENTAL_REGIONS, COUNTRIES
+    countries = sorted(set(COUNTRIES).union(*CONTINENTAL_REGIONS.values()))
+    return OWID_AGGREGATES + countries
+
+def generate_synthetic_owid(seed=SYNTHETIC_SEED):
+    """
+    Deterministic OWID-shaped energy dataset (one row per entity-year)
+
+    Consumption and electricity columns follow per-entity growth paths in
+    TWh; series start in a random year per entity and ~5% of the later
+    cells are missing, as in the real dataset.
+    """
+    rng = np.random.default_rng(seed)
+    entities = synthetic_entities()
+    years = np.arange(SYNTHETIC_YEARS[0], SYNTHETIC_YEARS[1] + 1)
+    n_entities, n_years = len(entities), len(years)
+
+    scale = rng.lognormal(mean=4.0, sigma=1.5, size=n_entities)
+    scale[:len(OWID_AGGREGATES)] *= 50
+    first_year = rng.integers(1900, 1991, size=n_entities)
+    first_year[0] = 1900
+
+    frame = {
+        'country': np.repeat(entities, n_years),
+        'year': np.tile(years, n_entities),
+        'iso_code': np.repeat([''] * len(OWID_AGGREGATES) +
+                              [f'X{i:02d}'[:3].upper() for i in range(n_entities - len(OWID_AGGREGATES))], n_years),
+        'population': np.repeat(rng.lognormal(15, 2, n_entities), n_years) * np.tile(np.linspace(0.3, 1.0, n_years), n_entities),
+        'gdp': np.repeat(rng.lognormal(24, 2, n_entities), n_years) * np.tile(np.linspace(0.05, 1.0, n_years), n_entities),
+    }
+    active = np.tile(years, n_entities) >= np.repeat(first_year, n_years)
+    elapsed = np.tile(years - years[0], n_entities)
+
+    def series(fuel_scale, growth):
+        values = np.repeat(scale * fuel_scale, n_years) * (1 + growth) ** elapsed
+        values *= rng.lognormal(0, 0.05, values.size)
+        missing = ~active | (rng.random(values.size) < 0.05)
+        return np.where(missing, np.nan, values)
+
+    fuel_scales = rng.uniform(0.01, 1.0, len(OWID_FUELS))
+    fuel_growth = rng.uniform(-0.01, 0.08, len(OWID_FUELS))
+    for fuel, fuel_scale, growth in zip(OWID_FUELS, fuel_scales, fuel_growth):
+        frame[f'{fuel}_consumption'] = series(fuel_scale * 1e-2, growth)
+        frame[f'{fuel}_share_energy'] = series(0.2, 0.0)
+        frame[f'{fuel}_cons_change_pct'] = series(0.02, 0.0)
+        frame[f'{fuel}_electricity'] = series(fuel_scale * 3e-3, growth)
+        frame[f'{fuel}_share_elec'] = series(0.2, 0.0)
+    for fuel in OWID_PRODUCTION_FUELS:
+        frame[f'{fuel}_production'] = series(rng.uniform(0.001, 0.02), rng.uniform(0.0, 0.04))
+    frame['other_renewable_exc_biofuel_electricity'] = series(1e-4, 0.05)
+
+    return pd.DataFrame(frame)
+
+def write_synthetic_inputs(df, directory):
+    """
+    Write the dataset the way fetch_data.py does
+
+    Returns:
+        (csv_path, cache_path); the cache is the typed columnar .npz that
+        calculate_useful_energy*.py read through owid_cache.load_owid_cache()
+    """
+    from fetch_data import parse_owid_csv
+    from owid_cache import cache_path as owid_cache_path, save_owid_cache
+
+    directory.mkdir(parents=True, exist_ok=True)
+    csv_path = directory / 'owid_energy_latest.csv'
+    df.to_csv(csv_path, index=False)
+
+    cache_path = Path(owid_cache_path(directory))
+    save_owid_cache(parse_owid_csv(str(csv_path)), str(cache_path))
+    return csv_path, cache_path
+
+def build_workspace(root):
+    """
+    Scratch tree mirroring the repo paths the scripts read and write
+
+    root/
+      downloads/                               synthetic OWID CSV and .npz cache
+      data-pipeline/                           cwd for the data-pipeline scripts
+      global-energy-tracker/public/data/       net imports / regional outputs
+      global-energy-services/data-pipeline/    sectoral script location
+      global-energy-services/public/data/      sectoral inputs and outputs
+    """
+    df = generate_synthetic_owid()
+    csv_path, cache_path = write_synthetic_inputs(df, root / 'downloads')
+
+    pipeline_dir = root / 'data-pipeline'
+    pipeline_dir.mkdir(parents=True)
+
+    tracker_dir = root / 'global-energy-tracker'
+    (tracker_dir / 'public' / 'data').mkdir(parents=True)
+
+    services_dir = root / 'global-energy-services'
+    (services_dir / 'data-pipeline').mkdir(parents=True)
+    (services_dir / 'public' / 'data').mkdir(parents=True)
+    shutil.copy(SERVICES_DATA_DIR / 'sectoral_energy_breakdown_v2.json', services_dir / 'public' / 'data')
+
+    return {'root': root, 'df': df, 'csv': csv_path, 'cache': cache_path, 'pipeline_dir': pipeline_dir,
+            'services_dir': services_dir}
+
+# ============================================================================
+# BENCHMARK DEFINITIONS
+# ============================================================================
+# Each setup_* receives the workspace and returns a zero-argument callable;
+# everything outside that callable (imports, input parsing) is untimed.
+
+def _useful_energy_configs():
+    from efficiency_cube import load_efficiency_cube
+
+    def load(name):
+        with open(SERVICES_PIPELINE_DIR / name, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    return {
+        'base': load('efficiency_factors_corrected.json'),
+        'temporal': load('efficiency_factors_temporal.json'),
+        'regional': load('efficiency_factors_regional.json'),
+        'exergy': load('exergy_factors_sectoral.json'),
+        'source_allocation': load('source_sector_allocation.json'),
+        'efficiency_cube': load_efficiency_cube(),
+    }
+
+def setup_ingest_owid_csv(workspace):
+    from fetch_data import parse_owid_csv
+    from owid_cache import save_owid_cache
+    cache_path = str(workspace['root'] / 'ingest_owid_energy.npz')
+    return lambda: save_owid_cache(parse_owid_csv(str(workspace['csv'])), cache_path)
+
+def setup_project_timeseries(workspace):
+    from projection_engine_v4 import SCENARIOS, ProjectionEngine
+    return lambda: [ProjectionEngine(scenario).project_timeseries() for scenario in SCENARIOS]
+
+def setup_generate_full_system_costs(workspace):
+    from calculate_full_system_costs_v25 import generate_full_system_costs
+    return generate_full_system_costs
+
+def setup_process_global_data(workspace):
+    from calculate_useful_energy_v2 import process_global_data
+    from owid_cache import OwidCache
+    data = OwidCache(str(workspace['cache']))
+    configs = _useful_energy_configs()
+    return lambda: process_global_data(data, configs, enable_temporal=True, enable_exergy=True, rebound_rate=0.07)
+
+def setup_process_all_entities(workspace):
+    from calculate_useful_energy_v2 import process_all_entities
+    from owid_cache import OwidCache
+    data = OwidCache(str(workspace['cache']))
+    configs = _useful_energy_configs()
+    return lambda: process_all_entities(data, configs, enable_temporal=True, enable_exergy=True, rebound_rate=0.07)
+
+def setup_process_regional_data(workspace):
+    os.chdir(workspace['pipeline_dir'])
+    from calculate_regional_useful_energy import process_regional_data
+    from owid_cache import OwidCache
+    data = OwidCache(str(workspace['cache']))
+    return lambda: process_regional_data(data)
+
+def setup_calculate_net_imports(workspace):
+    os.chdir(workspace['pipeline_dir'])
+    from calculate_net_imports import calculate_net_imports
+    return lambda: calculate_net_imports(str(workspace['cache']))
+
+def setup_generate_sectoral_timeseries(workspace):
+    import generate_sectoral_timeseries as module
+    from calculate_useful_energy_v2 import process_global_data
+    from owid_cache import OwidCache
+
+    # Sectoral input derived from the synthetic global services
+    data = OwidCache(str(workspace['cache']))
+    with contextlib.redirect_stdout(io.StringIO()):
+        results = process_global_data(data, _useful_energy_configs(), rebound_rate=0.07)
+    services_path = workspace['services_dir'] / 'public' / 'data' / 'exergy_services_timeseries.json'
+    with open(services_path, 'w', encoding='utf-8') as f:
+        json.dump({'data': results['energy_services']}, f)
+
+    # The script chdirs to its own directory; point it at the scratch tree
+    module.__file__ = str(workspace['services_dir'] / 'data-pipeline' / 'generate_sectoral_timeseries.py')
+    return module.generate_sectoral_timeseries
+
+def setup_run_pipeline(workspace):
+    import run_pipeline
+    from owid_cache import OwidCache
+    data = OwidCache(str(workspace['cache']))
+    configs = _useful_energy_configs()
+    return lambda: run_pipeline.run_pipeline(data, configs)
+
+BENCHMARKS = {
+    'ingest_owid_csv': setup_ingest_owid_csv,
+    'project_timeseries': setup_project_timeseries,
+    'generate_full_system_costs': setup_generate_full_system_costs,
+    'process_global_data': setup_process_global_data,
+    'process_all_entities': setup_process_all_entities,
+    'process_regional_data': setup_process_regional_data,
+    'calculate_net_imports': setup_calculate_net_imports,
+    'generate_sectoral_timeseries': setup_generate_sectoral_timeseries,
+    'run_pipeline': setup_run_pipeline,
+}
+
+# ============================================================================
+# MEASUREMENT
+# ============================================================================
+
+# In-process caches reset before every repeat: {module: reset(module)}.
+# Modules that are not imported yet have nothing cached.
+CACHE_RESETS = {
+    'calculate_full_system_costs_v25': lambda module: module.clear_dispatch_cache(),
+    'efficiency_cube': lambda module: module.clear_loaded_cubes(),
+    'projection_engine_v4': lambda module: module.use_compiled_parameters(None),
+    'vre_dispatch': lambda module: module.clear_profile_cache(),
+    'config_registry': lambda module: module.REGISTRY.invalidate(),
+}
+
+def reset_caches():
+    """Drop the in-process caches so the next call runs cold"""
+    for name, reset in CACHE_RESETS.items():
+        module = sys.modules.get(name)
+        if module is not None:
+            reset(module)
+
+def measure(function, repeats=DEFAULT_REPEATS):
+    """Wall/CPU time over cold repeats plus tracemalloc peak of one extra run"""
+    walls, cpus = [], []
+    for _ in range(repeats):
+        reset_caches()
+        with contextlib.redirect_stdout(io.StringIO()):
+            wall_start, cpu_start = time.perf_counter(), time.process_time()
+            function()
+            cpus.append(time.process_time() - cpu_start)
+            walls.append(time.perf_counter() - wall_start)
+
+    reset_caches()
+    tracemalloc.start()
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            function()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {
+        'wall_s_first': round(walls[0], 6),
+        'wall_s_min': round(min(walls), 6),
+        'wall_s_median': round(statistics.median(walls), 6),
+        'cpu_s_min': round(min(cpus), 6),
+        'peak_memory_mb': round(peak / 2**20, 3),
+        'repeats': repeats,
+    }
+
+def run_benchmarks(names=None, repeats=DEFAULT_REPEATS):
+    """Run the selected benchmarks in a scratch workspace"""
+    names = list(names or BENCHMARKS)
+    unknown = [name for name in names if name not in BENCHMARKS]
+    if unknown:
+        raise KeyError(f"Unknown benchmarks: {unknown} (available: {list(BENCHMARKS)})")
+
+    cwd = os.getcwd()
+    results = {}
+    with tempfile.TemporaryDirectory(prefix='pipeline_bench_') as tmp:
+        workspace = build_workspace(Path(tmp))
+        try:
+            for name in names:
+                os.chdir(workspace['root'])
+                function = BENCHMARKS[name](workspace)
+                results[name] = measure(function, repeats)
+                print(f"  {name:<30} {results[name]['wall_s_min'] * 1000:>10.1f} ms wall  "
+                      f"{results[name]['cpu_s_min'] * 1000:>10.1f} ms cpu  "
+                      f"{results[name]['peak_memory_mb']:>8.1f} MB peak")
+        finally:
+            os.chdir(cwd)
+
+    return {
+        'synthetic_input': {
+            'seed': SYNTHETIC_SEED,
+            'entities': int(workspace['df']['country'].nunique()),
+            'rows': int(len(workspace['df'])),
+            'columns': int(len(workspace['df'].columns)),
+        },
+        'benchmarks': results,
+    }
+
+# ============================================================================
+# HISTORY
+# ============================================================================
+
+def git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=REPO_ROOT,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def load_history():
+    if not HISTORY_FILE.exists():
+        return []
+    with open(HISTORY_FILE, 'r') as f:
+        return json.load(f)['runs']
+
+def save_history(runs):
+    HISTORY_FILE.parent.mkdir(parents=True, exist_ok=True)
+    with open(HISTORY_FILE, 'w') as f:
+        json.dump({'description': 'Pipeline benchmark history (benchmark_pipeline.py)', 'runs': runs}, f, indent=2)
+
+def compare(previous, current):
+    """Print wall-time and memory changes against the previous run"""
+    print(f"\nCompared with {previous.get('commit') or 'previous run'} ({previous['timestamp']}):")
+    for name, result in current['benchmarks'].items():
+        before = previous['benchmarks'].get(name)
+        if not before:
+            print(f"  {name:<30} (new)")
+            continue
+        wall_change = result['wall_s_min'] / before['wall_s_min'] - 1 if before['wall_s_min'] else 0.0
+        memory_change = result['peak_memory_mb'] - before['peak_memory_mb']
+        flag = '  ⚠ REGRESSION' if wall_change > REGRESSION_THRESHOLD else ''
+        print(f"  {name:<30} wall {wall_change:+7.1%}   peak memory {memory_change:+8.1f} MB{flag}")
+
+# ============================================================================
+# MAIN EXECUTION
+# ============================================================================
+
+if __name__ == '__main__':
+    args = sys.argv[1:]
+    repeats = DEFAULT_REPEATS
+    if '--repeats' in args:
+        index = args.index('--repeats')
+        if index + 1 >= len(args) or not args[index + 1].isdigit() or int(args[index + 1]) < 1:
+            print("✗ --repeats needs a positive integer")
+            sys.exit(1)
+        repeats = int(args[index + 1])
+        del args[index:index + 2]
+    save = '--no-save' not in args
+    names = [arg for arg in args if not arg.startswith('--')]
+
+    print("=" * 80)
+    print("PIPELINE BENCHMARKS")
+    print("=" * 80)
+    print(f"Repeats: {repeats}  |  Synthetic seed: {SYNTHETIC_SEED}\n")
+
+    run = {
+        'timestamp': datetime.now().isoformat(),
+        'commit': git_commit(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        **run_benchmarks(names, repeats),
+    }
+
+    history = load_history()
+    if history:
+        compare(history[-1], run)
+
+    if save:
+        history.append(run)
+        save_history(history)
+        print(f"\nAppended run to {HISTORY_FILE} ({len(history)} runs, local only)")
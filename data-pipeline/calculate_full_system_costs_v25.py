@@ -18,34 +18,48 @@ Date: December 2024
 """
 
 import json
-import os
 import math
 from pathlib import Path
 from datetime import datetime
 
+import numpy as np
+
+from config_registry import REGISTRY
+from cost_accessor import year_record
+from learning_by_deployment import capacity_table, cumulative_capacity, learning_summary
+from scenario_sets import list_scenarios, scenario_dimension
+from vre_dispatch import get_profiles, simulate_dispatch
+
 # Configuration
 OUTPUT_FILE = '../global-energy-services/public/data/full_system_costs.json'
-CONFIG_DIR = 'config'
+DISPATCH_YEARS = list(range(2024, 2051))
 
 # =============================================================================
 # LOAD CONFIGURATION FILES
 # =============================================================================
 
+# Config files already reported missing (warned once per file)
+_MISSING_CONFIGS = set()
+
 def load_config(filename):
-    """Load a JSON configuration file."""
-    filepath = os.path.join(CONFIG_DIR, filename)
-    with open(filepath, 'r') as f:
-        return json.load(f)
-
-# Load learning curves and manufacturing capacity
-try:
-    LEARNING_CURVES = load_config('learning_curves.json')
-    MANUFACTURING_CAPACITY = load_config('manufacturing_capacity.json')
-    print("✓ Loaded learning curves and manufacturing capacity configurations")
-except FileNotFoundError as e:
-    print(f"Warning: Could not load config file: {e}")
-    LEARNING_CURVES = None
-    MANUFACTURING_CAPACITY = None
+    """Load a JSON configuration file (lazily, via the shared config registry)."""
+    config = REGISTRY.get(filename)
+    if config is None and filename not in _MISSING_CONFIGS:
+        _MISSING_CONFIGS.add(filename)
+        print(f"Warning: Could not load config file: {filename}")
+    return config
+
+# Learning curves and manufacturing capacity, loaded on first access
+CONFIG_ATTRIBUTES = {
+    'LEARNING_CURVES': 'learning_curves.json',
+    'MANUFACTURING_CAPACITY': 'manufacturing_capacity.json'
+}
+
+def __getattr__(name):
+    """Serve LEARNING_CURVES and MANUFACTURING_CAPACITY as lazily loaded module attributes."""
+    if name in CONFIG_ATTRIBUTES:
+        return load_config(CONFIG_ATTRIBUTES[name])
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 # =============================================================================
 # WRIGHT'S LAW LEARNING CURVE FUNCTIONS
@@ -83,11 +97,22 @@ def calculate_learning_curve_cost(base_cost, learning_rate, base_cumulative, cur
     return max(new_cost, floor_cost)
 
 
+def engine_scenario(scenario):
+    """Projection engine scenario name for a (possibly lower-case) cost scenario name."""
+    for name in list_scenarios():
+        if name.lower() == scenario.lower():
+            return name
+    return scenario
+
+
 def calculate_cumulative_capacity(source, year, scenario='baseline'):
     """
     Calculate cumulative installed capacity for a given source and year.
 
-    Integrates manufacturing capacity trajectories to get cumulative deployment.
+    Solar and wind follow the deployment projected by Projection Engine v4.0
+    (learning by deployment, an O(1) prefix-sum table lookup), so costs and
+    energy projections share one deployment path. Other sources integrate
+    manufacturing capacity trajectories.
 
     Args:
         source: Energy source ('solar', 'wind', etc.)
@@ -97,13 +122,15 @@ def calculate_cumulative_capacity(source, year, scenario='baseline'):
     Returns:
         Cumulative capacity in GW (or GWh for batteries)
     """
-    if MANUFACTURING_CAPACITY is None:
+    if source in ['solar', 'wind']:
+        return cumulative_capacity(source, year, engine_scenario(scenario))
+
+    manufacturing_capacity = load_config('manufacturing_capacity.json')
+    if manufacturing_capacity is None:
         return None
 
     # Map source names to trajectory keys
     source_map = {
-        'solar': 'solar_pv_gw_year',
-        'wind': 'wind_onshore_gw_year',
         'wind_offshore': 'wind_offshore_gw_year',
         'batteries': 'batteries_gwh_year',
         'evs': 'evs_million_year',
@@ -113,22 +140,15 @@ def calculate_cumulative_capacity(source, year, scenario='baseline'):
     }
 
     trajectory_key = source_map.get(source)
-    if not trajectory_key or trajectory_key not in MANUFACTURING_CAPACITY['trajectories']:
+    if not trajectory_key or trajectory_key not in manufacturing_capacity['trajectories']:
         return None
 
-    trajectory = MANUFACTURING_CAPACITY['trajectories'][trajectory_key]
+    trajectory = manufacturing_capacity['trajectories'][trajectory_key]
 
     # Get scenario multiplier
     scenario_mult = trajectory.get('scenario_multipliers', {}).get(scenario.lower(), 1.0)
 
-    # Get base cumulative from learning curves config
-    if LEARNING_CURVES and source in ['solar', 'wind']:
-        source_key = 'solar_pv' if source == 'solar' else 'wind_onshore'
-        base_cumulative = LEARNING_CURVES['learning_rates'].get(source_key, {}).get('base_cumulative_gw', 0)
-    else:
-        base_cumulative = 0
-
-    cumulative = base_cumulative
+    cumulative = 0
 
     # Sum annual additions from 2025 to target year
     for y in range(2025, year + 1):
@@ -138,6 +158,21 @@ def calculate_cumulative_capacity(source, year, scenario='baseline'):
     return cumulative
 
 
+def calculate_cumulative_capacities(source, years, scenario='baseline'):
+    """
+    calculate_cumulative_capacity() over an array of years (0 where it is None)
+
+    Solar and wind are read from their deployment table in one vectorized
+    lookup.
+    """
+    if source in ['solar', 'wind']:
+        table = capacity_table(source, engine_scenario(scenario))
+        if table is not None:
+            return table.lookup(years)
+    return np.array([calculate_cumulative_capacity(source, int(year), scenario) or 0 for year in years],
+                    dtype=float)
+
+
 def interpolate_trajectory(trajectory_data, year):
     """Interpolate a value from a trajectory dictionary."""
     # Combine historical and projections
@@ -165,6 +200,54 @@ def interpolate_trajectory(trajectory_data, year):
     return all_data[str(years[0])]
 
 
+LEARNING_CURVE_KEYS = {
+    'solar': 'solar_pv',
+    'wind': 'wind_onshore'
+}
+
+
+def learning_curve_parameters(source, scenario='baseline'):
+    """
+    Scenario-adjusted Wright's Law inputs for a learning-curve source.
+
+    Returns:
+        Dict with base_cost, learning_rate, base_cumulative, floor_cost and
+        breakthrough_boost (LCOE reduction from 2030, None if no breakthrough),
+        or None when the source has no learning curve configured
+    """
+    learning_curves = load_config('learning_curves.json')
+    if learning_curves is None:
+        return None
+
+    learning_data = learning_curves['learning_rates']
+    source_key = LEARNING_CURVE_KEYS.get(source)
+    if source_key not in learning_data:
+        return None
+
+    config = learning_data[source_key]
+    scenario_adj = learning_curves.get('scenario_adjustments', {}).get(scenario.lower(), {})
+
+    # Apply floor cost buffer and learning rate multiplier from scenario
+    floor_buffer = scenario_adj.get('floor_cost_buffer', 1.0)
+    lr_mult = scenario_adj.get('learning_rate_multiplier', 1.0)
+
+    params = {
+        'base_cost': config['base_cost_usd_per_mwh'],
+        'learning_rate': config['learning_rate'] * lr_mult,
+        'base_cumulative': config['base_cumulative_gw'],
+        'floor_cost': config['floor_cost_usd_per_mwh'] * floor_buffer,
+        'breakthrough_boost': None
+    }
+
+    # Breakthrough adjustments (solar perovskite tandems lower cost via efficiency)
+    if source == 'solar':
+        breakthrough = scenario_adj.get('breakthrough_adjustments', {}).get('solar_pv', {})
+        if breakthrough.get('perovskite_tandem'):
+            params['breakthrough_boost'] = breakthrough.get('efficiency_boost_2030', 0)
+
+    return params
+
+
 def get_learning_curve_lcoe(source, year, scenario='baseline'):
     """
     Get LCOE using learning curves for applicable sources.
@@ -179,62 +262,24 @@ def get_learning_curve_lcoe(source, year, scenario='baseline'):
     Returns:
         LCOE in $/MWh
     """
-    if LEARNING_CURVES is None:
-        # Fallback to traditional interpolation
-        return interpolate_value(year, BASE_LCOE)[source]['mid']
-
-    learning_data = LEARNING_CURVES['learning_rates']
-    scenario_adj = LEARNING_CURVES.get('scenario_adjustments', {}).get(scenario.lower(), {})
-
-    # Solar PV
-    if source == 'solar' and 'solar_pv' in learning_data:
-        solar_config = learning_data['solar_pv']
-        cumulative = calculate_cumulative_capacity('solar', year, scenario)
+    params = learning_curve_parameters(source, scenario)
+    if params is not None:
+        cumulative = calculate_cumulative_capacity(source, year, scenario)
 
         if cumulative:
-            # Apply floor cost buffer from scenario
-            floor_buffer = scenario_adj.get('floor_cost_buffer', 1.0)
-            floor_cost = solar_config['floor_cost_usd_per_mwh'] * floor_buffer
-
-            # Apply learning rate multiplier from scenario
-            lr_mult = scenario_adj.get('learning_rate_multiplier', 1.0)
-            effective_lr = solar_config['learning_rate'] * lr_mult
-
-            base_cost = solar_config['base_cost_usd_per_mwh']
-            base_cumulative = solar_config['base_cumulative_gw']
-
             lcoe = calculate_learning_curve_cost(
-                base_cost, effective_lr, base_cumulative, cumulative, floor_cost
+                params['base_cost'],
+                params['learning_rate'],
+                params['base_cumulative'],
+                cumulative,
+                params['floor_cost']
             )
 
-            # Apply breakthrough adjustments if applicable
-            breakthrough = scenario_adj.get('breakthrough_adjustments', {}).get('solar_pv', {})
-            if breakthrough.get('perovskite_tandem') and year >= 2030:
-                efficiency_boost = breakthrough.get('efficiency_boost_2030', 0)
-                lcoe *= (1 - efficiency_boost)  # Lower cost due to higher efficiency
+            if params['breakthrough_boost'] is not None and year >= 2030:
+                lcoe *= (1 - params['breakthrough_boost'])  # Lower cost due to higher efficiency
 
             return lcoe
 
-    # Wind (onshore)
-    if source == 'wind' and 'wind_onshore' in learning_data:
-        wind_config = learning_data['wind_onshore']
-        cumulative = calculate_cumulative_capacity('wind', year, scenario)
-
-        if cumulative:
-            floor_buffer = scenario_adj.get('floor_cost_buffer', 1.0)
-            floor_cost = wind_config['floor_cost_usd_per_mwh'] * floor_buffer
-
-            lr_mult = scenario_adj.get('learning_rate_multiplier', 1.0)
-            effective_lr = wind_config['learning_rate'] * lr_mult
-
-            return calculate_learning_curve_cost(
-                wind_config['base_cost_usd_per_mwh'],
-                effective_lr,
-                wind_config['base_cumulative_gw'],
-                cumulative,
-                floor_cost
-            )
-
     # For other sources, use traditional BASE_LCOE interpolation
     return interpolate_value(year, BASE_LCOE)[source]['mid']
 
@@ -353,13 +398,162 @@ SCENARIO_DESCRIPTIONS = {
 }
 
 # =============================================================================
-# SYSTEM INTEGRATION COSTS (unchanged from v2.0)
+# SYSTEM INTEGRATION COSTS (hourly VRE dispatch)
 # =============================================================================
+# Integration costs are derived from an 8760-hour dispatch simulation
+# (vre_dispatch.py) of every scenario × region × year cell instead of fixed
+# adders per VRE penetration band. The dispatch yields curtailment, storage
+# throughput, the residual (firmed) load and its peak, which are priced into
+# $/MWh cost drivers below.
+
+# Solar share of VRE energy
+VRE_SOLAR_SHARE = {
+    '2024': 0.45,
+    '2030': 0.52,
+    '2040': 0.58,
+    '2050': 0.60
+}
 
-def get_system_integration_costs(source, vre_penetration):
+# Storage build-out: power as a multiple of average load, duration in hours
+STORAGE_BUILDOUT = {
+    'Conservative': {
+        '2024': {'power': 0.01, 'duration_hours': 4},
+        '2030': {'power': 0.04, 'duration_hours': 4},
+        '2040': {'power': 0.10, 'duration_hours': 6},
+        '2050': {'power': 0.18, 'duration_hours': 6}
+    },
+    'Baseline': {
+        '2024': {'power': 0.01, 'duration_hours': 4},
+        '2030': {'power': 0.06, 'duration_hours': 4},
+        '2040': {'power': 0.18, 'duration_hours': 6},
+        '2050': {'power': 0.30, 'duration_hours': 8}
+    },
+    'Optimistic': {
+        '2024': {'power': 0.01, 'duration_hours': 4},
+        '2030': {'power': 0.08, 'duration_hours': 6},
+        '2040': {'power': 0.25, 'duration_hours': 8},
+        '2050': {'power': 0.40, 'duration_hours': 8}
+    }
+}
+
+# Annualized storage costs (capex × capital recovery factor + fixed O&M)
+STORAGE_COSTS = {
+    '2024': {'power_kw_year': 45, 'energy_kwh_year': 40},
+    '2030': {'power_kw_year': 35, 'energy_kwh_year': 28},
+    '2050': {'power_kw_year': 25, 'energy_kwh_year': 16}
+}
+
+INTEGRATION_COST_PARAMETERS = {
+    'firm_capacity_cost_kw_year': 120,   # Fixed cost of firm (peaking) capacity
+    'reference_firm_utilization': 0.60,  # Firm fleet capacity factor without VRE
+    'grid_cost_kw_year': 45,             # Network reinforcement per kW of VRE
+    'curtailment_value_mwh': 60,         # Value of a curtailed VRE MWh
+    'balancing_cost_mwh': 5,             # Reserves and forecast error
+    'cycling_cost_mw_ramp': 100          # Firm fleet wear per MW of hourly ramp
+}
+
+# Dispatch results per region: {region: {'profiles': ..., 'cells': {(scenario, year): result}}}
+_DISPATCH_CACHE = {}
+
+def clear_dispatch_cache():
+    """Drop every cached dispatch result (the next lookup re-simulates)"""
+    _DISPATCH_CACHE.clear()
+
+def _dispatch_inputs(scenario, year):
+    storage = interpolate_value(year, STORAGE_BUILDOUT[scenario])
+    return (interpolate_value(year, VRE_SCENARIOS[scenario]), interpolate_value(year, VRE_SOLAR_SHARE),
+            storage['power'], storage['duration_hours'])
+
+def integration_cost_drivers(metrics, inputs, storage_costs):
+    """
+    Price dispatch results into $/MWh cost drivers
+
+    All VRE drivers are per MWh of delivered (non-curtailed) VRE; firm fleet
+    drivers are per MWh of firmed residual load. Energies are per unit of
+    average load (8.76 MWh/year).
+    """
+    vre_penetration, _, storage_power, storage_hours = inputs
+    p = INTEGRATION_COST_PARAMETERS
+    curtailment = metrics['curtailment_share']
+    delivered_mwh = vre_penetration * 8.76 * (1 - curtailment)
+    if delivered_mwh <= 0:
+        delivered_mwh = float('inf')
+
+    # Firm capacity a firm plant at the reference utilization would have provided, minus VRE credit
+    equivalent_firm_kw = vre_penetration / p['reference_firm_utilization']
+    credit_kw = metrics['capacity_credit'] * metrics['vre_capacity']
+    storage_cost = (storage_power * storage_costs['power_kw_year']
+                    + storage_power * storage_hours * storage_costs['energy_kwh_year'])
+
+    utilization = metrics['firm_utilization']
+    firmed_share = metrics['firming_energy_share']
+    ramp_per_mwh = metrics['ramp_intensity'] * metrics['firming_capacity'] / firmed_share if firmed_share > 0 else 0
+    underuse = (p['firm_capacity_cost_kw_year'] / 8.76
+                * max(0, 1 / utilization - 1 / p['reference_firm_utilization'])) if utilization > 0 else 0
+
+    return {
+        'storage': storage_cost / delivered_mwh,
+        'curtailment': curtailment / (1 - curtailment) * p['curtailment_value_mwh'] if curtailment < 1 else 0,
+        'backup': p['firm_capacity_cost_kw_year'] * max(0, equivalent_firm_kw - credit_kw) / delivered_mwh,
+        'grid': p['grid_cost_kw_year'] * metrics['vre_capacity'] / delivered_mwh,
+        'cycling': p['cycling_cost_mw_ramp'] * ramp_per_mwh,
+        'underuse': underuse
+    }
+
+def simulate_integration(region, cells):
     """
-    Calculate system integration costs based on VRE penetration level.
-    (Same logic as v2.0 with all fixes applied)
+    Dispatch a batch of (scenario, year) cells of one region
+
+    Returns:
+        {(scenario, year): {'metrics': {...}, 'drivers': {...}}}
+    """
+    inputs = [_dispatch_inputs(scenario, year) for scenario, year in cells]
+    metrics = simulate_dispatch(get_profiles(region), *map(list, zip(*inputs)))
+
+    results = {}
+    for i, (scenario, year) in enumerate(cells):
+        cell_metrics = {name: float(values[i]) for name, values in metrics.items()}
+        results[(scenario, year)] = {
+            'metrics': cell_metrics,
+            'drivers': integration_cost_drivers(cell_metrics, inputs[i], interpolate_value(year, STORAGE_COSTS))
+        }
+    return results
+
+def dispatch_results(region, cells):
+    """
+    Dispatch results of (scenario, year) cells of a region
+
+    Missing cells are simulated in one batch; the region's full scenario ×
+    DISPATCH_YEARS grid is included on first use. A region's results are
+    dropped when its profiles change (get_profiles() returns a new set);
+    clear_dispatch_cache() drops everything.
+    """
+    profiles = get_profiles(region)
+    entry = _DISPATCH_CACHE.get(region)
+    if entry is None or entry['profiles'] is not profiles:
+        entry = _DISPATCH_CACHE[region] = {'profiles': profiles, 'cells': {}}
+    region_cache = entry['cells']
+    cells = list(cells)
+    wanted = cells if region_cache else cells + [(s, y) for s in VRE_SCENARIOS for y in DISPATCH_YEARS]
+    missing = list(dict.fromkeys(cell for cell in wanted if cell not in region_cache))
+    if missing:
+        region_cache.update(simulate_integration(region, missing))
+    return [region_cache[cell] for cell in cells]
+
+def get_dispatch_results(scenario, year, region='Global'):
+    """Dispatch results of one cell (see dispatch_results)"""
+    return dispatch_results(region, [(scenario, year)])[0]
+
+def get_system_integration_costs(source, drivers):
+    """
+    Calculate system integration costs from the dispatch cost drivers.
+
+    - Solar, wind, other renewables: balancing + curtailment + firm-fleet cycling
+      (firming), storage, network (grid) and backup for the capacity VRE
+      cannot firm (capacity)
+    - Gas: cycling and fixed-cost under-recovery of the firming fleet
+    - Nuclear: firm clean output avoids the firming fleet's cycling and under-recovery
+    - Hydro, biofuels and other dispatchable sources: fixed adders
     """
     costs = {
         'firming': 0,
@@ -369,58 +563,22 @@ def get_system_integration_costs(source, vre_penetration):
     }
 
     if source in ['solar', 'wind', 'other_renewables']:
-        if vre_penetration < 0.30:
-            costs['firming'] = 10
-            costs['storage'] = 15
-            costs['grid'] = 20
-            costs['capacity'] = 15
-        elif vre_penetration < 0.60:
-            costs['firming'] = 30
-            costs['storage'] = 25
-            costs['grid'] = 25
-            costs['capacity'] = 15
-        elif vre_penetration < 0.80:
-            costs['firming'] = 50
-            costs['storage'] = 35
-            costs['grid'] = 25
-            costs['capacity'] = 10
-        else:
-            costs['firming'] = 65
-            costs['storage'] = 45
-            costs['grid'] = 25
-            costs['capacity'] = 10
+        costs['firming'] = INTEGRATION_COST_PARAMETERS['balancing_cost_mwh'] + drivers['curtailment'] + drivers['cycling']
+        costs['storage'] = drivers['storage']
+        costs['grid'] = drivers['grid']
+        costs['capacity'] = drivers['backup']
 
     elif source == 'nuclear':
-        if vre_penetration < 0.30:
-            costs['grid'] = 15
-            costs['capacity'] = 5
-        elif vre_penetration < 0.60:
-            costs['grid'] = 10
-            costs['capacity'] = 0
-        elif vre_penetration < 0.80:
-            costs['grid'] = -10
-            costs['capacity'] = -20
-        else:
-            costs['grid'] = -15
-            costs['capacity'] = -25
+        costs['grid'] = 15 - drivers['cycling']
+        costs['capacity'] = 5 - drivers['underuse']
 
     elif source in ['hydro', 'biofuels']:
         costs['grid'] = 25
         costs['capacity'] = 10
 
     elif source == 'gas':
-        if vre_penetration < 0.30:
-            costs['grid'] = 20
-            costs['capacity'] = 15
-        elif vre_penetration < 0.60:
-            costs['grid'] = 35
-            costs['capacity'] = 45
-        elif vre_penetration < 0.80:
-            costs['grid'] = 50
-            costs['capacity'] = 100
-        else:
-            costs['grid'] = 60
-            costs['capacity'] = 160
+        costs['grid'] = 20 + drivers['cycling']
+        costs['capacity'] = 15 + drivers['underuse']
 
     else:
         costs['grid'] = 20
@@ -522,28 +680,31 @@ def interpolate_value(year, data_dict):
 # MAIN CALCULATION FUNCTION
 # =============================================================================
 
+def get_base_lcoe(source, year, scenario):
+    """
+    Base LCOE of a source before integration costs (the same in every region)
+
+    Uses learning curves for applicable sources, BASE_LCOE otherwise.
+    """
+    if source in ['solar', 'wind'] and load_config('learning_curves.json'):
+        return get_learning_curve_lcoe(source, year, scenario)
+    return interpolate_value(year, BASE_LCOE)[source]['mid']
+
 def calculate_system_lcoes(source, year, scenario, region='Global', scc_scenario='none'):
     """
     Calculate full system LCOES using learning curves where applicable.
 
     v2.5.0: Uses Wright's Law for solar and wind, traditional interpolation for others.
     """
-    # Get base LCOE - use learning curves for applicable sources
-    if source in ['solar', 'wind'] and LEARNING_CURVES:
-        base_lcoe = get_learning_curve_lcoe(source, year, scenario)
-    else:
-        base_lcoe_data = interpolate_value(year, BASE_LCOE)
-        base_lcoe = base_lcoe_data[source]['mid']
+    base_lcoe = get_base_lcoe(source, year, scenario)
 
     # Get capacity factor (from BASE_LCOE for consistency)
     base_lcoe_data = interpolate_value(year, BASE_LCOE)
     capacity_factor = base_lcoe_data[source]['capacity_factor']
 
-    # Get VRE penetration for scenario and year
-    vre_penetration = interpolate_value(year, VRE_SCENARIOS[scenario])
-
-    # Calculate system integration costs
-    system_costs = get_system_integration_costs(source, vre_penetration)
+    # Calculate system integration costs from the hourly dispatch of this cell
+    dispatch = get_dispatch_results(scenario, year, region)
+    system_costs = get_system_integration_costs(source, dispatch['drivers'])
     total_system_cost = sum(system_costs.values())
 
     # Add Social Cost of Carbon if requested
@@ -587,16 +748,285 @@ def calculate_system_lcoes(source, year, scenario, region='Global', scc_scenario
         'service_units': service_units
     }
 
+# =============================================================================
+# VECTORIZED COST CUBE
+# =============================================================================
+# build_cost_cube() evaluates calculate_system_lcoes() for a whole
+# scenario × region × year × source cube with broadcast NumPy operations
+# (same operations in the same order, so values are bit-identical).
+# Interpolations are evaluated once per year instead of once per cell.
+
+COMPONENTS = ['firming', 'storage', 'grid', 'capacity']
+
+def key_year_index(years, key_years):
+    """
+    Index of the key year interpolate_value() starts from, for each year
+
+    Years before/after the key range map to the first/last key; otherwise
+    the left end of the first segment containing the year (an exact
+    interior key year resolves to the segment ending there).
+    """
+    years = np.asarray(years)
+    key_years = np.asarray(key_years)
+    index = np.clip(np.searchsorted(key_years, years, side='left') - 1, 0, len(key_years) - 2)
+    index = np.where(years <= key_years[0], 0, index)
+    return np.where(years >= key_years[-1], len(key_years) - 1, index)
+
+def interpolate_years(years, data_dict):
+    """interpolate_value() of a {year string: number} table over an array of years"""
+    key_years = sorted(int(y) for y in data_dict.keys())
+    table = np.array([data_dict[str(y)] for y in key_years], dtype=float)
+    years = np.asarray(years)
+
+    index = key_year_index(years, key_years)
+    segment = np.minimum(index, len(key_years) - 2)
+    y1, y2 = np.asarray(key_years)[segment], np.asarray(key_years)[segment + 1]
+    values = table[segment] + (table[segment + 1] - table[segment]) * (years - y1) / (y2 - y1)
+
+    clamped = (years <= key_years[0]) | (years >= key_years[-1])
+    values[clamped] = table[index[clamped]]
+    return values
+
+def learning_curve_lcoe_table(source, years, scenario):
+    """
+    get_learning_curve_lcoe() for a learning-curve source over an array of years
+
+    Returns:
+        (lcoe [Y], raw [Y], valid [Y]): raw holds the config base cost where
+        it is returned unconverted (else None); valid is False for years
+        without a cumulative capacity, which fall back to BASE_LCOE.
+        None when the source has no learning curve.
+    """
+    params = learning_curve_parameters(source, scenario)
+    if params is None:
+        return None
+
+    years = np.asarray(years)
+    cumulative = calculate_cumulative_capacities(source, years, scenario)
+    valid = cumulative != 0
+
+    # Python float powers as in calculate_learning_curve_cost(): NumPy's
+    # vectorized power can differ from libm pow in the last bit
+    b = math.log2(1 - params['learning_rate'])
+    unchanged = cumulative <= params['base_cumulative']
+    ratio = cumulative / params['base_cumulative']
+    lcoe = np.array([params['base_cost'] * r ** b if r > 1 else params['base_cost'] for r in ratio.tolist()])
+    lcoe = np.maximum(lcoe, params['floor_cost'])
+    lcoe[unchanged] = params['base_cost']
+
+    boosted = np.zeros(len(years), dtype=bool)
+    if params['breakthrough_boost'] is not None:
+        boosted = years >= 2030
+        lcoe = np.where(boosted, lcoe * (1 - params['breakthrough_boost']), lcoe)
+
+    raw = np.full(len(years), None, dtype=object)
+    raw[unchanged & ~boosted] = params['base_cost']
+    return lcoe, raw, valid
+
+def build_base_lcoe(scenarios, years, sources):
+    """
+    get_base_lcoe() for every scenario × year × source cell
+
+    Returns:
+        (base_lcoe [S, Y, K], base_lcoe_raw [S, Y, K] object array holding
+        the values the scalar path returns unconverted)
+    """
+    years = np.asarray(years)
+
+    # BASE_LCOE entries are per-source dicts, which interpolate_value()
+    # passes through from the segment's start year
+    lcoe_keys = sorted(BASE_LCOE, key=int)
+    key_index = key_year_index(years, [int(key) for key in lcoe_keys])
+    base_lcoe_raw = np.array([[BASE_LCOE[lcoe_keys[i]][source]['mid'] for source in sources] for i in key_index],
+                             dtype=object)
+    base_lcoe_raw = np.broadcast_to(base_lcoe_raw, (len(scenarios), len(years), len(sources))).copy()
+    base_lcoe = base_lcoe_raw.astype(float)
+
+    if load_config('learning_curves.json'):
+        for s, scenario in enumerate(scenarios):
+            for k, source in enumerate(sources):
+                if source not in ['solar', 'wind']:
+                    continue
+                table = learning_curve_lcoe_table(source, years, scenario)
+                if table is not None:
+                    lcoe, raw, valid = table
+                    base_lcoe[s, valid, k] = lcoe[valid]
+                    base_lcoe_raw[s, valid, k] = raw[valid]
+    return base_lcoe, base_lcoe_raw
+
+def build_cost_cube(scenarios, regions, years, sources, scc_scenario='none'):
+    """
+    Full system LCOES for every scenario × region × year × source cell
+
+    Returns:
+        Dict of arrays (S scenarios, R regions, Y years, K sources):
+            base_lcoe [S, Y, K] (+ base_lcoe_raw object array for values the
+            scalar path returns unconverted), capacity_factor [Y, K],
+            system_costs {source: {component: [S, R, Y] array or constant}},
+            total_system_cost {source: [S, R, Y] array or constant},
+            scc_cost {source: value}, total_lcoes [S, R, Y, K],
+            rebound [S, Y], vre_penetration [S, Y], service_mwh [S, Y, U],
+            service_cost [S, R, Y, K, U], dispatch (cell results, [S][R][Y])
+    """
+    years = np.asarray(years)
+    n_scen, n_region, n_year, n_source = len(scenarios), len(regions), len(years), len(sources)
+
+    # Base LCOE and capacity factor
+    base_lcoe, base_lcoe_raw = build_base_lcoe(scenarios, years, sources)
+    lcoe_keys = sorted(BASE_LCOE, key=int)
+    key_index = key_year_index(years, [int(key) for key in lcoe_keys])
+    capacity_factor = np.array([[BASE_LCOE[lcoe_keys[i]][source]['capacity_factor'] for source in sources]
+                                for i in key_index], dtype=object)
+
+    # Integration costs from the dispatch drivers of every cell
+    dispatch = [dispatch_results(region, [(scenario, int(year)) for year in years])
+                for scenario in scenarios for region in regions]
+    driver_names = list(dispatch[0][0]['drivers'])
+    drivers = {name: np.array([[cell['drivers'][name] for cell in cells] for cells in dispatch])
+                     .reshape(n_scen, n_region, n_year) for name in driver_names}
+    system_costs = {source: get_system_integration_costs(source, drivers) for source in sources}
+    total_system_cost = {source: sum(costs.values()) for source, costs in system_costs.items()}
+
+    # Social Cost of Carbon
+    scc_cost = {}
+    for source in sources:
+        scc_cost[source] = 0
+        if scc_scenario != 'none':
+            scc_cost[source] = SCC_SCENARIOS[scc_scenario]['value'] * CARBON_INTENSITY.get(source, 0)
+
+    # Total LCOES with regional multiplier [S, R, Y, K]
+    regional = np.array([REGIONAL_MULTIPLIERS.get(region, 1.0) for region in regions])
+    total_lcoes = np.stack([
+        (base_lcoe[:, None, :, k] + np.broadcast_to(total_system_cost[source], (n_scen, n_region, n_year))
+         + scc_cost[source]) * regional[None, :, None]
+        for k, source in enumerate(sources)
+    ], axis=-1)
+
+    # Rebound and VRE penetration [S, Y]; service units [S, R, Y, K, U]
+    rebound = np.stack([interpolate_years(years, REBOUND_MULTIPLIERS[scenario]) for scenario in scenarios])
+    vre_penetration = np.stack([interpolate_years(years, VRE_SCENARIOS[scenario]) for scenario in scenarios])
+    mwh_per_unit = np.array([conversion['mwh_per_unit'] for conversion in SERVICE_CONVERSIONS.values()])
+    service_mwh = mwh_per_unit * rebound[..., None]
+    service_cost = total_lcoes[..., None] * service_mwh[:, None, :, None, :]
+
+    return {
+        'scenarios': list(scenarios),
+        'regions': list(regions),
+        'years': [int(year) for year in years],
+        'sources': list(sources),
+        'base_lcoe': base_lcoe,
+        'base_lcoe_raw': base_lcoe_raw,
+        'capacity_factor': capacity_factor,
+        'system_costs': system_costs,
+        'total_system_cost': total_system_cost,
+        'scc_cost': scc_cost,
+        'total_lcoes': total_lcoes,
+        'rebound': rebound,
+        'vre_penetration': vre_penetration,
+        'service_mwh': service_mwh,
+        'service_cost': service_cost,
+        'dispatch': [dispatch[s * n_region:(s + 1) * n_region] for s in range(n_scen)]
+    }
+
+# =============================================================================
+# FACTORIZED OUTPUT
+# =============================================================================
+# full_system_costs.json stores the cost cube factorized rather than as one
+# materialized record per scenario × region × year × source:
+# - per scenario: base LCOE [source][year], rebound multipliers and VRE
+#   penetration [year] (the Global base cube, shared by all regions)
+# - per scenario and region: dispatch metrics and the integration cost
+#   components that follow the regional dispatch (components that are
+#   constant are stored once as numbers)
+# - side tables: regional multipliers, SCC scenarios, carbon intensities,
+#   service conversions and capacity factors
+# Values are stored unrounded; cost_accessor.py (and the mirrored
+# src/utils/costData.js) rebuild any cell, for any SCC scenario, on demand.
+
+FACTORIZED_FORMAT = 'factorized'
+FACTORIZED_FORMAT_VERSION = 1
+
+DISPATCH_OUTPUT_METRICS = {
+    'curtailment_share': 'curtailment_share',
+    'storage_throughput_share': 'storage_throughput',
+    'firming_energy_share': 'firming_energy_share',
+    'firming_capacity_ratio': 'firming_capacity',
+    'vre_capacity_credit': 'capacity_credit'
+}
+
+def _factorized_value(value, s, r):
+    """Year series of a [S, R, Y] cube array (constants pass through unchanged)"""
+    return value[s, r].tolist() if isinstance(value, np.ndarray) else value
+
+def factorized_base_lcoe(cube, s, k):
+    """Base LCOE series of a cube scenario/source (config numbers kept as-is)"""
+    raw = cube['base_lcoe_raw'][s, :, k]
+    return np.where(np.equal(raw, None), cube['base_lcoe'][s, :, k], raw).tolist()
+
+def factorized_system_costs(cube, s, r, source):
+    """Integration cost components of a cube scenario/region/source"""
+    return {component: _factorized_value(value, s, r) for component, value in cube['system_costs'][source].items()}
+
+def factorize_cost_cube(cube):
+    """
+    Factorized (side-table) form of a build_cost_cube() result
+
+    Returns:
+        Dict with 'dimensions', the side tables and 'scenarios'
+        {scenario: {'vre_penetration', 'rebound_multiplier', 'base_lcoe_mwh',
+        'regions': {region: {'dispatch', 'system_costs'}}}}
+    """
+    sources = cube['sources']
+    factorized = {
+        'dimensions': {
+            'scenarios': cube['scenarios'],
+            'regions': cube['regions'],
+            'years': cube['years'],
+            'sources': sources,
+            'components': COMPONENTS
+        },
+        'regional_multipliers': {region: REGIONAL_MULTIPLIERS.get(region, 1.0) for region in cube['regions']},
+        'scc_scenarios': SCC_SCENARIOS,
+        'carbon_intensity': CARBON_INTENSITY,
+        'service_conversions': SERVICE_CONVERSIONS,
+        'capacity_factor': {source: cube['capacity_factor'][:, k].tolist() for k, source in enumerate(sources)},
+        'scenarios': {}
+    }
+
+    for s, scenario in enumerate(cube['scenarios']):
+        regions = {}
+        for r, region in enumerate(cube['regions']):
+            metrics = [cell['metrics'] for cell in cube['dispatch'][s][r]]
+            regions[region] = {
+                'dispatch': {name: [round(cell[metric], 4) for cell in metrics]
+                             for name, metric in DISPATCH_OUTPUT_METRICS.items()},
+                'system_costs': {source: factorized_system_costs(cube, s, r, source) for source in sources}
+            }
+
+        factorized['scenarios'][scenario] = {
+            'vre_penetration': [round(value, 3) for value in cube['vre_penetration'][s].tolist()],
+            'rebound_multiplier': cube['rebound'][s].tolist(),
+            'base_lcoe_mwh': {source: factorized_base_lcoe(cube, s, k) for k, source in enumerate(sources)},
+            'regions': regions
+        }
+
+    return factorized
+
 # =============================================================================
 # MAIN GENERATION FUNCTION
 # =============================================================================
 
 def generate_full_system_costs():
-    """Generate complete full_system_costs.json file with v2.5.0 features."""
+    """
+    Generate complete full_system_costs.json file with v2.5.0 features.
+
+    The output is factorized (see FACTORIZED OUTPUT); cost_accessor.expand_costs()
+    rebuilds the per-cell records.
+    """
 
     sources = ['coal', 'oil', 'gas', 'nuclear', 'hydro', 'wind', 'solar', 'biofuels', 'other_renewables']
     years = list(range(2024, 2051))
-    scenarios = ['Conservative', 'Baseline', 'Optimistic']
+    scenarios = scenario_dimension().select(builtin=True)
     regions = list(REGIONAL_MULTIPLIERS.keys())
 
     output = {
@@ -616,10 +1046,12 @@ def generate_full_system_costs():
             ],
             'key_improvements_v25': [
                 'Wright\'s Law learning curves for solar (27% rate) and wind (15% rate)',
+                'Solar and wind cumulative capacity from the Projection Engine v4.0 deployment path (learning by deployment)',
                 'Manufacturing capacity constraints from IEA/BNEF data',
                 'New scenario framework: Conservative/Baseline/Optimistic (replacing IEA STEPS/APS/NZE)',
                 'Technology breakthrough adjustments by scenario',
-                'Scenario-specific S-curve saturation limits'
+                'Scenario-specific S-curve saturation limits',
+                'System integration costs from an 8760-hour VRE dispatch simulation per region, scenario and year'
             ],
             'learning_curves': {
                 'solar_pv': '27% cost reduction per doubling (50-year validated)',
@@ -627,42 +1059,24 @@ def generate_full_system_costs():
                 'floor_costs': 'Solar: $8/MWh, Wind: $15/MWh'
             },
             'scenario_framework': SCENARIO_DESCRIPTIONS,
-            'scc_scenarios_available': list(SCC_SCENARIOS.keys())
+            'scc_scenarios_available': list(SCC_SCENARIOS.keys()),
+            'format': FACTORIZED_FORMAT,
+            'format_version': FACTORIZED_FORMAT_VERSION
         },
-        'scenarios': {}
     }
 
-    # Generate data for each scenario
-    for scenario in scenarios:
-        scenario_data = {
+    cube = build_cost_cube(scenarios, regions, years, sources)
+    output.update(factorize_cost_cube(cube))
+
+    for scenario, scenario_data in output['scenarios'].items():
+        output['scenarios'][scenario] = {
             'name': scenario,
             'description': SCENARIO_DESCRIPTIONS[scenario]['description'],
             'philosophy': SCENARIO_DESCRIPTIONS[scenario]['philosophy'],
-            'regions': {}
+            'learning_by_deployment': learning_summary(scenario),
+            **scenario_data
         }
 
-        for region in regions:
-            region_data = {
-                'regional_multiplier': REGIONAL_MULTIPLIERS[region],
-                'timeseries': []
-            }
-
-            for year in years:
-                year_data = {
-                    'year': year,
-                    'vre_penetration': round(interpolate_value(year, VRE_SCENARIOS[scenario]), 3),
-                    'sources': {}
-                }
-
-                for source in sources:
-                    year_data['sources'][source] = calculate_system_lcoes(source, year, scenario, region)
-
-                region_data['timeseries'].append(year_data)
-
-            scenario_data['regions'][region] = region_data
-
-        output['scenarios'][scenario] = scenario_data
-
     return output
 
 
@@ -679,6 +1093,10 @@ def main():
     print("  - Technology breakthrough adjustments")
     print()
 
+    if REGISTRY.exists('learning_curves.json') and REGISTRY.exists('manufacturing_capacity.json'):
+        print("✓ Found learning curves and manufacturing capacity configurations")
+        print()
+
     # Generate the data
     data = generate_full_system_costs()
 
@@ -691,33 +1109,25 @@ def main():
         json.dump(data, f, indent=2)
 
     print(f"✓ Successfully generated {OUTPUT_FILE}")
-    print(f"  - {len(data['scenarios'])} scenarios: {list(data['scenarios'].keys())}")
-    print(f"  - {len(list(data['scenarios'].values())[0]['regions'])} regions")
-    print(f"  - {len(list(data['scenarios'].values())[0]['regions']['Global']['timeseries'])} years per region")
-    print(f"  - 9 energy sources")
+    print(f"  - {len(data['dimensions']['scenarios'])} scenarios: {data['dimensions']['scenarios']}")
+    print(f"  - {len(data['dimensions']['regions'])} regions")
+    print(f"  - {len(data['dimensions']['years'])} years per region")
+    print(f"  - {len(data['dimensions']['sources'])} energy sources")
+    print(f"  - Factorized output: {output_path.stat().st_size / 1024:.0f} KB")
     print()
 
     # Print sample output comparing scenarios
-    print("Sample data (2030, Global):")
-    print("-" * 50)
-    for scenario in data['scenarios']:
-        sample = data['scenarios'][scenario]['regions']['Global']['timeseries'][6]  # 2030
-        print(f"{scenario}:")
-        print(f"  VRE: {sample['vre_penetration']*100:.0f}%  |  "
-              f"Solar: ${sample['sources']['solar']['total_lcoes_mwh']}/MWh  |  "
-              f"Wind: ${sample['sources']['wind']['total_lcoes_mwh']}/MWh")
-
-    print()
-    print("Sample data (2050, Global):")
-    print("-" * 50)
-    for scenario in data['scenarios']:
-        sample = data['scenarios'][scenario]['regions']['Global']['timeseries'][-1]  # 2050
-        print(f"{scenario}:")
-        print(f"  VRE: {sample['vre_penetration']*100:.0f}%  |  "
-              f"Solar: ${sample['sources']['solar']['total_lcoes_mwh']}/MWh  |  "
-              f"Wind: ${sample['sources']['wind']['total_lcoes_mwh']}/MWh")
+    for year in [2030, 2050]:
+        print(f"Sample data ({year}, Global):")
+        print("-" * 50)
+        for scenario in data['dimensions']['scenarios']:
+            sample = year_record(data, scenario, 'Global', year)
+            print(f"{scenario}:")
+            print(f"  VRE: {sample['vre_penetration']*100:.0f}%  |  "
+                  f"Solar: ${sample['sources']['solar']['total_lcoes_mwh']}/MWh  |  "
+                  f"Wind: ${sample['sources']['wind']['total_lcoes_mwh']}/MWh")
+        print()
 
-    print()
     print("Data generation complete!")
 
 
@@ -1,17 +1,27 @@
-import pandas as pd
+import numpy as np
 import json
 import os
+import sys
+from pathlib import Path
+
+# Shared efficiency cube and typed OWID cache (global-energy-services/data-pipeline)
+SERVICES_PIPELINE_DIR = Path(__file__).resolve().parent.parent / 'global-energy-services' / 'data-pipeline'
+if str(SERVICES_PIPELINE_DIR) not in sys.path:
+    sys.path.insert(0, str(SERVICES_PIPELINE_DIR))
+import owid_cache
+from dimensions import SOURCES
+from efficiency_cube import load_efficiency_cube
 
 # Configuration
-INPUT_FILE = 'downloads/owid_energy_data.csv'
+INPUT_FILE = SERVICES_PIPELINE_DIR / owid_cache.DOWNLOAD_DIR / owid_cache.CACHE_FILENAME
 OUTPUT_FILE = '../global-energy-tracker/public/data/regional_net_imports_timeseries.json'
 
-# Efficiency factors for converting primary to useful energy (v2.3)
-EFFICIENCY_FACTORS = {
-    'coal': 0.32,
-    'oil': 0.30,
-    'gas': 0.52
-}
+# Traded fuels (the fossil sources of the shared registry)
+FUELS = SOURCES.select(fossil=True)
+
+# Efficiency factors for converting primary to useful energy (system-wide,
+# from the shared efficiency cube)
+EFFICIENCY_FACTORS = {fuel: load_efficiency_cube().factor(fuel) for fuel in FUELS}
 
 # Continental regions (for aggregation)
 CONTINENTAL_REGIONS = {
@@ -41,7 +51,7 @@ CONTINENTAL_REGIONS = {
     'Europe': [
         'Germany', 'United Kingdom', 'France', 'Italy', 'Spain', 'Poland',
         'Netherlands', 'Belgium', 'Russia', 'Norway', 'Sweden', 'Austria',
-        'Switzerland', 'Denmark', 'Finland', 'Portugal', 'Czech Republic',
+        'Switzerland', 'Denmark', 'Finland', 'Portugal', 'Czechia',
         'Greece', 'Hungary', 'Romania', 'Ireland', 'Slovakia', 'Bulgaria',
         'Croatia', 'Lithuania', 'Slovenia', 'Latvia', 'Estonia', 'Luxembourg',
         'Cyprus', 'Malta', 'Iceland', 'Albania', 'Serbia', 'Bosnia and Herzegovina',
@@ -76,6 +86,19 @@ CONTINENTAL_REGIONS = {
     ]
 }
 
+# Economic and political blocs, aggregated like the continents
+BLOCS = {
+    'G20': [
+        'Argentina', 'Australia', 'Brazil', 'Canada', 'China', 'France', 'Germany',
+        'India', 'Indonesia', 'Italy', 'Japan', 'Mexico', 'Russia', 'Saudi Arabia',
+        'South Africa', 'South Korea', 'Turkey', 'United Kingdom', 'United States'
+    ],
+    'OPEC': [
+        'Algeria', 'Congo', 'Equatorial Guinea', 'Gabon', 'Iran', 'Iraq', 'Kuwait',
+        'Libya', 'Nigeria', 'Saudi Arabia', 'United Arab Emirates', 'Venezuela'
+    ]
+}
+
 # Individual countries to include (targeting key importers and exporters that match Regions page)
 COUNTRIES = [
     'Australia', 'Brazil', 'Canada', 'China', 'France', 'Germany',
@@ -83,26 +106,176 @@ COUNTRIES = [
     'South Africa', 'South Korea', 'United Kingdom', 'United States'
 ]
 
-def calculate_net_imports():
-    """
-    Calculate net energy imports (consumption - production) by region and fuel type.
-    Converts from TWh to EJ and applies efficiency factors for useful energy.
-    """
-    print("Loading OWID energy dataset...")
-    df = pd.read_csv(INPUT_FILE)
+# OWID columns read per country-year (TWh)
+NET_IMPORT_COLUMNS = [f'{fuel}_{flow}' for fuel in FUELS for flow in ('consumption', 'production')]
 
-    # Filter to years with data
-    df = df[df['year'] >= 1965]
+FIRST_YEAR = 1965
 
-    # Get all countries that are in continental regions or in our country list
+def needed_countries():
+    """Countries in continental regions, blocs or the country list"""
     all_countries_needed = set(COUNTRIES)
     for continent_countries in CONTINENTAL_REGIONS.values():
         all_countries_needed.update(continent_countries)
+    for bloc_countries in BLOCS.values():
+        all_countries_needed.update(bloc_countries)
+    return all_countries_needed
+
+def aggregate_regions(countries):
+    """
+    Output regions in order with the countries summed into each
+
+    Global sums every needed country (in dataset order), then come the
+    continents (sorted), the blocs and the individual COUNTRIES (one member).
+
+    Args:
+        countries: Entities of the dataset, in dataset order
+    """
+    needed = needed_countries()
+    regions = {'Global': [country for country in countries if country in needed]}
+    for continent in sorted(CONTINENTAL_REGIONS):
+        regions[continent] = CONTINENTAL_REGIONS[continent]
+    regions.update(BLOCS)
+    for country in COUNTRIES:
+        regions.setdefault(country, [country])
+    return regions
+
+def year_entry(year, totals):
+    """Output entry of a region-year from fuel totals"""
+    total_primary = totals['coal']['primary_ej'] + totals['oil']['primary_ej'] + totals['gas']['primary_ej']
+    total_useful = totals['coal']['useful_ej'] + totals['oil']['useful_ej'] + totals['gas']['useful_ej']
+
+    return {
+        'year': year,
+        'coal': {
+            'primary_ej': round(totals['coal']['primary_ej'], 4),
+            'useful_ej': round(totals['coal']['useful_ej'], 4)
+        },
+        'oil': {
+            'primary_ej': round(totals['oil']['primary_ej'], 4),
+            'useful_ej': round(totals['oil']['useful_ej'], 4)
+        },
+        'gas': {
+            'primary_ej': round(totals['gas']['primary_ej'], 4),
+            'useful_ej': round(totals['gas']['useful_ej'], 4)
+        },
+        'total': {
+            'primary_ej': round(total_primary, 4),
+            'useful_ej': round(total_useful, 4)
+        }
+    }
+
+# ============================================================================
+# MEMBERSHIP-MATRIX AGGREGATION
+# ============================================================================
+# Every region (Global, continents, blocs, single countries) is a row of a
+# sparse 0/1 region × country membership matrix in CSR form. Its product
+# with the typed [country × year × fuel] net imports array gives all
+# regions and years at once: the member rows are gathered through the CSR
+# column indices and scattered onto their region rows with one np.add.at.
+# add.at applies the nonzeros in order, so totals add up from 0 in the same
+# order as summing country by country (np.add.reduceat would sum pairwise
+# and differ in the last bit).
+
+def net_imports_array(data, countries=None, first_year=None):
+    """
+    Net imports (EJ) of country-years of the typed OWID cache as an array
+
+    Args:
+        data: owid_cache.OwidCache
+        countries: Countries to include (default: every entity)
+        first_year: First year to include (default: all)
+
+    Returns:
+        (countries in dataset order, years, net [country, year, fuel],
+         present [country, year]: the country has a row for the year)
+    """
+    codes = data.row_codes()
+    row_years = data.column('year').astype(np.int64)
+    keep = np.ones(len(codes), dtype=bool)
+    if countries is not None:
+        wanted = set(countries)
+        keep &= np.array([entity in wanted for entity in data.entities], dtype=bool)[codes]
+    if first_year is not None:
+        keep &= row_years >= first_year
+
+    kept_codes, country_codes = np.unique(codes[keep], return_inverse=True)
+    countries = [data.entities[code] for code in kept_codes.tolist()]
+    years, year_codes = np.unique(row_years[keep], return_inverse=True)
+
+    def value(column):
+        # Blank or missing values count as 0
+        if column not in data.columns:
+            return np.zeros(int(keep.sum()))
+        return np.nan_to_num(data.column(column)[keep], nan=0.0)
+
+    net = np.zeros((len(countries), len(years), len(FUELS)))
+    for f, fuel in enumerate(FUELS):
+        net[country_codes, year_codes, f] = (value(f'{fuel}_consumption') - value(f'{fuel}_production')) / 277.778
+    present = np.zeros((len(countries), len(years)), dtype=bool)
+    present[country_codes, year_codes] = True
+    return countries, years, net, present
+
+def membership_matrix(regions, countries):
+    """
+    Sparse region × country membership matrix in CSR form
+
+    Args:
+        regions: {region: [member countries]} (members keep their order;
+                 countries not in the dataset are skipped)
+        countries: Column countries
 
-    # Filter to only the countries we need
-    df = df[df['country'].isin(all_countries_needed)]
+    Returns:
+        (indptr, indices) int arrays
+    """
+    column = {country: i for i, country in enumerate(countries)}
+    indptr, indices = [0], []
+    for members in regions.values():
+        indices.extend(column[country] for country in members if country in column)
+        indptr.append(len(indices))
+    return np.array(indptr, dtype=np.int64), np.array(indices, dtype=np.int64)
+
+def csr_sum(values, indptr, indices):
+    """
+    CSR 0/1 matrix × values: rows of values summed per matrix row
 
-    print(f"Processing data from {df['year'].min()} to {df['year'].max()}")
+    Args:
+        values: [column, ...] array
+        indptr, indices: CSR structure (see membership_matrix)
+
+    Returns:
+        [row, ...] array; rows without members are 0
+    """
+    counts = np.diff(indptr)
+    result = np.zeros((len(counts),) + values.shape[1:], dtype=values.dtype)
+    np.add.at(result, np.repeat(np.arange(len(counts)), counts), values[indices])
+    return result
+
+def aggregate_net_imports(net, present, indptr, indices):
+    """
+    Membership matrix × net imports for every region, year and fuel
+
+    Returns:
+        (primary [region, year, fuel], useful [region, year, fuel],
+         has_data [region, year]: some member has a row for the year)
+    """
+    efficiency = np.array([EFFICIENCY_FACTORS[fuel] for fuel in FUELS])
+    # Country-years without a row are 0 in net
+    primary = csr_sum(net, indptr, indices)
+    useful = csr_sum(net * efficiency, indptr, indices)
+    has_data = csr_sum(present.astype(np.int64), indptr, indices) > 0
+    return primary, useful, has_data
+
+def build_net_imports(data):
+    """
+    Net imports by region (Global, continents, blocs, countries) from the typed OWID cache
+
+    Returns:
+        Output structure of regional_net_imports_timeseries.json
+    """
+    # Only the countries we need, in years with data
+    countries, years, net, present = net_imports_array(data, needed_countries(), FIRST_YEAR)
+
+    print(f"Processing data from {years.min()} to {years.max()}")
 
     # Initialize results structure
     results = {
@@ -118,230 +291,114 @@ def calculate_net_imports():
         'regions': []
     }
 
-    # First, calculate Global totals by summing all regions for each year
-    print("Calculating global totals...")
-    global_years = {}
-    for country in df['country'].unique():
-        country_data = df[df['country'] == country]
-        for _, row in country_data.iterrows():
-            year = int(row['year'])
-            if year not in global_years:
-                global_years[year] = {
-                    'coal': {'primary_ej': 0, 'useful_ej': 0},
-                    'oil': {'primary_ej': 0, 'useful_ej': 0},
-                    'gas': {'primary_ej': 0, 'useful_ej': 0}
-                }
-
-            # Handle NaN values
-            coal_consumption = 0 if pd.isna(row.get('coal_consumption', 0)) else row.get('coal_consumption', 0)
-            coal_production = 0 if pd.isna(row.get('coal_production', 0)) else row.get('coal_production', 0)
-            oil_consumption = 0 if pd.isna(row.get('oil_consumption', 0)) else row.get('oil_consumption', 0)
-            oil_production = 0 if pd.isna(row.get('oil_production', 0)) else row.get('oil_production', 0)
-            gas_consumption = 0 if pd.isna(row.get('gas_consumption', 0)) else row.get('gas_consumption', 0)
-            gas_production = 0 if pd.isna(row.get('gas_production', 0)) else row.get('gas_production', 0)
-
-            # Calculate net imports in TWh then convert to EJ
-            coal_net_ej = (coal_consumption - coal_production) / 277.778
-            oil_net_ej = (oil_consumption - oil_production) / 277.778
-            gas_net_ej = (gas_consumption - gas_production) / 277.778
-
-            # Add to global totals
-            global_years[year]['coal']['primary_ej'] += coal_net_ej
-            global_years[year]['coal']['useful_ej'] += coal_net_ej * EFFICIENCY_FACTORS['coal']
-            global_years[year]['oil']['primary_ej'] += oil_net_ej
-            global_years[year]['oil']['useful_ej'] += oil_net_ej * EFFICIENCY_FACTORS['oil']
-            global_years[year]['gas']['primary_ej'] += gas_net_ej
-            global_years[year]['gas']['useful_ej'] += gas_net_ej * EFFICIENCY_FACTORS['gas']
-
-    # Build Global region entry
-    global_entry = {
-        'region': 'Global',
-        'years': []
-    }
-    for year in sorted(global_years.keys()):
-        year_data = global_years[year]
-        # Calculate totals
-        total_primary = year_data['coal']['primary_ej'] + year_data['oil']['primary_ej'] + year_data['gas']['primary_ej']
-        total_useful = year_data['coal']['useful_ej'] + year_data['oil']['useful_ej'] + year_data['gas']['useful_ej']
-
-        global_entry['years'].append({
-            'year': year,
-            'coal': {
-                'primary_ej': round(year_data['coal']['primary_ej'], 4),
-                'useful_ej': round(year_data['coal']['useful_ej'], 4)
-            },
-            'oil': {
-                'primary_ej': round(year_data['oil']['primary_ej'], 4),
-                'useful_ej': round(year_data['oil']['useful_ej'], 4)
-            },
-            'gas': {
-                'primary_ej': round(year_data['gas']['primary_ej'], 4),
-                'useful_ej': round(year_data['gas']['useful_ej'], 4)
-            },
-            'total': {
-                'primary_ej': round(total_primary, 4),
-                'useful_ej': round(total_useful, 4)
-            }
-        })
-
-    # Add Global entry first
-    results['regions'].append(global_entry)
-    print(f"  - Global totals calculated for {len(global_entry['years'])} years")
-
-    # Calculate continental region totals
-    print("Calculating continental region totals...")
-    for continent, countries in sorted(CONTINENTAL_REGIONS.items()):
-        continent_years = {}
-
-        # Sum data from all countries in this continent
-        for country in countries:
-            country_data = df[df['country'] == country]
-            if country_data.empty:
-                continue
-
-            for _, row in country_data.iterrows():
-                year = int(row['year'])
-                if year not in continent_years:
-                    continent_years[year] = {
-                        'coal': {'primary_ej': 0, 'useful_ej': 0},
-                        'oil': {'primary_ej': 0, 'useful_ej': 0},
-                        'gas': {'primary_ej': 0, 'useful_ej': 0}
-                    }
-
-                # Handle NaN values
-                coal_consumption = 0 if pd.isna(row.get('coal_consumption', 0)) else row.get('coal_consumption', 0)
-                coal_production = 0 if pd.isna(row.get('coal_production', 0)) else row.get('coal_production', 0)
-                oil_consumption = 0 if pd.isna(row.get('oil_consumption', 0)) else row.get('oil_consumption', 0)
-                oil_production = 0 if pd.isna(row.get('oil_production', 0)) else row.get('oil_production', 0)
-                gas_consumption = 0 if pd.isna(row.get('gas_consumption', 0)) else row.get('gas_consumption', 0)
-                gas_production = 0 if pd.isna(row.get('gas_production', 0)) else row.get('gas_production', 0)
-
-                # Calculate net imports in TWh then convert to EJ
-                coal_net_ej = (coal_consumption - coal_production) / 277.778
-                oil_net_ej = (oil_consumption - oil_production) / 277.778
-                gas_net_ej = (gas_consumption - gas_production) / 277.778
-
-                # Add to continent totals
-                continent_years[year]['coal']['primary_ej'] += coal_net_ej
-                continent_years[year]['coal']['useful_ej'] += coal_net_ej * EFFICIENCY_FACTORS['coal']
-                continent_years[year]['oil']['primary_ej'] += oil_net_ej
-                continent_years[year]['oil']['useful_ej'] += oil_net_ej * EFFICIENCY_FACTORS['oil']
-                continent_years[year]['gas']['primary_ej'] += gas_net_ej
-                continent_years[year]['gas']['useful_ej'] += gas_net_ej * EFFICIENCY_FACTORS['gas']
-
-        # Build continent entry
-        if continent_years:
-            continent_entry = {
-                'region': continent,
-                'years': []
-            }
-            for year in sorted(continent_years.keys()):
-                year_data = continent_years[year]
-                total_primary = year_data['coal']['primary_ej'] + year_data['oil']['primary_ej'] + year_data['gas']['primary_ej']
-                total_useful = year_data['coal']['useful_ej'] + year_data['oil']['useful_ej'] + year_data['gas']['useful_ej']
-
-                continent_entry['years'].append({
-                    'year': year,
-                    'coal': {
-                        'primary_ej': round(year_data['coal']['primary_ej'], 4),
-                        'useful_ej': round(year_data['coal']['useful_ej'], 4)
-                    },
-                    'oil': {
-                        'primary_ej': round(year_data['oil']['primary_ej'], 4),
-                        'useful_ej': round(year_data['oil']['useful_ej'], 4)
-                    },
-                    'gas': {
-                        'primary_ej': round(year_data['gas']['primary_ej'], 4),
-                        'useful_ej': round(year_data['gas']['useful_ej'], 4)
-                    },
-                    'total': {
-                        'primary_ej': round(total_primary, 4),
-                        'useful_ej': round(total_useful, 4)
-                    }
-                })
-
-            results['regions'].append(continent_entry)
-            print(f"  - {continent} calculated for {len(continent_entry['years'])} years")
-
-    # Process individual countries
-    print("Processing individual countries...")
-    for country in COUNTRIES:
-        country_data = df[df['country'] == country].sort_values('year')
+    # All regions and years in one membership-matrix product
+    regions = aggregate_regions(countries)
+    primary, useful, has_data = aggregate_net_imports(net, present, *membership_matrix(regions, countries))
 
+    years = years.tolist()
+    primary, useful, has_data = primary.tolist(), useful.tolist(), has_data.tolist()
+    for r, region in enumerate(regions):
         region_entry = {
-            'region': country,
-            'years': []
+            'region': region,
+            'years': [
+                year_entry(year, {fuel: {'primary_ej': primary[r][y][f], 'useful_ej': useful[r][y][f]}
+                                  for f, fuel in enumerate(FUELS)})
+                for y, year in enumerate(years) if has_data[r][y]
+            ]
         }
 
-        # Process each year
-        for _, row in country_data.iterrows():
-            year = int(row['year'])
-
-            # Calculate net imports for each fuel type (TWh)
-            # Net imports = consumption - production (positive = importer, negative = exporter)
-
-            # Handle NaN values from pandas
-            coal_consumption = row.get('coal_consumption', 0)
-            coal_consumption = 0 if pd.isna(coal_consumption) else coal_consumption
-            coal_production = row.get('coal_production', 0)
-            coal_production = 0 if pd.isna(coal_production) else coal_production
-            coal_net_twh = coal_consumption - coal_production
-
-            oil_consumption = row.get('oil_consumption', 0)
-            oil_consumption = 0 if pd.isna(oil_consumption) else oil_consumption
-            oil_production = row.get('oil_production', 0)
-            oil_production = 0 if pd.isna(oil_production) else oil_production
-            oil_net_twh = oil_consumption - oil_production
-
-            gas_consumption = row.get('gas_consumption', 0)
-            gas_consumption = 0 if pd.isna(gas_consumption) else gas_consumption
-            gas_production = row.get('gas_production', 0)
-            gas_production = 0 if pd.isna(gas_production) else gas_production
-            gas_net_twh = gas_consumption - gas_production
-
-            # Convert TWh to EJ (1 EJ = 277.778 TWh)
-            coal_net_ej = coal_net_twh / 277.778
-            oil_net_ej = oil_net_twh / 277.778
-            gas_net_ej = gas_net_twh / 277.778
-
-            # Calculate useful energy (apply efficiency factors)
-            coal_net_useful_ej = coal_net_ej * EFFICIENCY_FACTORS['coal']
-            oil_net_useful_ej = oil_net_ej * EFFICIENCY_FACTORS['oil']
-            gas_net_useful_ej = gas_net_ej * EFFICIENCY_FACTORS['gas']
-
-            # Calculate totals
-            total_net_primary_ej = coal_net_ej + oil_net_ej + gas_net_ej
-            total_net_useful_ej = coal_net_useful_ej + oil_net_useful_ej + gas_net_useful_ej
-
-            year_entry = {
-                'year': year,
-                'coal': {
-                    'primary_ej': round(coal_net_ej, 4),
-                    'useful_ej': round(coal_net_useful_ej, 4)
-                },
-                'oil': {
-                    'primary_ej': round(oil_net_ej, 4),
-                    'useful_ej': round(oil_net_useful_ej, 4)
-                },
-                'gas': {
-                    'primary_ej': round(gas_net_ej, 4),
-                    'useful_ej': round(gas_net_useful_ej, 4)
-                },
-                'total': {
-                    'primary_ej': round(total_net_primary_ej, 4),
-                    'useful_ej': round(total_net_useful_ej, 4)
-                }
-            }
-
-            region_entry['years'].append(year_entry)
-
         # Only include regions with at least some data
         if region_entry['years']:
             results['regions'].append(region_entry)
-            print(f"  - {country} processed for {len(region_entry['years'])} years")
+            print(f"  - {region} calculated for {len(region_entry['years'])} years")
+
+    return results
+
+def affected_regions(rows, entities):
+    """
+    Region-years of aggregate_regions() that contain changed country-years
+
+    Args:
+        rows: {country: [years]} with changed cells
+        entities: Entities of the old and the new snapshot, so that a
+                  country dropped from the dataset still marks Global
+
+    Returns:
+        {region: set of years}
+    """
+    needed = needed_countries()
+    members = aggregate_regions(list(dict.fromkeys(entities)))
+    affected = {}
+    for country, years in rows.items():
+        years = [year for year in years if year >= FIRST_YEAR]
+        if country not in needed or not years:
+            continue
+        for region in [region for region, countries in members.items() if country in countries]:
+            affected.setdefault(region, set()).update(years)
+    return affected
+
+def patch_net_imports(results, data, affected):
+    """
+    Recompute the given region-years, in place
+
+    The affected regions are re-aggregated from the new snapshot with the
+    same membership-matrix product as build_net_imports(), so patched
+    entries equal a full run. results may hold only some of the regions;
+    entries of other regions are left as they are.
+
+    Args:
+        results: Content of regional_net_imports_timeseries.json
+        data: owid_cache.OwidCache of the new snapshot
+        affected: {region: years} from affected_regions()
+
+    Returns:
+        Number of recomputed region-years
+    """
+    countries, years, net, present = net_imports_array(data, needed_countries(), FIRST_YEAR)
+    members = aggregate_regions(countries)
+    regions = [region for region in members if region in affected]
+    primary, useful, has_data = aggregate_net_imports(
+        net, present, *membership_matrix({region: members[region] for region in regions}, countries))
+    year_index = {year: y for y, year in enumerate(years.tolist())}
+
+    entries = {entry['region']: entry for entry in results['regions']}
+    for r, region in enumerate(regions):
+        region_years = entries.setdefault(region, {'region': region, 'years': []})['years']
+        for year in sorted(affected[region]):
+            y = year_index.get(year)
+            entry = None
+            if y is not None and has_data[r, y]:
+                entry = year_entry(year, {fuel: {'primary_ej': primary[r, y, f].item(), 'useful_ej': useful[r, y, f].item()}
+                                          for f, fuel in enumerate(FUELS)})
+
+            index = next((i for i, existing in enumerate(region_years) if existing['year'] >= year), len(region_years))
+            exists = index < len(region_years) and region_years[index]['year'] == year
+            if entry is None:
+                if exists:
+                    del region_years[index]
+            elif exists:
+                region_years[index] = entry
+            else:
+                region_years.insert(index, entry)
+
+    # Global, continents (sorted), blocs, then countries; regions without data are left out
+    results['regions'] = [entries[region] for region in members if region in entries and entries[region]['years']]
+    return sum(len(years) for years in affected.values())
+
+def calculate_net_imports(input_file=INPUT_FILE, output_file=OUTPUT_FILE):
+    """
+    Calculate net energy imports (consumption - production) by region and fuel type.
+    Converts from TWh to EJ and applies efficiency factors for useful energy.
+    """
+    print("Loading OWID energy dataset...")
+    data = owid_cache.load_owid_cache(str(input_file))
+    if data is None:
+        sys.exit(1)
+
+    results = build_net_imports(data)
 
     # Save to JSON
-    output_path = OUTPUT_FILE
+    output_path = output_file
     os.makedirs(os.path.dirname(output_path), exist_ok=True)
 
     with open(output_path, 'w') as f:
@@ -349,7 +406,9 @@ def calculate_net_imports():
 
     print(f"\nSuccessfully generated {output_path}")
     print(f"  - {len(results['regions'])} regions processed")
-    print(f"  - Years covered: {df['year'].min()}-{df['year'].max()}")
+    years = results['regions'][0]['years'] if results['regions'] else []
+    if years:
+        print(f"  - Years covered: {years[0]['year']}-{years[-1]['year']}")
 
     # Print sample statistics
     print("\nSample Net Imports for 2024 (Primary Energy, EJ):")
@@ -358,5 +417,7 @@ def calculate_net_imports():
         if latest_year['year'] >= 2020:
             print(f"  {region['region']}: {latest_year['total']['primary_ej']:+.2f} EJ")
 
+    return results
+
 if __name__ == '__main__':
     calculate_net_imports()
@@ -1,29 +1,20 @@
-import pandas as pd
+import numpy as np
 import json
+import sys
 from pathlib import Path
 
-def load_efficiency_factors():
-    """Load efficiency factors from corrected JSON file"""
-    efficiency_path = Path('../global-energy-tracker/data-pipeline/efficiency_factors_corrected.json')
-    with open(efficiency_path, 'r') as f:
-        factors_data = json.load(f)
+# Shared efficiency cube, source registry and typed OWID cache (global-energy-services/data-pipeline)
+SERVICES_PIPELINE_DIR = Path(__file__).resolve().parent.parent / 'global-energy-services' / 'data-pipeline'
+if str(SERVICES_PIPELINE_DIR) not in sys.path:
+    sys.path.insert(0, str(SERVICES_PIPELINE_DIR))
+import owid_cache
+from dimensions import SOURCES, is_fossil
+from efficiency_cube import load_efficiency_cube
+from energy_balance import percent, round_array, sum_columns
 
-    # Map JSON keys to expected source names
-    system_factors = factors_data['system_wide_efficiency']
-    return {
-        'coal': system_factors['coal'],
-        'oil': system_factors['oil'],
-        'gas': system_factors['gas'],
-        'nuclear': system_factors['nuclear'],
-        'hydro': system_factors['hydro'],
-        'wind': system_factors['wind'],
-        'solar': system_factors['solar'],
-        'biofuels': system_factors['biomass'],  # biomass -> biofuels
-        'other_renewables': system_factors.get('geothermal', 0.75)  # Use geothermal as default
-    }
-
-# Load efficiency factors from corrected file (nuclear: 0.25, wind/solar: 0.75, hydro: 0.85)
-EFFICIENCY_FACTORS = load_efficiency_factors()
+# Configuration
+INPUT_FILE = SERVICES_PIPELINE_DIR / owid_cache.DOWNLOAD_DIR / owid_cache.CACHE_FILENAME
+OUTPUT_FILE = '../global-energy-tracker/public/data/regional_energy_timeseries.json'
 
 # Define regions and their constituent countries
 # Using major world regions + economic groupings + key countries
@@ -72,94 +63,212 @@ OWID_COLUMN_MAPPING = {
     'other_renewable_consumption': 'other_renewables'
 }
 
-def load_owid_data():
-    """Load OWID primary energy consumption data"""
-    print("Loading OWID data...")
-    df = pd.read_csv('../global-energy-tracker/data-pipeline/downloads/owid_energy_latest.csv')
-    print(f"Loaded {len(df)} rows")
-    return df
+# Stage source names -> efficiency cube sources (source registry aliases)
+EFFICIENCY_SOURCES = {name: SOURCES.resolve(name) for name in OWID_COLUMN_MAPPING.values()}
 
-def calculate_useful_energy(primary_ej, source):
-    """Convert primary energy to useful energy using efficiency factor"""
-    efficiency = EFFICIENCY_FACTORS.get(source, 0.5)
-    return primary_ej * efficiency if pd.notna(primary_ej) else 0
+FOSSIL_SOURCES = [name for name in OWID_COLUMN_MAPPING.values() if is_fossil(name)]
+CLEAN_SOURCES = [name for name in OWID_COLUMN_MAPPING.values() if not is_fossil(name)]
 
-def process_regional_data(df):
-    """Process OWID data to calculate regional useful energy"""
-    print("\nProcessing regional data...")
+def load_efficiency_factors():
+    """Global system-wide efficiency factors from the shared efficiency cube"""
+    cube = load_efficiency_cube()
+    return {name: cube.factor(source) for name, source in EFFICIENCY_SOURCES.items()}
 
-    regional_timeseries = {}
+# System-wide (2024) factors of efficiency_factors_corrected.json, without
+# temporal or regional variation
+EFFICIENCY_FACTORS = load_efficiency_factors()
 
-    for region_name, region_filter in REGIONS.items():
-        print(f"Processing {region_name}...")
+def load_owid_data(input_file=INPUT_FILE):
+    """Open the typed OWID cache written by fetch_data.py"""
+    print("Loading OWID data...")
+    data = owid_cache.load_owid_cache(str(input_file))
+    if data is None:
+        sys.exit(1)
+    print(f"Loaded {len(data.column('year'))} rows")
+    return data
+
+# ============================================================================
+# VECTORIZED (GROUPED) ENGINE
+# ============================================================================
+# Useful energy of region-years as array operations over every requested
+# cache row: useful energy per source is primary × the source's efficiency
+# factor rounded to 4 decimals (0 for blank or missing sources); totals sum
+# left to right in OWID_COLUMN_MAPPING order and are rounded with Python
+# round() semantics. Fields stay int 0 where no source has a value.
+
+def owid_columns(data, rows):
+    """compute_regional_arrays() input of cache rows: 'year' and the OWID columns present"""
+    columns = {'year': data.column('year')[rows]}
+    for column in OWID_COLUMN_MAPPING:
+        if column in data.columns:
+            columns[column] = data.column(column)[rows]
+    return columns
+
+def compute_regional_arrays(columns):
+    """
+    Useful energy fields of a batch of OWID rows in one pass
+
+    Args:
+        columns: {column: row array} with 'year' and the OWID_COLUMN_MAPPING
+                 columns present in the dataset (see owid_columns)
+
+    Returns:
+        Dict of row arrays: year, useful [rows, sources] with has_useful
+        flags, and every rounded output field with the flags that make it
+        a float
+    """
+    sources = list(OWID_COLUMN_MAPPING.values())
+    n_rows = len(columns['year'])
+    primary = np.column_stack([
+        np.asarray(columns[column], dtype=float) if column in columns else np.full(n_rows, np.nan)
+        for column in OWID_COLUMN_MAPPING
+    ]) if n_rows else np.empty((0, len(sources)))
+    has_useful = ~np.isnan(primary)
+    primary = np.where(has_useful, primary, 0.0)
+
+    efficiency = np.array([EFFICIENCY_FACTORS.get(source, 0.5) for source in sources])
+    useful = np.where(has_useful, round_array(primary * efficiency, 4), 0.0)
+
+    everything = list(range(len(sources)))
+    fossil = [sources.index(source) for source in FOSSIL_SOURCES]
+    clean = [sources.index(source) for source in CLEAN_SOURCES]
+    total_useful = sum_columns(useful, everything)
+    fossil_useful = sum_columns(useful, fossil)
+    clean_useful = sum_columns(useful, clean)
+    total_primary = sum_columns(primary, everything)
 
-        # Filter data for this region
-        region_df = df[df['country'] == region_filter].copy()
+    return {
+        'year': np.asarray(columns['year']).astype(np.int64),
+        'useful': useful,
+        'has_useful': has_useful,
+        'total_useful_ej': round_array(total_useful, 2),
+        'fossil_useful_ej': round_array(fossil_useful, 2),
+        'clean_useful_ej': round_array(clean_useful, 2),
+        'fossil_share_percent': round_array(percent(fossil_useful, total_useful), 1),
+        'clean_share_percent': round_array(percent(clean_useful, total_useful), 1),
+        'efficiency_percent': round_array(percent(total_useful, total_primary), 1),
+        'any_useful': has_useful.any(axis=1),
+        'any_fossil': has_useful[:, fossil].any(axis=1),
+        'any_clean': has_useful[:, clean].any(axis=1),
+        'has_total_useful': total_useful > 0,
+        'has_total_primary': total_primary > 0,
+    }
 
-        if len(region_df) == 0:
-            print(f"  WARNING: No data found for {region_name}")
+def _regional_records(columns, positions):
+    """Yearly output entries of the given rows (columns as per-row lists)"""
+    def as_number(value, is_float):
+        return value if is_float else int(value)
+
+    sources = list(OWID_COLUMN_MAPPING.values())
+    records = []
+    for i in positions:
+        has_total_useful = columns['has_total_useful'][i]
+        records.append({
+            'year': columns['year'][i],
+            'total_useful_ej': as_number(columns['total_useful_ej'][i], columns['any_useful'][i]),
+            'fossil_useful_ej': as_number(columns['fossil_useful_ej'][i], columns['any_fossil'][i]),
+            'clean_useful_ej': as_number(columns['clean_useful_ej'][i], columns['any_clean'][i]),
+            'sources_useful_ej': {source: value if has else 0
+                                  for source, value, has in zip(sources, columns['useful'][i],
+                                                                columns['has_useful'][i])},
+            'fossil_share_percent': as_number(columns['fossil_share_percent'][i], has_total_useful),
+            'clean_share_percent': as_number(columns['clean_share_percent'][i], has_total_useful),
+            'efficiency_percent': as_number(columns['efficiency_percent'][i], columns['has_total_primary'][i]),
+        })
+    return records
+
+def regional_records(data, entities):
+    """
+    Yearly output entries of every row of the requested entities, in one pass
+
+    Args:
+        data: owid_cache.OwidCache
+        entities: {OWID entity: years to include (None for all)}
+
+    Returns:
+        {OWID entity: [entries in year order]} for the entities in data
+    """
+    spans, rows, start = {}, [], 0
+    for entity, years in entities.items():
+        if entity not in data:
             continue
+        entity_rows = np.arange(data.rows(entity).start, data.rows(entity).stop)
+        if years is not None:
+            entity_rows = entity_rows[np.isin(data.column('year')[entity_rows], list(years))]
+        spans[entity] = range(start, start + len(entity_rows))
+        rows.append(entity_rows)
+        start += len(entity_rows)
+
+    rows = np.concatenate(rows) if rows else np.empty(0, dtype=np.int64)
+    columns = {key: value.tolist() for key, value in compute_regional_arrays(owid_columns(data, rows)).items()}
+    return {entity: _regional_records(columns, positions) for entity, positions in spans.items()}
+
+def process_regional_data(data, regions=None):
+    """
+    Process OWID data to calculate regional useful energy
+
+    Args:
+        data: owid_cache.OwidCache
+        regions: {output name: OWID entity} or a list of OWID entities
+                 (default: REGIONS)
+
+    Returns:
+        {region name: {'data': [yearly entries]}} in regions order
+    """
+    print("\nProcessing regional data...")
+    if regions is None:
+        regions = REGIONS
+    elif not isinstance(regions, dict):
+        regions = {entity: entity for entity in regions}
 
-        # Sort by year
-        region_df = region_df.sort_values('year')
-
-        # Process each year
-        yearly_data = []
-
-        for _, row in region_df.iterrows():
-            year = int(row['year'])
-
-            # Calculate useful energy for each source
-            sources_useful_ej = {}
-            for owid_col, source_name in OWID_COLUMN_MAPPING.items():
-                if owid_col in region_df.columns:
-                    primary = row[owid_col]
-                    useful = calculate_useful_energy(primary, source_name)
-                    sources_useful_ej[source_name] = round(useful, 4)
-                else:
-                    sources_useful_ej[source_name] = 0
-
-            # Calculate totals
-            total_useful = sum(sources_useful_ej.values())
-
-            # Calculate fossil and clean totals
-            fossil_sources = ['coal', 'oil', 'gas']
-            clean_sources = ['nuclear', 'hydro', 'wind', 'solar', 'biofuels', 'other_renewables']
-
-            fossil_useful = sum(sources_useful_ej[s] for s in fossil_sources)
-            clean_useful = sum(sources_useful_ej[s] for s in clean_sources)
-
-            # Calculate shares
-            fossil_share = (fossil_useful / total_useful * 100) if total_useful > 0 else 0
-            clean_share = (clean_useful / total_useful * 100) if total_useful > 0 else 0
-
-            # Calculate efficiency (total useful / total primary)
-            total_primary = sum(
-                row.get(owid_col, 0) for owid_col in OWID_COLUMN_MAPPING.keys()
-                if owid_col in region_df.columns and pd.notna(row.get(owid_col, 0))
-            )
-            efficiency = (total_useful / total_primary * 100) if total_primary > 0 else 0
-
-            yearly_data.append({
-                'year': year,
-                'total_useful_ej': round(total_useful, 2),
-                'fossil_useful_ej': round(fossil_useful, 2),
-                'clean_useful_ej': round(clean_useful, 2),
-                'sources_useful_ej': sources_useful_ej,
-                'fossil_share_percent': round(fossil_share, 1),
-                'clean_share_percent': round(clean_share, 1),
-                'efficiency_percent': round(efficiency, 1)
-            })
-
-        regional_timeseries[region_name] = {
-            'data': yearly_data
-        }
-
-        print(f"  Processed {len(yearly_data)} years for {region_name}")
+    # One pass over the rows of every requested entity (cache rows are in year order)
+    records = regional_records(data, dict.fromkeys(regions.values()))
+
+    regional_timeseries = {}
+    for region_name, region_filter in regions.items():
+        if not records.get(region_filter):
+            print(f"  WARNING: No data found for {region_name}")
+            continue
+        regional_timeseries[region_name] = {'data': [dict(record) for record in records[region_filter]]}
 
+    print(f"  Processed {sum(len(r['data']) for r in regional_timeseries.values())} region-years "
+          f"for {len(regional_timeseries)} regions")
     return regional_timeseries
 
-def generate_output(regional_data):
+def patch_regional_data(regional_timeseries, data, rows):
+    """
+    Recompute changed region-years of process_regional_data() results in place
+
+    Args:
+        regional_timeseries: 'regions' of regional_energy_timeseries.json
+        data: owid_cache.OwidCache of the new snapshot
+        rows: {OWID entity: [years]} with changed cells
+
+    Returns:
+        Number of recomputed region-years
+    """
+    changed = {entity: rows[entity] for entity in REGIONS.values() if entity in rows}
+    records = regional_records(data, changed)
+
+    patched = 0
+    for region_name, region_filter in REGIONS.items():
+        if region_filter not in changed:
+            continue
+        years = set(changed[region_filter])
+        yearly_data = regional_timeseries.setdefault(region_name, {'data': []})['data']
+        # Changed years that no longer have a row are dropped
+        kept = [entry for entry in yearly_data if entry['year'] not in years]
+        yearly_data[:] = sorted(kept + records.get(region_filter, []), key=lambda entry: entry['year'])
+        patched += len(years)
+
+    # Keep REGIONS order; regions without data are left out as in a full run
+    ordered = {name: regional_timeseries[name] for name in REGIONS
+               if name in regional_timeseries and regional_timeseries[name]['data']}
+    regional_timeseries.clear()
+    regional_timeseries.update(ordered)
+    return patched
+
+def generate_output(regional_data, output_file=OUTPUT_FILE):
     """Generate the final JSON output"""
     print("\nGenerating output JSON...")
 
@@ -176,7 +285,7 @@ def generate_output(regional_data):
     }
 
     # Save to JSON
-    output_path = Path('../global-energy-tracker/public/data/regional_energy_timeseries.json')
+    output_path = Path(output_file)
     output_path.parent.mkdir(parents=True, exist_ok=True)
 
     with open(output_path, 'w') as f:
@@ -203,10 +312,10 @@ def main():
     print("=" * 60)
 
     # Load OWID data
-    df = load_owid_data()
+    data = load_owid_data()
 
     # Process regional data
-    regional_data = process_regional_data(df)
+    regional_data = process_regional_data(data)
 
     # Generate output
     output = generate_output(regional_data)
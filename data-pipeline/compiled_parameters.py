@@ -0,0 +1,325 @@
+#!/usr/bin/env python3
+"""
+Compiled Scenario Parameters for Projection Engine v4.0
+
+Turns the config lookups of the projection engine into dense arrays once:
+- manufacturing_capacity.json -> max annual deployment [scenario × technology × year]
+- policy_scenarios.json       -> policy multiplier     [scenario × technology × year]
+- inline efficiency tables    -> efficiency factor     [scenario × technology × year]
+- learning_curves.json        -> scenario-adjusted learning parameters per technology
+
+get_max_annual_deployment(), get_policy_multiplier(), get_efficiency_factor()
+and get_learning_rate_params() then become O(1) array indexing instead of
+re-sorting year keys, splitting 'YYYY-YYYY' periods and copying dicts on
+every call.
+
+The compiled arrays are cached in data-pipeline/cache/ as .npz, keyed by a
+SHA-256 of the config file contents (via config_registry) and the inline
+tables, so repeated engine runs load them without parsing the JSON configs.
+Writing a new fingerprint deletes the files of superseded ones.
+
+Values are computed with the same arithmetic as the scalar lookups, so
+compiled and uncompiled results are identical.
+"""
+
+import hashlib
+import json
+import os
+from pathlib import Path
+
+import numpy as np
+
+import projection_engine_v4 as engine
+import scenario_sets
+from config_registry import REGISTRY
+
+# ============================================================================
+# CONFIGURATION
+# ============================================================================
+
+COMPILE_VERSION = 2
+CACHE_DIR = Path(__file__).parent / 'cache'
+
+CONFIG_FILES = ['manufacturing_capacity.json', 'policy_scenarios.json', 'learning_curves.json']
+
+# Also fingerprinted: user-defined scenarios change what gets compiled
+FINGERPRINT_FILES = CONFIG_FILES + [scenario_sets.SCENARIOS_FILE]
+
+# Year grid covered by the compiled tables; other years use the scalar lookups
+FIRST_YEAR = 2000
+LAST_YEAR = 2100
+
+# ============================================================================
+# FINGERPRINT
+# ============================================================================
+
+def current_fingerprint(scenarios=None):
+    """Fingerprint of the current config files (cheap: no JSON parsing)"""
+    scenarios = list(scenarios or scenario_sets.list_scenarios())
+    digest = hashlib.sha256()
+    digest.update(f'v{COMPILE_VERSION}:{FIRST_YEAR}-{LAST_YEAR}:{scenarios}'.encode())
+    digest.update(REGISTRY.fingerprint(FINGERPRINT_FILES).encode())
+    inline_tables = [
+        engine.BASE_EFFICIENCIES, engine.EFFICIENCY_IMPROVEMENTS, engine.MAX_EFFICIENCY,
+        engine.MANUFACTURING_TECH_MAP, engine.POLICY_TECH_MAP, engine.LEARNING_TECH_MAP,
+    ]
+    digest.update(json.dumps(inline_tables, sort_keys=True).encode())
+    return digest.hexdigest()
+
+# ============================================================================
+# COMPILE STEP
+# ============================================================================
+
+def _compile_manufacturing(manufacturing_capacity, scenarios, years):
+    """Max annual deployment [S, T, Y] for MANUFACTURING_TECH_MAP technologies"""
+    technologies = list(engine.MANUFACTURING_TECH_MAP)
+    table = np.full((len(scenarios), len(technologies), len(years)), np.inf)
+    if not manufacturing_capacity:
+        return technologies, table
+
+    for t, technology in enumerate(technologies):
+        tech_key = engine.MANUFACTURING_TECH_MAP[technology]
+        trajectory = manufacturing_capacity.get('trajectories', {}).get(tech_key, {})
+        projections = trajectory.get('projections', {})
+        if not projections:
+            continue
+
+        points = sorted(int(y) for y in projections)
+        values = np.array([projections[str(y)] for y in points], dtype=float)
+        points = np.array(points)
+
+        # Same interpolation arithmetic as the scalar lookup
+        capacity = np.empty(len(years))
+        capacity[years <= points[0]] = values[0]
+        capacity[years >= points[-1]] = values[-1]
+        inside = (years > points[0]) & (years < points[-1])
+        segment = np.searchsorted(points, years[inside], side='right') - 1
+        y0, y1 = points[segment], points[segment + 1]
+        ratio = (years[inside] - y0) / (y1 - y0)
+        capacity[inside] = values[segment] + ratio * (values[segment + 1] - values[segment])
+
+        multipliers = trajectory.get('scenario_multipliers', {})
+        for s, scenario in enumerate(scenarios):
+            key = scenario_sets.config_scenario(scenario, 'manufacturing_scenario')
+            table[s, t] = capacity * multipliers.get(key.lower(), 1.0)
+
+    return technologies, table
+
+def _compile_policy(policy_scenarios, scenarios, years):
+    """Policy multiplier [S, T, Y] for every technology key in the config"""
+    by_technology = {}
+    if policy_scenarios:
+        by_technology = policy_scenarios.get('global_aggregated_multipliers', {}).get('by_technology', {})
+
+    tech_keys = list(by_technology)
+    table = np.ones((len(scenarios), len(tech_keys), len(years)))
+
+    for t, tech_key in enumerate(tech_keys):
+        for s, scenario in enumerate(scenarios):
+            filled = np.zeros(len(years), dtype=bool)
+            # First matching period wins, as in the scalar lookup
+            key = scenario_sets.config_scenario(scenario, 'policy_scenario')
+            for period, mult in by_technology[tech_key].get(key, {}).items():
+                if '-' not in period:
+                    continue
+                start, end = (int(part) for part in period.split('-'))
+                match = (years >= start) & (years <= end) & ~filled
+                table[s, t, match] = mult
+                filled |= match
+
+    return tech_keys, table
+
+def _compile_efficiency(scenarios, years):
+    """Efficiency factor [S, T, Y] from the inline efficiency tables"""
+    technologies = list(engine.BASE_EFFICIENCIES)
+    table = np.empty((len(scenarios), len(technologies), len(years)))
+    years_from_base = years - engine.BASE_YEAR
+
+    for t, technology in enumerate(technologies):
+        base = engine.BASE_EFFICIENCIES[technology]
+        max_efficiency = engine.MAX_EFFICIENCY.get(technology, 1.0)
+        for s, scenario in enumerate(scenarios):
+            rate = scenario_sets.efficiency_improvements(scenario).get(technology, 0)
+            table[s, t] = np.minimum(base + (rate * years_from_base), max_efficiency)
+
+    return technologies, table
+
+def _compile_learning(learning_curves, scenarios):
+    """Scenario-adjusted learning parameters {scenario: {tech_key: params}}"""
+    tech_keys = set(engine.LEARNING_TECH_MAP.values())
+    if learning_curves:
+        tech_keys.update(learning_curves.get('learning_rates', {}))
+
+    return {
+        scenario: {tech_key: engine._resolve_learning_rate_params(
+                       learning_curves, tech_key, scenario_sets.config_scenario(scenario, 'learning_scenario'))
+                   for tech_key in sorted(tech_keys)}
+        for scenario in scenarios
+    }
+
+def compile_parameters(scenarios):
+    """Build the dense parameter arrays from the registry's configs"""
+    configs = {name: REGISTRY.get(name) for name in CONFIG_FILES}
+    years = np.arange(FIRST_YEAR, LAST_YEAR + 1)
+
+    manufacturing_techs, max_annual = _compile_manufacturing(configs['manufacturing_capacity.json'], scenarios, years)
+    policy_techs, policy = _compile_policy(configs['policy_scenarios.json'], scenarios, years)
+    efficiency_techs, efficiency = _compile_efficiency(scenarios, years)
+    learning = _compile_learning(configs['learning_curves.json'], scenarios)
+
+    return {
+        'scenarios': np.array(scenarios),
+        'years': years,
+        'manufacturing_technologies': np.array(manufacturing_techs),
+        'max_annual_deployment': max_annual,
+        'policy_technologies': np.array(policy_techs),
+        'policy_multiplier': policy,
+        'efficiency_technologies': np.array(efficiency_techs),
+        'efficiency': efficiency,
+        'learning_params_json': np.array(json.dumps(learning)),
+    }
+
+# ============================================================================
+# COMPILED LOOKUPS
+# ============================================================================
+
+class CompiledParameters:
+    """O(1) lookups into the compiled parameter arrays"""
+
+    # Returned by learning_rate_params() when the lookup is not covered
+    NOT_COMPILED = object()
+
+    def __init__(self, arrays, fingerprint=None):
+        self.fingerprint = fingerprint
+        self.scenarios = [str(s) for s in arrays['scenarios']]
+        self.years = np.asarray(arrays['years'])
+        self.first_year = int(self.years[0])
+        self.last_year = int(self.years[-1])
+
+        self.max_annual = arrays['max_annual_deployment']
+        self.policy = arrays['policy_multiplier']
+        self.efficiency = arrays['efficiency']
+        self.learning = json.loads(str(arrays['learning_params_json']))
+
+        self.scenario_index = {s: i for i, s in enumerate(self.scenarios)}
+        self.manufacturing_index = {str(t): i for i, t in enumerate(arrays['manufacturing_technologies'])}
+        self.policy_index = {str(t): i for i, t in enumerate(arrays['policy_technologies'])}
+        self.efficiency_index = {str(t): i for i, t in enumerate(arrays['efficiency_technologies'])}
+
+    def _cell(self, year, scenario):
+        """(scenario index, year index) or None when outside the compiled grid"""
+        s = self.scenario_index.get(scenario)
+        if s is None or not isinstance(year, (int, np.integer)) or not self.first_year <= year <= self.last_year:
+            return None
+        return s, int(year) - self.first_year
+
+    def max_annual_deployment(self, technology, year, scenario):
+        cell = self._cell(year, scenario)
+        if cell is None:
+            return None
+        t = self.manufacturing_index.get(technology)
+        if t is None:
+            return float('inf')
+        return float(self.max_annual[cell[0], t, cell[1]])
+
+    def policy_multiplier(self, technology, year, scenario):
+        cell = self._cell(year, scenario)
+        if cell is None:
+            return None
+        t = self.policy_index.get(engine.POLICY_TECH_MAP.get(technology, technology))
+        if t is None:
+            return 1.0
+        return float(self.policy[cell[0], t, cell[1]])
+
+    def efficiency_factor(self, technology, year, scenario):
+        cell = self._cell(year, scenario)
+        t = self.efficiency_index.get(technology)
+        if cell is None or t is None:
+            return None
+        return float(self.efficiency[cell[0], t, cell[1]])
+
+    def learning_rate_params(self, technology, scenario):
+        by_tech = self.learning.get(scenario)
+        tech_key = engine.LEARNING_TECH_MAP.get(technology, technology)
+        if by_tech is None or tech_key not in by_tech:
+            return self.NOT_COMPILED
+        return by_tech[tech_key]
+
+    def table(self, name, technologies, scenarios, years):
+        """
+        Dense [S, T, Y] slice of a compiled table for the vectorized engine
+
+        Args:
+            name: 'max_annual_deployment', 'policy_multiplier' or 'efficiency'
+        Returns:
+            Array, or None if any scenario/technology/year is not compiled
+        """
+        years = np.asarray(years)
+        if (any(s not in self.scenario_index for s in scenarios)
+                or years.min() < self.first_year or years.max() > self.last_year):
+            return None
+
+        s_idx = [self.scenario_index[s] for s in scenarios]
+        y_idx = years - self.first_year
+
+        if name == 'max_annual_deployment':
+            source, index, default = self.max_annual, self.manufacturing_index, np.inf
+            keys = technologies
+        elif name == 'policy_multiplier':
+            source, index, default = self.policy, self.policy_index, 1.0
+            keys = [engine.POLICY_TECH_MAP.get(t, t) for t in technologies]
+        elif name == 'efficiency':
+            source, index, default = self.efficiency, self.efficiency_index, None
+            keys = technologies
+        else:
+            raise ValueError(f"Unknown compiled table: {name}")
+
+        result = np.empty((len(s_idx), len(keys), len(y_idx)))
+        for t, key in enumerate(keys):
+            if key in index:
+                result[:, t, :] = source[np.ix_(s_idx, [index[key]], y_idx)][:, 0, :]
+            elif default is None:
+                return None
+            else:
+                result[:, t, :] = default
+        return result
+
+# ============================================================================
+# DISK CACHE
+# ============================================================================
+
+def load_compiled_parameters(scenarios=None, use_cache=True):
+    """
+    Load compiled parameters from the disk cache, compiling on a miss
+
+    Args:
+        scenarios: Scenarios to compile (default: every defined scenario)
+        use_cache: Read/write data-pipeline/cache/compiled_parameters_<hash>.npz
+    """
+    scenarios = list(scenarios or scenario_sets.list_scenarios())
+    fingerprint = current_fingerprint(scenarios)
+    cache_path = CACHE_DIR / f'compiled_parameters_{fingerprint[:16]}.npz'
+
+    if use_cache and cache_path.exists():
+        try:
+            with np.load(cache_path, allow_pickle=False) as cached:
+                return CompiledParameters({key: cached[key] for key in cached.files}, fingerprint)
+        except (OSError, ValueError, KeyError) as e:
+            print(f"Warning: Ignoring unreadable parameter cache {cache_path.name}: {e}")
+
+    arrays = compile_parameters(scenarios)
+
+    if use_cache:
+        CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        tmp_path = cache_path.with_suffix('.tmp.npz')
+        np.savez(tmp_path, **arrays)
+        os.replace(tmp_path, cache_path)
+        remove_superseded_caches(cache_path)
+
+    return CompiledParameters(arrays, fingerprint)
+
+def remove_superseded_caches(current):
+    """Delete the cache files of other fingerprints (in-progress .tmp files are kept)"""
+    for path in CACHE_DIR.glob('compiled_parameters_*.npz'):
+        if path != current and not path.name.endswith('.tmp.npz'):
+            path.unlink(missing_ok=True)
@@ -0,0 +1,235 @@
+#!/usr/bin/env python3
+"""
+Config Registry - shared, lazy access to the JSON configuration files
+
+Replaces the import-time json.load() calls scattered across the pipeline
+(projection_engine_v4.py, calculate_full_system_costs_v25.py,
+LearningCurveProjectionModel) with one registry that:
+- resolves a file name against a fixed list of search directories
+  (independent of the current working directory)
+- reads and parses each file only on first access
+- revalidates cached entries by mtime/size, re-hashing the content on
+  change and re-parsing only if the SHA-256 actually differs
+- exposes a content fingerprint for caches derived from configs
+
+Revalidation stats the file at most once per REVALIDATE_INTERVAL seconds,
+so hot lookup paths stay cheap while long-running processes still pick up
+edited configs without restarting.
+
+Parsed configs are shared between callers and must be treated as read-only.
+
+While a REGISTRY.recording() block is active, get() returns read-tracking
+views of the configs, recording every key path that is actually read
+(used by incremental_recompute.py to map config keys to output cells).
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from collections.abc import Mapping
+from contextlib import contextmanager
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+SERVICES_PIPELINE_DIR = REPO_ROOT / 'global-energy-services' / 'data-pipeline'
+
+# Searched in order; the first directory containing the file wins
+SEARCH_DIRS = [
+    REPO_ROOT / 'data-pipeline' / 'config',
+    SERVICES_PIPELINE_DIR,
+    REPO_ROOT / 'global-energy-services' / 'public' / 'data',
+    REPO_ROOT,
+]
+
+# Minimum seconds between stat() checks of a cached file
+REVALIDATE_INTERVAL = 1.0
+
+_UNPARSED = object()
+
+# Path component recorded when a mapping's key set is read (iteration, len)
+ANY_KEY = '*'
+
+class TrackedMapping(Mapping):
+    """
+    Read-only view of a parsed config dict that records the key paths read
+
+    Leaf values and missing keys are recorded by their full path
+    (name, key, ...); nested dicts are returned as further views and
+    only recorded once their own leaves are read. Iterating a mapping
+    or taking its length records (path..., ANY_KEY).
+    """
+
+    def __init__(self, data, path, reads):
+        self._data = data
+        self._path = path
+        self._reads = reads
+
+    def _wrap(self, key, value):
+        path = self._path + (key,)
+        if isinstance(value, dict):
+            return TrackedMapping(value, path, self._reads)
+        self._reads.add(path)
+        return value
+
+    def __getitem__(self, key):
+        if key not in self._data:
+            self._reads.add(self._path + (key,))
+            raise KeyError(key)
+        return self._wrap(key, self._data[key])
+
+    def get(self, key, default=None):
+        if key not in self._data:
+            self._reads.add(self._path + (key,))
+            return default
+        return self._wrap(key, self._data[key])
+
+    def __contains__(self, key):
+        self._reads.add(self._path + (key,))
+        return key in self._data
+
+    def __iter__(self):
+        self._reads.add(self._path + (ANY_KEY,))
+        return iter(self._data)
+
+    def __len__(self):
+        self._reads.add(self._path + (ANY_KEY,))
+        return len(self._data)
+
+    def items(self):
+        self._reads.add(self._path + (ANY_KEY,))
+        for key, value in self._data.items():
+            yield key, self._wrap(key, value)
+
+class ConfigRegistry:
+    """Lazily loaded, mtime/hash-validated JSON configuration files"""
+
+    def __init__(self, search_dirs=None, revalidate_interval=REVALIDATE_INTERVAL):
+        self.search_dirs = [Path(d) for d in (search_dirs or SEARCH_DIRS)]
+        self.revalidate_interval = revalidate_interval
+        self._entries = {}
+        self._lock = threading.RLock()
+        self._reads = None
+
+    def resolve(self, name):
+        """Absolute path of a config file, or None if it is not found"""
+        path = Path(name)
+        if path.is_absolute():
+            return path if path.exists() else None
+        for directory in self.search_dirs:
+            candidate = directory / name
+            if candidate.exists():
+                return candidate
+        return None
+
+    def _entry(self, name):
+        """Cache entry for name, (re)reading the file if it changed"""
+        with self._lock:
+            entry = self._entries.get(name)
+            now = time.monotonic()
+            if entry is not None and now - entry['checked_at'] < self.revalidate_interval:
+                return entry
+
+            path = entry['path'] if entry is not None and entry['path'] is not None else self.resolve(name)
+            if path is None or not path.exists():
+                entry = {'path': None, 'stat': None, 'sha256': None, 'data': None, 'checked_at': now}
+                self._entries[name] = entry
+                return entry
+
+            stat = path.stat()
+            stat_key = (stat.st_mtime_ns, stat.st_size)
+            if entry is not None and entry['stat'] == stat_key:
+                entry['checked_at'] = now
+                return entry
+
+            content = path.read_bytes()
+            sha256 = hashlib.sha256(content).hexdigest()
+            if entry is not None and entry['sha256'] == sha256:
+                # Touched but unchanged: keep the parsed data
+                entry.update(path=path, stat=stat_key, checked_at=now)
+                return entry
+
+            entry = {'path': path, 'stat': stat_key, 'sha256': sha256,
+                     'content': content, 'data': _UNPARSED, 'checked_at': now}
+            self._entries[name] = entry
+            return entry
+
+    def get(self, name, default=None):
+        """Parsed JSON content of a config file (default if missing)"""
+        entry = self._entry(name)
+        if entry['path'] is None:
+            return default
+        with self._lock:
+            if entry['data'] is _UNPARSED:
+                entry['data'] = json.loads(entry.pop('content'))
+            data = entry['data']
+        if self._reads is not None:
+            if not isinstance(data, dict):
+                self._reads.add((name,))
+                return data
+            return TrackedMapping(data, (name,), self._reads)
+        return data
+
+    @contextmanager
+    def recording(self):
+        """
+        Record the config key paths read through get() inside the block
+
+        Yields a set that collects (name, key, ...) tuples. Not nested and
+        not thread-safe: one recording at a time per registry.
+        """
+        reads = set()
+        self._reads = reads
+        try:
+            yield reads
+        finally:
+            self._reads = None
+
+    def exists(self, name):
+        return self._entry(name)['path'] is not None
+
+    def path(self, name):
+        return self._entry(name)['path']
+
+    def content_hash(self, name):
+        """SHA-256 of the file content (None if missing) without parsing it"""
+        return self._entry(name)['sha256']
+
+    def fingerprint(self, names):
+        """Combined SHA-256 over several config files"""
+        digest = hashlib.sha256()
+        for name in names:
+            digest.update(name.encode())
+            digest.update((self.content_hash(name) or '<missing>').encode())
+        return digest.hexdigest()
+
+    def invalidate(self, name=None):
+        """Drop one (or every) cached entry so the next access re-reads it"""
+        with self._lock:
+            if name is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(name, None)
+
+# Shared registry used by all pipeline scripts
+REGISTRY = ConfigRegistry()
+
+def get_config(name, default=None):
+    """Parsed config from the shared registry"""
+    return REGISTRY.get(name, default)
+
+@contextmanager
+def working_directory(path=SERVICES_PIPELINE_DIR):
+    """
+    Run a block from path (default: the services pipeline)
+
+    calculate_useful_energy_v2.load_configs() and the other services stages
+    read their configs relative to the working directory.
+    """
+    previous = os.getcwd()
+    os.chdir(path)
+    try:
+        yield
+    finally:
+        os.chdir(previous)
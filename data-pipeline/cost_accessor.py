@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""
+Cost Accessor - on-demand cells of the factorized full_system_costs.json
+
+calculate_full_system_costs_v25 writes the cost cube in factorized form:
+the region-independent base cube per scenario (base LCOE, rebound, VRE
+penetration), the dispatch-dependent integration costs per region, and
+small side tables (regional multipliers, SCC scenarios, carbon
+intensities, service conversions, capacity factors).
+
+The functions below rebuild the calculate_system_lcoes() record of any
+scenario × region × year × source cell, for any SCC scenario, with the
+same arithmetic and rounding. src/utils/costData.js mirrors them for the
+Costs page.
+
+Usage:
+    data = load_costs()
+    cell = cost_cell(data, 'Baseline', 'China', 2035, 'solar', scc_scenario='moderate')
+    legacy = expand_costs(data)   # fully materialized nested structure
+"""
+
+import json
+from pathlib import Path
+
+# ============================================================================
+# CONFIGURATION
+# ============================================================================
+
+COSTS_FILE = Path(__file__).parent.parent / 'global-energy-services' / 'public' / 'data' / 'full_system_costs.json'
+
+FORMAT = 'factorized'
+FORMAT_VERSION = 1
+
+# Metadata keys describing the storage format only (dropped by expand_costs)
+FORMAT_KEYS = ['format', 'format_version']
+
+# Scenario keys copied into the materialized structure
+SCENARIO_INFO_KEYS = ['name', 'description', 'philosophy', 'learning_by_deployment']
+
+# ============================================================================
+# LOADING
+# ============================================================================
+
+def load_costs(path=COSTS_FILE):
+    """
+    Load a factorized full_system_costs.json
+
+    Raises:
+        ValueError: File is not in the supported factorized format
+    """
+    with open(path, 'r') as f:
+        data = json.load(f)
+
+    metadata = data.get('metadata', {})
+    if metadata.get('format') != FORMAT or metadata.get('format_version') != FORMAT_VERSION:
+        raise ValueError(f"Unsupported cost data format in {path}: "
+                         f"{metadata.get('format')} v{metadata.get('format_version')}")
+    return data
+
+# ============================================================================
+# CELL ACCESS
+# ============================================================================
+
+def year_index(data, year):
+    """Index of a year in the cost data (KeyError if not covered)"""
+    years = data['dimensions']['years']
+    index = year - years[0]
+    if not 0 <= index < len(years) or years[index] != year:
+        raise KeyError(f"Year not in cost data: {year}")
+    return index
+
+def _at(value, index):
+    """Year value of a series (numbers are constant over the years)"""
+    return value[index] if isinstance(value, list) else value
+
+def scc_cost(data, source, scc_scenario='none'):
+    """Social cost of carbon adder ($/MWh) of a source"""
+    if scc_scenario == 'none':
+        return 0
+    return data['scc_scenarios'][scc_scenario]['value'] * data['carbon_intensity'].get(source, 0)
+
+def cost_cell(data, scenario, region, year, source, scc_scenario='none'):
+    """
+    Full system LCOES record of one cell (calculate_system_lcoes() format)
+
+    Args:
+        data: load_costs() result
+        scc_scenario: Any key of data['scc_scenarios']
+
+    Returns:
+        Dict with base_lcoe_mwh, system_costs, total_system_cost_mwh,
+        scc_cost_mwh, total_lcoes_mwh, capacity_factor,
+        carbon_intensity_tco2_mwh, rebound_multiplier and service_units
+    """
+    index = year_index(data, year)
+    scenario_data = data['scenarios'][scenario]
+    region_data = scenario_data['regions'][region]
+
+    base_lcoe = scenario_data['base_lcoe_mwh'][source][index]
+    system_costs = {component: _at(value, index) for component, value in region_data['system_costs'][source].items()}
+    total_system_cost = sum(system_costs.values())
+    scc_cost_mwh = scc_cost(data, source, scc_scenario)
+    total_lcoes_mwh = (base_lcoe + total_system_cost + scc_cost_mwh) * data['regional_multipliers'][region]
+    rebound_multiplier = scenario_data['rebound_multiplier'][index]
+
+    service_units = {}
+    for service, conversion in data['service_conversions'].items():
+        adjusted_mwh_per_unit = conversion['mwh_per_unit'] * rebound_multiplier
+        service_units[service] = {
+            'value': round(total_lcoes_mwh * adjusted_mwh_per_unit, 2),
+            'label': conversion['label'],
+            'description': conversion['description'],
+            'mwh_per_unit': round(adjusted_mwh_per_unit, 4)
+        }
+
+    return {
+        'base_lcoe_mwh': round(base_lcoe, 2),
+        'system_costs': {k: round(v, 2) for k, v in system_costs.items()},
+        'total_system_cost_mwh': round(total_system_cost, 2),
+        'scc_cost_mwh': round(scc_cost_mwh, 2),
+        'total_lcoes_mwh': round(total_lcoes_mwh, 2),
+        'capacity_factor': data['capacity_factor'][source][index],
+        'carbon_intensity_tco2_mwh': data['carbon_intensity'].get(source, 0),
+        'rebound_multiplier': round(rebound_multiplier, 3),
+        'service_units': service_units
+    }
+
+def year_record(data, scenario, region, year, scc_scenario='none'):
+    """All sources of a scenario/region/year with VRE penetration and dispatch metrics"""
+    index = year_index(data, year)
+    scenario_data = data['scenarios'][scenario]
+    dispatch = scenario_data['regions'][region]['dispatch']
+    return {
+        'year': year,
+        'vre_penetration': scenario_data['vre_penetration'][index],
+        'dispatch': {metric: values[index] for metric, values in dispatch.items()},
+        'sources': {source: cost_cell(data, scenario, region, year, source, scc_scenario)
+                    for source in data['dimensions']['sources']}
+    }
+
+def region_timeseries(data, scenario, region, scc_scenario='none'):
+    """Regional multiplier and year records of a scenario/region"""
+    return {
+        'regional_multiplier': data['regional_multipliers'][region],
+        'timeseries': [year_record(data, scenario, region, year, scc_scenario)
+                       for year in data['dimensions']['years']]
+    }
+
+def expand_costs(data, scc_scenario='none'):
+    """
+    Fully materialized cost structure (scenarios → regions → timeseries)
+
+    With scc_scenario='none' this is the pre-factorization
+    full_system_costs.json layout.
+    """
+    metadata = {key: value for key, value in data['metadata'].items() if key not in FORMAT_KEYS}
+    scenarios = {}
+    for scenario in data['dimensions']['scenarios']:
+        scenario_data = data['scenarios'][scenario]
+        scenarios[scenario] = {key: scenario_data[key] for key in SCENARIO_INFO_KEYS if key in scenario_data}
+        scenarios[scenario]['regions'] = {region: region_timeseries(data, scenario, region, scc_scenario)
+                                          for region in data['dimensions']['regions']}
+    return {'metadata': metadata, 'scenarios': scenarios}
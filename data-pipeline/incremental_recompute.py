@@ -0,0 +1,491 @@
+#!/usr/bin/env python3
+"""
+Incremental Recompute - dependency-tracked updates of projections and costs
+
+Records which config keys every output cell reads, so that after editing
+a config file only the affected cells are recomputed and patched into the
+existing output files instead of regenerating them end to end:
+- energy_projections_v4.json: one record per (scenario, year)
+- full_system_costs.json:     one base LCOE entry per (scenario, year,
+                              source) of the factorized output
+
+Integration costs follow the regional 8760-hour dispatch, whose inputs
+(VRE_SCENARIOS, STORAGE_BUILDOUT, the hourly profiles) are inline tables
+and profile files rather than config keys, so a config edit never reaches
+them: a patch re-prices base LCOE entries only and runs no dispatch.
+
+Solar and wind depend on every year of their scenario through the
+learning-by-deployment fixed point (learning_by_deployment). A
+technology's solved deployment only feeds back through its own costs, so
+its cost entries carry the reads of that technology in every year, and a
+projection record carries the reads of its own year plus those of the
+coupled technologies.
+
+Dependencies are recorded with REGISTRY.recording() (config_registry),
+which logs the key paths actually read, e.g.
+    ('policy_scenarios.json', 'global_aggregated_multipliers',
+     'by_technology', 'solar_pv', 'Baseline', '2031-2040')
+
+The manifest in data-pipeline/cache/dependency_manifest/ stores the
+dependencies together with snapshots of the configs they were recorded
+against, one file per config snapshot and per output and scenario (each
+distinct dependency list stored once). A run diffs the current configs
+against those snapshots, selects the cells whose dependencies touch a
+changed key path, recomputes and patches them, and re-records their
+dependencies; only the files of changed configs and patched scenarios are
+rewritten.
+
+Edits to the engine code itself (inline tables such as SATURATION_LIMITS)
+or to the hourly VRE profiles are not tracked per key: a changed code
+fingerprint triggers a full run.
+
+Usage:
+    python incremental_recompute.py            # incremental update
+    python incremental_recompute.py --dry-run  # list affected cells only
+    python incremental_recompute.py --full     # regenerate and re-record
+"""
+
+import hashlib
+import json
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+import projection_engine_v4 as engine
+import calculate_full_system_costs_v25 as costs
+import learning_by_deployment as learning
+import vre_dispatch
+from config_registry import REGISTRY, ANY_KEY
+from scenario_sets import scenario_dimension
+
+# ============================================================================
+# CONFIGURATION
+# ============================================================================
+
+MANIFEST_VERSION = 2
+MANIFEST_DIR = Path(__file__).parent / 'cache' / 'dependency_manifest'
+MANIFEST_SECTIONS = ['projections', 'costs']
+
+PROJECTIONS_FILE = Path(__file__).parent.parent / 'global-energy-services' / 'public' / 'data' / 'energy_projections_v4.json'
+COSTS_FILE = Path(__file__).parent / costs.OUTPUT_FILE
+
+TRACKED_CONFIGS = ['learning_curves.json', 'manufacturing_capacity.json', 'policy_scenarios.json']
+
+# Source files whose inline tables feed the outputs
+CODE_FILES = [Path(engine.__file__), Path(costs.__file__), Path(learning.__file__), Path(vre_dispatch.__file__)]
+
+PROJECTION_YEARS = list(range(engine.BASE_YEAR, engine.TARGET_YEAR + 1))
+COST_SOURCES = ['coal', 'oil', 'gas', 'nuclear', 'hydro', 'wind', 'solar', 'biofuels', 'other_renewables']
+COST_YEARS = list(range(2024, 2051))
+COST_SCENARIOS = scenario_dimension().select(builtin=True)
+
+# Engine technologies whose deployment is coupled to their learning-curve costs
+COUPLED_TECHNOLOGIES = [tech for tech in engine.CLEAN_TECHNOLOGIES
+                        if tech in engine.COST_PROJECTIONS and engine.COST_PROJECTIONS[tech]['capacity_unit'] == 'gw']
+
+# ============================================================================
+# DEPENDENCY RECORDING
+# ============================================================================
+
+def code_fingerprint():
+    """SHA-256 over the engine source files and local VRE profile files"""
+    digest = hashlib.sha256()
+    for path in CODE_FILES + sorted(vre_dispatch.PROFILE_DIR.glob('*.csv')):
+        digest.update(path.read_bytes())
+    return digest.hexdigest()
+
+def _projection_reads(scenario, year, technologies=None):
+    """Config key paths read by ProjectionEngine(scenario).project_all(year) for the technologies"""
+    with REGISTRY.recording() as reads:
+        manufacturing = REGISTRY.get('manufacturing_capacity.json')
+        policy = REGISTRY.get('policy_scenarios.json')
+        for tech in (technologies or engine.CLEAN_TECHNOLOGIES):
+            engine._resolve_max_annual_deployment(manufacturing, tech, year, scenario)
+            engine._resolve_policy_multiplier(policy, tech, year, scenario)
+    return reads
+
+def _learning_reads(scenario, technologies):
+    """Config key paths of the learning-curve parameters and adoption feedback of the technologies"""
+    with REGISTRY.recording() as reads:
+        learning_curves = REGISTRY.get('learning_curves.json')
+        for tech in technologies:
+            if tech in engine.COST_PROJECTIONS:
+                engine._resolve_learning_rate_params(learning_curves, tech,
+                                                     engine.config_scenario(scenario, 'learning_scenario'))
+        learning.adoption_feedback(technologies)
+    return reads
+
+def _coupled_reads(scenario, technology):
+    """
+    Config key paths read by the learning-by-deployment solve of one technology
+
+    The fixed point couples every projected year through cumulative
+    capacity, so this covers the technology's projection reads in all
+    years plus its learning-curve parameters and adoption feedback.
+    """
+    reads = _learning_reads(scenario, [technology])
+    for year in PROJECTION_YEARS:
+        reads |= _projection_reads(scenario, year, [technology])
+    return reads
+
+def _cost_reads(scenario, year, source, coupled_reads=None):
+    """Config key paths read by get_base_lcoe(source, year, scenario)"""
+    with REGISTRY.recording() as reads:
+        costs.get_base_lcoe(source, year, scenario)
+    if source in COUPLED_TECHNOLOGIES:
+        reads |= coupled_reads if coupled_reads is not None else _coupled_reads(costs.engine_scenario(scenario), source)
+    return reads
+
+def _encode(reads):
+    return sorted(list(path) for path in reads)
+
+def record_projection_dependencies(scenarios=None, years=None):
+    """{scenario: {year: [path, ...]}} for the projection records"""
+    dependencies = {}
+    for scenario in (scenarios or engine.SCENARIOS):
+        shared = _learning_reads(scenario, list(engine.COST_PROJECTIONS))
+        for tech in COUPLED_TECHNOLOGIES:
+            shared |= _coupled_reads(scenario, tech)
+        dependencies[scenario] = {str(year): _encode(_projection_reads(scenario, year) | shared)
+                                  for year in (years or PROJECTION_YEARS)}
+    return dependencies
+
+def record_cost_dependencies(cells=None):
+    """{scenario: {year: {source: [path, ...]}}} for the cost entries"""
+    if cells is None:
+        cells = [(s, y, src) for s in COST_SCENARIOS for y in COST_YEARS for src in COST_SOURCES]
+
+    coupled = {}
+    dependencies = {}
+    for scenario, year, source in cells:
+        if source in COUPLED_TECHNOLOGIES and (scenario, source) not in coupled:
+            coupled[(scenario, source)] = _coupled_reads(costs.engine_scenario(scenario), source)
+        dependencies.setdefault(scenario, {}).setdefault(str(year), {})[source] = _encode(
+            _cost_reads(scenario, year, source, coupled.get((scenario, source))))
+    return dependencies
+
+# ============================================================================
+# CONFIG DIFF
+# ============================================================================
+
+def diff_paths(old, new, path=()):
+    """
+    Key paths that differ between two configs
+
+    Returns:
+        List of (path, structural) pairs; structural is True when the key
+        was added or removed, False when its value changed
+    """
+    if isinstance(old, dict) and isinstance(new, dict):
+        changed = []
+        for key in old.keys() | new.keys():
+            if key not in old or key not in new:
+                changed.append((path + (key,), True))
+            else:
+                changed.extend(diff_paths(old[key], new[key], path + (key,)))
+        return changed
+    return [] if old == new else [(path, False)]
+
+def is_affected(dependency, change):
+    """
+    Whether a recorded read depends on a changed key path
+
+    A read is affected when the changed path is the read path or one of
+    its ancestors; a key-set read (path..., ANY_KEY) is also affected by
+    keys added to or removed from that mapping.
+    """
+    changed, structural = change
+    dependency = tuple(dependency)
+    if dependency[:len(changed)] == changed:
+        return True
+    return structural and dependency[-1] == ANY_KEY and dependency[:-1] == changed[:-1]
+
+def _any_affected(dependencies, changed_paths):
+    return any(is_affected(dep, changed) for dep in dependencies for changed in changed_paths)
+
+# ============================================================================
+# MANIFEST
+# ============================================================================
+
+def _read_json(path):
+    with open(path, 'r') as f:
+        return json.load(f)
+
+def _write_manifest_file(path, data):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix('.tmp')
+    with open(tmp_path, 'w') as f:
+        json.dump(data, f)
+    tmp_path.replace(path)
+
+def _entry_path(section, scenario):
+    return MANIFEST_DIR / section / f'{scenario}.json'
+
+def _encode_entry(cells):
+    """Manifest file form of a scenario's {key: ... dependencies} tree, each distinct list stored once"""
+    dependency_sets, index = [], {}
+
+    def encode(value):
+        if isinstance(value, dict):
+            return {key: encode(item) for key, item in value.items()}
+        key = tuple(map(tuple, value))
+        if key not in index:
+            index[key] = len(dependency_sets)
+            dependency_sets.append(value)
+        return index[key]
+
+    return {'dependency_sets': dependency_sets, 'cells': encode(cells)}
+
+def _decode_entry(entry):
+    """Inverse of _encode_entry(); cells with equal dependencies share one list"""
+    dependency_sets = entry['dependency_sets']
+
+    def decode(value):
+        return {key: decode(item) for key, item in value.items()} if isinstance(value, dict) else dependency_sets[value]
+
+    return decode(entry['cells'])
+
+def load_manifest():
+    """Manifest dict (version, code_fingerprint, configs, projections, costs) or None"""
+    header_path = MANIFEST_DIR / 'manifest.json'
+    if not header_path.exists():
+        return None
+    header = _read_json(header_path)
+    if header.get('version') != MANIFEST_VERSION:
+        return None
+    try:
+        manifest = {
+            'version': header['version'],
+            'code_fingerprint': header['code_fingerprint'],
+            'configs': {name: _read_json(MANIFEST_DIR / 'configs' / name) for name in TRACKED_CONFIGS},
+        }
+        for section in MANIFEST_SECTIONS:
+            manifest[section] = {scenario: _decode_entry(_read_json(_entry_path(section, scenario)))
+                                 for scenario in header[section]}
+    except FileNotFoundError:
+        return None
+    return manifest
+
+def save_manifest(manifest, entries=None, configs=None):
+    """
+    Write manifest files
+
+    Args:
+        entries: (section, scenario) entries to write; None writes the whole
+                 manifest
+        configs: Names of the config snapshots to write (with entries)
+    """
+    if entries is None:
+        entries = [(section, scenario) for section in MANIFEST_SECTIONS for scenario in manifest[section]]
+        configs = TRACKED_CONFIGS
+        header = {'version': manifest['version'], 'code_fingerprint': manifest['code_fingerprint'],
+                  **{section: list(manifest[section]) for section in MANIFEST_SECTIONS}}
+    else:
+        header = None
+
+    for section, scenario in entries:
+        _write_manifest_file(_entry_path(section, scenario), _encode_entry(manifest[section][scenario]))
+    # Snapshots last: an interrupted update re-selects the same cells next run
+    for name in configs or []:
+        _write_manifest_file(MANIFEST_DIR / 'configs' / name, manifest['configs'][name])
+    if header is not None:
+        _write_manifest_file(MANIFEST_DIR / 'manifest.json', header)
+
+def _config_snapshots():
+    return {name: REGISTRY.get(name) for name in TRACKED_CONFIGS}
+
+# ============================================================================
+# RECOMPUTE
+# ============================================================================
+
+def _write_json(path, data):
+    with open(path, 'w') as f:
+        json.dump(data, f, indent=2)
+
+def full_recompute():
+    """Regenerate both output files and record every dependency"""
+    projections = engine.generate_all_projections()
+    engine.save_projections(projections, PROJECTIONS_FILE)
+
+    COSTS_FILE.parent.mkdir(parents=True, exist_ok=True)
+    _write_json(COSTS_FILE, costs.generate_full_system_costs())
+    print(f"✓ Successfully generated {COSTS_FILE}")
+
+    save_manifest({
+        'version': MANIFEST_VERSION,
+        'code_fingerprint': code_fingerprint(),
+        'configs': _config_snapshots(),
+        'projections': record_projection_dependencies(),
+        'costs': record_cost_dependencies(),
+    })
+
+def affected_cells(manifest):
+    """
+    Changed config paths and the output cells that depend on them
+
+    Returns:
+        (changed_paths [(path, structural)], projection_cells [(scenario, year)],
+         cost_cells [(scenario, year, source)])
+    """
+    current = _config_snapshots()
+    changed_paths = []
+    for name in TRACKED_CONFIGS:
+        old, new = manifest['configs'].get(name), current[name]
+        if old is None or new is None:
+            if old != new:
+                changed_paths.append(((name,), True))
+            continue
+        changed_paths.extend(((name,) + path, structural) for path, structural in diff_paths(old, new))
+
+    # Cells with equal dependencies share one list (see _decode_entry)
+    checked = {}
+
+    def affected(dependencies):
+        if id(dependencies) not in checked:
+            checked[id(dependencies)] = _any_affected(dependencies, changed_paths)
+        return checked[id(dependencies)]
+
+    projection_cells = [
+        (scenario, int(year))
+        for scenario, by_year in manifest['projections'].items()
+        for year, dependencies in by_year.items()
+        if affected(dependencies)
+    ]
+    cost_cells = [
+        (scenario, int(year), source)
+        for scenario, by_year in manifest['costs'].items()
+        for year, by_source in by_year.items()
+        for source, dependencies in by_source.items()
+        if affected(dependencies)
+    ]
+    return changed_paths, projection_cells, cost_cells
+
+def patch_projections(cells):
+    """Recompute (scenario, year) records and patch energy_projections_v4.json"""
+    with open(PROJECTIONS_FILE, 'r') as f:
+        output = json.load(f)
+
+    engines = {}
+    for scenario, year in cells:
+        if scenario not in engines:
+            engines[scenario] = engine.ProjectionEngine(scenario)
+        record = engines[scenario].project_all(year)
+        record['year'] = year
+        record['scenario'] = scenario
+
+        timeseries = output['projections'][scenario]
+        index = next(i for i, existing in enumerate(timeseries) if existing['year'] == year)
+        timeseries[index] = record
+
+    for scenario in engines:
+        output.setdefault('learning_by_deployment', {})[scenario] = learning.learning_summary(scenario)
+    output['metadata']['generated'] = datetime.now().isoformat()
+    _write_json(PROJECTIONS_FILE, output)
+
+def patch_costs(cells):
+    """
+    Recompute the base LCOE of (scenario, year, source) entries and patch full_system_costs.json
+
+    Only the affected years of the affected sources are re-priced; the
+    regional integration costs read no config keys and are left as stored.
+    """
+    with open(COSTS_FILE, 'r') as f:
+        output = json.load(f)
+
+    dimensions = output['dimensions']
+    by_scenario = {}
+    for scenario, year, source in cells:
+        by_scenario.setdefault(scenario, {}).setdefault(source, set()).add(year)
+
+    for scenario, by_source in by_scenario.items():
+        sources = sorted(by_source, key=dimensions['sources'].index)
+        years = sorted(set().union(*by_source.values()))
+        base_lcoe, base_lcoe_raw = costs.build_base_lcoe([scenario], years, sources)
+        base = {'base_lcoe': base_lcoe, 'base_lcoe_raw': base_lcoe_raw}
+        scenario_data = output['scenarios'][scenario]
+
+        for k, source in enumerate(sources):
+            series = costs.factorized_base_lcoe(base, 0, k)
+            for year in by_source[source]:
+                scenario_data['base_lcoe_mwh'][source][dimensions['years'].index(year)] = series[years.index(year)]
+
+        scenario_data['learning_by_deployment'] = learning.learning_summary(scenario)
+
+    output['metadata']['date_generated'] = datetime.now().isoformat()
+    _write_json(COSTS_FILE, output)
+
+def incremental_recompute(dry_run=False):
+    """
+    Patch the output files for config edits since the last recorded run
+
+    Falls back to full_recompute() when there is no usable manifest, an
+    output file is missing or the engine code changed.
+
+    Returns:
+        Dict with the changed config paths and recomputed cells
+    """
+    # Pick up config edits immediately instead of after the revalidation interval
+    REGISTRY.invalidate()
+    engine.get_compiled_parameters(revalidate=True)
+
+    manifest = load_manifest()
+    if (manifest is None or manifest.get('code_fingerprint') != code_fingerprint()
+            or not PROJECTIONS_FILE.exists() or not COSTS_FILE.exists()):
+        if not dry_run:
+            print("No usable dependency manifest - running full recompute")
+            full_recompute()
+        return {'full': True, 'changed_paths': [], 'projection_cells': [], 'cost_cells': []}
+
+    changed_paths, projection_cells, cost_cells = affected_cells(manifest)
+
+    if not dry_run and changed_paths:
+        if projection_cells:
+            patch_projections(projection_cells)
+            scenarios = {s for s, _ in projection_cells}
+            updated = record_projection_dependencies(scenarios, sorted({y for _, y in projection_cells}))
+            for scenario, year in projection_cells:
+                manifest['projections'][scenario][str(year)] = updated[scenario][str(year)]
+        if cost_cells:
+            patch_costs(cost_cells)
+            updated = record_cost_dependencies(cost_cells)
+            for scenario, year, source in cost_cells:
+                manifest['costs'][scenario][str(year)][source] = updated[scenario][str(year)][source]
+        manifest['configs'] = _config_snapshots()
+        entries = sorted({('projections', s) for s, _ in projection_cells} | {('costs', s) for s, _, _ in cost_cells})
+        save_manifest(manifest, entries, sorted({path[0] for path, _ in changed_paths}))
+
+    return {
+        'full': False,
+        'changed_paths': changed_paths,
+        'projection_cells': projection_cells,
+        'cost_cells': cost_cells,
+    }
+
+# ============================================================================
+# MAIN EXECUTION
+# ============================================================================
+
+if __name__ == '__main__':
+    print("=" * 80)
+    print("INCREMENTAL RECOMPUTE - Projections and Full System Costs")
+    print("=" * 80)
+
+    start = time.perf_counter()
+    if '--full' in sys.argv:
+        full_recompute()
+        print(f"\nFull recompute and dependency recording: {time.perf_counter() - start:.2f} s")
+        sys.exit(0)
+
+    result = incremental_recompute(dry_run='--dry-run' in sys.argv)
+    elapsed = time.perf_counter() - start
+
+    if not result['full']:
+        print(f"\nChanged config keys: {len(result['changed_paths'])}")
+        for path, structural in result['changed_paths'][:20]:
+            print(f"  - {' / '.join(path)}{' (added/removed)' if structural else ''}")
+        total_projection = len(engine.SCENARIOS) * len(PROJECTION_YEARS)
+        total_costs = len(COST_SCENARIOS) * len(COST_YEARS) * len(COST_SOURCES)
+        print(f"Projection records recomputed: {len(result['projection_cells'])} / {total_projection}")
+        print(f"Cost entries recomputed:       {len(result['cost_cells'])} / {total_costs}")
+    print(f"\nCompleted in {elapsed:.2f} s")
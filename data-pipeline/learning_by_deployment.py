@@ -0,0 +1,327 @@
+#!/usr/bin/env python3
+"""
+Learning by Deployment - endogenous coupling of costs and adoption for Projection Engine v4.0
+
+Closes the loop between the engine's projected deployment and Wright's-law
+costs instead of pricing technologies off a fixed cumulative-capacity
+guess (COST_PROJECTIONS 'cumulative_2024' + 'annual_addition'):
+
+    steepness -> project_batch() deployment -> cumulative capacity (GW)
+              -> Wright's-law costs -> steepness multiplier -> steepness
+
+- Cumulative capacity = base_cumulative_gw (learning_curves.json) plus the
+  projected annual additions (constrained S-curve growth, EJ -> GW via
+  GW_TO_EJ_FACTORS) from the first projected year on
+- Costs: calculate_learning_curve_cost() on that cumulative capacity
+- Feedback: the base steepness was calibrated against the reference cost
+  path of the linear cumulative estimate, so
+      multiplier = (C_reference / C_endogenous) ^ elasticity
+  (geometric mean over the projection years, clipped to the configured
+  bounds) with elasticities from learning_curves.json 'adoption_feedback'
+
+The fixed point is iterated for a whole parameter batch at once (all
+scenarios, or every ensemble draw / sensitivity perturbation); each
+technology of a row stops updating once its steepness changes by less
+than the tolerance. A technology's multiplier only feeds back through its
+own costs, so its result depends neither on the batch it is solved in
+nor on the other technologies (incremental_recompute relies on this).
+
+Technologies without a GW learning curve (nuclear, hydro) keep their base
+steepness; battery costs stay on the linear cumulative estimate since the
+engine does not project battery deployment.
+
+scenario_learning() caches the solution per scenario. ProjectionEngine
+takes its steepness and cost inputs from it and the full system cost
+calculator (calculate_full_system_costs_v25) its solar/wind cumulative
+capacity, so energy_projections_v4.json and full_system_costs.json are
+derived from the same deployment path.
+
+Cumulative capacity is served from CumulativeCapacityTable prefix-sum
+tables (one per technology and scenario, see capacity_table()), so
+Wright's-law cost lookups are O(1) per year.
+"""
+
+from itertools import accumulate
+
+import numpy as np
+
+from config_registry import REGISTRY
+from projection_engine_v4 import (
+    BASE_YEAR,
+    TARGET_YEAR,
+    COST_PROJECTIONS,
+    GW_TO_EJ_FACTORS,
+    LEARNING_TECH_MAP,
+    get_compiled_parameters,
+)
+from projection_engine_vectorized import (
+    build_scenario_parameters,
+    build_cost_parameters,
+    project_batch,
+    project_costs_batch,
+)
+
+# ============================================================================
+# SOLVER CONFIGURATION
+# ============================================================================
+
+FEEDBACK_CONFIG = 'learning_curves.json'
+DEFAULT_TOLERANCE = 1e-12
+MAX_ITERATIONS = 100
+
+# ============================================================================
+# FEEDBACK PARAMETERS
+# ============================================================================
+
+def coupled_technologies(technologies, cost_technologies):
+    """(t, c) index pairs of technologies projected by the engine and priced per GW"""
+    return [(t, cost_technologies.index(tech))
+            for t, tech in enumerate(technologies)
+            if tech in cost_technologies and COST_PROJECTIONS[tech]['capacity_unit'] == 'gw']
+
+def adoption_feedback(technologies):
+    """
+    Cost elasticities of adoption steepness and multiplier bounds
+
+    Returns:
+        (elasticity [T], (low, high)); elasticity 0 (no feedback) when the
+        config or a technology entry is missing
+    """
+    config = (REGISTRY.get(FEEDBACK_CONFIG) or {}).get('adoption_feedback') or {}
+    elasticities = config.get('cost_elasticity', {})
+    elasticity = np.array([elasticities.get(LEARNING_TECH_MAP.get(tech, tech), 0.0) for tech in technologies],
+                          dtype=float)
+    low, high = config.get('steepness_multiplier_bounds', [1.0, 1.0])
+    return elasticity, (low, high)
+
+# ============================================================================
+# FIXED-POINT SOLVER
+# ============================================================================
+
+def cumulative_from_additions(annual_addition_ej, gw_to_ej, base_cumulative):
+    """
+    Cumulative capacity (GW) from projected annual additions
+
+    The first year's cumulative is the base; additions count from the
+    following year on.
+    """
+    additions_gw = np.maximum(annual_addition_ej, 0) / gw_to_ej
+    cumulative = np.empty_like(additions_gw)
+    cumulative[..., 0] = 0
+    np.cumsum(additions_gw[..., 1:], axis=-1, out=cumulative[..., 1:])
+    return base_cumulative[..., None] + cumulative
+
+def _couple(params, cost_params, results, pairs):
+    """Cumulative capacity and costs implied by a projection result"""
+    cumulative = cost_params['cumulative'].copy()
+    for t, c in pairs:
+        gw_to_ej = GW_TO_EJ_FACTORS.get(params['technologies'][t], 0.01)
+        coupled = cumulative_from_additions(results['annual_addition_ej'][:, t, :], gw_to_ej,
+                                            cost_params['base_cumulative'][:, c])
+        has_curve = ~np.isnan(cost_params['base_cost'][:, c])
+        cumulative[:, c, :] = np.where(has_curve[:, None], coupled, cumulative[:, c, :])
+    costs = project_costs_batch(dict(cost_params, cumulative=cumulative))
+    return cumulative, costs
+
+def solve_learning_by_deployment(params, cost_params, tolerance=DEFAULT_TOLERANCE, max_iterations=MAX_ITERATIONS):
+    """
+    Solve the deployment/cost fixed point for a parameter batch
+
+    Args:
+        params: build_scenario_parameters()-style batch; its 'steepness' is
+                the exogenous (pre-feedback) steepness
+        cost_params: build_cost_parameters()-style batch of the same size;
+                     its 'cumulative' is the reference (linear) path
+        tolerance: Relative steepness change at which a technology has converged
+
+    Returns:
+        Dict with
+            params: params with the solved steepness
+            results: project_batch() output at the solved steepness
+            cost_params: cost_params with the coupled cumulative capacity
+            cumulative [B, C, Y], costs [B, C, Y]
+            steepness_multiplier [B, T], iterations [B], converged [B]
+    """
+    pairs = coupled_technologies(list(params['technologies']), list(cost_params['cost_technologies']))
+    base_steepness = params['steepness']
+    n_batch = len(base_steepness)
+
+    elasticity, (low, high) = adoption_feedback(params['technologies'])
+    reference_costs = project_costs_batch(cost_params)
+
+    multiplier = np.ones_like(base_steepness)
+    iterations = np.zeros(n_batch, dtype=int)
+    active = np.ones(base_steepness.shape, dtype=bool)
+
+    if pairs and elasticity.any():
+        for _ in range(max_iterations):
+            results = project_batch(dict(params, steepness=base_steepness * multiplier))
+            _, costs = _couple(params, cost_params, results, pairs)
+
+            updated = np.ones_like(multiplier)
+            for t, c in pairs:
+                with np.errstate(divide='ignore', invalid='ignore'):
+                    log_ratio = np.log(reference_costs[:, c, :] / costs[:, c, :]).mean(axis=-1)
+                updated[:, t] = np.where(np.isnan(log_ratio), 1.0, np.clip(np.exp(elasticity[t] * log_ratio), low, high))
+
+            change = np.abs(updated - multiplier)
+            multiplier = np.where(active, updated, multiplier)
+            iterations += active.any(axis=1)
+            active &= change > tolerance
+            if not active.any():
+                break
+
+    solved_params = dict(params, steepness=base_steepness * multiplier)
+    results = project_batch(solved_params)
+    cumulative, costs = _couple(solved_params, cost_params, results, pairs)
+
+    return {
+        'params': solved_params,
+        'results': results,
+        'cost_params': dict(cost_params, cumulative=cumulative),
+        'cumulative': cumulative,
+        'costs': costs,
+        'steepness_multiplier': multiplier,
+        'iterations': iterations,
+        'converged': ~active.any(axis=1),
+    }
+
+# ============================================================================
+# CUMULATIVE CAPACITY TABLES
+# ============================================================================
+
+class CumulativeCapacityTable:
+    """
+    Cumulative capacity by year with O(1) lookup
+
+    values[i] is the cumulative capacity at first_year + i (a prefix sum of
+    annual additions). Years before first_year return the first value;
+    years after the last one extend the last year's addition linearly (a
+    single-year table has no addition and stays flat).
+    """
+
+    def __init__(self, first_year, values):
+        self.first_year = int(first_year)
+        self.values = [float(value) for value in values]
+        if not self.values:
+            raise ValueError("CumulativeCapacityTable needs at least one year")
+        self.last_year = self.first_year + len(self.values) - 1
+        self.last_addition = self.values[-1] - self.values[-2] if len(self.values) > 1 else 0.0
+
+    @classmethod
+    def from_additions(cls, first_year, base, additions):
+        """Table of base plus the running sum of additions from first_year + 1 on"""
+        return cls(first_year, accumulate([base, *additions]))
+
+    def covers(self, year):
+        """Whether year lies within the table (no extrapolation)"""
+        return self.first_year <= year <= self.last_year
+
+    def at(self, year):
+        """Cumulative capacity in a year"""
+        if year <= self.first_year:
+            return self.values[0]
+        if year > self.last_year:
+            return self.values[-1] + (year - self.last_year) * self.last_addition
+        return self.values[year - self.first_year]
+
+    def lookup(self, years):
+        """at() for an array of years"""
+        years = np.asarray(years)
+        values = np.asarray(self.values)
+        index = np.clip(years - self.first_year, 0, len(values) - 1)
+        extension = np.maximum(years - self.last_year, 0) * self.last_addition
+        return values[index] + extension
+
+    def as_dict(self):
+        """{year: cumulative capacity}"""
+        return dict(zip(range(self.first_year, self.last_year + 1), self.values))
+
+# ============================================================================
+# PER-SCENARIO SOLUTIONS
+# ============================================================================
+
+_SOLUTION_CACHE = {'compiled': None, 'solutions': {}}
+
+def clear_solution_cache():
+    """Drop every cached scenario solution (the next lookup re-solves)"""
+    _SOLUTION_CACHE.update(compiled=None, solutions={})
+
+def solve_scenarios(scenarios, start_year=BASE_YEAR, end_year=TARGET_YEAR):
+    """Coupled solution for a list of scenarios (one batch row each)"""
+    params = build_scenario_parameters(scenarios, start_year, end_year)
+    cost_params = build_cost_parameters(scenarios, start_year, end_year)
+    return solve_learning_by_deployment(params, cost_params)
+
+def scenario_learning(scenario):
+    """
+    Coupled solution of one scenario over BASE_YEAR-TARGET_YEAR (cached)
+
+    Returns:
+        Dict with 'years', 'steepness' {technology: value},
+        'steepness_multiplier' {technology: value}, 'cumulative' and
+        'costs' {cost technology: {year: value}}, 'capacity_tables'
+        {cost technology: CumulativeCapacityTable}, 'iterations', 'converged'
+    """
+    compiled = get_compiled_parameters()
+    if _SOLUTION_CACHE['compiled'] is not compiled:
+        _SOLUTION_CACHE['compiled'] = compiled
+        _SOLUTION_CACHE['solutions'] = {}
+
+    solutions = _SOLUTION_CACHE['solutions']
+    if scenario not in solutions:
+        solution = solve_scenarios([scenario])
+        params = solution['params']
+        years = [int(year) for year in params['years']]
+        cost_technologies = solution['cost_params']['cost_technologies']
+        tables = {tech: CumulativeCapacityTable(years[0], solution['cumulative'][0, c])
+                  for c, tech in enumerate(cost_technologies)}
+        solutions[scenario] = {
+            'years': years,
+            'steepness': {tech: float(params['steepness'][0, t]) for t, tech in enumerate(params['technologies'])},
+            'steepness_multiplier': {tech: float(solution['steepness_multiplier'][0, t])
+                                     for t, tech in enumerate(params['technologies'])},
+            'cumulative': {tech: table.as_dict() for tech, table in tables.items()},
+            'costs': {tech: dict(zip(years, map(float, solution['costs'][0, c])))
+                      for c, tech in enumerate(cost_technologies)},
+            'capacity_tables': tables,
+            'iterations': int(solution['iterations'][0]),
+            'converged': bool(solution['converged'][0]),
+        }
+    return solutions[scenario]
+
+def capacity_table(technology, scenario):
+    """
+    Endogenous cumulative capacity (GW) table of a technology
+
+    None when the technology has no coupled learning curve.
+    """
+    if technology not in COST_PROJECTIONS or COST_PROJECTIONS[technology]['capacity_unit'] != 'gw':
+        return None
+    return scenario_learning(scenario)['capacity_tables'].get(technology)
+
+def cumulative_capacity(technology, year, scenario):
+    """
+    Endogenous cumulative capacity (GW) of a technology in a year
+
+    Years after the horizon extend the last year's addition linearly;
+    years before it return the base-year value. None when the technology
+    has no coupled learning curve.
+    """
+    table = capacity_table(technology, scenario)
+    return table.at(year) if table else None
+
+def learning_summary(scenario):
+    """JSON-ready summary of a scenario's coupled solution for the output files"""
+    learning = scenario_learning(scenario)
+    coupled = [tech for tech, mult in learning['steepness_multiplier'].items()
+               if tech in COST_PROJECTIONS and COST_PROJECTIONS[tech]['capacity_unit'] == 'gw']
+    return {
+        'iterations': learning['iterations'],
+        'converged': learning['converged'],
+        'steepness_multiplier': {tech: round(learning['steepness_multiplier'][tech], 6) for tech in coupled},
+        'cumulative_capacity_gw': {tech: [round(learning['cumulative'][tech][year], 3) for year in learning['years']]
+                                   for tech in coupled},
+        'learning_cost_usd_per_mwh': {tech: [round(learning['costs'][tech][year], 4) for year in learning['years']]
+                                      for tech in coupled},
+    }
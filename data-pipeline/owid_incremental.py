@@ -0,0 +1,437 @@
+#!/usr/bin/env python3
+"""
+OWID Incremental Recompute - snapshot-diff driven updates of OWID-derived outputs
+
+When OWID publishes a revision, usually only a handful of countries and
+the latest year change. Instead of recomputing every stage from scratch,
+this diffs the ingested snapshot the outputs were built from against the
+latest one (fetch_data.py snapshots, owid_cache.diff_owid_caches) and
+recomputes only the affected rows:
+- calculate_useful_energy_v2:       changed 'World' years
+                                    (useful_energy / exergy_services_timeseries.json)
+                                    and changed entities (energy_services_by_entity.json)
+- calculate_ff_growth:              entries whose deltas or 5-year average
+                                    read a changed useful energy year
+- calculate_regional_useful_energy: changed region-years
+- calculate_net_imports:            changed country-years and the Global,
+                                    continental and bloc aggregates containing them
+
+The manifest in data-pipeline/cache/owid_outputs_manifest.json records
+the snapshot the outputs currently reflect. Stage code or config edits
+(code fingerprint) or missing outputs trigger a full run.
+
+The per-entity, regional and net imports outputs are patched record by
+record: only the affected entities and regions are parsed, recomputed and
+spliced back into the file text, so a patch costs in proportion to the
+revision rather than to the dataset. The manifest keeps the span of every
+record (see RECORD OUTPUTS below).
+
+Usage:
+    python owid_incremental.py            # patch outputs for the latest snapshot
+    python owid_incremental.py --dry-run  # list changed cells and rows only
+    python owid_incremental.py --full     # recompute all stages from the latest snapshot
+"""
+
+import bisect
+import hashlib
+import json
+import os
+import re
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+PIPELINE_DIR = Path(__file__).resolve().parent
+SERVICES_PIPELINE_DIR = PIPELINE_DIR.parent / 'global-energy-services' / 'data-pipeline'
+if str(SERVICES_PIPELINE_DIR) not in sys.path:
+    sys.path.insert(0, str(SERVICES_PIPELINE_DIR))
+
+import fetch_data
+import owid_cache
+import efficiency_cube
+import dimensions
+import energy_balance
+import calculate_useful_energy_v2 as useful
+import calculate_ff_growth as ff_growth
+import calculate_net_imports as net_imports
+import calculate_regional_useful_energy as regional
+from config_registry import working_directory
+
+# ============================================================================
+# CONFIGURATION
+# ============================================================================
+
+MANIFEST_VERSION = 2
+MANIFEST_PATH = PIPELINE_DIR / 'cache' / 'owid_outputs_manifest.json'
+
+SNAPSHOT_DIR = SERVICES_PIPELINE_DIR / fetch_data.SNAPSHOT_DIR
+
+SERVICES_DATA_DIR = (SERVICES_PIPELINE_DIR / useful.OUTPUT_DIR).resolve()
+USEFUL_FILE = SERVICES_DATA_DIR / 'useful_energy_timeseries.json'
+SERVICES_FILE = SERVICES_DATA_DIR / 'exergy_services_timeseries.json'
+FF_GROWTH_FILE = SERVICES_DATA_DIR / 'ff_growth_timeseries.json'
+ENTITY_FILE = SERVICES_DATA_DIR / useful.ENTITY_OUTPUT_FILENAME
+REGIONAL_FILE = PIPELINE_DIR / regional.OUTPUT_FILE
+NET_IMPORTS_FILE = PIPELINE_DIR / net_imports.OUTPUT_FILE
+
+OUTPUT_FILES = [USEFUL_FILE, SERVICES_FILE, FF_GROWTH_FILE, ENTITY_FILE, REGIONAL_FILE, NET_IMPORTS_FILE]
+
+# Outputs patched record by record: file name → (collection holding the
+# records, key field of list records, json.dump indent as the stage writes it)
+RECORD_OUTPUTS = {
+    ENTITY_FILE.name: ('entities', None, None),
+    REGIONAL_FILE.name: ('regions', None, 2),
+    NET_IMPORTS_FILE.name: ('regions', 'region', 2),
+}
+
+# Stage and ingest code whose edits invalidate the recorded outputs
+CODE_FILES = [Path(module.__file__) for module in (fetch_data, owid_cache, efficiency_cube, dimensions, energy_balance,
+                                                   useful, ff_growth, regional, net_imports)]
+
+# ============================================================================
+# MANIFEST
+# ============================================================================
+
+def load_useful_configs():
+    with working_directory(SERVICES_PIPELINE_DIR):
+        return useful.load_configs()
+
+def code_fingerprint(configs):
+    """SHA-256 over the stage source files and the configs they read"""
+    digest = hashlib.sha256()
+    for path in CODE_FILES:
+        digest.update(path.read_bytes())
+    parsed = {name: config for name, config in configs.items() if name != 'efficiency_cube'}
+    digest.update(json.dumps(parsed, sort_keys=True).encode('utf-8'))
+    digest.update(efficiency_cube.current_fingerprint().encode('utf-8'))
+    return digest.hexdigest()
+
+def load_manifest():
+    if not MANIFEST_PATH.exists():
+        return None
+    with open(MANIFEST_PATH, 'r') as f:
+        manifest = json.load(f)
+    if manifest.get('version') != MANIFEST_VERSION:
+        return None
+    return manifest
+
+def save_manifest(snapshot, fingerprint, record_index=None):
+    MANIFEST_PATH.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = MANIFEST_PATH.with_suffix('.tmp')
+    with open(tmp_path, 'w') as f:
+        json.dump({'version': MANIFEST_VERSION, 'snapshot': snapshot, 'code_fingerprint': fingerprint,
+                   'records': record_index or {}}, f)
+    tmp_path.replace(MANIFEST_PATH)
+
+# ============================================================================
+# RECORD OUTPUTS
+# ============================================================================
+# A record output is a JSON object with a 'metadata' member and one
+# collection of records (an object, or a list keyed by a field). Its index
+# holds the character spans of the metadata and of every record, with the
+# file's size and mtime; a stale index is rebuilt by scanning the file once
+# with the C scanner. A patch parses only the affected records, lets the
+# stage patch them and splices them back serialized exactly as json.dump
+# writes them inside the whole file. Records added or removed by a patch
+# change the collection's order, so the file is then rewritten as a whole.
+
+_DECODER = json.JSONDecoder()
+_WHITESPACE = re.compile(r'[ \t\n\r]*')
+
+def _skip(text, index):
+    return _WHITESPACE.match(text, index).end()
+
+def _walk(text, start, visit):
+    """
+    Call visit(key, value start) for each member of the object or array at
+    text[start] (keys are None in arrays); visit returns the value's end
+
+    Returns:
+        Index after the closing bracket
+    """
+    closing = '}' if text[start] == '{' else ']'
+    index = _skip(text, start + 1)
+    while text[index] != closing:
+        key = None
+        if closing == '}':
+            key, index = json.decoder.scanstring(text, index + 1)
+            index = _skip(text, _skip(text, index) + 1)
+        index = _skip(text, visit(key, index))
+        if text[index] == ',':
+            index = _skip(text, index + 1)
+    return index + 1
+
+def _file_stamp(path):
+    stat = os.stat(path)
+    return {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns}
+
+def _scan_record_index(path, text):
+    """Index of a record output: metadata span, {record key: span} and the file stamp"""
+    collection, key_field, _ = RECORD_OUTPUTS[path.name]
+    index = {'metadata': None, 'records': {}}
+
+    def record(key, start):
+        value, end = _DECODER.raw_decode(text, start)
+        index['records'][value[key_field] if key_field else key] = [start, end]
+        return end
+
+    def member(key, start):
+        if key == collection:
+            return _walk(text, start, record)
+        end = _DECODER.raw_decode(text, start)[1]
+        if key == 'metadata':
+            index['metadata'] = [start, end]
+        return end
+
+    _walk(text, _skip(text, 0), member)
+    index.update(_file_stamp(path))
+    return index
+
+def build_record_index():
+    """Scan every record output (after a full recompute)"""
+    record_index = {}
+    for path in (ENTITY_FILE, REGIONAL_FILE, NET_IMPORTS_FILE):
+        with open(path, 'r', encoding='utf-8') as f:
+            record_index[path.name] = _scan_record_index(path, f.read())
+    return record_index
+
+def _dumps(value, indent, depth):
+    """value as json.dump writes it at the given nesting depth of a file"""
+    if indent is None:
+        return json.dumps(value, separators=(',', ':'))
+    return json.dumps(value, indent=indent).replace('\n', '\n' + ' ' * (indent * depth))
+
+def patch_record_output(path, keys, patch, record_index):
+    """
+    Patch the given records of a record output on disk
+
+    Args:
+        path: ENTITY_FILE, REGIONAL_FILE or NET_IMPORTS_FILE
+        keys: Records the patch may change (missing ones may be added)
+        patch: Stage patch, called with {'metadata': ..., collection: ...}
+               holding only those records; returns the recomputed count
+        record_index: {file name: index}, updated in place
+
+    Returns:
+        patch()'s count
+    """
+    collection, key_field, indent = RECORD_OUTPUTS[path.name]
+    with open(path, 'r', encoding='utf-8') as f:
+        text = f.read()
+    index = record_index.get(path.name)
+    if index is None or {key: index[key] for key in ('size', 'mtime_ns')} != _file_stamp(path):
+        index = _scan_record_index(path, text)
+
+    loaded = {key: json.loads(text[slice(*index['records'][key])]) for key in keys if key in index['records']}
+    output = {'metadata': json.loads(text[slice(*index['metadata'])]),
+              collection: list(loaded.values()) if key_field else dict(loaded)}
+    count = patch(output)
+    records = {record[key_field]: record for record in output[collection]} if key_field else output[collection]
+
+    if set(records) != set(loaded):
+        # Records added or removed: patch and write the whole output
+        output = json.loads(text)
+        count = patch(output)
+        text = json.dumps(output, indent=indent, separators=None if indent else (',', ':'))
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(text)
+        record_index[path.name] = _scan_record_index(path, text)
+        return count
+
+    spans = [(index['metadata'], _dumps(output['metadata'], indent, 1))]
+    spans += [(index['records'][key], _dumps(record, indent, 2)) for key, record in records.items()]
+    spans.sort(key=lambda span: span[0][0])
+    pieces, starts, shifts, last = [], [], [0], 0
+    for (start, end), replacement in spans:
+        pieces += [text[last:start], replacement]
+        starts.append(start)
+        shifts.append(shifts[-1] + len(replacement) - (end - start))
+        last = end
+    pieces.append(text[last:])
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(''.join(pieces))
+
+    def shifted(span, length=None):
+        shift = shifts[bisect.bisect_left(starts, span[0])]
+        return [span[0] + shift, span[0] + shift + (span[1] - span[0] if length is None else length)]
+
+    replaced = {start: len(replacement) for (start, _), replacement in spans}
+    record_index[path.name] = {
+        'metadata': shifted(index['metadata'], replaced[index['metadata'][0]]),
+        'records': {key: shifted(span, replaced.get(span[0])) for key, span in index['records'].items()},
+        **_file_stamp(path),
+    }
+    return count
+
+# ============================================================================
+# RECOMPUTE
+# ============================================================================
+
+def _read_json(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+def _write_json(path, data, ensure_ascii=True):
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=2, ensure_ascii=ensure_ascii)
+
+def full_recompute(snapshot, configs):
+    """Run every stage on a snapshot and record it in the manifest"""
+    data = fetch_data.load_snapshot_cache(str(SNAPSHOT_DIR), snapshot)
+
+    options = dict(enable_temporal=useful.ENABLE_TEMPORAL, enable_exergy=useful.ENABLE_EXERGY,
+                   rebound_rate=useful.REBOUND_RATE)
+    results = useful.process_global_data(data, configs, **options)
+    useful.save_results(results, output_dir=str(SERVICES_DATA_DIR))
+    entity_results = useful.process_all_entities(data, configs, **options)
+    useful.save_entity_results(entity_results, data, output_dir=str(SERVICES_DATA_DIR))
+    ff_growth.calculate_ff_growth(str(USEFUL_FILE))
+
+    regional.generate_output(regional.process_regional_data(data), REGIONAL_FILE)
+    net_imports.calculate_net_imports(data.path, str(NET_IMPORTS_FILE))
+
+    save_manifest(snapshot, code_fingerprint(configs), build_record_index())
+
+def affected_rows(cells):
+    """Changed rows of each stage: {stage: {entity: [years]}}"""
+    return {
+        'useful_energy': owid_cache.changed_rows(cells, useful.OWID_COLUMNS, ['World']),
+        'entities': owid_cache.changed_rows(cells, useful.OWID_COLUMNS + ['iso_code']),
+        'regional': owid_cache.changed_rows(cells, regional.OWID_COLUMN_MAPPING, regional.REGIONS.values()),
+        'net_imports': owid_cache.changed_rows(cells, net_imports.NET_IMPORT_COLUMNS, net_imports.needed_countries()),
+    }
+
+def patch_outputs(data, rows, configs, previous_entities=(), record_index=None):
+    """
+    Recompute the affected rows of every stage and patch the output files
+
+    Args:
+        data: owid_cache.OwidCache of the new snapshot
+        rows: affected_rows() of the snapshot diff
+        configs: load_useful_configs()
+        previous_entities: Entities of the snapshot the outputs reflect
+        record_index: {file name: record index} from the manifest, updated in place
+
+    Returns:
+        {stage: number of recomputed rows}
+    """
+    record_index = {} if record_index is None else record_index
+    patched = {'useful_energy': 0, 'ff_growth': 0, 'entities': 0, 'regional': 0, 'net_imports': 0}
+    options = dict(enable_temporal=useful.ENABLE_TEMPORAL, enable_exergy=useful.ENABLE_EXERGY,
+                   rebound_rate=useful.REBOUND_RATE)
+
+    world_years = rows['useful_energy'].get('World', [])
+    if world_years:
+        useful_output = _read_json(USEFUL_FILE)
+        services_output = _read_json(SERVICES_FILE)
+        results = {'useful_energy': useful_output['data'], 'energy_services': services_output['data']}
+        years = useful.patch_global_data(results, data, world_years, configs, **options)
+        if years:
+            generated_at = datetime.now().isoformat()
+            useful_output['metadata']['generated_at'] = generated_at
+            services_output['metadata']['generated_at'] = generated_at
+            _write_json(USEFUL_FILE, useful_output)
+            _write_json(SERVICES_FILE, services_output)
+
+            ff_output = _read_json(FF_GROWTH_FILE)
+            ff_growth.patch_ff_growth(ff_output['data'], useful_output['data'], years)
+            ff_output['metadata']['generated_at'] = generated_at
+            _write_json(FF_GROWTH_FILE, ff_output, ensure_ascii=False)
+            patched['useful_energy'] = patched['ff_growth'] = len(years)
+
+    if rows['entities']:
+        def patch_entities(output):
+            before = len(output['entities'])
+            count = useful.patch_entity_results(output['entities'], data, list(rows['entities']), configs, **options)
+            output['metadata']['generated_at'] = datetime.now().isoformat()
+            output['metadata']['entities'] += len(output['entities']) - before
+            return count
+        patched['entities'] = patch_record_output(ENTITY_FILE, list(rows['entities']), patch_entities, record_index)
+
+    if rows['regional']:
+        regions = [name for name, entity in regional.REGIONS.items() if entity in rows['regional']]
+        patched['regional'] = patch_record_output(
+            REGIONAL_FILE, regions,
+            lambda output: regional.patch_regional_data(output['regions'], data, rows['regional']), record_index)
+
+    affected = net_imports.affected_regions(rows['net_imports'], list(previous_entities) + data.entities)
+    if affected:
+        patched['net_imports'] = patch_record_output(
+            NET_IMPORTS_FILE, list(affected),
+            lambda output: net_imports.patch_net_imports(output, data, affected), record_index)
+
+    return patched
+
+def incremental_recompute(dry_run=False, full=False):
+    """
+    Bring the OWID-derived outputs up to date with the latest snapshot
+
+    Falls back to full_recompute() when there is no usable manifest, an
+    output file or the recorded snapshot is missing, or the stage code or
+    configs changed.
+
+    Returns:
+        Dict with the snapshots compared, changed cells, affected rows and
+        recomputed row counts (None if no snapshot has been fetched)
+    """
+    pointer = fetch_data.read_latest(str(SNAPSHOT_DIR))
+    if pointer is None:
+        print("✗ No OWID snapshot found - run global-energy-services/data-pipeline/fetch_data.py first")
+        return None
+    snapshot = pointer['sha256']
+
+    configs = load_useful_configs()
+    manifest = load_manifest()
+    previous = manifest and manifest['snapshot']
+    usable = (manifest is not None and manifest.get('code_fingerprint') == code_fingerprint(configs)
+              and all(path.exists() for path in OUTPUT_FILES)
+              and os.path.exists(fetch_data.snapshot_path(str(SNAPSHOT_DIR), previous)))
+
+    if full or not usable:
+        if not dry_run:
+            print("Running full recompute" if full else "No usable OWID output manifest - running full recompute")
+            full_recompute(snapshot, configs)
+        return {'full': True, 'snapshots': (previous, snapshot), 'cells': set(), 'rows': {}, 'patched': {}}
+
+    if previous == snapshot:
+        return {'full': False, 'snapshots': (previous, snapshot), 'cells': set(), 'rows': {}, 'patched': {}}
+
+    old = fetch_data.load_snapshot_cache(str(SNAPSHOT_DIR), previous)
+    new = fetch_data.load_snapshot_cache(str(SNAPSHOT_DIR), snapshot)
+    cells = owid_cache.diff_owid_caches(old, new)
+    rows = affected_rows(cells)
+
+    patched = {}
+    if not dry_run:
+        record_index = manifest.get('records', {})
+        patched = patch_outputs(new, rows, configs, old.entities, record_index)
+        save_manifest(snapshot, manifest['code_fingerprint'], record_index)
+
+    return {'full': False, 'snapshots': (previous, snapshot), 'cells': cells, 'rows': rows, 'patched': patched}
+
+# ============================================================================
+# MAIN EXECUTION
+# ============================================================================
+
+if __name__ == '__main__':
+    print("=" * 80)
+    print("OWID INCREMENTAL RECOMPUTE - Useful Energy, FF Growth, Regional, Net Imports")
+    print("=" * 80)
+
+    start = time.perf_counter()
+    result = incremental_recompute(dry_run='--dry-run' in sys.argv, full='--full' in sys.argv)
+    elapsed = time.perf_counter() - start
+    if result is None:
+        sys.exit(1)
+
+    previous, snapshot = result['snapshots']
+    print(f"\nSnapshot: {(previous or 'none')[:12]} → {snapshot[:12]}")
+    if not result['full']:
+        print(f"Changed cells: {len(result['cells'])}")
+        for stage, stage_rows in result['rows'].items():
+            count = sum(len(years) for years in stage_rows.values())
+            print(f"  {stage:15s} {count:5d} changed rows in {len(stage_rows)} entities")
+        for stage, count in result['patched'].items():
+            print(f"  {stage:15s} {count:5d} rows recomputed")
+    print(f"\nCompleted in {elapsed:.2f} s")
@@ -15,6 +15,8 @@ This is the master projection script for Global Exergy Services Platform v2.5.0
 
 import json
 import math
+import sys
+import time
 from pathlib import Path
 from datetime import datetime
 
@@ -22,27 +24,71 @@ from datetime import datetime
 # CONFIGURATION LOADING
 # ============================================================================
 
+from config_registry import REGISTRY
+
 def load_config(filename):
-    """Load JSON configuration file"""
-    config_path = Path(__file__).parent / 'config' / filename
-    if not config_path.exists():
-        # Try alternative paths
-        alt_path = Path(__file__).parent.parent / 'data-pipeline' / 'config' / filename
-        if alt_path.exists():
-            config_path = alt_path
-        else:
-            print(f"Warning: Config file not found: {filename}")
-            return None
+    """Load JSON configuration file (lazily, via the shared config registry)"""
+    config = REGISTRY.get(filename)
+    if config is None:
+        print(f"Warning: Config file not found: {filename}")
+    return config
+
+# Configuration files, loaded on first access rather than at import
+CONFIG_ATTRIBUTES = {
+    'LEARNING_CURVES': 'learning_curves.json',
+    'MANUFACTURING_CAPACITY': 'manufacturing_capacity.json',
+    'POLICY_SCENARIOS': 'policy_scenarios.json',
+    'TECHNOLOGY_BREAKTHROUGHS': 'technology_breakthroughs.json',
+    'DIGITALIZATION_GAINS': 'digitalization_gains.json'
+}
+
+def __getattr__(name):
+    """Serve LEARNING_CURVES etc. as lazily loaded module attributes"""
+    if name in CONFIG_ATTRIBUTES:
+        return load_config(CONFIG_ATTRIBUTES[name])
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+_COMPILED_PARAMETERS = None
+_COMPILED_CHECKED_AT = 0.0
 
-    with open(config_path, 'r') as f:
-        return json.load(f)
+def get_compiled_parameters(revalidate=False):
+    """
+    Dense [scenario × technology × year] lookup tables (compiled_parameters)
 
-# Load all configurations
-LEARNING_CURVES = load_config('learning_curves.json')
-MANUFACTURING_CAPACITY = load_config('manufacturing_capacity.json')
-POLICY_SCENARIOS = load_config('policy_scenarios.json')
-TECHNOLOGY_BREAKTHROUGHS = load_config('technology_breakthroughs.json')
-DIGITALIZATION_GAINS = load_config('digitalization_gains.json')
+    Compiled on first use and cached on disk keyed by a hash of the config
+    files, so config lookups become O(1) array indexing. Recompiled (or
+    reloaded from cache) when the registry sees a config file change;
+    revalidate=True skips the revalidation throttle.
+    """
+    global _COMPILED_PARAMETERS, _COMPILED_CHECKED_AT
+    from compiled_parameters import load_compiled_parameters, current_fingerprint
+
+    # Revalidate no more often than the registry re-stats its files
+    now = time.monotonic()
+    if (_COMPILED_PARAMETERS is not None and not revalidate
+            and now - _COMPILED_CHECKED_AT < REGISTRY.revalidate_interval):
+        return _COMPILED_PARAMETERS
+
+    if _COMPILED_PARAMETERS is None or _COMPILED_PARAMETERS.fingerprint != current_fingerprint():
+        _COMPILED_PARAMETERS = load_compiled_parameters()
+    _COMPILED_CHECKED_AT = now
+    return _COMPILED_PARAMETERS
+
+def use_compiled_parameters(compiled):
+    """Install already compiled parameters (e.g. handed to a pool worker)"""
+    global _COMPILED_PARAMETERS, _COMPILED_CHECKED_AT
+    _COMPILED_PARAMETERS = compiled
+    _COMPILED_CHECKED_AT = time.monotonic()
+
+def scenario_definition(scenario):
+    """Resolved built-in or user-defined scenario (see scenario_sets)"""
+    from scenario_sets import resolve_scenario
+    return resolve_scenario(scenario)
+
+def config_scenario(scenario, field):
+    """Scenario key a (possibly user-defined) scenario uses in a config file"""
+    from scenario_sets import config_scenario as resolve_config_scenario
+    return resolve_config_scenario(scenario, field)
 
 # ============================================================================
 # CONSTANTS AND SCENARIO DEFINITIONS
@@ -86,6 +132,70 @@ SATURATION_LIMITS = {
     }
 }
 
+# Clean technologies projected on S-curves
+CLEAN_TECHNOLOGIES = ['solar', 'wind', 'nuclear', 'hydro']
+
+# S-curve steepness by technology, scaled by scenario
+BASE_STEEPNESS = {
+    'solar': 0.35,  # Fast adoption
+    'wind': 0.25,   # Moderate
+    'nuclear': 0.15, # Slow
+    'hydro': 0.10   # Very slow (limited sites)
+}
+
+STEEPNESS_MULTIPLIERS = {
+    'Conservative': 0.8,
+    'Baseline': 1.0,
+    'Optimistic': 1.3
+}
+
+# Total energy demand growth by scenario
+DEMAND_GROWTH_RATES = {
+    'Conservative': 0.008,  # 0.8% per year
+    'Baseline': 0.012,      # 1.2% per year
+    'Optimistic': 0.015     # 1.5% per year
+}
+
+# Rough conversion from annual manufacturing capacity (GW/year) to EJ/year
+GW_TO_EJ_FACTORS = {
+    'solar': 0.005,  # 100 GW ≈ 0.5 EJ at 20% CF
+    'wind': 0.008,   # 100 GW ≈ 0.8 EJ at 35% CF
+    'nuclear': 0.025, # 100 GW ≈ 2.5 EJ at 90% CF
+    'hydro': 0.012   # 100 GW ≈ 1.2 EJ at 45% CF
+}
+
+# Learning-curve cost outputs of ProjectionEngine.get_costs()
+# defaults: (base cost, learning rate, base cumulative, floor cost) used when
+# the config omits a field; cumulative_2024 + annual_addition is the linear
+# reference path (the GW technologies use the projected deployment instead,
+# see learning_by_deployment)
+COST_PROJECTIONS = {
+    'solar': {
+        'output': 'solar_usd_per_mwh',
+        'cost_unit': 'usd_per_mwh',
+        'capacity_unit': 'gw',
+        'defaults': (32, 0.27, 1500, 8),
+        'cumulative_2024': 1500,
+        'annual_addition': 800
+    },
+    'wind': {
+        'output': 'wind_usd_per_mwh',
+        'cost_unit': 'usd_per_mwh',
+        'capacity_unit': 'gw',
+        'defaults': (38, 0.15, 900, 15),
+        'cumulative_2024': 900,
+        'annual_addition': 150
+    },
+    'batteries': {
+        'output': 'battery_usd_per_kwh',
+        'cost_unit': 'usd_per_kwh',
+        'capacity_unit': 'gwh',
+        'defaults': (139, 0.18, 2500, 40),
+        'cumulative_2024': 2500,
+        'annual_addition': 1500
+    }
+}
+
 # 2024 baseline values (EJ useful energy)
 BASELINE_2024 = {
     'solar': 5.2,
@@ -129,31 +239,49 @@ def calculate_learning_curve_cost(base_cost, learning_rate, base_cumulative,
     # Apply floor cost
     return max(new_cost, floor_cost)
 
+# Engine technology names -> learning_curves.json keys
+LEARNING_TECH_MAP = {
+    'solar': 'solar_pv',
+    'wind': 'wind_onshore',
+    'batteries': 'lithium_ion_batteries',
+    'heat_pumps': 'heat_pumps',
+    'electrolyzers': 'electrolyzers_pem'
+}
+
 def get_learning_rate_params(technology, scenario='Baseline'):
-    """Get learning rate parameters for a technology"""
-    if not LEARNING_CURVES:
-        return None
+    """
+    Get learning rate parameters for a technology
 
-    tech_map = {
-        'solar': 'solar_pv',
-        'wind': 'wind_onshore',
-        'batteries': 'lithium_ion_batteries',
-        'heat_pumps': 'heat_pumps',
-        'electrolyzers': 'electrolyzers_pem'
-    }
+    Served from the compiled parameter cache when the scenario/technology
+    is covered; the returned dict is shared and must not be modified.
+    """
+    compiled = get_compiled_parameters()
+    params = compiled.learning_rate_params(technology, scenario)
+    if params is not compiled.NOT_COMPILED:
+        return params
 
-    tech_key = tech_map.get(technology, technology)
-    params = LEARNING_CURVES.get('learning_rates', {}).get(tech_key)
+    return _resolve_learning_rate_params(load_config('learning_curves.json'), technology,
+                                         config_scenario(scenario, 'learning_scenario'))
+
+def _resolve_learning_rate_params(learning_curves, technology, scenario):
+    """Apply scenario adjustments to a technology's learning curve parameters"""
+    if not learning_curves:
+        return None
 
-    if params and LEARNING_CURVES.get('scenario_adjustments'):
-        adj = LEARNING_CURVES['scenario_adjustments'].get(scenario, {})
+    tech_key = LEARNING_TECH_MAP.get(technology, technology)
+    params = learning_curves.get('learning_rates', {}).get(tech_key)
+
+    if params and learning_curves.get('scenario_adjustments'):
+        # Adjustments are keyed by lower-case scenario name
+        adjustments = learning_curves['scenario_adjustments']
+        adj = adjustments.get(scenario) or adjustments.get(scenario.lower(), {})
 
         # Apply scenario adjustments
         learning_rate_mult = adj.get('learning_rate_multiplier', 1.0)
         floor_buffer = adj.get('floor_cost_buffer', 1.0)
 
         # Create adjusted params
-        adjusted_params = params.copy()
+        adjusted_params = dict(params)
         adjusted_params['learning_rate'] = params['learning_rate'] * learning_rate_mult
 
         # Apply floor cost buffer
@@ -169,24 +297,34 @@ def get_learning_rate_params(technology, scenario='Baseline'):
 # MANUFACTURING CAPACITY CONSTRAINTS
 # ============================================================================
 
+# Engine technology names -> manufacturing_capacity.json trajectory keys
+MANUFACTURING_TECH_MAP = {
+    'solar': 'solar_pv_gw_year',
+    'wind': 'wind_total_gw_year',
+    'batteries': 'battery_gwh_year',
+    'heat_pumps': 'heat_pumps_million_units',
+    'evs': 'evs_million_units'
+}
+
 def get_max_annual_deployment(technology, year, scenario='Baseline'):
     """Get maximum annual deployment based on manufacturing capacity"""
-    if not MANUFACTURING_CAPACITY:
-        return float('inf')
+    value = get_compiled_parameters().max_annual_deployment(technology, year, scenario)
+    if value is not None:
+        return value
 
-    tech_map = {
-        'solar': 'solar_pv_gw_year',
-        'wind': 'wind_total_gw_year',
-        'batteries': 'battery_gwh_year',
-        'heat_pumps': 'heat_pumps_million_units',
-        'evs': 'evs_million_units'
-    }
+    return _resolve_max_annual_deployment(load_config('manufacturing_capacity.json'), technology, year,
+                                          config_scenario(scenario, 'manufacturing_scenario'))
 
-    tech_key = tech_map.get(technology)
+def _resolve_max_annual_deployment(manufacturing_capacity, technology, year, scenario):
+    """Interpolate a technology's manufacturing trajectory for one year"""
+    if not manufacturing_capacity:
+        return float('inf')
+
+    tech_key = MANUFACTURING_TECH_MAP.get(technology)
     if not tech_key:
         return float('inf')
 
-    trajectory = MANUFACTURING_CAPACITY.get('trajectories', {}).get(tech_key, {})
+    trajectory = manufacturing_capacity.get('trajectories', {}).get(tech_key, {})
     projections = trajectory.get('projections', {})
 
     # If no projections available, return infinity (no constraint)
@@ -222,24 +360,34 @@ def get_max_annual_deployment(technology, year, scenario='Baseline'):
 # POLICY ACCELERATION FACTORS
 # ============================================================================
 
+# Engine technology names -> policy_scenarios.json technology keys
+POLICY_TECH_MAP = {
+    'solar': 'solar_pv',
+    'wind': 'wind_total',
+    'batteries': 'batteries',
+    'heat_pumps': 'heat_pumps',
+    'evs': 'evs',
+    'hydrogen': 'hydrogen',
+    'nuclear': 'nuclear'
+}
+
 def get_policy_multiplier(technology, year, scenario='Baseline'):
     """Get policy-driven deployment acceleration multiplier"""
-    if not POLICY_SCENARIOS:
-        return 1.0
+    value = get_compiled_parameters().policy_multiplier(technology, year, scenario)
+    if value is not None:
+        return value
 
-    global_mults = POLICY_SCENARIOS.get('global_aggregated_multipliers', {}).get('by_technology', {})
+    return _resolve_policy_multiplier(load_config('policy_scenarios.json'), technology, year,
+                                      config_scenario(scenario, 'policy_scenario'))
 
-    tech_map = {
-        'solar': 'solar_pv',
-        'wind': 'wind_total',
-        'batteries': 'batteries',
-        'heat_pumps': 'heat_pumps',
-        'evs': 'evs',
-        'hydrogen': 'hydrogen',
-        'nuclear': 'nuclear'
-    }
+def _resolve_policy_multiplier(policy_scenarios, technology, year, scenario):
+    """Find the multiplier of the first 'YYYY-YYYY' period containing year"""
+    if not policy_scenarios:
+        return 1.0
 
-    tech_key = tech_map.get(technology, technology)
+    global_mults = policy_scenarios.get('global_aggregated_multipliers', {}).get('by_technology', {})
+
+    tech_key = POLICY_TECH_MAP.get(technology, technology)
     tech_data = global_mults.get(tech_key, {}).get(scenario, {})
 
     # Find applicable period
@@ -255,57 +403,63 @@ def get_policy_multiplier(technology, year, scenario='Baseline'):
 # EFFICIENCY FACTORS
 # ============================================================================
 
-def get_efficiency_factor(technology, year, scenario='Baseline'):
-    """Get efficiency factor for a technology in a given year"""
-    # Base efficiencies from corrected factors
-    base_efficiencies = {
-        'solar': 0.70,
-        'wind': 0.70,
-        'nuclear': 0.33,
-        'hydro': 0.70,
-        'coal': 0.32,
-        'gas': 0.45,
-        'oil': 0.30
-    }
+# Base efficiencies from corrected factors
+BASE_EFFICIENCIES = {
+    'solar': 0.70,
+    'wind': 0.70,
+    'nuclear': 0.33,
+    'hydro': 0.70,
+    'coal': 0.32,
+    'gas': 0.45,
+    'oil': 0.30
+}
 
-    # Efficiency improvement rates by scenario
-    improvements = {
-        'Conservative': {
-            'solar': 0.003,  # 0.3% per year
-            'wind': 0.002,
-            'nuclear': 0.001,
-            'hydro': 0.0
-        },
-        'Baseline': {
-            'solar': 0.006,  # 0.6% per year
-            'wind': 0.004,
-            'nuclear': 0.002,
-            'hydro': 0.001
-        },
-        'Optimistic': {
-            'solar': 0.010,  # 1.0% per year
-            'wind': 0.006,
-            'nuclear': 0.004,
-            'hydro': 0.002
-        }
+# Efficiency improvement rates by scenario
+EFFICIENCY_IMPROVEMENTS = {
+    'Conservative': {
+        'solar': 0.003,  # 0.3% per year
+        'wind': 0.002,
+        'nuclear': 0.001,
+        'hydro': 0.0
+    },
+    'Baseline': {
+        'solar': 0.006,  # 0.6% per year
+        'wind': 0.004,
+        'nuclear': 0.002,
+        'hydro': 0.001
+    },
+    'Optimistic': {
+        'solar': 0.010,  # 1.0% per year
+        'wind': 0.006,
+        'nuclear': 0.004,
+        'hydro': 0.002
     }
+}
+
+# Theoretical efficiency maxima
+MAX_EFFICIENCY = {
+    'solar': 0.95,
+    'wind': 0.88,
+    'nuclear': 0.45,
+    'hydro': 0.78
+}
+
+def get_efficiency_factor(technology, year, scenario='Baseline'):
+    """Get efficiency factor for a technology in a given year"""
+    value = get_compiled_parameters().efficiency_factor(technology, year, scenario)
+    if value is not None:
+        return value
 
-    base = base_efficiencies.get(technology, 0.5)
-    rate = improvements.get(scenario, {}).get(technology, 0)
+    base = BASE_EFFICIENCIES.get(technology, 0.5)
+    from scenario_sets import efficiency_improvements
+    rate = efficiency_improvements(scenario).get(technology, 0)
     years_from_base = year - BASE_YEAR
 
     # Calculate improved efficiency with cap
     improved = base + (rate * years_from_base)
 
     # Cap at theoretical maxima
-    max_efficiency = {
-        'solar': 0.95,
-        'wind': 0.88,
-        'nuclear': 0.45,
-        'hydro': 0.78
-    }
-
-    return min(improved, max_efficiency.get(technology, 1.0))
+    return min(improved, MAX_EFFICIENCY.get(technology, 1.0))
 
 # ============================================================================
 # S-CURVE GROWTH MODEL
@@ -354,32 +508,26 @@ class ProjectionEngine:
     def __init__(self, scenario='Baseline'):
         self.scenario = scenario
         self.base_year = BASE_YEAR
-        self.saturation = SATURATION_LIMITS[scenario]
+        self.definition = scenario_definition(scenario)
+        self.saturation = self.definition['saturation_limits']
+
+        # Steepness and cumulative capacity from the learning-by-deployment fixed point
+        from learning_by_deployment import scenario_learning
+        self.learning = scenario_learning(scenario)
 
         # Calculate S-curve parameters
         self.midpoints = {}
-        for tech in ['solar', 'wind', 'nuclear', 'hydro']:
+        for tech in CLEAN_TECHNOLOGIES:
             current = BASELINE_2024.get(tech, 0)
             sat = self.saturation.get(tech, 100)
             steepness = self._get_steepness(tech)
             self.midpoints[tech] = calculate_s_curve_midpoint(current, BASE_YEAR, sat, steepness)
 
     def _get_steepness(self, technology):
-        """Get S-curve steepness based on scenario and technology"""
-        base_steepness = {
-            'solar': 0.35,  # Fast adoption
-            'wind': 0.25,   # Moderate
-            'nuclear': 0.15, # Slow
-            'hydro': 0.10   # Very slow (limited sites)
-        }
-
-        scenario_mult = {
-            'Conservative': 0.8,
-            'Baseline': 1.0,
-            'Optimistic': 1.3
-        }
-
-        return base_steepness.get(technology, 0.2) * scenario_mult.get(self.scenario, 1.0)
+        """Get S-curve steepness based on scenario, technology and learning feedback"""
+        if technology in self.learning['steepness']:
+            return self.learning['steepness'][technology]
+        return BASE_STEEPNESS.get(technology, 0.2) * self.definition['steepness_multiplier']
 
     def project_technology(self, technology, year):
         """Project deployment for a single technology"""
@@ -402,14 +550,7 @@ class ProjectionEngine:
 
         # Cap growth at manufacturing capacity (convert to EJ if needed)
         # Rough conversion: 100 GW solar ≈ 0.5 EJ/year at 20% CF
-        gw_to_ej_factor = {
-            'solar': 0.005,  # 100 GW ≈ 0.5 EJ at 20% CF
-            'wind': 0.008,   # 100 GW ≈ 0.8 EJ at 35% CF
-            'nuclear': 0.025, # 100 GW ≈ 2.5 EJ at 90% CF
-            'hydro': 0.012   # 100 GW ≈ 1.2 EJ at 45% CF
-        }
-
-        max_annual_ej = max_annual * gw_to_ej_factor.get(technology, 0.01) if max_annual != float('inf') else float('inf')
+        max_annual_ej = max_annual * GW_TO_EJ_FACTORS.get(technology, 0.01) if max_annual != float('inf') else float('inf')
 
         # Constrain growth
         constrained_growth = min(annual_growth * policy_mult, max_annual_ej)
@@ -427,23 +568,17 @@ class ProjectionEngine:
         results = {}
 
         # Total energy demand growth (moderate growth assumption)
-        demand_growth_rate = {
-            'Conservative': 0.008,  # 0.8% per year
-            'Baseline': 0.012,      # 1.2% per year
-            'Optimistic': 0.015     # 1.5% per year
-        }
-
         years_from_base = year - BASE_YEAR
-        growth = demand_growth_rate.get(self.scenario, 0.01)
+        growth = self.definition['demand_growth_rate']
         results['total_demand_ej'] = BASELINE_2024['total_useful_energy'] * (1 + growth) ** years_from_base
 
         # Clean energy sources
-        for tech in ['solar', 'wind', 'nuclear', 'hydro']:
+        for tech in CLEAN_TECHNOLOGIES:
             results[f'{tech}_ej'] = self.project_technology(tech, year)
 
         # Calculate raw clean total
         raw_clean_total = sum([
-            results.get(f'{t}_ej', 0) for t in ['solar', 'wind', 'nuclear', 'hydro']
+            results.get(f'{t}_ej', 0) for t in CLEAN_TECHNOLOGIES
         ])
 
         # Cap clean energy at total demand (can't exceed 100%)
@@ -453,7 +588,7 @@ class ProjectionEngine:
         if raw_clean_total > max_clean:
             # Scale down proportionally
             scale_factor = max_clean / raw_clean_total
-            for tech in ['solar', 'wind', 'nuclear', 'hydro']:
+            for tech in CLEAN_TECHNOLOGIES:
                 results[f'{tech}_ej'] *= scale_factor
             results['clean_total_ej'] = max_clean
         else:
@@ -480,57 +615,61 @@ class ProjectionEngine:
 
         return timeseries
 
+    def sensitivity(self, delta=0.10, report_years=None, metrics=None):
+        """
+        One-at-a-time (tornado) sensitivity of this scenario
+
+        Evaluates all parameter perturbations as one vectorized batch;
+        see projection_sensitivity.run_sensitivity().
+        """
+        from projection_sensitivity import run_sensitivity
+        return run_sensitivity(self.scenario, delta, report_years, metrics)
+
     def get_costs(self, year):
         """Calculate technology costs using learning curves"""
         costs = {}
 
-        # Solar
-        solar_params = get_learning_rate_params('solar', self.scenario)
-        if solar_params:
-            # Estimate cumulative capacity growth
-            cumulative_gw = 1500 + (year - 2024) * 800  # Rough estimate
-            costs['solar_usd_per_mwh'] = calculate_learning_curve_cost(
-                solar_params.get('base_cost_usd_per_mwh', 32),
-                solar_params.get('learning_rate', 0.27),
-                solar_params.get('base_cumulative_gw', 1500),
-                cumulative_gw,
-                solar_params.get('floor_cost_usd_per_mwh', 8)
-            )
-
-        # Wind
-        wind_params = get_learning_rate_params('wind', self.scenario)
-        if wind_params:
-            cumulative_gw = 900 + (year - 2024) * 150
-            costs['wind_usd_per_mwh'] = calculate_learning_curve_cost(
-                wind_params.get('base_cost_usd_per_mwh', 38),
-                wind_params.get('learning_rate', 0.15),
-                wind_params.get('base_cumulative_gw', 900),
-                cumulative_gw,
-                wind_params.get('floor_cost_usd_per_mwh', 15)
-            )
-
-        # Batteries
-        battery_params = get_learning_rate_params('batteries', self.scenario)
-        if battery_params:
-            cumulative_gwh = 2500 + (year - 2024) * 1500
-            costs['battery_usd_per_kwh'] = calculate_learning_curve_cost(
-                battery_params.get('base_cost_usd_per_kwh', 139),
-                battery_params.get('learning_rate', 0.18),
-                battery_params.get('base_cumulative_gwh', 2500),
-                cumulative_gwh,
-                battery_params.get('floor_cost_usd_per_kwh', 40)
+        for technology, spec in COST_PROJECTIONS.items():
+            params = get_learning_rate_params(technology, self.scenario)
+            if not params:
+                continue
+
+            # Projected deployment (learning by deployment), else the linear reference path
+            table = self.learning['capacity_tables'].get(technology)
+            if table is not None and table.covers(year):
+                cumulative = table.at(year)
+            else:
+                cumulative = spec['cumulative_2024'] + (year - 2024) * spec['annual_addition']
+            base_cost, learning_rate, base_cumulative, floor_cost = spec['defaults']
+            costs[spec['output']] = calculate_learning_curve_cost(
+                params.get(f"base_cost_{spec['cost_unit']}", base_cost),
+                params.get('learning_rate', learning_rate),
+                params.get(f"base_cumulative_{spec['capacity_unit']}", base_cumulative),
+                cumulative,
+                params.get(f"floor_cost_{spec['cost_unit']}", floor_cost)
             )
 
         return costs
 
-def generate_all_projections():
-    """Generate projections for all scenarios"""
+def generate_all_projections(vectorized=False):
+    """
+    Generate projections for all scenarios
+
+    Args:
+        vectorized: Evaluate all scenarios in one NumPy pass
+                    (projection_engine_vectorized) instead of the scalar engine
+    """
     all_projections = {}
 
+    if vectorized:
+        from projection_engine_vectorized import project_scenarios_vectorized
+        all_projections = project_scenarios_vectorized(SCENARIOS)
+
     for scenario in SCENARIOS:
         print(f"\nGenerating {scenario} scenario...")
-        engine = ProjectionEngine(scenario)
-        all_projections[scenario] = engine.project_timeseries()
+        if not vectorized:
+            engine = ProjectionEngine(scenario)
+            all_projections[scenario] = engine.project_timeseries()
 
         # Print summary
         data_2050 = all_projections[scenario][-1]
@@ -541,6 +680,7 @@ def generate_all_projections():
 
 def save_projections(projections, output_path=None):
     """Save projections to JSON file"""
+    from learning_by_deployment import learning_summary
     if output_path is None:
         output_path = Path(__file__).parent.parent / 'global-energy-services' / 'public' / 'data' / 'energy_projections_v4.json'
 
@@ -552,16 +692,18 @@ def save_projections(projections, output_path=None):
             'version': '4.0.0',
             'generated': datetime.now().isoformat(),
             'model': 'Projection Engine v4.0',
-            'scenarios': SCENARIOS,
+            'scenarios': list(projections),
             'features': [
                 'Wright\'s Law learning curves',
+                'Endogenous learning by deployment (projected deployment drives costs, costs drive adoption)',
                 'Manufacturing capacity constraints',
                 'Policy acceleration factors',
                 'Time-varying efficiency',
                 'S-curve technology adoption'
             ]
         },
-        'projections': projections
+        'projections': projections,
+        'learning_by_deployment': {scenario: learning_summary(scenario) for scenario in projections}
     }
 
     with open(output_path, 'w') as f:
@@ -581,21 +723,21 @@ if __name__ == '__main__':
 
     # Check configuration loading
     configs = [
-        ('Learning Curves', LEARNING_CURVES),
-        ('Manufacturing Capacity', MANUFACTURING_CAPACITY),
-        ('Policy Scenarios', POLICY_SCENARIOS),
-        ('Technology Breakthroughs', TECHNOLOGY_BREAKTHROUGHS),
-        ('Digitalization Gains', DIGITALIZATION_GAINS)
+        ('Learning Curves', 'learning_curves.json'),
+        ('Manufacturing Capacity', 'manufacturing_capacity.json'),
+        ('Policy Scenarios', 'policy_scenarios.json'),
+        ('Technology Breakthroughs', 'technology_breakthroughs.json'),
+        ('Digitalization Gains', 'digitalization_gains.json')
     ]
 
     print("\nConfiguration Status:")
-    for name, config in configs:
-        status = "Loaded" if config else "Not Found"
+    for name, filename in configs:
+        status = "Found" if REGISTRY.exists(filename) else "Not Found"
         print(f"  {name}: {status}")
 
-    # Generate projections
+    # Generate projections (--vectorized uses the NumPy backend)
     print("\n" + "-" * 80)
-    projections = generate_all_projections()
+    projections = generate_all_projections(vectorized='--vectorized' in sys.argv)
 
     # Save output
     output_path = save_projections(projections)
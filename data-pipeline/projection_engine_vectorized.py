@@ -0,0 +1,325 @@
+#!/usr/bin/env python3
+"""
+Vectorized Projection Engine - NumPy backend for Projection Engine v4.0
+
+Evaluates every scenario × technology × year cell of the v4.0 model as
+NumPy arrays in a single pass instead of calling
+ProjectionEngine.project_technology() once per (technology, year).
+
+The engine is split in two stages:
+- build_scenario_parameters(): resolves the config lookups (policy
+  multipliers, manufacturing caps, efficiency tables, S-curve settings)
+  into dense arrays with a leading batch axis (one row per scenario)
+- project_batch(): pure array math over [batch × technology × year]
+
+Any batch of parameter sets can be fed to project_batch(), so the same
+kernel serves the deterministic scenarios and perturbed parameter runs.
+
+Results are converted back to the project_timeseries() record format
+with to_projection_records(), so output files are unchanged.
+"""
+
+import numpy as np
+
+from projection_engine_v4 import (
+    SCENARIOS,
+    BASE_YEAR,
+    TARGET_YEAR,
+    BASELINE_2024,
+    CLEAN_TECHNOLOGIES,
+    BASE_STEEPNESS,
+    GW_TO_EJ_FACTORS,
+    COST_PROJECTIONS,
+    BASE_EFFICIENCIES,
+    MAX_EFFICIENCY,
+    get_policy_multiplier,
+    get_max_annual_deployment,
+    get_learning_rate_params,
+    get_compiled_parameters,
+    scenario_definition,
+)
+
+# ============================================================================
+# PARAMETER ARRAYS
+# ============================================================================
+
+def build_scenario_parameters(scenarios=None, start_year=BASE_YEAR, end_year=TARGET_YEAR,
+                              technologies=None):
+    """
+    Resolve scenario configuration into dense parameter arrays
+
+    Args:
+        scenarios: Built-in or user-defined scenario names (default: SCENARIOS)
+        start_year: First projected year
+        end_year: Last projected year (inclusive)
+        technologies: Technologies to project (default: CLEAN_TECHNOLOGIES)
+
+    Returns:
+        Dict of arrays with a leading batch axis B (one row per scenario):
+            saturation [B, T], steepness [B, T], baseline [B, T],
+            policy_multiplier [B, T, Y], max_annual_ej [B, T, Y],
+            efficiency_base [B, T], efficiency_rate [B, T],
+            efficiency_max [B, T], demand_growth [B], total_2024 [B]
+        plus the 'scenarios', 'technologies' and 'years' labels.
+    """
+    scenarios = list(scenarios or SCENARIOS)
+    technologies = list(technologies or CLEAN_TECHNOLOGIES)
+    years = np.arange(start_year, end_year + 1)
+
+    n_scen, n_tech, n_year = len(scenarios), len(technologies), len(years)
+
+    saturation = np.empty((n_scen, n_tech))
+    steepness = np.empty((n_scen, n_tech))
+    efficiency_rate = np.empty((n_scen, n_tech))
+    policy_multiplier = np.empty((n_scen, n_tech, n_year))
+    max_annual_ej = np.empty((n_scen, n_tech, n_year))
+
+    definitions = [scenario_definition(scenario) for scenario in scenarios]
+    for s, definition in enumerate(definitions):
+        for t, tech in enumerate(technologies):
+            saturation[s, t] = definition['saturation_limits'].get(tech, 100)
+            steepness[s, t] = BASE_STEEPNESS.get(tech, 0.2) * definition['steepness_multiplier']
+            efficiency_rate[s, t] = definition['efficiency_improvements'].get(tech, 0)
+
+    # Config lookups: slice the compiled tables, falling back to per-cell lookups
+    compiled = get_compiled_parameters()
+    policy_table = compiled.table('policy_multiplier', technologies, scenarios, years)
+    capacity_table = compiled.table('max_annual_deployment', technologies, scenarios, years)
+
+    if policy_table is not None and capacity_table is not None:
+        policy_multiplier[:] = policy_table
+        gw_to_ej = np.array([GW_TO_EJ_FACTORS.get(tech, 0.01) for tech in technologies])[None, :, None]
+        with np.errstate(invalid='ignore'):
+            max_annual_ej[:] = np.where(np.isinf(capacity_table), np.inf, capacity_table * gw_to_ej)
+    else:
+        for s, scenario in enumerate(scenarios):
+            for t, tech in enumerate(technologies):
+                gw_to_ej = GW_TO_EJ_FACTORS.get(tech, 0.01)
+                for y, year in enumerate(years):
+                    year = int(year)
+                    policy_multiplier[s, t, y] = get_policy_multiplier(tech, year, scenario)
+                    max_annual = get_max_annual_deployment(tech, year, scenario)
+                    max_annual_ej[s, t, y] = max_annual * gw_to_ej if max_annual != float('inf') else np.inf
+
+    baseline = np.array([BASELINE_2024.get(tech, 0) for tech in technologies], dtype=float)
+    efficiency_base = np.array([BASE_EFFICIENCIES.get(tech, 0.5) for tech in technologies])
+    efficiency_max = np.array([MAX_EFFICIENCY.get(tech, 1.0) for tech in technologies])
+
+    return {
+        'scenarios': scenarios,
+        'technologies': technologies,
+        'years': years,
+        'saturation': saturation,
+        'steepness': steepness,
+        'baseline': np.broadcast_to(baseline, (n_scen, n_tech)).copy(),
+        'policy_multiplier': policy_multiplier,
+        'max_annual_ej': max_annual_ej,
+        'efficiency_base': np.broadcast_to(efficiency_base, (n_scen, n_tech)).copy(),
+        'efficiency_rate': efficiency_rate,
+        'efficiency_max': np.broadcast_to(efficiency_max, (n_scen, n_tech)).copy(),
+        'demand_growth': np.array([definition['demand_growth_rate'] for definition in definitions]),
+        'total_2024': np.full(n_scen, BASELINE_2024['total_useful_energy'], dtype=float),
+    }
+
+def build_cost_parameters(scenarios=None, start_year=BASE_YEAR, end_year=TARGET_YEAR):
+    """
+    Resolve ProjectionEngine.get_costs() inputs into dense arrays
+
+    Returns:
+        Dict with 'base_cost', 'learning_rate', 'base_cumulative',
+        'floor_cost' [B, C] and 'cumulative' [B, C, Y] for the cost
+        technologies C in COST_PROJECTIONS (NaN where a technology has
+        no learning-curve parameters). 'cumulative' is the linear reference
+        estimate; learning_by_deployment replaces it with the projected
+        deployment for the GW technologies.
+    """
+    scenarios = list(scenarios or SCENARIOS)
+    technologies = list(COST_PROJECTIONS)
+    years = np.arange(start_year, end_year + 1)
+
+    shape = (len(scenarios), len(technologies))
+    fields = {name: np.full(shape, np.nan) for name in
+              ('base_cost', 'learning_rate', 'base_cumulative', 'floor_cost')}
+    cumulative = np.full(shape + (len(years),), np.nan)
+
+    for s, scenario in enumerate(scenarios):
+        for c, tech in enumerate(technologies):
+            params = get_learning_rate_params(tech, scenario)
+            if not params:
+                continue
+            spec = COST_PROJECTIONS[tech]
+            base_cost, learning_rate, base_cumulative, floor_cost = spec['defaults']
+            fields['base_cost'][s, c] = params.get(f"base_cost_{spec['cost_unit']}", base_cost)
+            fields['learning_rate'][s, c] = params.get('learning_rate', learning_rate)
+            fields['base_cumulative'][s, c] = params.get(f"base_cumulative_{spec['capacity_unit']}", base_cumulative)
+            fields['floor_cost'][s, c] = params.get(f"floor_cost_{spec['cost_unit']}", floor_cost)
+            cumulative[s, c] = spec['cumulative_2024'] + (years - 2024) * spec['annual_addition']
+
+    return {
+        'scenarios': scenarios,
+        'cost_technologies': technologies,
+        'years': years,
+        'cumulative': cumulative,
+        **fields,
+    }
+
+# ============================================================================
+# ARRAY KERNELS
+# ============================================================================
+
+def s_curve_midpoints(current_value, current_year, saturation, steepness):
+    """Vectorized calculate_s_curve_midpoint() over matching arrays"""
+    current_value = np.asarray(current_value, dtype=float)
+    saturation = np.asarray(saturation, dtype=float)
+    steepness = np.asarray(steepness, dtype=float)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        ratio = (saturation - current_value) / current_value
+        midpoint = current_year + np.log(ratio) / steepness
+
+    midpoint = np.where(ratio <= 0, current_year, midpoint)
+    midpoint = np.where(current_value <= 0, current_year + 20, midpoint)
+    midpoint = np.where(current_value >= saturation * 0.99, current_year - 20, midpoint)
+    return midpoint
+
+def project_batch(params):
+    """
+    Project every batch × technology × year cell in one pass
+
+    Mirrors ProjectionEngine.project_all() operation for operation, so the
+    results match the scalar path to floating-point rounding.
+
+    Args:
+        params: Parameter dict as returned by build_scenario_parameters()
+
+    Returns:
+        Dict of arrays:
+            technology_ej [B, T, Y], annual_addition_ej [B, T, Y]
+            (constrained S-curve growth before efficiency), total_demand_ej [B, Y],
+            clean_total_ej [B, Y], fossil_ej [B, Y],
+            clean_share [B, Y], fossil_share [B, Y]
+    """
+    years = np.asarray(params['years'])
+    saturation = params['saturation'][..., None]
+    steepness = params['steepness'][..., None]
+    midpoint = s_curve_midpoints(params['baseline'], BASE_YEAR,
+                                 params['saturation'], params['steepness'])[..., None]
+
+    # S-curve value this year and last year
+    base_projection = saturation / (1 + np.exp(-steepness * (years - midpoint)))
+    prev_projection = saturation / (1 + np.exp(-steepness * ((years - 1) - midpoint)))
+    annual_growth = base_projection - prev_projection
+
+    # Policy acceleration capped by manufacturing capacity
+    constrained_growth = np.minimum(annual_growth * params['policy_multiplier'], params['max_annual_ej'])
+    final_value = prev_projection + constrained_growth
+
+    # Efficiency relative to the base year
+    eff_base = params['efficiency_base'][..., None]
+    eff_rate = params['efficiency_rate'][..., None]
+    eff_max = params['efficiency_max'][..., None]
+    efficiency = np.minimum(eff_base + eff_rate * (years - BASE_YEAR), eff_max)
+    efficiency_base_year = np.minimum(eff_base + eff_rate * 0, eff_max)
+
+    technology_ej = final_value * efficiency / efficiency_base_year
+
+    # Total demand
+    total_demand = params['total_2024'][:, None] * (1 + params['demand_growth'][:, None]) ** (years - BASE_YEAR)
+
+    # Sum technologies in the same order as the scalar engine
+    raw_clean_total = np.zeros_like(total_demand)
+    for t in range(technology_ej.shape[1]):
+        raw_clean_total = raw_clean_total + technology_ej[:, t, :]
+
+    # Cap clean energy at total demand plus 5% flexibility buffer
+    max_clean = total_demand * 1.05
+    over_cap = raw_clean_total > max_clean
+    with np.errstate(divide='ignore', invalid='ignore'):
+        scale_factor = max_clean / raw_clean_total
+    technology_ej = np.where(over_cap[:, None, :], technology_ej * scale_factor[:, None, :], technology_ej)
+    clean_total = np.where(over_cap, max_clean, raw_clean_total)
+
+    fossil = np.maximum(0, total_demand - clean_total)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        clean_share = np.where(total_demand > 0, np.minimum(1.0, clean_total / total_demand), 0)
+    fossil_share = np.maximum(0, 1 - clean_share)
+
+    return {
+        'technology_ej': technology_ej,
+        'annual_addition_ej': constrained_growth,
+        'total_demand_ej': total_demand,
+        'clean_total_ej': clean_total,
+        'fossil_ej': fossil,
+        'clean_share': clean_share,
+        'fossil_share': fossil_share,
+    }
+
+def learning_curve_costs(base_cost, learning_rate, base_cumulative, current_cumulative, floor_cost):
+    """Vectorized calculate_learning_curve_cost() (Wright's Law with floor)"""
+    with np.errstate(divide='ignore', invalid='ignore'):
+        b = np.log2(1 - learning_rate)
+        new_cost = np.maximum(base_cost * (current_cumulative / base_cumulative) ** b, floor_cost)
+    return np.where(current_cumulative <= base_cumulative, base_cost, new_cost)
+
+def project_costs_batch(cost_params):
+    """
+    Learning-curve costs for every batch × cost technology × year cell
+
+    Returns:
+        Array [B, C, Y] matching ProjectionEngine.get_costs()
+    """
+    return learning_curve_costs(
+        cost_params['base_cost'][..., None],
+        cost_params['learning_rate'][..., None],
+        cost_params['base_cumulative'][..., None],
+        cost_params['cumulative'],
+        cost_params['floor_cost'][..., None],
+    )
+
+# ============================================================================
+# OUTPUT CONVERSION
+# ============================================================================
+
+def _clamp_zero(value):
+    """Reproduce max(0, x) from the scalar engine (returns int 0 when clamped)"""
+    value = float(value)
+    return 0 if value <= 0 else value
+
+def to_projection_records(params, results):
+    """
+    Convert batch results to project_timeseries() records keyed by scenario
+
+    Returns:
+        {scenario: [record, ...]} with the same keys, key order and value
+        types as ProjectionEngine.project_timeseries()
+    """
+    projections = {}
+    technologies = params['technologies']
+
+    for s, scenario in enumerate(params['scenarios']):
+        timeseries = []
+        for y, year in enumerate(params['years']):
+            data = {'total_demand_ej': float(results['total_demand_ej'][s, y])}
+            for t, tech in enumerate(technologies):
+                data[f'{tech}_ej'] = float(results['technology_ej'][s, t, y])
+            data['clean_total_ej'] = float(results['clean_total_ej'][s, y])
+            data['fossil_ej'] = _clamp_zero(results['total_demand_ej'][s, y] - results['clean_total_ej'][s, y])
+            data['clean_share'] = float(results['clean_share'][s, y])
+            data['fossil_share'] = _clamp_zero(1 - results['clean_share'][s, y])
+            data['year'] = int(year)
+            data['scenario'] = scenario
+            timeseries.append(data)
+        projections[scenario] = timeseries
+
+    return projections
+
+def project_scenarios_vectorized(scenarios=None, start_year=BASE_YEAR, end_year=TARGET_YEAR):
+    """
+    Vectorized equivalent of running ProjectionEngine(s).project_timeseries() per scenario
+
+    Solves the learning-by-deployment fixed point for all scenarios in one
+    batch (see learning_by_deployment), as ProjectionEngine does per scenario.
+    """
+    from learning_by_deployment import solve_scenarios
+    solution = solve_scenarios(list(scenarios or SCENARIOS), start_year, end_year)
+    return to_projection_records(solution['params'], solution['results'])
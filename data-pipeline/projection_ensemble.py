@@ -0,0 +1,349 @@
+#!/usr/bin/env python3
+"""
+Projection Ensemble - Monte Carlo uncertainty bands for Projection Engine v4.0
+
+Samples the uncertain engine parameters and evaluates the draws with the
+vectorized engine (projection_engine_vectorized) in batches spread over a
+process pool:
+- S-curve saturation limits (log-uniform between the Conservative and
+  Optimistic values of SATURATION_LIMITS)
+- S-curve steepness multiplier (uniform across STEEPNESS_MULTIPLIERS range)
+- Learning rates from learning_curves.json (uniform ±10% around the config)
+
+All other inputs (policy multipliers, manufacturing caps, efficiency,
+demand growth) stay at the reference scenario. Every draw is solved for
+its learning-by-deployment fixed point (learning_by_deployment), so the
+sampled learning rates feed back into adoption and the cost bands follow
+each draw's own deployment.
+
+Percentiles are aggregated in a streaming way: each batch is binned into
+fixed per-cell histograms which are summed across batches and workers,
+so memory stays constant regardless of the number of draws. Every batch
+has its own RNG stream spawned from one SeedSequence, making results
+reproducible independent of the number of workers.
+
+Output: energy_projections_v4_ensemble.json next to energy_projections_v4.json
+"""
+
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+
+from projection_engine_v4 import (
+    SCENARIOS,
+    BASE_YEAR,
+    TARGET_YEAR,
+    SATURATION_LIMITS,
+    BASE_STEEPNESS,
+    STEEPNESS_MULTIPLIERS,
+)
+from projection_engine_vectorized import (
+    build_scenario_parameters,
+    build_cost_parameters,
+)
+from learning_by_deployment import solve_learning_by_deployment
+
+# ============================================================================
+# ENSEMBLE CONFIGURATION
+# ============================================================================
+
+DEFAULT_DRAWS = 10_000
+DEFAULT_BATCH_SIZE = 5_000
+DEFAULT_SEED = 20241205
+PERCENTILES = [5, 50, 95]
+
+# Histogram resolution per output cell
+HISTOGRAM_BINS = 4096
+PILOT_DRAWS = 2_000
+
+# Relative spread of sampled learning rates around the configured value
+LEARNING_RATE_SPREAD = 0.10
+
+# ============================================================================
+# PARAMETER SAMPLING
+# ============================================================================
+
+def sample_parameters(base_params, base_cost_params, n_draws, rng):
+    """
+    Draw n_draws parameter sets around the reference scenario
+
+    Args:
+        base_params: build_scenario_parameters() output for one scenario
+        base_cost_params: build_cost_parameters() output for the same scenario
+        n_draws: Number of ensemble members
+        rng: numpy Generator for this batch
+
+    Returns:
+        (params, cost_params) with a leading batch axis of n_draws
+    """
+    technologies = base_params['technologies']
+
+    params = {key: (np.repeat(value, n_draws, axis=0) if isinstance(value, np.ndarray) and key != 'years' else value)
+              for key, value in base_params.items()}
+    cost_params = {key: (np.repeat(value, n_draws, axis=0) if isinstance(value, np.ndarray) and key != 'years' else value)
+                   for key, value in base_cost_params.items()}
+
+    # Saturation: log-uniform across the scenario range
+    sat_low = np.array([min(SATURATION_LIMITS[s].get(t, 100) for s in SCENARIOS) for t in technologies])
+    sat_high = np.array([max(SATURATION_LIMITS[s].get(t, 100) for s in SCENARIOS) for t in technologies])
+    params['saturation'] = np.exp(rng.uniform(np.log(sat_low), np.log(sat_high), size=(n_draws, len(technologies))))
+
+    # Steepness: one scenario-style multiplier per draw
+    mult_low = min(STEEPNESS_MULTIPLIERS.values())
+    mult_high = max(STEEPNESS_MULTIPLIERS.values())
+    multiplier = rng.uniform(mult_low, mult_high, size=(n_draws, 1))
+    params['steepness'] = np.array([BASE_STEEPNESS.get(t, 0.2) for t in technologies]) * multiplier
+
+    # Learning rates: uniform spread around the configured value
+    spread = rng.uniform(1 - LEARNING_RATE_SPREAD, 1 + LEARNING_RATE_SPREAD,
+                         size=cost_params['learning_rate'].shape)
+    cost_params['learning_rate'] = cost_params['learning_rate'] * spread
+
+    return params, cost_params
+
+def ensemble_outputs(params, cost_params):
+    """Evaluate a batch and return {metric: array [N, cells...]} of outputs"""
+    solution = solve_learning_by_deployment(params, cost_params)
+    results = solution['results']
+    outputs = {
+        'total_demand_ej': results['total_demand_ej'],
+        'clean_total_ej': results['clean_total_ej'],
+        'fossil_ej': results['fossil_ej'],
+        'clean_share': results['clean_share'],
+    }
+    for t, tech in enumerate(params['technologies']):
+        outputs[f'{tech}_ej'] = results['technology_ej'][:, t, :]
+
+    costs = solution['costs']
+    for c, tech in enumerate(cost_params['cost_technologies']):
+        outputs[f'{tech}_cost'] = costs[:, c, :]
+
+    return outputs
+
+# ============================================================================
+# STREAMING PERCENTILES
+# ============================================================================
+
+class StreamingHistogram:
+    """
+    Mergeable fixed-bin histograms for one metric over its year cells
+
+    Values outside the pilot range are clipped into the edge bins and
+    counted, so the percentile error is bounded by the bin width.
+    """
+
+    def __init__(self, low, high, bins=HISTOGRAM_BINS):
+        self.low = np.asarray(low, dtype=float)
+        self.high = np.asarray(high, dtype=float)
+        self.bins = bins
+        self.width = np.where(self.high > self.low, (self.high - self.low) / bins, 1.0)
+        self.counts = np.zeros(self.low.shape + (bins,), dtype=np.int64)
+        self.total = np.zeros(self.low.shape)
+        self.minimum = np.full(self.low.shape, np.inf)
+        self.maximum = np.full(self.low.shape, -np.inf)
+        self.clipped = 0
+        self.n = 0
+
+    def add(self, values):
+        """Bin a batch of values shaped [N, cells...]"""
+        values = np.asarray(values, dtype=float)
+        index = np.floor((values - self.low) / self.width)
+        self.clipped += int(np.count_nonzero((index < 0) | (index >= self.bins)))
+        index = np.clip(index, 0, self.bins - 1).astype(np.int64)
+
+        n_cells = self.low.size
+        flat = (np.arange(n_cells) * self.bins + index.reshape(len(values), n_cells)).ravel()
+        self.counts += np.bincount(flat, minlength=n_cells * self.bins).reshape(self.counts.shape)
+
+        self.total += values.sum(axis=0)
+        self.minimum = np.minimum(self.minimum, values.min(axis=0))
+        self.maximum = np.maximum(self.maximum, values.max(axis=0))
+        self.n += len(values)
+
+    def merge(self, other):
+        """Fold another histogram with the same bin edges into this one"""
+        self.counts += other.counts
+        self.total += other.total
+        self.minimum = np.minimum(self.minimum, other.minimum)
+        self.maximum = np.maximum(self.maximum, other.maximum)
+        self.clipped += other.clipped
+        self.n += other.n
+
+    def percentile(self, q):
+        """Percentile q (0-100) per cell, interpolated within the bin"""
+        cumulative = np.cumsum(self.counts, axis=-1)
+        target = q / 100 * self.n
+        index = np.minimum((cumulative < target).sum(axis=-1), self.bins - 1)
+        below = np.where(index > 0, np.take_along_axis(cumulative, np.maximum(index - 1, 0)[..., None], axis=-1)[..., 0], 0)
+        in_bin = np.take_along_axis(self.counts, index[..., None], axis=-1)[..., 0]
+        fraction = np.where(in_bin > 0, (target - below) / np.maximum(in_bin, 1), 0.5)
+        value = self.low + (index + fraction) * self.width
+        return np.clip(value, self.minimum, self.maximum)
+
+    def mean(self):
+        return self.total / max(self.n, 1)
+
+# ============================================================================
+# PARALLEL EXECUTION
+# ============================================================================
+
+_WORKER_STATE = {}
+
+def _init_worker(base_params, base_cost_params, bounds):
+    """Share read-only inputs with each worker once"""
+    _WORKER_STATE['base_params'] = base_params
+    _WORKER_STATE['base_cost_params'] = base_cost_params
+    _WORKER_STATE['bounds'] = bounds
+
+def _run_batches(batch_jobs):
+    """Evaluate a list of (seed_sequence, n_draws) batches into merged histograms"""
+    base_params = _WORKER_STATE['base_params']
+    base_cost_params = _WORKER_STATE['base_cost_params']
+    histograms = {metric: StreamingHistogram(low, high)
+                  for metric, (low, high) in _WORKER_STATE['bounds'].items()}
+
+    for seed_sequence, n_draws in batch_jobs:
+        rng = np.random.default_rng(seed_sequence)
+        params, cost_params = sample_parameters(base_params, base_cost_params, n_draws, rng)
+        for metric, values in ensemble_outputs(params, cost_params).items():
+            histograms[metric].add(values)
+
+    return histograms
+
+def _pilot_bounds(base_params, base_cost_params, seed_sequence):
+    """Histogram ranges per metric/cell from a pilot sample, padded by 10%"""
+    rng = np.random.default_rng(seed_sequence)
+    params, cost_params = sample_parameters(base_params, base_cost_params, PILOT_DRAWS, rng)
+    bounds = {}
+    for metric, values in ensemble_outputs(params, cost_params).items():
+        low, high = values.min(axis=0), values.max(axis=0)
+        pad = (high - low) * 0.10
+        bounds[metric] = (low - pad, high + pad)
+    return bounds
+
+def run_ensemble(n_draws=DEFAULT_DRAWS, reference_scenario='Baseline', seed=DEFAULT_SEED,
+                 batch_size=DEFAULT_BATCH_SIZE, workers=None,
+                 start_year=BASE_YEAR, end_year=TARGET_YEAR):
+    """
+    Run the Monte Carlo ensemble and return percentile bands
+
+    Args:
+        n_draws: Number of ensemble members (10k-1M)
+        reference_scenario: Scenario supplying the non-sampled inputs
+        seed: Root seed; per-batch streams are spawned from it
+        batch_size: Draws evaluated per vectorized batch
+        workers: Process pool size (None = os.cpu_count(), 1 = in-process)
+
+    Returns:
+        Dict with 'years', 'draws' and {metric: {'p5': [...], ...}} bands
+    """
+    base_params = build_scenario_parameters([reference_scenario], start_year, end_year)
+    base_cost_params = build_cost_parameters([reference_scenario], start_year, end_year)
+
+    root = np.random.SeedSequence(seed)
+    pilot_seed, batches_seed = root.spawn(2)
+    bounds = _pilot_bounds(base_params, base_cost_params, pilot_seed)
+
+    batch_sizes = [batch_size] * (n_draws // batch_size)
+    if n_draws % batch_size:
+        batch_sizes.append(n_draws % batch_size)
+    jobs = list(zip(batches_seed.spawn(len(batch_sizes)), batch_sizes))
+
+    workers = workers or os.cpu_count() or 1
+    workers = min(workers, len(jobs))
+
+    if workers <= 1:
+        _init_worker(base_params, base_cost_params, bounds)
+        partials = [_run_batches(jobs)]
+    else:
+        chunks = [jobs[i::workers] for i in range(workers)]
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(base_params, base_cost_params, bounds)) as pool:
+            partials = list(pool.map(_run_batches, chunks))
+
+    histograms = partials[0]
+    for partial in partials[1:]:
+        for metric, histogram in partial.items():
+            histograms[metric].merge(histogram)
+
+    bands = {}
+    for metric, histogram in histograms.items():
+        band = {f'p{q}': [round(float(v), 4) for v in histogram.percentile(q)] for q in PERCENTILES}
+        band['mean'] = [round(float(v), 4) for v in histogram.mean()]
+        band['clipped_fraction'] = round(histogram.clipped / max(histogram.n * histogram.low.size, 1), 6)
+        bands[metric] = band
+
+    return {
+        'reference_scenario': reference_scenario,
+        'draws': n_draws,
+        'seed': seed,
+        'years': [int(y) for y in base_params['years']],
+        'bands': bands,
+    }
+
+def save_ensemble(ensemble, output_path=None):
+    """Save ensemble bands next to energy_projections_v4.json"""
+    if output_path is None:
+        output_path = Path(__file__).parent.parent / 'global-energy-services' / 'public' / 'data' / 'energy_projections_v4_ensemble.json'
+
+    output_path = Path(output_path)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+
+    output_data = {
+        'metadata': {
+            'version': '4.0.0',
+            'generated': datetime.now().isoformat(),
+            'model': 'Projection Engine v4.0 - Monte Carlo ensemble',
+            'percentiles': PERCENTILES,
+            'sampled_parameters': [
+                'S-curve saturation limits (log-uniform, Conservative-Optimistic range)',
+                'S-curve steepness multiplier (uniform, Conservative-Optimistic range)',
+                f'Learning rates (uniform ±{LEARNING_RATE_SPREAD:.0%} around config)'
+            ],
+            'units': {
+                '*_ej': 'EJ useful energy',
+                'clean_share': 'fraction of total demand',
+                'solar_cost': 'USD/MWh',
+                'wind_cost': 'USD/MWh',
+                'batteries_cost': 'USD/kWh'
+            }
+        },
+        'ensemble': ensemble
+    }
+
+    with open(output_path, 'w') as f:
+        json.dump(output_data, f, indent=2)
+
+    print(f"\nEnsemble saved to: {output_path}")
+    return output_path
+
+# ============================================================================
+# MAIN EXECUTION
+# ============================================================================
+
+if __name__ == '__main__':
+    n_draws = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_DRAWS
+
+    print("=" * 80)
+    print("PROJECTION ENSEMBLE - Projection Engine v4.0")
+    print("=" * 80)
+    print(f"\nDraws: {n_draws:,}  |  Batch size: {DEFAULT_BATCH_SIZE:,}  |  Seed: {DEFAULT_SEED}")
+
+    start = time.perf_counter()
+    ensemble = run_ensemble(n_draws)
+    elapsed = time.perf_counter() - start
+    print(f"Completed in {elapsed:.2f} s ({n_draws / elapsed:,.0f} draws/s)")
+
+    save_ensemble(ensemble)
+
+    print("\n" + "=" * 80)
+    print("UNCERTAINTY BANDS (2050, P5 / P50 / P95)")
+    print("=" * 80)
+    for metric, band in ensemble['bands'].items():
+        print(f"  {metric:<18} {band['p5'][-1]:>10.2f} {band['p50'][-1]:>10.2f} {band['p95'][-1]:>10.2f}")
@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""
+Projection Sensitivity - one-at-a-time (tornado) analysis for Projection Engine v4.0
+
+Perturbs each engine parameter of one scenario down and up by a relative
+delta while holding every other parameter at the scenario value:
+- S-curve saturation limit (per technology)
+- S-curve steepness (per technology)
+- Policy multipliers (per technology, whole trajectory)
+- Manufacturing caps (per technology, whole trajectory)
+- Efficiency improvement rate (per technology)
+- Total demand growth rate
+
+The unperturbed run and all 2 × n_parameters perturbed runs are stacked
+along the batch axis and evaluated with a single learning-by-deployment
+solve (learning_by_deployment) over project_batch() from
+projection_engine_vectorized, instead of one project_timeseries() run per
+perturbation. Steepness perturbations apply to the pre-feedback steepness.
+
+Sensitivities are reported for clean_share and fossil_ej in 2030, 2040
+and 2050, with parameters ranked by swing (|high - low|).
+
+Note: technologies without a manufacturing cap in manufacturing_capacity.json
+have an infinite cap, so perturbing it has no effect (swing 0).
+"""
+
+import sys
+import time
+
+import numpy as np
+
+from projection_engine_v4 import BASE_YEAR, TARGET_YEAR
+from projection_engine_vectorized import build_scenario_parameters, build_cost_parameters
+from learning_by_deployment import solve_learning_by_deployment
+
+# ============================================================================
+# SENSITIVITY CONFIGURATION
+# ============================================================================
+
+DEFAULT_DELTA = 0.10
+REPORT_YEARS = [2030, 2040, 2050]
+REPORT_METRICS = ['clean_share', 'fossil_ej']
+
+# Perturbed parameter arrays: (label, key in build_scenario_parameters())
+PER_TECHNOLOGY_PARAMETERS = [
+    ('saturation', 'saturation'),
+    ('steepness', 'steepness'),
+    ('policy_multiplier', 'policy_multiplier'),
+    ('manufacturing_cap', 'max_annual_ej'),
+    ('efficiency_rate', 'efficiency_rate'),
+]
+
+# ============================================================================
+# PERTURBATION BATCH
+# ============================================================================
+
+def build_perturbation_batch(base_params, delta=DEFAULT_DELTA):
+    """
+    Stack the base run and every down/up perturbation along the batch axis
+
+    Args:
+        base_params: build_scenario_parameters() output for one scenario
+        delta: Relative perturbation (0.10 = ±10%)
+
+    Returns:
+        (params, parameter_names): batch row 0 is the base run, rows
+        1 + 2i and 2 + 2i are parameter i scaled by (1 - delta) and (1 + delta)
+    """
+    technologies = base_params['technologies']
+
+    parameters = [(f'{label}.{tech}', key, t)
+                  for label, key in PER_TECHNOLOGY_PARAMETERS
+                  for t, tech in enumerate(technologies)]
+    parameters.append(('demand_growth', 'demand_growth', None))
+
+    n_runs = 1 + 2 * len(parameters)
+    params = {key: (np.repeat(value, n_runs, axis=0) if isinstance(value, np.ndarray) and key != 'years' else value)
+              for key, value in base_params.items()}
+
+    for i, (_, key, t) in enumerate(parameters):
+        for row, factor in ((1 + 2 * i, 1 - delta), (2 + 2 * i, 1 + delta)):
+            if t is None:
+                params[key][row] *= factor
+            else:
+                params[key][row, t] *= factor
+
+    return params, [name for name, _, _ in parameters]
+
+# ============================================================================
+# TORNADO ANALYSIS
+# ============================================================================
+
+def run_sensitivity(scenario='Baseline', delta=DEFAULT_DELTA, report_years=None, metrics=None,
+                    start_year=BASE_YEAR, end_year=TARGET_YEAR):
+    """
+    One-at-a-time sensitivity of the projection outputs to every parameter
+
+    Args:
+        scenario: Scenario supplying the base parameter values
+        delta: Relative perturbation applied down and up (0.10 = ±10%)
+        report_years: Years to report (default REPORT_YEARS)
+        metrics: project_batch() outputs to report (default REPORT_METRICS)
+
+    Returns:
+        Dict with 'base' {metric: {year: value}} and 'tornado'
+        {metric: {year: [{'parameter', 'low', 'high', 'swing'}, ...]}},
+        each list sorted by descending swing
+    """
+    report_years = list(report_years or REPORT_YEARS)
+    metrics = list(metrics or REPORT_METRICS)
+
+    base_params = build_scenario_parameters([scenario], start_year, end_year)
+    params, parameter_names = build_perturbation_batch(base_params, delta)
+
+    n_runs = len(params['demand_growth'])
+    cost_params = {key: (np.repeat(value, n_runs, axis=0) if isinstance(value, np.ndarray) and key != 'years' else value)
+                   for key, value in build_cost_parameters([scenario], start_year, end_year).items()}
+    results = solve_learning_by_deployment(params, cost_params)['results']
+
+    year_index = {int(year): y for y, year in enumerate(params['years'])}
+    missing = [year for year in report_years if year not in year_index]
+    if missing:
+        raise ValueError(f"Report years {missing} outside projection range {start_year}-{end_year}")
+
+    base = {}
+    tornado = {}
+    for metric in metrics:
+        base[metric] = {}
+        tornado[metric] = {}
+        for year in report_years:
+            values = results[metric][:, year_index[year]]
+            low, high = values[1::2], values[2::2]
+            swing = np.abs(high - low)
+
+            base[metric][year] = float(values[0])
+            tornado[metric][year] = [
+                {
+                    'parameter': parameter_names[i],
+                    'low': float(low[i]),
+                    'high': float(high[i]),
+                    'swing': float(swing[i]),
+                }
+                for i in np.argsort(-swing, kind='stable')
+            ]
+
+    return {
+        'scenario': scenario,
+        'delta': delta,
+        'runs': n_runs,
+        'parameters': parameter_names,
+        'base': base,
+        'tornado': tornado,
+    }
+
+# ============================================================================
+# MAIN EXECUTION
+# ============================================================================
+
+if __name__ == '__main__':
+    scenario = sys.argv[1] if len(sys.argv) > 1 else 'Baseline'
+    delta = float(sys.argv[2]) if len(sys.argv) > 2 else DEFAULT_DELTA
+
+    print("=" * 80)
+    print("SENSITIVITY ANALYSIS - Projection Engine v4.0")
+    print("=" * 80)
+
+    start = time.perf_counter()
+    sensitivity = run_sensitivity(scenario, delta)
+    elapsed = time.perf_counter() - start
+
+    print(f"\nScenario: {scenario}  |  Delta: ±{delta:.0%}  |  "
+          f"Runs: {sensitivity['runs']}  |  Time: {elapsed * 1000:.1f} ms")
+
+    for metric, by_year in sensitivity['tornado'].items():
+        for year, ranking in by_year.items():
+            print(f"\n{metric} {year} (base {sensitivity['base'][metric][year]:.4f})")
+            for entry in ranking[:8]:
+                print(f"  {entry['parameter']:<28} {entry['low']:>10.4f} {entry['high']:>10.4f}  swing {entry['swing']:.4f}")
@@ -0,0 +1,382 @@
+#!/usr/bin/env python3
+"""
+Hierarchical Reconciliation - country, continent and World totals that add up
+
+The stages disagree across the region hierarchy: calculate_useful_energy_v2
+reports OWID's 'World' row, calculate_regional_useful_energy reports OWID's
+continent aggregates, and calculate_net_imports sums its country lists.
+OWID aggregates and the sums of their countries differ (missing countries,
+territories, revisions), so a continent is not the sum of its countries and
+the continents are not the World.
+
+This stage balances the hierarchy World → continents → countries
+(continents and country lists of calculate_net_imports.py) for every year,
+source and tier (primary, useful, services) with RAS / iterative
+proportional fitting, top-down one level at a time:
+- column margins: the parent's per-source values (the World is the anchor)
+- row margins:    each child's own total, scaled down when the children
+                  together exceed their parent
+Where a parent exceeds the sum of its children (e.g. an OWID continent
+that includes territories the country lists leave out) the countries are
+not inflated to cover it: the excess goes to an explicit remainder row
+per parent, so children and remainder add up to the parent.
+
+Each level is balanced for all parents, years, sources and tiers at once
+as one [tier, child, year, source] array; an iteration is two scalings and
+one segmented sum, so its cost is linear in the data size. After every
+iteration the rows sum exactly (to float precision) to their parent per
+source; iterations only refine how a parent's source mix is spread over
+its rows. RAS never fills a zero cell, so zero patterns that make the
+margins unreachable (a parent source larger than its reporting children
+can hold, a child larger than its parent's share of its sources) are
+opened first from the parent's source shares. Blank parent cells (or zero
+cells above children that report the source) are filled bottom-up with
+the sum of their children, so an unreported parent never erases its
+children's data.
+
+The stage reports each level's convergence, filled and opened cells and
+the share of every parent outside its listed members, and exits non-zero
+when a level does not converge within MAX_ITERATIONS.
+
+Values are computed from the OWID cache with the pipeline's own factors
+(efficiency cube, rebound, exergy) and are not rounded before balancing.
+Traditional biomass is only known globally and is left out of the
+hierarchy. Net imports are signed and already add up (calculate_net_imports
+sums countries), so they are not rebalanced.
+
+Usage:
+    python reconcile_hierarchy.py
+"""
+
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+PIPELINE_DIR = Path(__file__).resolve().parent
+SERVICES_PIPELINE_DIR = PIPELINE_DIR.parent / 'global-energy-services' / 'data-pipeline'
+if str(SERVICES_PIPELINE_DIR) not in sys.path:
+    sys.path.insert(0, str(SERVICES_PIPELINE_DIR))
+
+import owid_cache
+from dimensions import entity_dimension
+import calculate_useful_energy_v2 as useful
+import calculate_net_imports as net_imports
+from config_registry import working_directory
+from region_algebra import OWID_CACHE_PATH
+
+if sys.platform == 'win32':
+    sys.stdout.reconfigure(encoding='utf-8')
+
+# ============================================================================
+# CONFIGURATION
+# ============================================================================
+
+ROOT = 'World'
+TIERS = ['primary', 'useful', 'services']
+
+# RAS stops when every row total is within TOLERANCE × parent total
+MAX_ITERATIONS = 500
+TOLERANCE = 1e-9
+
+def region_hierarchy():
+    """{parent: [children]}: World → continents → countries"""
+    hierarchy = {ROOT: list(net_imports.CONTINENTAL_REGIONS)}
+    hierarchy.update({continent: list(countries) for continent, countries in net_imports.CONTINENTAL_REGIONS.items()})
+    return hierarchy
+
+# ============================================================================
+# TIER ARRAYS
+# ============================================================================
+
+def tier_arrays(data, configs, entities, enable_temporal=True, rebound_rate=0.0):
+    """
+    Primary, useful and services energy of the given entities from FIRST_YEAR
+
+    Same factors as compute_entity_arrays() (unrounded, without traditional
+    biomass).
+
+    Returns:
+        (years, values [tier, entity, year, source] in EJ (0 where blank),
+         present [entity, year]: the entity has a row for the year,
+         reported [entity, year, source]: the source's cell is not blank)
+    """
+    # Cache entity code -> position in entities (-1 outside the hierarchy)
+    position = np.full(len(data.entities), -1, dtype=np.int64)
+    position[entity_dimension(data).codes(entities)] = np.arange(len(entities))
+    rows = position[data.row_codes()]
+    row_years = data.column('year').astype(np.int64)
+    keep = (row_years >= useful.FIRST_YEAR) & (rows >= 0)
+    rows, row_years = rows[keep], row_years[keep]
+    row_entity = np.array(entities)[rows]
+
+    twh = np.column_stack([data.column(useful.SOURCE_COLUMNS[source])[keep]
+                           if useful.SOURCE_COLUMNS[source] in data.columns else np.full(len(row_years), np.nan)
+                           for source in useful.SOURCES])
+    row_reported = ~np.isnan(twh)
+    primary = np.nan_to_num(twh, nan=0.0) * useful.TWH_TO_EJ
+    useful_ej = primary * useful.efficiency_matrix(row_entity, row_years, configs, enable_temporal)
+    if rebound_rate > 0:
+        useful_ej = useful_ej * (1 - rebound_rate)
+    services = useful_ej * useful.exergy_factor_array(configs)
+
+    years = np.unique(row_years)
+    columns = np.searchsorted(years, row_years)
+
+    values = np.zeros((len(TIERS), len(entities), len(years), len(useful.SOURCES)))
+    values[:, rows, columns] = np.stack([primary, useful_ej, services])
+    present = np.zeros((len(entities), len(years)), dtype=bool)
+    present[rows, columns] = True
+    reported = np.zeros((len(entities), len(years), len(useful.SOURCES)), dtype=bool)
+    reported[rows, columns] = row_reported
+    return years, values, present, reported
+
+# ============================================================================
+# RAS BALANCING
+# ============================================================================
+
+def _ratio(target, current):
+    """target / current, 0 where current is 0"""
+    return np.divide(target, current, out=np.zeros(np.broadcast(target, current).shape), where=current > 0)
+
+def _open_infeasible(seed, parents, row_targets, group, starts, tolerance=TOLERANCE):
+    """
+    Seed the zero cells that make the margins unreachable
+
+    RAS keeps zero cells at zero, so it cannot converge when a parent's
+    source exceeds the row targets of the children that report it, or a
+    child's target exceeds what its parent holds of the child's sources.
+    Zero cells of such sources (where the parent has the source) and of
+    such children start from the child's target × the parent's share of
+    the source.
+
+    Returns:
+        (seed, opened [batch, child, year, source] cells)
+    """
+    support = seed > 0
+    parent_total = parents.sum(axis=-1, keepdims=True)
+    share = _ratio(parents, parent_total)[:, group] * row_targets[..., None]
+    supply = np.add.reduceat(support * row_targets[..., None], starts, axis=1)
+    short_sources = (parents > supply * (1 + tolerance))[:, group]
+    capacity = (support * parents[:, group]).sum(axis=-1)
+    short_rows = row_targets > capacity * (1 + tolerance)
+    opened = ~support & (share > 0) & (short_sources | short_rows[..., None])
+    return np.where(opened, share, seed), opened
+
+def ras_balance(seed, parents, indptr, max_iterations=MAX_ITERATIONS, tolerance=TOLERANCE):
+    """
+    Scale children so that they and a remainder sum to their parent for every source (RAS)
+
+    Row margins: children that together exceed their parent are scaled
+    down to it; otherwise each child keeps its own total and the
+    parent's excess goes to the parent's remainder (members the hierarchy
+    does not list, e.g. territories, bunkers or OWID-only aggregates),
+    which starts from the parent's per-source excess over its children.
+    Zero patterns that make these margins unreachable are opened first
+    (_open_infeasible).
+
+    Args:
+        seed: Children [batch, child, year, source], grouped by parent
+        parents: Parent targets [batch, parent, year, source]
+        indptr: Child offsets of each parent (CSR, every parent has children)
+
+    Returns:
+        (balanced children, remainder [batch, parent, year, source],
+         iterations, residual: largest row misfit relative to its parent's
+         total, opened: number of infeasible zero cells seeded)
+    """
+    counts = np.diff(indptr)
+    group = np.repeat(np.arange(len(counts)), counts)
+    starts = indptr[:-1]
+
+    # Each parent's remainder is the last row of its group
+    child_rows = np.arange(len(group)) + group
+    remainder_rows = indptr[1:] + np.arange(len(counts))
+    rows_indptr = indptr + np.arange(len(counts) + 1)
+    rows_group = np.repeat(np.arange(len(counts)), counts + 1)
+    rows_starts = rows_indptr[:-1]
+
+    parent_total = parents.sum(axis=-1)
+    child_total = seed.sum(axis=-1)
+    reported_total = np.add.reduceat(child_total, starts, axis=1)
+    child_scale = np.minimum(_ratio(parent_total, reported_total), 1.0)
+    child_scale[reported_total <= 0] = 0.0
+
+    row_targets = np.zeros(seed.shape[:1] + (len(rows_group),) + seed.shape[2:3])
+    row_targets[:, child_rows] = child_total * child_scale[:, group]
+    row_targets[:, remainder_rows] = np.maximum(parent_total - reported_total, 0.0)
+    balanced = np.zeros(seed.shape[:1] + (len(rows_group),) + seed.shape[2:])
+    balanced[:, child_rows] = seed
+    balanced[:, remainder_rows] = np.maximum(parents - np.add.reduceat(seed, starts, axis=1), 0.0)
+    balanced, opened = _open_infeasible(balanced, parents, row_targets, rows_group, rows_starts, tolerance)
+
+    scale = np.maximum(parent_total, np.finfo(float).tiny)[:, rows_group]
+    iterations, residual = 0, 0.0
+    for iterations in range(1, max_iterations + 1):
+        balanced = balanced * _ratio(row_targets, balanced.sum(axis=-1))[..., None]
+        balanced = balanced * _ratio(parents, np.add.reduceat(balanced, rows_starts, axis=1))[:, rows_group]
+        residual = float(np.max(np.abs(balanced.sum(axis=-1) - row_targets) / scale, initial=0.0))
+        if residual < tolerance:
+            break
+    return balanced[:, child_rows], balanced[:, remainder_rows], iterations, residual, int(opened.sum())
+
+def hierarchy_levels(hierarchy, entities, root=ROOT):
+    """
+    Parent → children levels below root, restricted to the given entities
+
+    Returns:
+        List of {parent: [children]}, top-down (parents without children
+        are left out)
+    """
+    levels = []
+    seen = {root}
+    level = [root]
+    while level:
+        groups = {parent: [child for child in hierarchy.get(parent, []) if child in entities] for parent in level}
+        groups = {parent: children for parent, children in groups.items() if children}
+        if not groups:
+            break
+        children = [child for members in groups.values() for child in members]
+        repeated = seen.intersection(children) or {child for child in children if children.count(child) > 1}
+        if repeated:
+            raise ValueError(f"Region hierarchy is not a tree: {', '.join(sorted(repeated))} appear more than once")
+        seen.update(children)
+        levels.append(groups)
+        level = children
+    return levels
+
+def fill_unreported(values, reported, entities, levels):
+    """
+    Parent cells without a usable value take the sum of their children
+
+    A parent cell is unusable when it is blank, or zero while its children
+    report energy: as a column margin it would scale every child's value of
+    that source to 0. Levels are filled bottom-up, so a continent filled
+    from its countries in turn feeds a blank World cell.
+
+    Args:
+        values: [tier, entity, year, source]
+        reported: [entity, year, source] non-blank cells
+        levels: hierarchy_levels() of the entities
+
+    Returns:
+        (filled values, filled [entity, year, source] cells)
+    """
+    index = {entity: i for i, entity in enumerate(entities)}
+    primary = TIERS.index('primary')
+    filled = values.copy()
+    filled_cells = np.zeros(reported.shape, dtype=bool)
+    for groups in reversed(levels):
+        indptr, children = net_imports.membership_matrix(groups, entities)
+        parent_rows = [index[parent] for parent in groups]
+        sums = np.add.reduceat(filled[:, children], indptr[:-1], axis=1)
+        parents = filled[:, parent_rows]
+        missing = (~reported[parent_rows] | (parents[primary] <= 0)) & (sums[primary] > 0)
+        filled[:, parent_rows] = np.where(missing, sums, parents)
+        filled_cells[parent_rows] = missing
+    return filled, filled_cells
+
+def reconcile(values, entities, hierarchy=None, reported=None, root=ROOT, max_iterations=MAX_ITERATIONS,
+              tolerance=TOLERANCE):
+    """
+    Balance values [tier, entity, year, source] down the region hierarchy
+
+    Blank parent cells (reported False, default: none) are filled from
+    their children first (fill_unreported), so they do not erase the
+    children's data.
+
+    Returns:
+        (reconciled values, {parent: remainder [tier, year, source]},
+         per-level statistics)
+    """
+    hierarchy = region_hierarchy() if hierarchy is None else hierarchy
+    index = {entity: i for i, entity in enumerate(entities)}
+    levels = hierarchy_levels(hierarchy, index, root)
+    if reported is None:
+        reported = np.ones(values.shape[1:], dtype=bool)
+    reconciled, filled_cells = fill_unreported(values, reported, entities, levels)
+    primary = TIERS.index('primary')
+    remainders, stats = {}, []
+    for groups in levels:
+        indptr, children = net_imports.membership_matrix(groups, entities)
+        parent_rows = [index[parent] for parent in groups]
+        parents = reconciled[:, parent_rows]
+        child_totals = np.add.reduceat(reconciled[primary, children].sum(axis=-1), indptr[:-1], axis=0)
+        balanced, remainder, iterations, residual, opened = ras_balance(
+            reconciled[:, children], parents, indptr, max_iterations, tolerance)
+        reconciled[:, children] = balanced
+        remainders.update(zip(groups, remainder.swapaxes(0, 1)))
+
+        parent_energy = parents[primary].sum(axis=(1, 2))
+        remainder_percent = 100 * _ratio(remainder[primary].sum(axis=(1, 2)), parent_energy)
+        stats.append({
+            'parents': len(groups),
+            'children': len(children),
+            'iterations': iterations,
+            'residual': residual,
+            'converged': residual < tolerance,
+            'filled_cells': int(filled_cells[parent_rows].sum()),
+            'opened_cells': opened,
+            'unallocated_cells': int(((parents[primary].sum(axis=-1) > 0) & (child_totals <= 0)).sum()),
+            'remainder_percent': {parent: round(percent, 2)
+                                  for parent, percent in zip(groups, remainder_percent.tolist())},
+        })
+    return reconciled, remainders, stats
+
+def reconcile_regions(data, configs, hierarchy=None):
+    """
+    Reconciled hierarchy of an OWID cache
+
+    Returns:
+        (entities, years, reconciled [tier, entity, year, source],
+         {parent: remainder [tier, year, source]}, per-level statistics)
+    """
+    hierarchy = region_hierarchy() if hierarchy is None else hierarchy
+
+    # ROOT first, then each level in hierarchy order
+    entities = [ROOT] + [child for groups in hierarchy_levels(hierarchy, set(data.entities))
+                         for children in groups.values() for child in children]
+    years, values, _, reported = tier_arrays(data, configs, entities, enable_temporal=useful.ENABLE_TEMPORAL,
+                                             rebound_rate=useful.REBOUND_RATE)
+    reconciled, remainders, stats = reconcile(values, entities, hierarchy, reported)
+    return entities, years, reconciled, remainders, stats
+
+# ============================================================================
+# MAIN EXECUTION
+# ============================================================================
+
+def main():
+    print("=" * 80)
+    print("HIERARCHICAL RECONCILIATION: WORLD → CONTINENTS → COUNTRIES")
+    print("=" * 80)
+
+    data = owid_cache.load_owid_cache(str(OWID_CACHE_PATH))
+    if data is None:
+        sys.exit(1)
+    with working_directory():
+        configs = useful.load_configs()
+
+    start = time.perf_counter()
+    entities, years, _, _, levels = reconcile_regions(data, configs)
+    elapsed = time.perf_counter() - start
+
+    for level, stats in enumerate(levels, start=1):
+        print(f"Level {level}: {stats['parents']} parents, {stats['children']} children, "
+              f"{stats['iterations']} iterations, residual {stats['residual']:.2e}, "
+              f"{stats['filled_cells']} filled cells, {stats['opened_cells']} opened cells, "
+              f"{stats['unallocated_cells']} unallocated cells")
+        for parent, percent in stats['remainder_percent'].items():
+            if percent >= 1:
+                print(f"  {parent}: {percent:.1f}% of primary energy outside the listed members")
+    print(f"Reconciled {len(entities)} regions over {len(years)} years in {elapsed * 1000:.0f} ms")
+
+    unconverged = [level for level, stats in enumerate(levels, start=1) if not stats['converged']]
+    if unconverged:
+        print(f"\n⚠ Level {', '.join(map(str, unconverged))} did not converge within {MAX_ITERATIONS} iterations "
+              f"(tolerance {TOLERANCE:.0e})")
+        sys.exit(1)
+    return levels
+
+if __name__ == '__main__':
+    main()
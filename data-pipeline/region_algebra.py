@@ -0,0 +1,427 @@
+#!/usr/bin/env python3
+"""
+Region Algebra - ad-hoc regions as set expressions over countries
+
+Regions are sets of OWID countries combined with set operators:
+
+    EU - Germany                  difference   (also 'minus', 'excluding')
+    Asia excluding China
+    G20 + OPEC                    union        (also 'plus', '|')
+    (Europe + Asia) & G20         intersection (also 'intersect')
+
+Names resolve in order:
+1. user-defined regions in config/regions.json (a member list or an expression)
+2. built-in continents and blocs of calculate_net_imports.py
+3. OWID entity names (countries; matched case-insensitively)
+
+Aggregates of any metric - an OWID column from the typed cache
+(owid_cache.py) or a derived metric (net imports, useful energy, energy
+services) - are summed on request over the members from per-country
+[entity × year] arrays that are built once per metric. Recently requested
+region/metric aggregates are kept in an LRU cache keyed by the resolved
+member set, so equivalent expressions share one entry.
+
+Every member of a user-defined list (config/regions.json or define()) must
+be an entity of the cache, exactly as names in expressions must be; an
+unknown member raises ValueError. Built-in lists are shared with
+calculate_net_imports.py and may name countries a dataset lacks; those
+members are dropped with a warning (once per region and member).
+
+A region-year has a value when at least one member reports the metric for
+that year; blank member values count as 0.
+
+Usage:
+    algebra = RegionAlgebra(load_owid_cache())
+    algebra.members('EU minus Germany')
+    algebra.aggregate('Asia excluding China', 'coal_consumption', 2000, 2024)   # {year: value}
+
+    python region_algebra.py "EU - Germany" oil_consumption --years 2000-2024
+    python region_algebra.py "G20 & OPEC" --members
+"""
+
+import functools
+import re
+import sys
+from pathlib import Path
+
+import numpy as np
+
+PIPELINE_DIR = Path(__file__).resolve().parent
+SERVICES_PIPELINE_DIR = PIPELINE_DIR.parent / 'global-energy-services' / 'data-pipeline'
+if str(SERVICES_PIPELINE_DIR) not in sys.path:
+    sys.path.insert(0, str(SERVICES_PIPELINE_DIR))
+
+import owid_cache
+import calculate_useful_energy_v2 as useful
+import calculate_net_imports as net_imports
+from config_registry import REGISTRY, working_directory
+
+# ============================================================================
+# CONFIGURATION
+# ============================================================================
+
+REGIONS_FILE = 'regions.json'
+
+# Aggregates kept per RegionAlgebra (region members × metric)
+AGGREGATE_CACHE_SIZE = 128
+
+OWID_CACHE_PATH = SERVICES_PIPELINE_DIR / owid_cache.DOWNLOAD_DIR / owid_cache.CACHE_FILENAME
+
+OPERATORS = {
+    '+': 'union', '|': 'union', 'plus': 'union', 'union': 'union',
+    '-': 'difference', 'minus': 'difference', 'excluding': 'difference', 'except': 'difference',
+    'without': 'difference',
+    '&': 'intersection', 'intersect': 'intersection',
+}
+SYMBOLS = '+|-&()'
+
+def builtin_regions():
+    """Continents and blocs of calculate_net_imports.py"""
+    regions = {continent: list(countries) for continent, countries in net_imports.CONTINENTAL_REGIONS.items()}
+    regions.update({bloc: list(countries) for bloc, countries in net_imports.BLOCS.items()})
+    return regions
+
+def user_regions():
+    """User-defined regions of config/regions.json ({name: [members] or expression})"""
+    config = REGISTRY.get(REGIONS_FILE) or {}
+    return dict(config.get('regions', {}))
+
+# ============================================================================
+# EXPRESSIONS
+# ============================================================================
+
+def tokenize(expression, names):
+    """
+    Split an expression into names, operators and parentheses
+
+    Names may contain spaces, hyphens and parentheses ('Guinea-Bissau',
+    'Micronesia (country)'); the longest known name wins. Quoted text is
+    always a name.
+
+    Returns:
+        List of (kind, value): kind is 'name', 'op', '(' or ')'
+    """
+    by_lower = {name.lower(): name for name in names}
+    ordered = sorted(by_lower, key=len, reverse=True)
+    tokens = []
+    i = 0
+    while i < len(expression):
+        if expression[i].isspace():
+            i += 1
+            continue
+        rest = expression[i:]
+        lower = rest.lower()
+
+        quoted = re.match(r'"([^"]*)"|\'([^\']*)\'', rest)
+        if quoted:
+            tokens.append(('name', quoted.group(1) if quoted.group(1) is not None else quoted.group(2)))
+            i += quoted.end()
+            continue
+
+        name = next((n for n in ordered if lower.startswith(n)
+                     and (len(lower) == len(n) or not (lower[len(n)].isalnum() or lower[len(n)] == '_'))), None)
+        if name is not None:
+            tokens.append(('name', by_lower[name]))
+            i += len(name)
+            continue
+
+        if rest[0] in '()':
+            tokens.append((rest[0], rest[0]))
+            i += 1
+            continue
+        if rest[0] in SYMBOLS:
+            tokens.append(('op', OPERATORS[rest[0]]))
+            i += 1
+            continue
+        word = re.match(r'[A-Za-z_]+', rest)
+        if word and word.group(0).lower() in OPERATORS:
+            tokens.append(('op', OPERATORS[word.group(0).lower()]))
+            i += word.end()
+            continue
+
+        unknown = re.split(r'\s[-+|&]\s|[+|&()]', rest)[0].strip()
+        raise ValueError(f"Unknown region or country in '{expression}': '{unknown}'")
+    return tokens
+
+def _combine(left, operator, right):
+    """Ordered set operation on member lists"""
+    if operator == 'union':
+        seen = set(left)
+        return left + [country for country in right if country not in seen]
+    other = set(right)
+    if operator == 'difference':
+        return [country for country in left if country not in other]
+    return [country for country in left if country in other]
+
+def parse(tokens, resolve):
+    """
+    Evaluate tokens to an ordered member list
+
+    Grammar (intersection binds tighter than union / difference, all
+    left-associative):
+        expression := term (('union' | 'difference') term)*
+        term       := factor ('intersection' factor)*
+        factor     := name | '(' expression ')'
+    """
+    position = 0
+
+    def peek():
+        return tokens[position] if position < len(tokens) else (None, None)
+
+    def take():
+        nonlocal position
+        token = peek()
+        position += 1
+        return token
+
+    def factor():
+        kind, value = take()
+        if kind == 'name':
+            return resolve(value)
+        if kind == '(':
+            members = expression()
+            if take()[0] != ')':
+                raise ValueError("Missing ')' in region expression")
+            return members
+        raise ValueError(f"Expected a region or country, found {value or 'end of expression'!r}")
+
+    def term():
+        members = factor()
+        while peek() == ('op', 'intersection'):
+            take()
+            members = _combine(members, 'intersection', factor())
+        return members
+
+    def expression():
+        members = term()
+        while peek()[0] == 'op' and peek()[1] in ('union', 'difference'):
+            operator = take()[1]
+            members = _combine(members, operator, term())
+        return members
+
+    members = expression()
+    if position != len(tokens):
+        raise ValueError(f"Unexpected {tokens[position][1]!r} in region expression")
+    return members
+
+# ============================================================================
+# REGION ALGEBRA
+# ============================================================================
+
+class RegionAlgebra:
+    """Region expressions over the entities of an OWID cache with cached aggregates"""
+
+    def __init__(self, data, regions=None, cache_size=AGGREGATE_CACHE_SIZE):
+        """
+        Args:
+            data: owid_cache.OwidCache
+            regions: Extra {name: [members] or expression} definitions
+                     (default: config/regions.json)
+        """
+        self.data = data
+        self.entities = list(data.entities)
+        self.entity_index = {entity: i for i, entity in enumerate(self.entities)}
+        self.years = np.unique(data.column('year')).astype(np.int64)
+
+        self.builtin = builtin_regions()
+        self.definitions = dict(self.builtin)
+        self.definitions.update(user_regions() if regions is None else regions)
+        self._dropped = set()
+
+        self._metrics = {}
+        self._aggregate = functools.lru_cache(maxsize=cache_size)(self._compute_aggregate)
+
+    def define(self, name, definition):
+        """Add or replace a region ([members] or expression)"""
+        self.definitions[name] = definition
+        self._aggregate.cache_clear()
+
+    # ------------------------------------------------------------------
+    # Members
+    # ------------------------------------------------------------------
+
+    def members(self, expression):
+        """Countries of a region expression (ordered, without duplicates)"""
+        return self._members(expression, ())
+
+    def _members(self, expression, resolving):
+        names = list(self.definitions) + self.entities
+
+        def resolve(name):
+            if name in self.definitions:
+                if name in resolving:
+                    raise ValueError(f"Circular region definition: {' -> '.join(resolving + (name,))}")
+                definition = self.definitions[name]
+                if isinstance(definition, str):
+                    return self._members(definition, resolving + (name,))
+                return self._list_members(name, definition)
+            if name in self.entity_index:
+                return [name]
+            raise ValueError(f"Unknown region or country: '{name}'")
+
+        return parse(tokenize(expression, names), resolve)
+
+    def _list_members(self, name, members):
+        """Members of a list definition that are entities of the cache"""
+        unknown = [member for member in members if member not in self.entity_index]
+        if unknown and self.definitions[name] is not self.builtin.get(name):
+            raise ValueError(f"Unknown countries in region '{name}': {', '.join(map(repr, unknown))}")
+        for member in unknown:
+            if (name, member) not in self._dropped:
+                self._dropped.add((name, member))
+                print(f"Warning: built-in region '{name}' member '{member}' is not in the OWID cache")
+        return [member for member in dict.fromkeys(members) if member in self.entity_index]
+
+    # ------------------------------------------------------------------
+    # Metrics
+    # ------------------------------------------------------------------
+
+    def _grid(self, entities, years, values):
+        """[entity, year] array (NaN where no row) from per-row values"""
+        grid = np.full((len(self.entities), len(self.years)), np.nan)
+        rows = np.array([self.entity_index[entity] for entity in entities], dtype=np.int64)
+        grid[rows, np.searchsorted(self.years, years)] = values
+        return grid
+
+    def metric_array(self, metric):
+        """Per-entity [entity, year] array of a metric (built once, NaN = no data)"""
+        if metric not in self._metrics:
+            if metric in DERIVED_METRICS:
+                self._metrics.update(DERIVED_METRICS[metric](self))
+            elif metric in owid_cache.STRING_COLUMNS + owid_cache.INT_COLUMNS:
+                raise ValueError(f"Not a numeric metric: {metric}")
+            else:
+                # Entities are the cache's, so row codes index the grid directly
+                values = self.data.column(metric)
+                grid = np.full((len(self.entities), len(self.years)), np.nan)
+                grid[self.data.row_codes(), np.searchsorted(self.years, self.data.column('year'))] = values
+                self._metrics[metric] = grid
+        return self._metrics[metric]
+
+    def metrics(self):
+        """Names of the OWID and derived metrics"""
+        return self.data.numeric_columns() + list(DERIVED_METRICS)
+
+    # ------------------------------------------------------------------
+    # Aggregates
+    # ------------------------------------------------------------------
+
+    def _compute_aggregate(self, members, metric):
+        """(years with data, sums) of a member tuple; members are summed in order"""
+        values = self.metric_array(metric)[[self.entity_index[country] for country in members]]
+        reported = ~np.isnan(values)
+        total = np.zeros(len(self.years))
+        for row, row_reported in zip(values, reported):
+            total = total + np.where(row_reported, row, 0.0)
+        has_data = reported.any(axis=0)
+        return self.years[has_data], total[has_data]
+
+    def aggregate(self, expression, metric, first_year=None, last_year=None):
+        """
+        Sum of a metric over the members of a region expression
+
+        Returns:
+            {year: value} for the years (within the range) with any data
+        """
+        members = tuple(self.members(expression))
+        years, totals = self._aggregate(members, metric)
+        keep = np.ones(len(years), dtype=bool)
+        if first_year is not None:
+            keep &= years >= first_year
+        if last_year is not None:
+            keep &= years <= last_year
+        return dict(zip(years[keep].tolist(), totals[keep].tolist()))
+
+    def cache_info(self):
+        """LRU statistics of the aggregate cache"""
+        return self._aggregate.cache_info()
+
+# ============================================================================
+# DERIVED METRICS
+# ============================================================================
+# Each builder returns {metric: [entity, year] array} for one or more metrics,
+# computed with the pipeline's own formulas.
+
+def _net_imports_metrics(algebra):
+    """Net imports (EJ) per fuel and in total (calculate_net_imports formulas)"""
+    countries, years, net, present = net_imports.net_imports_array(algebra.data)
+    country, year = present.nonzero()
+    entities = [countries[i] for i in country.tolist()]
+
+    metrics = {}
+    for f, fuel in enumerate(net_imports.FUELS):
+        metrics[f'net_{fuel}_imports_ej'] = algebra._grid(entities, years[year], net[country, year, f])
+    metrics['net_imports_ej'] = algebra._grid(entities, years[year], net[country, year].sum(axis=1))
+    return metrics
+
+def _useful_energy_metrics(algebra):
+    """Useful energy and energy services (EJ) from FIRST_YEAR (calculate_useful_energy_v2)"""
+    with working_directory():
+        configs = useful.load_configs()
+    arrays = useful.compute_entity_arrays(algebra.data, configs, enable_temporal=useful.ENABLE_TEMPORAL,
+                                          enable_exergy=True, rebound_rate=useful.REBOUND_RATE)
+    return {
+        'useful_energy_ej': algebra._grid(arrays['entity'], arrays['year'], arrays['total_useful_ej']),
+        'energy_services_ej': algebra._grid(arrays['entity'], arrays['year'], arrays['total_services_ej']),
+    }
+
+DERIVED_METRICS = {
+    'net_imports_ej': _net_imports_metrics,
+    'net_coal_imports_ej': _net_imports_metrics,
+    'net_oil_imports_ej': _net_imports_metrics,
+    'net_gas_imports_ej': _net_imports_metrics,
+    'useful_energy_ej': _useful_energy_metrics,
+    'energy_services_ej': _useful_energy_metrics,
+}
+
+# ============================================================================
+# MAIN EXECUTION
+# ============================================================================
+
+def parse_years(text):
+    """'2000-2024' or '2024' -> (first, last)"""
+    first, _, last = text.partition('-')
+    return int(first), int(last or first)
+
+if __name__ == '__main__':
+    argv = sys.argv[1:]
+    first_year = last_year = None
+    if '--years' in argv[:-1]:
+        i = argv.index('--years')
+        first_year, last_year = parse_years(argv[i + 1])
+        del argv[i:i + 2]
+    args = [arg for arg in argv if not arg.startswith('--')]
+    if not args:
+        print(__doc__)
+        sys.exit(1)
+
+    data = owid_cache.load_owid_cache(str(OWID_CACHE_PATH))
+    if data is None:
+        sys.exit(1)
+    algebra = RegionAlgebra(data)
+
+    expression = args[0]
+    try:
+        members = algebra.members(expression)
+    except ValueError as e:
+        print(f"✗ {e}")
+        sys.exit(1)
+
+    print("=" * 80)
+    print(f"REGION: {expression}  ({len(members)} countries)")
+    print("=" * 80)
+    if '--members' in argv or len(args) < 2:
+        print(", ".join(members))
+        sys.exit(0)
+
+    metric = args[1]
+    try:
+        series = algebra.aggregate(expression, metric, first_year, last_year)
+    except (KeyError, ValueError) as e:
+        print(f"✗ {e}")
+        sys.exit(1)
+
+    print(f"\n{'Year':<8} {metric}")
+    print("-" * 40)
+    for year, value in series.items():
+        print(f"{year:<8} {value:,.3f}")
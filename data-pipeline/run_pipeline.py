@@ -0,0 +1,222 @@
+#!/usr/bin/env python3
+"""
+Pipeline Runner - the useful energy stage and its consumers in one process
+
+Run as separate scripts, every consumer of calculate_useful_energy_v2
+starts its own interpreter, chdirs to its own directory and re-reads
+useful_energy_timeseries.json / exergy_services_timeseries.json from
+disk. This runner imports the stages as functions and hands each one the
+in-memory results of the previous stages:
+- useful_energy  calculate_useful_energy_v2: World timeseries and every
+                 OWID entity (from the OWID cache)
+- ff_growth      calculate_ff_growth.compute_ff_growth()
+                 (useful energy timeseries)
+- sectoral       generate_sectoral_timeseries.build_sectoral_timeseries()
+                 (energy services timeseries)
+- cagrs          calculate_historical_cagrs.calculate_cagrs()
+                 (useful energy timeseries)
+- projections    demand_growth_model_v4_learning.LearningCurveProjectionModel
+                 (useful energy timeseries and CAGRs); --demand-model v1
+                 runs demand_growth_model.EnergyDemandModel instead
+
+The outputs (global-energy-services/public/data and calculated_cagrs.json)
+are written only after every stage has succeeded, so a failing stage
+leaves the published files untouched. The file outputs are the same as
+running the scripts one after another.
+
+The regional and net imports stages read the OWID cache, not these
+outputs; they are run by owid_incremental.py.
+
+Usage:
+    python run_pipeline.py                    # run all stages and write the outputs
+    python run_pipeline.py --dry-run          # run all stages, write nothing
+    python run_pipeline.py --demand-model v1  # projections of demand_growth_model.py
+"""
+
+import json
+import os
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+PIPELINE_DIR = Path(__file__).resolve().parent
+REPO_ROOT = PIPELINE_DIR.parent
+SERVICES_PIPELINE_DIR = REPO_ROOT / 'global-energy-services' / 'data-pipeline'
+for path in (SERVICES_PIPELINE_DIR, REPO_ROOT):
+    if str(path) not in sys.path:
+        sys.path.insert(0, str(path))
+
+import owid_cache
+import calculate_useful_energy_v2 as useful
+import calculate_ff_growth as ff_growth
+import generate_sectoral_timeseries as sectoral
+import calculate_historical_cagrs as historical_cagrs
+from config_registry import working_directory
+from region_algebra import OWID_CACHE_PATH
+
+if sys.platform == 'win32':
+    sys.stdout.reconfigure(encoding='utf-8')
+
+# ============================================================================
+# CONFIGURATION
+# ============================================================================
+
+SERVICES_DATA_DIR = (SERVICES_PIPELINE_DIR / useful.OUTPUT_DIR).resolve()
+FF_GROWTH_FILE = SERVICES_DATA_DIR / 'ff_growth_timeseries.json'
+SECTORAL_INPUT_FILE = (SERVICES_PIPELINE_DIR / sectoral.SECTORAL_FILE).resolve()
+SECTORAL_FILE = (SERVICES_PIPELINE_DIR / sectoral.OUTPUT_FILE).resolve()
+PROJECTIONS_FILE = SERVICES_DATA_DIR / 'demand_growth_projections.json'
+CAGRS_FILE = historical_cagrs.OUTPUT_FILE
+
+DEFAULT_DEMAND_MODEL = 'v4'
+
+# ============================================================================
+# PROJECTION MODELS
+# ============================================================================
+# Each takes the useful energy timeseries and the CAGRs and returns the
+# demand_growth_projections.json content.
+
+def learning_curve_projections(timeseries, cagrs):
+    from demand_growth_model_v4_learning import SCENARIOS, LearningCurveProjectionModel
+    model = LearningCurveProjectionModel(historical=timeseries, cagrs=cagrs)
+    return model.projection_output({name: model.calculate_scenario(name) for name in SCENARIOS})
+
+def demand_model_projections(timeseries, cagrs):
+    from demand_growth_model import EnergyDemandModel
+    model = EnergyDemandModel()
+    if model.run_all_scenarios(timeseries, save=False) is None:
+        raise ValueError("Demand growth model could not load the historical baseline")
+    return model.projection_output()
+
+DEMAND_MODELS = {
+    'v4': learning_curve_projections,
+    'v1': demand_model_projections,
+}
+
+# ============================================================================
+# PIPELINE
+# ============================================================================
+
+class StageTimer:
+    """Wall time of each stage, in run order"""
+
+    def __init__(self):
+        self.timings = {}
+
+    def run(self, name, function, *args, **kwargs):
+        print(f"\n{'─' * 80}\n▶ {name}\n{'─' * 80}")
+        start = time.perf_counter()
+        result = function(*args, **kwargs)
+        self.timings[name] = time.perf_counter() - start
+        return result
+
+def run_pipeline(data, configs, demand_model=DEFAULT_DEMAND_MODEL, timer=None):
+    """
+    Run every stage in memory
+
+    Args:
+        data: owid_cache.OwidCache
+        configs: calculate_useful_energy_v2.load_configs()
+        demand_model: Key of DEMAND_MODELS
+        timer: StageTimer collecting the stage timings
+
+    Returns:
+        {output: content} for write_outputs()
+    """
+    if demand_model not in DEMAND_MODELS:
+        raise KeyError(f"Unknown demand model: {demand_model} (available: {list(DEMAND_MODELS)})")
+    timer = timer or StageTimer()
+    options = dict(enable_temporal=useful.ENABLE_TEMPORAL, enable_exergy=useful.ENABLE_EXERGY,
+                   rebound_rate=useful.REBOUND_RATE)
+    generated_at = datetime.now().isoformat()
+
+    results = timer.run('useful_energy', useful.process_global_data, data, configs, **options)
+    entity_results = timer.run('entities', useful.process_all_entities, data, configs, **options)
+    timeseries = results['useful_energy']
+
+    ff_output = timer.run('ff_growth', ff_growth.compute_ff_growth, timeseries, generated_at)
+    ff_growth.print_summary(ff_output['data'])
+
+    sectoral_output = timer.run('sectoral', sectoral.build_sectoral_timeseries, results['energy_services'],
+                                sectoral.load_json_file(str(SECTORAL_INPUT_FILE)))
+    sectoral.print_summary(sectoral_output)
+
+    cagrs = timer.run('cagrs', historical_cagrs.calculate_cagrs, timeseries)
+    projections = timer.run('projections', DEMAND_MODELS[demand_model], timeseries, cagrs)
+
+    return {
+        'generated_at': generated_at,
+        'useful_energy': results,
+        'entities': entity_results,
+        'ff_growth': ff_output,
+        'sectoral': sectoral_output,
+        'cagrs': cagrs,
+        'projections': projections,
+    }
+
+def write_outputs(outputs, data):
+    """Write the stage outputs to their published files"""
+    useful.save_results(outputs['useful_energy'], output_dir=str(SERVICES_DATA_DIR),
+                        generated_at=outputs['generated_at'])
+    useful.save_entity_results(outputs['entities'], data, output_dir=str(SERVICES_DATA_DIR),
+                               generated_at=outputs['generated_at'])
+    ff_growth.save_ff_growth(outputs['ff_growth'], str(FF_GROWTH_FILE))
+    sectoral.save_sectoral_timeseries(outputs['sectoral'], str(SECTORAL_FILE))
+    historical_cagrs.save_cagrs(outputs['cagrs'], CAGRS_FILE)
+
+    os.makedirs(PROJECTIONS_FILE.parent, exist_ok=True)
+    with open(PROJECTIONS_FILE, 'w') as f:
+        json.dump(outputs['projections'], f, indent=2)
+    print(f"\n✓ Projections saved to: {PROJECTIONS_FILE}")
+
+# ============================================================================
+# MAIN EXECUTION
+# ============================================================================
+
+def parse_args(args):
+    """(dry_run, demand_model) of the command line; exits on a bad --demand-model"""
+    dry_run = '--dry-run' in args
+    demand_model = DEFAULT_DEMAND_MODEL
+    if '--demand-model' in args:
+        i = args.index('--demand-model')
+        if i + 1 >= len(args) or args[i + 1].startswith('--'):
+            print(f"✗ --demand-model needs a value (available: {', '.join(DEMAND_MODELS)})")
+            sys.exit(1)
+        demand_model = args[i + 1]
+        if demand_model not in DEMAND_MODELS:
+            print(f"✗ Unknown demand model: {demand_model} (available: {', '.join(DEMAND_MODELS)})")
+            sys.exit(1)
+    return dry_run, demand_model
+
+def main(args):
+    dry_run, demand_model = parse_args(args)
+
+    print("=" * 80)
+    print("PIPELINE RUNNER - Useful Energy → FF Growth, Sectoral, CAGRs, Projections")
+    print("=" * 80)
+
+    start = time.perf_counter()
+    data = owid_cache.load_owid_cache(str(OWID_CACHE_PATH))
+    if data is None:
+        sys.exit(1)
+    with working_directory():
+        configs = useful.load_configs()
+
+    timer = StageTimer()
+    outputs = run_pipeline(data, configs, demand_model=demand_model, timer=timer)
+    if dry_run:
+        print("\nDry run - no outputs written")
+    else:
+        timer.run('write_outputs', write_outputs, outputs, data)
+
+    print("\n" + "=" * 80)
+    print("STAGE TIMINGS")
+    print("=" * 80)
+    for name, elapsed in timer.timings.items():
+        print(f"  {name:<15} {elapsed * 1000:>10.1f} ms")
+    print(f"\nCompleted in {time.perf_counter() - start:.2f} s")
+    return outputs
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
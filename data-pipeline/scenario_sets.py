@@ -0,0 +1,270 @@
+#!/usr/bin/env python3
+"""
+Scenario Sets - data-driven scenario definitions for Projection Engine v4.0
+
+The built-in scenarios (Conservative, Baseline, Optimistic) come from the
+engine tables (SATURATION_LIMITS, STEEPNESS_MULTIPLIERS, DEMAND_GROWTH_RATES,
+EFFICIENCY_IMPROVEMENTS). config/scenarios.json adds user-defined scenarios
+that inherit from a parent (default Baseline) and override any of its fields:
+
+    "Client_A_HighDemand": {
+        "parent": "Baseline",
+        "demand_growth_rate": 0.018,
+        "saturation_limits": {"solar": 260}
+    }
+
+Fields of a resolved scenario definition:
+- saturation_limits        {technology: EJ} (merged per technology)
+- steepness_multiplier     S-curve steepness scale
+- demand_growth_rate       annual total demand growth
+- efficiency_improvements  {technology: rate per year} (merged per technology)
+- policy_scenario          scenario key used in policy_scenarios.json
+- manufacturing_scenario   scenario key used in manufacturing_capacity.json
+- learning_scenario        scenario key used in learning_curves.json
+
+A user-defined scenario named like a built-in and inheriting from that name
+(e.g. "Baseline": {"parent": "Baseline", ...}) extends the built-in table
+entry and replaces it for every other scenario.
+
+Named scenario sets ("sets": {"clients": [...]}) select groups of scenarios.
+
+run_scenario_set() projects any number of scenarios through ProjectionEngine
+on a process pool. The compiled parameters (compiled_parameters) are built
+once in the parent for the whole set and handed to each worker through the
+pool initializer, so workers never parse or compile the configs themselves.
+"""
+
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+PIPELINE_DIR = Path(__file__).resolve().parent
+SERVICES_PIPELINE_DIR = PIPELINE_DIR.parent / 'global-energy-services' / 'data-pipeline'
+if str(SERVICES_PIPELINE_DIR) not in sys.path:
+    sys.path.insert(0, str(SERVICES_PIPELINE_DIR))
+
+import projection_engine_v4 as engine
+from config_registry import REGISTRY
+from dimensions import Dimension
+
+# ============================================================================
+# CONFIGURATION
+# ============================================================================
+
+SCENARIOS_FILE = 'scenarios.json'
+
+# Fields a user-defined scenario may override (dict fields merge per key)
+SCENARIO_FIELDS = [
+    'saturation_limits',
+    'steepness_multiplier',
+    'demand_growth_rate',
+    'efficiency_improvements',
+    'policy_scenario',
+    'manufacturing_scenario',
+    'learning_scenario',
+]
+MERGED_FIELDS = ['saturation_limits', 'efficiency_improvements']
+
+# ============================================================================
+# SCENARIO DEFINITIONS
+# ============================================================================
+
+def builtin_definition(scenario):
+    """Definition of a built-in scenario from the engine tables"""
+    return {
+        'name': scenario,
+        'parent': None,
+        'description': f'Built-in {scenario} scenario',
+        'saturation_limits': dict(engine.SATURATION_LIMITS[scenario]),
+        'steepness_multiplier': engine.STEEPNESS_MULTIPLIERS.get(scenario, 1.0),
+        'demand_growth_rate': engine.DEMAND_GROWTH_RATES.get(scenario, 0.01),
+        'efficiency_improvements': dict(engine.EFFICIENCY_IMPROVEMENTS.get(scenario, {})),
+        'policy_scenario': scenario,
+        'manufacturing_scenario': scenario,
+        'learning_scenario': scenario,
+    }
+
+_RESOLVED = {'content_hash': None, 'definitions': {}}
+
+def _user_scenarios():
+    config = REGISTRY.get(SCENARIOS_FILE) or {}
+    return config.get('scenarios', {})
+
+def _resolved_cache():
+    """Resolved definitions, dropped whenever scenarios.json changes"""
+    content_hash = REGISTRY.content_hash(SCENARIOS_FILE)
+    if _RESOLVED['content_hash'] != content_hash:
+        _RESOLVED['content_hash'] = content_hash
+        _RESOLVED['definitions'] = {}
+    return _RESOLVED['definitions']
+
+def resolve_scenario(scenario):
+    """
+    Fully resolved definition of a scenario (built-in or user-defined)
+
+    Raises:
+        KeyError: Unknown scenario or parent
+        ValueError: Circular inheritance
+    """
+    cache = _resolved_cache()
+    if scenario in cache:
+        return cache[scenario]
+
+    user_scenarios = _user_scenarios()
+    chain = []
+    name = scenario
+    while name in user_scenarios:
+        if name in chain:
+            raise ValueError(f"Circular scenario inheritance: {' -> '.join(chain + [name])}")
+        chain.append(name)
+        parent = user_scenarios[name].get('parent', 'Baseline')
+        if parent == name:
+            break  # a user scenario named like a built-in extends the built-in itself
+        name = parent
+
+    if name not in engine.SATURATION_LIMITS:
+        raise KeyError(f"Unknown scenario: {name}" + (f" (parent of {chain[-1]})" if chain else ""))
+
+    definition = builtin_definition(name)
+    for name in reversed(chain):
+        overrides = user_scenarios[name]
+        unknown = set(overrides) - set(SCENARIO_FIELDS) - {'parent', 'description'}
+        if unknown:
+            raise KeyError(f"Unknown fields in scenario {name}: {sorted(unknown)}")
+
+        definition = dict(definition)
+        for field in SCENARIO_FIELDS:
+            if field not in overrides:
+                continue
+            if field in MERGED_FIELDS:
+                definition[field] = {**definition[field], **overrides[field]}
+            else:
+                definition[field] = overrides[field]
+        definition['name'] = name
+        definition['parent'] = overrides.get('parent', 'Baseline')
+        definition['description'] = overrides.get('description', definition['description'])
+
+    cache[scenario] = definition
+    return definition
+
+def config_scenario(scenario, field):
+    """
+    Scenario key to use for a config lookup (policy/manufacturing/learning)
+
+    Unknown scenario names are passed through unchanged, matching the
+    config lookups' own defaults for missing scenarios.
+    """
+    try:
+        return resolve_scenario(scenario)[field]
+    except KeyError:
+        return scenario
+
+def efficiency_improvements(scenario):
+    """Efficiency improvement rates of a scenario ({} for unknown names)"""
+    try:
+        return resolve_scenario(scenario)['efficiency_improvements']
+    except KeyError:
+        return {}
+
+def list_scenarios():
+    """Built-in scenarios followed by the user-defined ones"""
+    return list(engine.SCENARIOS) + [s for s in _user_scenarios() if s not in engine.SCENARIOS]
+
+def scenario_dimension():
+    """
+    Scenario registry: every scenario with a stable integer code
+
+    Built-in scenarios come first, so their codes do not depend on
+    scenarios.json. Metadata: builtin flag and parent scenario.
+    """
+    scenarios = list_scenarios()
+    user_scenarios = _user_scenarios()
+    return Dimension(
+        'scenario',
+        scenarios,
+        builtin=[scenario in engine.SCENARIOS for scenario in scenarios],
+        parent=[user_scenarios[scenario].get('parent', 'Baseline') if scenario in user_scenarios else None
+                for scenario in scenarios],
+    )
+
+def scenario_set(name):
+    """Scenario names of a named set from scenarios.json ('all' = every scenario)"""
+    if name == 'all':
+        return list_scenarios()
+    if name == 'default':
+        return list(engine.SCENARIOS)
+    sets = (REGISTRY.get(SCENARIOS_FILE) or {}).get('sets', {})
+    if name not in sets:
+        raise KeyError(f"Unknown scenario set: {name}")
+    return list(sets[name])
+
+# ============================================================================
+# PARALLEL EXECUTION
+# ============================================================================
+
+def _init_worker(compiled):
+    engine.use_compiled_parameters(compiled)
+
+def _project_scenario(args):
+    scenario, start_year, end_year = args
+    return scenario, engine.ProjectionEngine(scenario).project_timeseries(start_year, end_year)
+
+def run_scenario_set(scenarios=None, workers=None, start_year=engine.BASE_YEAR, end_year=engine.TARGET_YEAR):
+    """
+    Project a set of scenarios through ProjectionEngine on a process pool
+
+    Args:
+        scenarios: Scenario names (default: every defined scenario)
+        workers: Process pool size (None = os.cpu_count(), 1 = in-process)
+
+    Returns:
+        {scenario: project_timeseries() records} in the order given
+    """
+    scenarios = list(scenarios or list_scenarios())
+    for scenario in scenarios:
+        resolve_scenario(scenario)  # fail fast on unknown names
+
+    # Compile once (covers every defined scenario); workers receive the read-only arrays
+    compiled = engine.get_compiled_parameters(revalidate=True)
+    jobs = [(scenario, start_year, end_year) for scenario in scenarios]
+
+    workers = min(workers or os.cpu_count() or 1, len(jobs))
+    if workers <= 1:
+        _init_worker(compiled)
+        results = [_project_scenario(job) for job in jobs]
+    else:
+        chunksize = max(1, len(jobs) // (workers * 4))
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(compiled,)) as pool:
+            results = list(pool.map(_project_scenario, jobs, chunksize=chunksize))
+
+    return dict(results)
+
+# ============================================================================
+# MAIN EXECUTION
+# ============================================================================
+
+if __name__ == '__main__':
+    args = [arg for arg in sys.argv[1:] if not arg.startswith('--')]
+    set_name = args[0] if args else 'all'
+
+    print("=" * 80)
+    print("SCENARIO SET - Projection Engine v4.0")
+    print("=" * 80)
+
+    scenarios = scenario_set(set_name)
+    start = time.perf_counter()
+    projections = run_scenario_set(scenarios)
+    elapsed = time.perf_counter() - start
+    print(f"\nSet '{set_name}': {len(scenarios)} scenarios in {elapsed:.2f} s")
+
+    output_name = 'energy_projections_v4.json' if set_name == 'default' else f'energy_projections_v4_{set_name}.json'
+    engine.save_projections(projections, Path(__file__).parent.parent / 'global-energy-services' / 'public' / 'data' / output_name)
+
+    print(f"\n{'Scenario':<32} {'Parent':<14} {'Clean % 2050':<14} {'Fossil EJ 2050':<14}")
+    print("-" * 80)
+    for scenario, timeseries in projections.items():
+        data = timeseries[-1]
+        parent = resolve_scenario(scenario)['parent'] or '-'
+        print(f"{scenario:<32} {parent:<14} {data['clean_share'] * 100:<14.1f} {data['fossil_ej']:<14.1f}")
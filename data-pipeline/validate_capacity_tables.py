@@ -0,0 +1,132 @@
+"""
+Validate the prefix-sum cumulative capacity tables (learning_by_deployment.py)
+
+For every year 2015-2130 (before, inside and past the solved horizon):
+1. CumulativeCapacityTable.at() equals the dict lookup with linear
+   extension it replaced, for every coupled technology and scenario
+2. lookup() equals at() for the same years, element by element
+3. calculate_cumulative_capacities() (the cost cube's vectorized path)
+   equals calculate_cumulative_capacity() for every source and scenario
+4. For the manufacturing-trajectory sources, a table built with
+   from_additions() equals calculate_cumulative_capacity()'s running sum
+5. A single-year table answers every year with its one value and an
+   empty table is rejected
+"""
+
+import sys
+import time
+
+import numpy as np
+
+import calculate_full_system_costs_v25 as costs
+from learning_by_deployment import CumulativeCapacityTable, capacity_table, scenario_learning
+from scenario_sets import list_scenarios
+
+YEARS = list(range(2015, 2131))
+COST_SCENARIOS = ['conservative', 'baseline', 'optimistic']
+SOURCES = ['solar', 'wind', 'wind_offshore', 'batteries', 'evs', 'heat_pumps', 'electrolyzers', 'nuclear', 'coal']
+TRAJECTORY_SOURCES = {'wind_offshore': 'wind_offshore_gw_year', 'batteries': 'batteries_gwh_year',
+                      'evs': 'evs_million_year', 'heat_pumps': 'heat_pumps_million_year',
+                      'electrolyzers': 'electrolyzers_gw_year', 'nuclear': 'nuclear_gw_year'}
+
+if sys.platform == 'win32':
+    sys.stdout.reconfigure(encoding='utf-8')
+
+def dict_cumulative(table, year):
+    """Cumulative capacity from a {year: value} table, extended linearly after its last year"""
+    first, last = min(table), max(table)
+    if year <= first:
+        return table[first]
+    if year > last:
+        return table[last] + (year - last) * (table[last] - table[last - 1])
+    return table[year]
+
+print("=" * 80)
+print("VALIDATION REPORT: Cumulative Capacity Tables")
+print("=" * 80)
+print()
+
+failures = []
+lookups = 0
+
+# ============================================================================
+# 1-2. DEPLOYMENT TABLES
+# ============================================================================
+
+for scenario in list_scenarios():
+    for technology, values in scenario_learning(scenario)['cumulative'].items():
+        table = capacity_table(technology, scenario)
+        if table is None:
+            continue
+        vectorized = table.lookup(YEARS)
+        for year, looked_up in zip(YEARS, vectorized.tolist()):
+            lookups += 1
+            expected = dict_cumulative(values, year)
+            if table.at(year) != expected:
+                failures.append(f"{scenario} {technology} {year}: at() {table.at(year)!r} vs dict {expected!r}")
+            if looked_up != table.at(year):
+                failures.append(f"{scenario} {technology} {year}: lookup() {looked_up!r} vs at() {table.at(year)!r}")
+print(f"Deployment tables:    {lookups} lookups ({len(list_scenarios())} scenarios, {YEARS[0]}-{YEARS[-1]})")
+
+# ============================================================================
+# 3. COST CUBE PATH VS SCALAR PATH
+# ============================================================================
+
+start = time.perf_counter()
+for scenario in COST_SCENARIOS:
+    for source in SOURCES:
+        expected = [costs.calculate_cumulative_capacity(source, year, scenario) or 0 for year in YEARS]
+        actual = costs.calculate_cumulative_capacities(source, np.array(YEARS), scenario).tolist()
+        if actual != expected:
+            year = next(y for y, a, e in zip(YEARS, actual, expected) if a != e)
+            failures.append(f"{scenario} {source}: calculate_cumulative_capacities() differs from "
+                            f"calculate_cumulative_capacity() (first in {year})")
+print(f"Cost paths:           {len(COST_SCENARIOS) * len(SOURCES)} source/scenario series "
+      f"({time.perf_counter() - start:.2f} s)")
+
+# ============================================================================
+# 4. MANUFACTURING TRAJECTORIES AS PREFIX SUMS
+# ============================================================================
+
+manufacturing = costs.load_config('manufacturing_capacity.json')
+checked = 0
+for scenario in COST_SCENARIOS:
+    for source, trajectory_key in TRAJECTORY_SOURCES.items():
+        trajectory = manufacturing['trajectories'][trajectory_key]
+        multiplier = trajectory.get('scenario_multipliers', {}).get(scenario, 1.0)
+        table = CumulativeCapacityTable.from_additions(
+            2024, 0, [costs.interpolate_trajectory(trajectory, year) * multiplier for year in range(2025, YEARS[-1] + 1)])
+        for year in YEARS:
+            checked += 1
+            running_sum = costs.calculate_cumulative_capacity(source, year, scenario)
+            if table.at(year) != running_sum:
+                failures.append(f"{scenario} {source} {year}: prefix sum {table.at(year)!r} vs running sum "
+                                f"{running_sum!r}")
+                break
+print(f"Trajectory sums:      {checked} years checked")
+
+# ============================================================================
+# 5. DEGENERATE TABLES
+# ============================================================================
+
+single = CumulativeCapacityTable(2024, [42.0])
+for year in (2000, 2024, 2100):
+    if single.at(year) != 42.0:
+        failures.append(f"single-year table: at({year}) = {single.at(year)!r}")
+if single.lookup([2000, 2024, 2100]).tolist() != [42.0, 42.0, 42.0]:
+    failures.append(f"single-year table: lookup() = {single.lookup([2000, 2024, 2100]).tolist()}")
+try:
+    CumulativeCapacityTable(2024, [])
+    failures.append("empty table was accepted")
+except ValueError:
+    pass
+print("Degenerate tables:    single-year and empty")
+print()
+
+if failures:
+    print(f"✗ FAIL: {len(failures)} checks failed")
+    for failure in failures[:20]:
+        print(f"  - {failure}")
+    sys.exit(1)
+
+print("✓ PASS: Capacity tables equal the lookups and running sums they replace")
@@ -0,0 +1,202 @@
+"""
+Validate the factorized full_system_costs.json accessors (cost_accessor.py, costData.js)
+
+The cost data is generated in memory (generate_full_system_costs()) and
+round-tripped through a scratch JSON file, so public/data is not touched:
+1. expand_costs() rebuilds the materialized scenarios → regions →
+   timeseries structure exactly (built cell by cell from
+   calculate_system_lcoes() and the dispatch results)
+2. cost_cell() equals calculate_system_lcoes() for every cell and every
+   SCC scenario
+3. src/utils/costData.js (run with node) returns the same cells as
+   cost_cell(); rounded values may differ by the 0.01 tie-break of
+   Math.round vs round()
+"""
+
+import json
+import math
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import calculate_full_system_costs_v25 as costs
+from cost_accessor import FORMAT_KEYS, SCENARIO_INFO_KEYS, cost_cell, expand_costs, load_costs
+
+COST_DATA_JS = Path(__file__).resolve().parent.parent / 'global-energy-services' / 'src' / 'utils' / 'costData.js'
+
+# Math.round(x * 100) / 100 vs Python's round(x, 2) on binary ties
+JS_ROUNDING_TOL = 0.01 + 1e-9
+
+JS_CELLS = """
+import { readFileSync } from 'fs';
+import { getCostCell } from './costData.mjs';
+
+const [dataPath, sccScenario] = process.argv.slice(2);
+const data = JSON.parse(readFileSync(dataPath, 'utf8'));
+const cells = [];
+for (const scenario of data.dimensions.scenarios)
+  for (const region of data.dimensions.regions)
+    for (const year of data.dimensions.years)
+      for (const source of data.dimensions.sources)
+        cells.push(getCostCell(data, scenario, region, year, source, sccScenario));
+process.stdout.write(JSON.stringify(cells));
+"""
+
+if sys.platform == 'win32':
+    sys.stdout.reconfigure(encoding='utf-8')
+
+def materialized_costs(output):
+    """Pre-factorization full_system_costs.json structure, built from the scalar path"""
+    scenarios = {}
+    for scenario in output['dimensions']['scenarios']:
+        scenario_data = {key: output['scenarios'][scenario][key] for key in SCENARIO_INFO_KEYS}
+        scenario_data['regions'] = {}
+        for region in output['dimensions']['regions']:
+            timeseries = []
+            for year in output['dimensions']['years']:
+                metrics = costs.get_dispatch_results(scenario, year, region)['metrics']
+                timeseries.append({
+                    'year': year,
+                    'vre_penetration': round(costs.interpolate_value(year, costs.VRE_SCENARIOS[scenario]), 3),
+                    'dispatch': {name: round(metrics[metric], 4) for name, metric in costs.DISPATCH_OUTPUT_METRICS.items()},
+                    'sources': {source: costs.calculate_system_lcoes(source, year, scenario, region)
+                                for source in output['dimensions']['sources']}
+                })
+            scenario_data['regions'][region] = {
+                'regional_multiplier': costs.REGIONAL_MULTIPLIERS[region],
+                'timeseries': timeseries
+            }
+        scenarios[scenario] = scenario_data
+    return scenarios
+
+def first_difference(expected, actual, path=''):
+    """Path of the first differing value (None if equal)"""
+    if isinstance(expected, dict) and isinstance(actual, dict):
+        if list(expected) != list(actual):
+            return f"{path} keys {list(expected)} vs {list(actual)}"
+        for key in expected:
+            difference = first_difference(expected[key], actual[key], f"{path}/{key}")
+            if difference:
+                return difference
+        return None
+    if isinstance(expected, list) and isinstance(actual, list):
+        if len(expected) != len(actual):
+            return f"{path} length {len(expected)} vs {len(actual)}"
+        for i, (a, b) in enumerate(zip(expected, actual)):
+            difference = first_difference(a, b, f"{path}[{i}]")
+            if difference:
+                return difference
+        return None
+    return None if expected == actual else f"{path}: {expected!r} vs {actual!r}"
+
+def js_mismatch(expected, actual, path=''):
+    """Like first_difference, with JS_ROUNDING_TOL for numbers"""
+    if isinstance(expected, dict) and isinstance(actual, dict):
+        if set(expected) != set(actual):
+            return f"{path} keys {sorted(expected)} vs {sorted(actual)}"
+        for key in expected:
+            mismatch = js_mismatch(expected[key], actual[key], f"{path}/{key}")
+            if mismatch:
+                return mismatch
+        return None
+    if isinstance(expected, (int, float)) and isinstance(actual, (int, float)):
+        return None if math.isclose(expected, actual, rel_tol=0, abs_tol=JS_ROUNDING_TOL) \
+            else f"{path}: {expected!r} vs {actual!r}"
+    return None if expected == actual else f"{path}: {expected!r} vs {actual!r}"
+
+print("=" * 80)
+print("VALIDATION REPORT: Factorized Cost Data Accessors")
+print("=" * 80)
+print()
+
+failures = []
+
+with tempfile.TemporaryDirectory(prefix='cost_accessor_validate_') as tmp:
+    tmp = Path(tmp)
+    start = time.perf_counter()
+    output = costs.generate_full_system_costs()
+    costs_path = tmp / 'full_system_costs.json'
+    with open(costs_path, 'w') as f:
+        json.dump(output, f, indent=2)
+    data = load_costs(costs_path)
+    print(f"Generated cost data:  {costs_path.stat().st_size / 1024:.0f} KB factorized "
+          f"({time.perf_counter() - start:.2f} s)")
+
+    dimensions = data['dimensions']
+    cells = [(scenario, region, year, source) for scenario in dimensions['scenarios']
+             for region in dimensions['regions'] for year in dimensions['years'] for source in dimensions['sources']]
+
+    # ========================================================================
+    # 1. expand_costs() ROUND TRIP
+    # ========================================================================
+
+    start = time.perf_counter()
+    expanded = expand_costs(data)
+    expected = json.loads(json.dumps(materialized_costs(output)))
+    difference = first_difference(expected, expanded['scenarios'])
+    if difference:
+        failures.append(f"expand_costs(): {difference}")
+    metadata = {key: value for key, value in output['metadata'].items() if key not in FORMAT_KEYS}
+    if expanded['metadata'] != metadata:
+        failures.append("expand_costs(): metadata differs from the generated metadata")
+    print(f"expand_costs():       {len(cells)} cells compared ({time.perf_counter() - start:.2f} s)")
+
+    # ========================================================================
+    # 2. CELL PARITY WITH calculate_system_lcoes()
+    # ========================================================================
+
+    start = time.perf_counter()
+    for scc_scenario in data['scc_scenarios']:
+        mismatches = 0
+        for scenario, region, year, source in cells:
+            cell = cost_cell(data, scenario, region, year, source, scc_scenario)
+            if cell != costs.calculate_system_lcoes(source, year, scenario, region, scc_scenario):
+                mismatches += 1
+                if mismatches == 1:
+                    failures.append(f"cost_cell() {scenario} {region} {year} {source} (SCC {scc_scenario}) "
+                                    f"differs from calculate_system_lcoes()")
+        if mismatches > 1:
+            failures.append(f"SCC {scc_scenario}: {mismatches} cells differ from calculate_system_lcoes()")
+    print(f"Cell parity:          {len(cells)} cells × {len(data['scc_scenarios'])} SCC scenarios "
+          f"({time.perf_counter() - start:.2f} s)")
+
+    # ========================================================================
+    # 3. costData.js AGREES WITH cost_accessor.py
+    # ========================================================================
+
+    node = shutil.which('node')
+    if node is None:
+        print("costData.js:          skipped (node not found)")
+    else:
+        shutil.copy(COST_DATA_JS, tmp / 'costData.mjs')
+        (tmp / 'cells.mjs').write_text(JS_CELLS, encoding='utf-8')
+        start = time.perf_counter()
+        tie_breaks = 0
+        for scc_scenario in data['scc_scenarios']:
+            result = subprocess.run([node, str(tmp / 'cells.mjs'), str(costs_path), scc_scenario],
+                                    capture_output=True, text=True)
+            if result.returncode != 0:
+                failures.append(f"costData.js failed (SCC {scc_scenario}): {result.stderr.strip()[:200]}")
+                continue
+            js_cells = json.loads(result.stdout)
+            for (scenario, region, year, source), js_cell in zip(cells, js_cells):
+                cell = cost_cell(data, scenario, region, year, source, scc_scenario)
+                mismatch = js_mismatch(cell, js_cell)
+                if mismatch:
+                    failures.append(f"costData.js {scenario} {region} {year} {source} (SCC {scc_scenario}): {mismatch}")
+                    break
+                tie_breaks += cell != js_cell
+        print(f"costData.js:          {len(cells)} cells × {len(data['scc_scenarios'])} SCC scenarios, "
+              f"{tie_breaks} rounding tie-breaks ({time.perf_counter() - start:.2f} s)")
+print()
+
+if failures:
+    print(f"✗ FAIL: {len(failures)} checks failed")
+    for failure in failures[:20]:
+        print(f"  - {failure}")
+    sys.exit(1)
+
+print("✓ PASS: Factorized cost data rebuilds every cell in Python and JS")
@@ -0,0 +1,118 @@
+"""
+Validate the vectorized cost cube (build_cost_cube) against calculate_system_lcoes()
+
+Evaluates the full scenario × region × year × source cube for every SCC
+scenario both ways. build_cost_cube() claims bit-identical values, so the
+scalar path is run with the module's round() disabled and every field is
+compared unrounded and exactly (==): base LCOE, integration cost
+components, totals, SCC adder, capacity factor, carbon intensity, rebound
+and every service unit cost.
+"""
+
+import sys
+import time
+
+import numpy as np
+
+import calculate_full_system_costs_v25 as costs
+from scenario_sets import scenario_dimension
+
+SOURCES = ['coal', 'oil', 'gas', 'nuclear', 'hydro', 'wind', 'solar', 'biofuels', 'other_renewables']
+SCENARIOS = scenario_dimension().select(builtin=True)
+REGIONS = list(costs.REGIONAL_MULTIPLIERS)
+YEARS = list(range(2024, 2051))
+
+if sys.platform == 'win32':
+    sys.stdout.reconfigure(encoding='utf-8')
+
+def cube_value(value, s, r, y):
+    """Cell of a [S, R, Y] cube array (constants pass through)"""
+    return value[s, r, y] if isinstance(value, np.ndarray) else value
+
+def cube_cell(cube, s, r, y, k):
+    """calculate_system_lcoes() fields of one cube cell, unrounded"""
+    source = cube['sources'][k]
+    raw = cube['base_lcoe_raw'][s, y, k]
+    services = list(costs.SERVICE_CONVERSIONS)
+    return {
+        'base_lcoe_mwh': cube['base_lcoe'][s, y, k] if raw is None else raw,
+        'system_costs': {component: cube_value(value, s, r, y)
+                         for component, value in cube['system_costs'][source].items()},
+        'total_system_cost_mwh': cube_value(cube['total_system_cost'][source], s, r, y),
+        'scc_cost_mwh': cube['scc_cost'][source],
+        'total_lcoes_mwh': cube['total_lcoes'][s, r, y, k],
+        'capacity_factor': cube['capacity_factor'][y, k],
+        'carbon_intensity_tco2_mwh': costs.CARBON_INTENSITY.get(source, 0),
+        'rebound_multiplier': cube['rebound'][s, y],
+        'service_units': {service: {'value': cube['service_cost'][s, r, y, k, u],
+                                    'mwh_per_unit': cube['service_mwh'][s, y, u]}
+                          for u, service in enumerate(services)}
+    }
+
+def scalar_cell(source, year, scenario, region, scc_scenario):
+    """calculate_system_lcoes() with the service unit labels dropped"""
+    record = costs.calculate_system_lcoes(source, year, scenario, region, scc_scenario)
+    record['service_units'] = {service: {'value': unit['value'], 'mwh_per_unit': unit['mwh_per_unit']}
+                               for service, unit in record['service_units'].items()}
+    return record
+
+def differences(expected, actual, path=''):
+    """Paths whose values are not exactly equal (same type family, ==)"""
+    if isinstance(expected, dict):
+        if list(expected) != list(actual):
+            return [f"{path} keys {list(expected)} vs {list(actual)}"]
+        return [d for key in expected for d in differences(expected[key], actual[key], f"{path}/{key}")]
+    if type(expected) is not type(actual) and not (isinstance(actual, np.floating) and isinstance(expected, float)):
+        return [f"{path}: type {type(expected).__name__} vs {type(actual).__name__}"]
+    return [] if expected == actual else [f"{path}: {expected!r} vs {actual!r}"]
+
+print("=" * 80)
+print("VALIDATION REPORT: Vectorized Cost Cube vs calculate_system_lcoes()")
+print("=" * 80)
+print()
+
+failures = []
+cells = 0
+cube_time = scalar_time = 0.0
+
+# The scalar path rounds its outputs; compare the unrounded values
+costs.round = lambda value, digits=None: value
+try:
+    for scc_scenario in costs.SCC_SCENARIOS:
+        start = time.perf_counter()
+        cube = costs.build_cost_cube(SCENARIOS, REGIONS, YEARS, SOURCES, scc_scenario)
+        cube_time += time.perf_counter() - start
+
+        mismatches = 0
+        start = time.perf_counter()
+        for s, scenario in enumerate(SCENARIOS):
+            for r, region in enumerate(REGIONS):
+                for y, year in enumerate(YEARS):
+                    for k, source in enumerate(SOURCES):
+                        cells += 1
+                        found = differences(scalar_cell(source, year, scenario, region, scc_scenario),
+                                            cube_cell(cube, s, r, y, k))
+                        if found:
+                            mismatches += 1
+                            if mismatches <= 5:
+                                failures.append(f"{scenario} {region} {year} {source} (SCC {scc_scenario}): "
+                                                f"{found[0]}")
+        scalar_time += time.perf_counter() - start
+        if mismatches > 5:
+            failures.append(f"SCC {scc_scenario}: {mismatches} cells differ in total")
+finally:
+    del costs.round
+
+print(f"Cells compared:       {cells} ({len(SCENARIOS)} scenarios × {len(REGIONS)} regions × {len(YEARS)} years "
+      f"× {len(SOURCES)} sources × {len(costs.SCC_SCENARIOS)} SCC scenarios)")
+print(f"build_cost_cube():    {cube_time * 1000:8.1f} ms")
+print(f"Scalar path:          {scalar_time * 1000:8.1f} ms (incl. comparison)")
+print()
+
+if failures:
+    print(f"✗ FAIL: {len(failures)} checks failed")
+    for failure in failures[:20]:
+        print(f"  - {failure}")
+    sys.exit(1)
+
+print("✓ PASS: Cost cube is bit-identical to calculate_system_lcoes()")
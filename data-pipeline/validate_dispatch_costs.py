@@ -0,0 +1,127 @@
+"""
+Validate the dispatch-derived system integration costs (calculate_full_system_costs_v25.py)
+
+1. Curtailment rises with VRE penetration (hourly dispatch, fixed storage)
+2. Without storage there is no storage throughput and the storage cost
+   driver and the VRE storage component are 0
+3. The integration costs of build_cost_cube() equal calculate_system_lcoes()
+   for every scenario × region × year × source cell, with the dispatch
+   cache cleared before each path so both simulate from scratch
+"""
+
+import sys
+import time
+
+import numpy as np
+
+import calculate_full_system_costs_v25 as costs
+from scenario_sets import scenario_dimension
+from vre_dispatch import get_profiles, simulate_dispatch
+
+PENETRATIONS = np.round(np.arange(0.05, 1.0, 0.05), 2)
+SOLAR_SHARE = 0.5
+STORAGE_CASES = [(0.0, 4), (0.10, 4), (0.30, 8)]
+
+# Curtailment may stay flat (0) at low penetration but never fall
+MONOTONE_TOL = 1e-12
+
+if sys.platform == 'win32':
+    sys.stdout.reconfigure(encoding='utf-8')
+
+print("=" * 80)
+print("VALIDATION REPORT: Dispatch Cost Drivers and Cost Cube")
+print("=" * 80)
+print()
+
+failures = []
+
+# ============================================================================
+# 1. CURTAILMENT VS VRE PENETRATION
+# ============================================================================
+
+print("CURTAILMENT SHARE BY VRE PENETRATION (Global profiles)")
+print("-" * 80)
+for region in costs.REGIONAL_MULTIPLIERS:
+    profiles = get_profiles(region)
+    for power, hours in STORAGE_CASES:
+        n = len(PENETRATIONS)
+        metrics = simulate_dispatch(profiles, PENETRATIONS, [SOLAR_SHARE] * n, [power] * n, [hours] * n)
+        curtailment = metrics['curtailment_share']
+        drops = np.flatnonzero(np.diff(curtailment) < -MONOTONE_TOL)
+        if drops.size:
+            i = drops[0]
+            failures.append(f"{region}, storage {power}×{hours}h: curtailment falls from {curtailment[i]:.4f} "
+                            f"at {PENETRATIONS[i]:.0%} to {curtailment[i + 1]:.4f} at {PENETRATIONS[i + 1]:.0%} VRE")
+        if region == 'Global':
+            print(f"  storage {power:.2f}×{hours}h: " +
+                  "  ".join(f"{p:.0%} {c:.3f}" for p, c in zip(PENETRATIONS[::3], curtailment[::3])))
+print()
+
+# ============================================================================
+# 2. NO STORAGE, NO STORAGE COST
+# ============================================================================
+
+storage_costs = costs.interpolate_value(2030, costs.STORAGE_COSTS)
+n = len(PENETRATIONS)
+metrics = simulate_dispatch(get_profiles('Global'), PENETRATIONS, [SOLAR_SHARE] * n, [0.0] * n, [4] * n)
+for i, penetration in enumerate(PENETRATIONS):
+    cell_metrics = {name: float(values[i]) for name, values in metrics.items()}
+    drivers = costs.integration_cost_drivers(cell_metrics, (penetration, SOLAR_SHARE, 0.0, 4), storage_costs)
+    if cell_metrics['storage_throughput'] != 0:
+        failures.append(f"{penetration:.0%} VRE without storage: throughput {cell_metrics['storage_throughput']}")
+    if drivers['storage'] != 0:
+        failures.append(f"{penetration:.0%} VRE without storage: storage driver {drivers['storage']}")
+    for source in ['solar', 'wind', 'other_renewables']:
+        storage = costs.get_system_integration_costs(source, drivers)['storage']
+        if storage != 0:
+            failures.append(f"{penetration:.0%} VRE without storage: {source} storage cost {storage}")
+print(f"No-storage cells:     {n} penetrations checked")
+print()
+
+# ============================================================================
+# 3. COST CUBE VS calculate_system_lcoes()
+# ============================================================================
+
+sources = ['coal', 'oil', 'gas', 'nuclear', 'hydro', 'wind', 'solar', 'biofuels', 'other_renewables']
+scenarios = scenario_dimension().select(builtin=True)
+regions = list(costs.REGIONAL_MULTIPLIERS)
+years = costs.DISPATCH_YEARS
+
+costs.clear_dispatch_cache()
+start = time.perf_counter()
+cube = costs.build_cost_cube(scenarios, regions, years, sources)
+cube_time = time.perf_counter() - start
+
+costs.clear_dispatch_cache()
+start = time.perf_counter()
+cells = 0
+for s, scenario in enumerate(scenarios):
+    for r, region in enumerate(regions):
+        for y, year in enumerate(years):
+            for k, source in enumerate(sources):
+                cells += 1
+                expected = costs.calculate_system_lcoes(source, year, scenario, region)
+                label = f"{scenario} {region} {year} {source}"
+                for component, value in costs.factorized_system_costs(cube, s, r, source).items():
+                    actual = round(value[y] if isinstance(value, list) else value, 2)
+                    if actual != expected['system_costs'][component]:
+                        failures.append(f"{label} {component}: cube {actual} vs {expected['system_costs'][component]}")
+                total = cube['total_system_cost'][source]
+                total = round(float(total[s, r, y] if isinstance(total, np.ndarray) else total), 2)
+                if total != expected['total_system_cost_mwh']:
+                    failures.append(f"{label} total system cost: cube {total} vs {expected['total_system_cost_mwh']}")
+scalar_time = time.perf_counter() - start
+
+print(f"Cost cube cells:      {cells} ({len(scenarios)} scenarios × {len(regions)} regions × "
+      f"{len(years)} years × {len(sources)} sources)")
+print(f"build_cost_cube():    {cube_time * 1000:8.1f} ms (cold dispatch cache)")
+print(f"Scalar path:          {scalar_time * 1000:8.1f} ms (cold dispatch cache)")
+print()
+
+if failures:
+    print(f"✗ FAIL: {len(failures)} checks failed")
+    for failure in failures[:20]:
+        print(f"  - {failure}")
+    sys.exit(1)
+
+print("✓ PASS: Dispatch cost drivers behave and the cost cube matches the scalar path")
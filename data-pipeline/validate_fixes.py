@@ -1,19 +1,18 @@
-import json
+from cost_accessor import expand_costs, load_costs
 
-# Load the regenerated data
-with open('../global-energy-services/public/data/full_system_costs.json', 'r') as f:
-    data = json.load(f)
+# Load the regenerated (factorized) data and materialize every cell
+data = expand_costs(load_costs())
 
 print("=" * 80)
 print("VALIDATION REPORT: 5 Critical Fixes Applied")
 print("=" * 80)
 print()
 
-# Get 2050 NZE Global data for validation
-nze_global = data['scenarios']['NZE']['regions']['Global']['timeseries']
+# Get 2050 Optimistic Global data for validation
+nze_global = data['scenarios']['Optimistic']['regions']['Global']['timeseries']
 nze_2050 = next(y for y in nze_global if y['year'] == 2050)
 
-print("TARGET: 2050 NZE Global Scenario (90% VRE)")
+print("TARGET: 2050 Optimistic Global Scenario")
 print("-" * 80)
 print(f"VRE Penetration: {nze_2050['vre_penetration']*100:.0f}%")
 print()
@@ -24,7 +23,7 @@ print("-" * 80)
 solar = nze_2050['sources']['solar']
 wind = nze_2050['sources']['wind']
 
-print(f"Solar 2050 NZE:")
+print(f"Solar 2050 Optimistic:")
 print(f"  Base LCOE: ${solar['base_lcoe_mwh']}/MWh")
 print(f"  System Costs: ${solar['total_system_cost_mwh']}/MWh")
 print(f"  Total LCOES: ${solar['total_lcoes_mwh']}/MWh")
@@ -35,7 +34,7 @@ else:
     print(f"  ✗ FAIL: Outside target range (${solar['total_lcoes_mwh'] - 135:.0f} from target)")
 
 print()
-print(f"Wind 2050 NZE:")
+print(f"Wind 2050 Optimistic:")
 print(f"  Base LCOE: ${wind['base_lcoe_mwh']}/MWh")
 print(f"  System Costs: ${wind['total_system_cost_mwh']}/MWh")
 print(f"  Total LCOES: ${wind['total_lcoes_mwh']}/MWh")
@@ -50,7 +49,7 @@ print()
 print("FIX 2: Gas System Costs Explode at High VRE (Peaking Operation)")
 print("-" * 80)
 gas = nze_2050['sources']['gas']
-print(f"Gas 2050 NZE:")
+print(f"Gas 2050 Optimistic:")
 print(f"  Base LCOE: ${gas['base_lcoe_mwh']}/MWh")
 print(f"  System Costs: ${gas['total_system_cost_mwh']}/MWh")
 print(f"    - Grid: ${gas['system_costs']['grid']}/MWh")
@@ -68,7 +67,7 @@ print()
 print("FIX 3: Nuclear Provides Grid Stability Benefit at High VRE")
 print("-" * 80)
 nuclear = nze_2050['sources']['nuclear']
-print(f"Nuclear 2050 NZE:")
+print(f"Nuclear 2050 Optimistic:")
 print(f"  Base LCOE: ${nuclear['base_lcoe_mwh']}/MWh")
 print(f"  System Costs: ${nuclear['total_system_cost_mwh']}/MWh (should be negative)")
 print(f"    - Grid: ${nuclear['system_costs']['grid']}/MWh")
@@ -90,7 +89,7 @@ print()
 # FIX 4: Rebound Effect (Induced Demand)
 print("FIX 4: Rebound Effect Applied to Service Units")
 print("-" * 80)
-print(f"Rebound Multiplier 2050 NZE: {solar['rebound_multiplier']}")
+print(f"Rebound Multiplier 2050 Optimistic: {solar['rebound_multiplier']}")
 print(f"  Expected: 1.05 (+5% induced demand from cheap electricity)")
 
 if 1.04 <= solar['rebound_multiplier'] <= 1.06:
@@ -130,7 +129,7 @@ print()
 
 # Summary Table
 print("=" * 80)
-print("SUMMARY: 2050 NZE Global System LCOES ($/MWh)")
+print("SUMMARY: 2050 Optimistic Global System LCOES ($/MWh)")
 print("=" * 80)
 print(f"{'Source':<15} {'Base LCOE':<12} {'System Cost':<12} {'Total LCOES':<12} {'$/home-year'}")
 print("-" * 80)
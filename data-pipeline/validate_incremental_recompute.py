@@ -0,0 +1,175 @@
+"""
+Validate the dependency-tracked incremental recompute (incremental_recompute.py)
+
+In a scratch directory, with copies of the tracked configs searched first:
+1. A full recompute writes both outputs and records the dependencies
+2. A config edit (a solar learning rate and a Baseline policy multiplier)
+   is patched incrementally and must touch only part of the cells
+3. The patched outputs must equal a full recompute with the edited
+   configs (parsed JSON, ignoring generation timestamps)
+4. The patch rewrites only the manifest files of the edited configs and
+   the patched scenarios
+5. From cold caches (dispatch results, VRE profiles, learning solutions),
+   as in a fresh process, the patch must be faster than a full recompute
+
+Nothing under public/data, data-pipeline/config or the real manifest is
+touched.
+"""
+
+import contextlib
+import io
+import json
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import incremental_recompute as incremental
+from config_registry import REGISTRY
+from learning_by_deployment import clear_solution_cache
+from vre_dispatch import clear_profile_cache
+
+if sys.platform == 'win32':
+    sys.stdout.reconfigure(encoding='utf-8')
+
+# Metadata keys that differ between runs
+TIMESTAMP_KEYS = {'generated', 'date_generated'}
+
+# (config, key path, new value)
+CONFIG_EDITS = [
+    ('learning_curves.json', ('learning_rates', 'solar_pv', 'learning_rate'), 0.28),
+    ('policy_scenarios.json', ('global_aggregated_multipliers', 'by_technology', 'solar_pv', 'Baseline',
+                               '2041-2050'), 1.30),
+]
+
+def use_output_dir(directory):
+    """Point incremental_recompute's outputs and manifest at directory"""
+    directory.mkdir(parents=True, exist_ok=True)
+    incremental.PROJECTIONS_FILE = directory / incremental.PROJECTIONS_FILE.name
+    incremental.COSTS_FILE = directory / incremental.COSTS_FILE.name
+    incremental.MANIFEST_DIR = directory / incremental.MANIFEST_DIR.name
+
+def clear_caches():
+    """Start the next run as cold as a fresh process"""
+    incremental.costs.clear_dispatch_cache()
+    clear_profile_cache()
+    clear_solution_cache()
+
+def manifest_files():
+    """{relative path: (inode, mtime)} of the manifest files"""
+    return {str(path.relative_to(incremental.MANIFEST_DIR)): (path.stat().st_ino, path.stat().st_mtime_ns)
+            for path in incremental.MANIFEST_DIR.rglob('*.json')}
+
+def edit_config(config_dir, name, path, value):
+    config_path = config_dir / name
+    with open(config_path, 'r') as f:
+        config = json.load(f)
+    target = config
+    for key in path[:-1]:
+        target = target[key]
+    target[path[-1]] = value
+    with open(config_path, 'w') as f:
+        json.dump(config, f, indent=2)
+
+def without_timestamps(value):
+    if isinstance(value, dict):
+        return {key: without_timestamps(item) for key, item in value.items() if key not in TIMESTAMP_KEYS}
+    if isinstance(value, list):
+        return [without_timestamps(item) for item in value]
+    return value
+
+print("=" * 80)
+print("VALIDATION REPORT: Incremental Recompute vs Full Recompute")
+print("=" * 80)
+print()
+
+failures = []
+search_dirs = list(REGISTRY.search_dirs)
+with tempfile.TemporaryDirectory(prefix='incremental_validate_') as tmp:
+    root = Path(tmp)
+    config_dir = root / 'config'
+    config_dir.mkdir()
+    for name in incremental.TRACKED_CONFIGS:
+        shutil.copy(REGISTRY.path(name), config_dir / name)
+    REGISTRY.search_dirs = [config_dir] + search_dirs
+    REGISTRY.invalidate()
+
+    try:
+        use_output_dir(root / 'incremental')
+        with contextlib.redirect_stdout(io.StringIO()):
+            first = incremental.incremental_recompute()
+        if not first['full']:
+            failures.append("first run without a manifest did not run a full recompute")
+
+        for name, path, value in CONFIG_EDITS:
+            edit_config(config_dir, name, path, value)
+        before = manifest_files()
+        clear_caches()
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            patch = incremental.incremental_recompute()
+        patch_time = time.perf_counter() - start
+        patched_files = [incremental.PROJECTIONS_FILE, incremental.COSTS_FILE]
+
+        total_projections = len(incremental.engine.SCENARIOS) * len(incremental.PROJECTION_YEARS)
+        total_costs = len(incremental.COST_SCENARIOS) * len(incremental.COST_YEARS) * len(incremental.COST_SOURCES)
+        if patch['full']:
+            failures.append("config edit ran a full recompute instead of a patch")
+        elif not patch['projection_cells'] or not patch['cost_cells']:
+            failures.append(f"config edit reached {len(patch['projection_cells'])} projection records and "
+                            f"{len(patch['cost_cells'])} cost entries (expected both)")
+        elif len(patch['cost_cells']) == total_costs:
+            failures.append("config edit recomputed every cost entry")
+
+        after = manifest_files()
+        rewritten = {name for name in after if before.get(name) != after[name]}
+        expected = ({f'configs/{name}' for name in dict.fromkeys(name for name, _, _ in CONFIG_EDITS)}
+                    | {f'projections/{scenario}.json' for scenario, _ in patch['projection_cells']}
+                    | {f'costs/{scenario}.json' for scenario, _, _ in patch['cost_cells']})
+        if rewritten != expected:
+            failures.append(f"patch rewrote manifest files {sorted(rewritten)} (expected {sorted(expected)})")
+
+        use_output_dir(root / 'full')
+        clear_caches()
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            incremental.full_recompute()
+        full_time = time.perf_counter() - start
+
+        for patched_path, full_path in zip(patched_files, [incremental.PROJECTIONS_FILE, incremental.COSTS_FILE]):
+            with open(patched_path, 'r') as f:
+                patched = without_timestamps(json.load(f))
+            with open(full_path, 'r') as f:
+                full = without_timestamps(json.load(f))
+            if patched != full:
+                failures.append(f"{patched_path.name}: patched output differs from a full recompute")
+    finally:
+        REGISTRY.search_dirs = search_dirs
+        REGISTRY.invalidate()
+        incremental.engine.get_compiled_parameters(revalidate=True)
+
+print("Config edits:")
+for name, path, value in CONFIG_EDITS:
+    print(f"  - {name}: {' / '.join(path)} = {value}")
+print(f"Changed config keys:  {len(patch['changed_paths'])}")
+print(f"Projection records:   {len(patch['projection_cells'])} / {total_projections} recomputed")
+print(f"Cost entries:         {len(patch['cost_cells'])} / {total_costs} recomputed")
+print()
+print(f"Manifest files:       {len(rewritten)} / {len(after)} rewritten")
+print()
+print(f"Incremental patch:    {patch_time:8.2f} s (cold caches)")
+print(f"Full recompute:       {full_time:8.2f} s (cold caches, incl. dependency recording)")
+print(f"Speedup:              {full_time / patch_time:8.1f}x")
+print()
+
+if patch_time >= full_time:
+    failures.append(f"incremental patch ({patch_time:.2f} s) is not faster than a full recompute ({full_time:.2f} s)")
+
+if failures:
+    print(f"✗ FAIL: {len(failures)} checks failed")
+    for failure in failures:
+        print(f"  - {failure}")
+    sys.exit(1)
+
+print("✓ PASS: Patched outputs equal a full recompute and take less time")
@@ -0,0 +1,90 @@
+"""
+Validate the learning-by-deployment fixed point (learning_by_deployment.py)
+
+For the batch of every scenario:
+1. Every row converges within MAX_ITERATIONS at DEFAULT_TOLERANCE
+2. The solution is a fixed point: one more update moves no steepness
+   multiplier by more than DEFAULT_TOLERANCE
+3. A row's solution does not depend on its batch (each scenario solved
+   alone equals its batch row exactly)
+4. A looser tolerance stops earlier and stays within that tolerance of
+   the tight solution
+5. A row cut off by max_iterations is reported as not converged
+"""
+
+import sys
+import time
+
+import numpy as np
+
+from learning_by_deployment import (BASE_YEAR, DEFAULT_TOLERANCE, MAX_ITERATIONS, TARGET_YEAR,
+                                    solve_learning_by_deployment, solve_scenarios)
+from projection_engine_v4 import SCENARIOS
+from projection_engine_vectorized import build_cost_parameters, build_scenario_parameters
+
+LOOSE_TOLERANCE = 1e-6
+
+if sys.platform == 'win32':
+    sys.stdout.reconfigure(encoding='utf-8')
+
+print("=" * 80)
+print("VALIDATION REPORT: Learning-by-Deployment Fixed Point")
+print("=" * 80)
+print()
+
+failures = []
+params = build_scenario_parameters(SCENARIOS, BASE_YEAR, TARGET_YEAR)
+cost_params = build_cost_parameters(SCENARIOS, BASE_YEAR, TARGET_YEAR)
+
+# 1. Convergence
+start = time.perf_counter()
+solution = solve_learning_by_deployment(params, cost_params)
+solve_time = time.perf_counter() - start
+multiplier = solution['steepness_multiplier']
+for i, scenario in enumerate(SCENARIOS):
+    print(f"  {scenario:<15} {solution['iterations'][i]:3d} iterations, converged: {bool(solution['converged'][i])}")
+    if not solution['converged'][i]:
+        failures.append(f"{scenario}: no convergence in {MAX_ITERATIONS} iterations")
+print()
+
+# 2. Fixed-point residual: continue every row for one more update
+extra = solve_learning_by_deployment(params, cost_params, tolerance=0,
+                                     max_iterations=int(solution['iterations'].max()) + 1)
+residual = np.abs(extra['steepness_multiplier'] - multiplier).max(axis=1)
+for i, scenario in enumerate(SCENARIOS):
+    if residual[i] > DEFAULT_TOLERANCE:
+        failures.append(f"{scenario}: one more update moves the multiplier by {residual[i]:.2e} "
+                        f"(tolerance {DEFAULT_TOLERANCE:.0e})")
+print(f"Fixed-point residual: {residual.max():.2e} (tolerance {DEFAULT_TOLERANCE:.0e})")
+
+# 3. Batch independence
+for i, scenario in enumerate(SCENARIOS):
+    alone = solve_scenarios([scenario])
+    if not (np.array_equal(alone['steepness_multiplier'][0], multiplier[i])
+            and np.array_equal(alone['costs'][0], solution['costs'][i], equal_nan=True)):
+        failures.append(f"{scenario}: solved alone differs from its batch row")
+
+# 4. Looser tolerance
+loose = solve_learning_by_deployment(params, cost_params, tolerance=LOOSE_TOLERANCE)
+loose_error = np.abs(loose['steepness_multiplier'] - multiplier).max()
+if (loose['iterations'] > solution['iterations']).any():
+    failures.append(f"tolerance {LOOSE_TOLERANCE:.0e} took more iterations than {DEFAULT_TOLERANCE:.0e}")
+if loose_error > LOOSE_TOLERANCE:
+    failures.append(f"tolerance {LOOSE_TOLERANCE:.0e}: multipliers {loose_error:.2e} from the tight solution")
+print(f"Tolerance {LOOSE_TOLERANCE:.0e}:     {loose['iterations'].max()} iterations, "
+      f"{loose_error:.2e} from the tight solution")
+
+# 5. Cut-off rows are flagged
+cut = solve_learning_by_deployment(params, cost_params, max_iterations=1)
+if cut['converged'][solution['iterations'] > 1].any():
+    failures.append("rows stopped by max_iterations=1 are reported as converged")
+print(f"Solved in:            {solve_time * 1000:.1f} ms")
+print()
+
+if failures:
+    print(f"✗ FAIL: {len(failures)} checks failed")
+    for failure in failures:
+        print(f"  - {failure}")
+    sys.exit(1)
+
+print("✓ PASS: Learning-by-deployment solver converges to a batch-independent fixed point")
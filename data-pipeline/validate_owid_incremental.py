@@ -0,0 +1,178 @@
+"""
+Validate the OWID incremental recompute (owid_incremental.py)
+
+In a scratch directory, with the benchmark's synthetic OWID dataset as
+the first snapshot:
+1. The first run has no manifest and runs a full recompute
+2. A revised snapshot (changed 'World' years, countries and aggregates)
+   is patched incrementally, at least MIN_SPEEDUP times faster than a
+   full recompute (snapshot caches built beforehand, as fetch_data.py does)
+3. A second revision drops a country from the snapshot; Global and the
+   aggregates it belonged to are patched without it
+4. After each revision the patched outputs must equal a full recompute
+   of the revised snapshot (parsed JSON, and for the outputs patched
+   record by record the file text, ignoring generation timestamps)
+
+Nothing under public/data or the real snapshot store is touched.
+"""
+
+import contextlib
+import hashlib
+import io
+import json
+import re
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import owid_incremental as incremental
+from benchmark_pipeline import generate_synthetic_owid
+from fetch_data import LATEST_POINTER, load_snapshot_cache, snapshot_path, write_json_file
+
+if sys.platform == 'win32':
+    sys.stdout.reconfigure(encoding='utf-8')
+
+# Metadata keys that differ between runs
+TIMESTAMP_KEYS = {'generated_at'}
+TIMESTAMP_PATTERN = re.compile(r'"generated_at": ?"[^"]*"')
+
+# Required speedup of a patch over a full recompute
+MIN_SPEEDUP = 5
+
+# Country removed by the second revision (African, OPEC, not an output region)
+DROPPED_COUNTRY = 'Nigeria'
+
+# Output path globals of owid_incremental redirected to the scratch tree
+OUTPUT_GLOBALS = ['USEFUL_FILE', 'SERVICES_FILE', 'FF_GROWTH_FILE', 'ENTITY_FILE', 'REGIONAL_FILE', 'NET_IMPORTS_FILE']
+
+def store_snapshot(df, snapshot_dir):
+    """Write df as a content-addressed snapshot and point latest at it"""
+    content = df.to_csv(index=False).encode('utf-8')
+    digest = hashlib.sha256(content).hexdigest()
+    Path(snapshot_path(str(snapshot_dir), digest)).write_bytes(content)
+    write_json_file(str(snapshot_dir / LATEST_POINTER), {'sha256': digest})
+    return digest
+
+def use_output_dir(directory):
+    """Point owid_incremental's outputs and manifest at directory"""
+    directory.mkdir(parents=True, exist_ok=True)
+    incremental.SERVICES_DATA_DIR = directory
+    incremental.MANIFEST_PATH = directory / 'owid_outputs_manifest.json'
+    for name in OUTPUT_GLOBALS:
+        setattr(incremental, name, directory / getattr(incremental, name).name)
+    incremental.OUTPUT_FILES = [getattr(incremental, name) for name in OUTPUT_GLOBALS]
+
+def without_timestamps(value):
+    if isinstance(value, dict):
+        return {key: without_timestamps(item) for key, item in value.items() if key not in TIMESTAMP_KEYS}
+    if isinstance(value, list):
+        return [without_timestamps(item) for item in value]
+    return value
+
+def revise(df):
+    """Synthetic OWID revision: latest year of a few entities and two older World years"""
+    revised = df.copy()
+    columns = [column for column in revised.columns
+               if column.endswith(('_consumption', '_electricity', '_production'))]
+    latest = (revised['year'] == revised['year'].max()) & revised['country'].isin(['World', 'Germany', 'Brazil',
+                                                                                 'Asia', 'Nigeria'])
+    older = (revised['country'] == 'World') & revised['year'].isin([1990, 2010])
+    revised.loc[latest, columns] *= 1.05
+    revised.loc[older, 'coal_consumption'] *= 0.97
+    return revised, int(latest.sum() + older.sum())
+
+def compare_outputs(patched_files, full_files, label):
+    """Failures where patched outputs differ from a full recompute"""
+    differences = []
+    for patched_path, full_path in zip(patched_files, full_files):
+        with open(patched_path, 'r', encoding='utf-8') as f:
+            patched = f.read()
+        with open(full_path, 'r', encoding='utf-8') as f:
+            full = f.read()
+        if without_timestamps(json.loads(patched)) != without_timestamps(json.loads(full)):
+            differences.append(f"{label} {patched_path.name}: patched output differs from a full recompute")
+        elif patched_path.name in incremental.RECORD_OUTPUTS and \
+                TIMESTAMP_PATTERN.sub('', patched) != TIMESTAMP_PATTERN.sub('', full):
+            differences.append(f"{label} {patched_path.name}: patched file text differs from a full recompute")
+    return differences
+
+def patch_and_compare(snapshot_df, root, label):
+    """Patch the incremental outputs to a new snapshot and compare with a full recompute of it"""
+    use_output_dir(root / 'incremental')
+    snapshot = store_snapshot(snapshot_df, root / 'snapshots')
+    load_snapshot_cache(str(root / 'snapshots'), snapshot)
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        result = incremental.incremental_recompute()
+    patch_time = time.perf_counter() - start
+    patched_files = list(incremental.OUTPUT_FILES)
+
+    use_output_dir(root / 'full')
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        incremental.full_recompute(snapshot, incremental.load_useful_configs())
+    full_time = time.perf_counter() - start
+    return result, patch_time, full_time, compare_outputs(patched_files, incremental.OUTPUT_FILES, label)
+
+print("=" * 80)
+print("VALIDATION REPORT: OWID Incremental Recompute vs Full Recompute")
+print("=" * 80)
+print()
+
+failures = []
+with tempfile.TemporaryDirectory(prefix='owid_incremental_validate_') as tmp:
+    root = Path(tmp)
+    snapshot_dir = root / 'snapshots'
+    snapshot_dir.mkdir()
+    incremental.SNAPSHOT_DIR = snapshot_dir
+    use_output_dir(root / 'incremental')
+
+    df = generate_synthetic_owid()
+    store_snapshot(df, snapshot_dir)
+    with contextlib.redirect_stdout(io.StringIO()):
+        first = incremental.incremental_recompute()
+    if not first['full']:
+        failures.append("first run without a manifest did not run a full recompute")
+
+    # ------------------------------------------------------------------------
+    # Revision: changed values
+    # ------------------------------------------------------------------------
+    revised, changed_rows = revise(df)
+    patch, patch_time, full_time, differences = patch_and_compare(revised, root, 'revision')
+    failures += differences
+    if patch['full']:
+        failures.append("revised snapshot ran a full recompute instead of a patch")
+    if not all(patch['patched'].values()):
+        failures.append(f"revision did not reach every stage: {patch['patched']}")
+    if patch_time * MIN_SPEEDUP > full_time:
+        failures.append(f"patch took {patch_time * 1000:.1f} ms, less than {MIN_SPEEDUP}x faster than "
+                        f"a full recompute ({full_time * 1000:.1f} ms)")
+
+    # ------------------------------------------------------------------------
+    # Revision: a country dropped from the snapshot
+    # ------------------------------------------------------------------------
+    dropped = revised[revised['country'] != DROPPED_COUNTRY]
+    removal, _, _, differences = patch_and_compare(dropped, root, f"without {DROPPED_COUNTRY}")
+    failures += differences
+    if removal['full']:
+        failures.append(f"snapshot without {DROPPED_COUNTRY} ran a full recompute instead of a patch")
+
+print(f"Revised OWID rows:    {changed_rows}")
+print(f"Changed cells:        {len(patch['cells'])}")
+for stage, count in patch['patched'].items():
+    print(f"  {stage:15s} {count:5d} rows patched")
+print(f"Dropped {DROPPED_COUNTRY}:       {len(removal['cells'])} changed cells, "
+      f"{removal['patched']['net_imports']} net imports region-years patched")
+print()
+print(f"Incremental patch:    {patch_time * 1000:8.1f} ms (snapshot caches built beforehand)")
+print(f"Full recompute:       {full_time * 1000:8.1f} ms ({full_time / patch_time:.1f}x, required {MIN_SPEEDUP}x)")
+print()
+
+if failures:
+    print(f"✗ FAIL: {len(failures)} checks failed")
+    for failure in failures:
+        print(f"  - {failure}")
+    sys.exit(1)
+
+print("✓ PASS: Patched outputs equal a full recompute")
@@ -0,0 +1,73 @@
+"""
+Validate the reproducibility of the Monte Carlo ensemble (projection_ensemble.py)
+
+With a fixed seed and batch size:
+1. Running the batches in-process (workers=1) and on a process pool
+   (workers=N) gives identical percentile bands, means and clipped
+   fractions for every metric
+2. Repeating the in-process run gives identical bands
+3. A different seed gives different bands (the seed reaches the samples)
+
+Nothing is written to public/data.
+"""
+
+import sys
+import time
+
+from projection_ensemble import DEFAULT_DRAWS, DEFAULT_SEED, PERCENTILES, run_ensemble
+
+N_DRAWS = DEFAULT_DRAWS
+BATCH_SIZE = 1_000  # 10 batches, split unevenly over the pool
+POOL_WORKERS = 3
+
+if sys.platform == 'win32':
+    sys.stdout.reconfigure(encoding='utf-8')
+
+def band_differences(expected, actual):
+    """Metric/band keys whose values are not exactly equal"""
+    if list(expected['bands']) != list(actual['bands']):
+        return [f"metrics {list(expected['bands'])} vs {list(actual['bands'])}"]
+    return [f"{metric}/{key}" for metric, bands in expected['bands'].items()
+            for key in bands if bands[key] != actual['bands'][metric][key]]
+
+print("=" * 80)
+print("VALIDATION REPORT: Projection Ensemble Reproducibility")
+print("=" * 80)
+print()
+
+failures = []
+runs = {}
+for label, seed, workers in [('in-process', DEFAULT_SEED, 1),
+                             ('pool', DEFAULT_SEED, POOL_WORKERS),
+                             ('repeat', DEFAULT_SEED, 1),
+                             ('other seed', DEFAULT_SEED + 1, 1)]:
+    start = time.perf_counter()
+    runs[label] = run_ensemble(N_DRAWS, seed=seed, batch_size=BATCH_SIZE, workers=workers)
+    print(f"  {label:<12} seed {seed}, workers {workers}: {time.perf_counter() - start:6.2f} s")
+print()
+
+# 1. Pool vs in-process
+for difference in band_differences(runs['in-process'], runs['pool']):
+    failures.append(f"workers={POOL_WORKERS} vs workers=1: {difference} differs")
+
+# 2. Repeat run
+for difference in band_differences(runs['in-process'], runs['repeat']):
+    failures.append(f"repeated run: {difference} differs")
+
+# 3. Different seed
+if not band_differences(runs['in-process'], runs['other seed']):
+    failures.append(f"seed {DEFAULT_SEED + 1} gives the same bands as seed {DEFAULT_SEED}")
+
+metrics = runs['in-process']['bands']
+print(f"Draws:                {N_DRAWS} in batches of {BATCH_SIZE}")
+print(f"Bands compared:       {len(metrics)} metrics × {len(PERCENTILES) + 2} bands × "
+      f"{len(runs['in-process']['years'])} years")
+print()
+
+if failures:
+    print(f"✗ FAIL: {len(failures)} checks failed")
+    for failure in failures[:20]:
+        print(f"  - {failure}")
+    sys.exit(1)
+
+print("✓ PASS: Ensemble bands depend on the seed only, not on the number of workers")
@@ -0,0 +1,126 @@
+"""
+Validate the tornado analysis (projection_sensitivity.py)
+
+For every scenario and every reported metric and year:
+1. The tornado has one bar per perturbed parameter (5 per technology plus
+   demand growth), each parameter exactly once
+2. Bars are sorted by descending swing, ties kept in parameter order,
+   and every swing equals |high - low|
+3. The base value equals the scenario solved alone (solve_scenarios)
+4. Every bar's low and high equal a separate learning-by-deployment solve
+   with only that parameter scaled by (1 - delta) and (1 + delta)
+"""
+
+import sys
+import time
+
+import numpy as np
+
+from learning_by_deployment import solve_learning_by_deployment, solve_scenarios
+from projection_engine_v4 import BASE_YEAR, SCENARIOS, TARGET_YEAR
+from projection_engine_vectorized import build_cost_parameters, build_scenario_parameters
+from projection_sensitivity import (DEFAULT_DELTA, PER_TECHNOLOGY_PARAMETERS, REPORT_METRICS, REPORT_YEARS,
+                                    run_sensitivity)
+
+if sys.platform == 'win32':
+    sys.stdout.reconfigure(encoding='utf-8')
+
+def perturbed_run(scenario, parameter, factor):
+    """Report values of one scenario with a single parameter scaled by factor"""
+    params = build_scenario_parameters([scenario], BASE_YEAR, TARGET_YEAR)
+    params = {key: value.copy() if isinstance(value, np.ndarray) else value for key, value in params.items()}
+    label, _, tech = parameter.partition('.')
+    key = dict(PER_TECHNOLOGY_PARAMETERS).get(label, label)
+    if tech:
+        params[key][0, params['technologies'].index(tech)] *= factor
+    else:
+        params[key][0] *= factor
+    results = solve_learning_by_deployment(params, build_cost_parameters([scenario], BASE_YEAR, TARGET_YEAR))['results']
+    years = [int(year) for year in params['years']]
+    return {metric: {year: float(results[metric][0, years.index(year)]) for year in REPORT_YEARS}
+            for metric in REPORT_METRICS}
+
+print("=" * 80)
+print("VALIDATION REPORT: Sensitivity Tornado Bars")
+print("=" * 80)
+print()
+
+failures = []
+tornados = 0
+separate_time = 0.0
+for scenario in SCENARIOS:
+    start = time.perf_counter()
+    sensitivity = run_sensitivity(scenario)
+    batch_time = time.perf_counter() - start
+
+    parameters = sensitivity['parameters']
+    technologies = build_scenario_parameters([scenario], BASE_YEAR, TARGET_YEAR)['technologies']
+    expected_count = len(PER_TECHNOLOGY_PARAMETERS) * len(technologies) + 1
+    if len(parameters) != expected_count or len(set(parameters)) != expected_count:
+        failures.append(f"{scenario}: {len(set(parameters))} distinct of {len(parameters)} parameters "
+                        f"(expected {expected_count})")
+
+    # 1-2. Bar count and ordering
+    for metric, by_year in sensitivity['tornado'].items():
+        for year, bars in by_year.items():
+            tornados += 1
+            label = f"{scenario} {metric} {year}"
+            if sorted(bar['parameter'] for bar in bars) != sorted(parameters):
+                failures.append(f"{label}: {len(bars)} bars do not cover the {len(parameters)} parameters once each")
+                continue
+            for bar in bars:
+                if bar['swing'] != abs(bar['high'] - bar['low']):
+                    failures.append(f"{label} {bar['parameter']}: swing {bar['swing']} vs "
+                                    f"|high - low| {abs(bar['high'] - bar['low'])}")
+            for above, below in zip(bars, bars[1:]):
+                if above['swing'] < below['swing'] or (
+                        above['swing'] == below['swing']
+                        and parameters.index(above['parameter']) > parameters.index(below['parameter'])):
+                    failures.append(f"{label}: {above['parameter']} ({above['swing']:.6f}) ranked above "
+                                    f"{below['parameter']} ({below['swing']:.6f})")
+                    break
+
+    # 3. Base run
+    solution = solve_scenarios([scenario])
+    results = solution['results']
+    years = [int(year) for year in solution['params']['years']]
+    for metric in REPORT_METRICS:
+        for year in REPORT_YEARS:
+            alone = float(results[metric][0, years.index(year)])
+            if sensitivity['base'][metric][year] != alone:
+                failures.append(f"{scenario} {metric} {year}: base {sensitivity['base'][metric][year]} vs "
+                                f"scenario solved alone {alone}")
+
+    # 4. Bars vs separate one-at-a-time solves
+    start = time.perf_counter()
+    mismatches = 0
+    for parameter in parameters:
+        low = perturbed_run(scenario, parameter, 1 - DEFAULT_DELTA)
+        high = perturbed_run(scenario, parameter, 1 + DEFAULT_DELTA)
+        for metric, by_year in sensitivity['tornado'].items():
+            for year, bars in by_year.items():
+                bar = next(bar for bar in bars if bar['parameter'] == parameter)
+                if (bar['low'], bar['high']) != (low[metric][year], high[metric][year]):
+                    mismatches += 1
+                    if mismatches <= 5:
+                        failures.append(f"{scenario} {metric} {year} {parameter}: bar {bar['low']}/{bar['high']} vs "
+                                        f"separate solves {low[metric][year]}/{high[metric][year]}")
+    separate_time += time.perf_counter() - start
+    if mismatches > 5:
+        failures.append(f"{scenario}: {mismatches} bars differ from separate solves in total")
+
+    print(f"  {scenario:<15} {len(parameters)} bars per tornado, {sensitivity['runs']} runs in one batch "
+          f"({batch_time * 1000:.1f} ms)")
+print()
+print(f"Tornados checked:     {tornados} ({len(SCENARIOS)} scenarios × {len(REPORT_METRICS)} metrics × "
+      f"{len(REPORT_YEARS)} years)")
+print(f"Separate solves:      {separate_time * 1000:8.1f} ms")
+print()
+
+if failures:
+    print(f"✗ FAIL: {len(failures)} checks failed")
+    for failure in failures[:20]:
+        print(f"  - {failure}")
+    sys.exit(1)
+
+print("✓ PASS: Tornado bars cover every parameter once, ranked by swing, and match separate runs")
@@ -0,0 +1,167 @@
+"""
+Validate the hierarchical reconciliation (reconcile_hierarchy.py)
+
+On the benchmark's synthetic OWID dataset (blank cells, continents and a
+World that disagree with their countries, Oceania far above the sum of
+its countries):
+1. Every level converges within MAX_ITERATIONS
+2. Children plus their parent's remainder sum to the parent for every
+   tier, year and source (relative 1e-9 of the parent's total), and
+   remainders are never negative
+3. No reported child value is zeroed (in particular below blank parent
+   cells) and no child grows above its own total: a parent's excess over
+   its children goes to its remainder
+4. The dataset exercises blank parent cells, opened zero patterns and a
+   parent/children gap
+On a consistent hierarchy (parents = children × noise) RAS must converge
+as well.
+"""
+
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+PIPELINE_DIR = Path(__file__).resolve().parent
+SERVICES_PIPELINE_DIR = PIPELINE_DIR.parent / 'global-energy-services' / 'data-pipeline'
+if str(SERVICES_PIPELINE_DIR) not in sys.path:
+    sys.path.insert(0, str(SERVICES_PIPELINE_DIR))
+
+import calculate_net_imports as net_imports
+import calculate_useful_energy_v2 as useful
+from benchmark_pipeline import generate_synthetic_owid, write_synthetic_inputs
+from config_registry import working_directory
+from owid_cache import OwidCache
+from reconcile_hierarchy import (MAX_ITERATIONS, ROOT, TIERS, TOLERANCE, fill_unreported, hierarchy_levels,
+                                 reconcile, region_hierarchy, tier_arrays)
+
+REL_TOL = 1e-9
+
+if sys.platform == 'win32':
+    sys.stdout.reconfigure(encoding='utf-8')
+
+print("=" * 80)
+print("VALIDATION REPORT: Hierarchical Reconciliation (World → Continents → Countries)")
+print("=" * 80)
+print()
+
+failures = []
+
+def check_levels(name, values, reported, entities, levels, reconciled, remainders, stats):
+    """Levels converge, children and remainder sum to parents, reported values are kept and never inflated"""
+    index = {entity: i for i, entity in enumerate(entities)}
+    filled, _ = fill_unreported(values, reported, entities, levels)
+    cells = 0
+    for level, (groups, level_stats) in enumerate(zip(levels, stats), start=1):
+        if not level_stats['converged']:
+            failures.append(f"{name} level {level}: no convergence in {MAX_ITERATIONS} iterations "
+                            f"(residual {level_stats['residual']:.2e}, tolerance {TOLERANCE:.0e})")
+
+        indptr, children = net_imports.membership_matrix(groups, entities)
+        parent_rows = [index[parent] for parent in groups]
+        parents = reconciled[:, parent_rows]
+        remainder = np.stack([remainders[parent] for parent in groups], axis=1)
+        sums = np.add.reduceat(reconciled[:, children], indptr[:-1], axis=1) + remainder
+        scale = np.maximum(parents.sum(axis=-1, keepdims=True), np.finfo(float).tiny)
+        misfit = np.abs(sums - parents) / scale
+        cells += int((parents.sum(axis=-1) > 0).sum())
+        if misfit.max() > REL_TOL:
+            t, p, y, s = np.unravel_index(np.argmax(misfit), misfit.shape)
+            failures.append(f"{name} level {level}: children of {list(groups)[p]} miss their parent by "
+                            f"{misfit.max():.2e} ({TIERS[t]}, year index {y}, {useful.SOURCES[s]})")
+        if (remainder < 0).any():
+            failures.append(f"{name} level {level}: {(remainder < 0).sum()} negative remainder cells")
+
+        kept = reported[children][None] & (values[:, children] > 0)
+        zeroed = kept & (reconciled[:, children] <= 0)
+        if zeroed.any():
+            t, c, y, s = np.argwhere(zeroed)[0]
+            failures.append(f"{name} level {level}: {zeroed.sum()} reported child cells zeroed "
+                            f"(e.g. {entities[children[c]]}, {TIERS[t]}, year index {y}, {useful.SOURCES[s]})")
+
+        # Within the RAS tolerance, relative to the parent's total
+        own = filled[:, children].sum(axis=-1)
+        group = np.repeat(np.arange(len(groups)), np.diff(indptr))
+        growth = (reconciled[:, children].sum(axis=-1) - own) / scale[..., 0][:, group]
+        inflated = growth > REL_TOL
+        if inflated.any():
+            t, c, y = np.argwhere(inflated)[0]
+            failures.append(f"{name} level {level}: {inflated.sum()} child totals above their own "
+                            f"(e.g. {entities[children[c]]}, {TIERS[t]}, year index {y})")
+    return cells
+
+# ============================================================================
+# SYNTHETIC OWID DATASET
+# ============================================================================
+
+with tempfile.TemporaryDirectory(prefix='reconcile_validate_') as tmp:
+    _, cache_path = write_synthetic_inputs(generate_synthetic_owid(), Path(tmp))
+    data = OwidCache(str(cache_path))
+    with working_directory():
+        configs = useful.load_configs()
+
+    hierarchy = region_hierarchy()
+    entities = [ROOT] + [child for groups in hierarchy_levels(hierarchy, set(data.entities))
+                         for children in groups.values() for child in children]
+    years, values, present, reported = tier_arrays(data, configs, entities, rebound_rate=useful.REBOUND_RATE)
+
+    start = time.perf_counter()
+    reconciled, remainders, stats = reconcile(values, entities, hierarchy, reported)
+    elapsed = time.perf_counter() - start
+    levels = hierarchy_levels(hierarchy, set(entities))
+    cells = check_levels('synthetic', values, reported, entities, levels, reconciled, remainders, stats)
+
+    # The dataset must exercise blank parent cells above reported children
+    index = {entity: i for i, entity in enumerate(entities)}
+    blank_parents = 0
+    for groups in levels:
+        for parent, children in groups.items():
+            child_rows = [index[child] for child in children]
+            blank_parents += int((~reported[index[parent]] & (values[0, child_rows] > 0).any(axis=0)).sum())
+    if not blank_parents:
+        failures.append("synthetic dataset has no blank parent cell above reported children")
+
+    # ... and infeasible zero patterns and a parent far above its children
+    if not any(level_stats['opened_cells'] for level_stats in stats):
+        failures.append("synthetic dataset has no infeasible zero pattern")
+    largest_gap = max((percent, parent) for level_stats in stats
+                      for parent, percent in level_stats['remainder_percent'].items())
+    if largest_gap[0] < 1:
+        failures.append("synthetic dataset has no parent above the sum of its children")
+
+print(f"Synthetic dataset:    {len(entities)} regions, {len(years)} years, {cells} parent-years checked")
+print(f"Blank parent cells:   {blank_parents} with reported children")
+print(f"Largest remainder:    {largest_gap[1]} ({largest_gap[0]:.1f}% outside its listed countries)")
+for level, level_stats in enumerate(stats, start=1):
+    print(f"  Level {level}: {level_stats['iterations']} iterations, residual {level_stats['residual']:.2e}, "
+          f"{level_stats['filled_cells']} filled cells, {level_stats['opened_cells']} opened cells")
+print(f"Reconciled in:        {elapsed * 1000:.0f} ms")
+print()
+
+# ============================================================================
+# CONSISTENT HIERARCHY
+# ============================================================================
+
+rng = np.random.default_rng(7)
+consistent = values.copy()
+for groups in reversed(levels):
+    indptr, children = net_imports.membership_matrix(groups, entities)
+    parent_rows = [index[parent] for parent in groups]
+    sums = np.add.reduceat(consistent[:, children], indptr[:-1], axis=1)
+    consistent[:, parent_rows] = sums * rng.uniform(0.9, 1.1, sums.shape)
+everything = np.ones(reported.shape, dtype=bool)
+reconciled, remainders, stats = reconcile(consistent, entities, hierarchy, everything)
+check_levels('consistent', consistent, everything, entities, levels, reconciled, remainders, stats)
+for level, level_stats in enumerate(stats, start=1):
+    print(f"Consistent level {level}: {level_stats['iterations']} iterations, residual {level_stats['residual']:.2e}")
+print()
+
+if failures:
+    print(f"✗ FAIL: {len(failures)} checks failed")
+    for failure in failures[:20]:
+        print(f"  - {failure}")
+    sys.exit(1)
+
+print("✓ PASS: Every level converges and children plus remainder add up to their parent")
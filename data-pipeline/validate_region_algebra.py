@@ -0,0 +1,180 @@
+"""
+Validate the region algebra (region_algebra.py)
+
+On the benchmark's synthetic OWID dataset:
+1. Every operator spelling gives the ordered set operation it names
+2. Intersection binds tighter than union and difference, operators are
+   left-associative and parentheses override both
+3. Names with hyphens, parentheses, other case or quotes resolve as one
+   name
+4. Circular definitions, unknown names, unknown list members and
+   malformed expressions raise ValueError
+5. Every region of config/regions.json resolves with all its list
+   members, and aggregates equal the members' sums from the dataset;
+   equivalent expressions share one cached aggregate
+"""
+
+import contextlib
+import io
+import sys
+import tempfile
+from pathlib import Path
+
+import numpy as np
+
+from benchmark_pipeline import generate_synthetic_owid, write_synthetic_inputs
+from owid_cache import OwidCache
+from region_algebra import OPERATORS, RegionAlgebra, user_regions
+
+METRIC = 'coal_consumption'
+
+if sys.platform == 'win32':
+    sys.stdout.reconfigure(encoding='utf-8')
+
+def union(left, right):
+    return left + [country for country in right if country not in left]
+
+def difference(left, right):
+    return [country for country in left if country not in right]
+
+def intersection(left, right):
+    return [country for country in left if country in right]
+
+SET_OPERATIONS = {'union': union, 'difference': difference, 'intersection': intersection}
+
+def raises(function, *args):
+    """Message of the ValueError raised by function(*args) (None if none)"""
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            function(*args)
+    except ValueError as e:
+        return str(e)
+    return None
+
+print("=" * 80)
+print("VALIDATION REPORT: Region Algebra")
+print("=" * 80)
+print()
+
+failures = []
+
+with tempfile.TemporaryDirectory(prefix='region_algebra_validate_') as tmp:
+    df = generate_synthetic_owid()
+    _, cache_path = write_synthetic_inputs(df, Path(tmp))
+    algebra = RegionAlgebra(OwidCache(str(cache_path)))
+
+def check(expression, expected):
+    actual = algebra.members(expression)
+    if actual != expected:
+        failures.append(f"'{expression}': {len(actual)} members {actual[:5]}... vs expected {len(expected)} "
+                        f"{expected[:5]}...")
+
+europe, asia, g20 = (algebra.members(name) for name in ('Europe', 'Asia', 'G20'))
+
+# ============================================================================
+# 1. OPERATORS
+# ============================================================================
+
+for spelling, operation in OPERATORS.items():
+    check(f"Europe {spelling} G20", SET_OPERATIONS[operation](europe, g20))
+print(f"Operators:            {len(OPERATORS)} spellings checked")
+
+# ============================================================================
+# 2. PRECEDENCE AND ASSOCIATIVITY
+# ============================================================================
+
+PRECEDENCE = [
+    ("Europe + Asia & G20", union(europe, intersection(asia, g20))),
+    ("Asia & G20 + Europe", union(intersection(asia, g20), europe)),
+    ("(Europe + Asia) & G20", intersection(union(europe, asia), g20)),
+    ("Europe - G20 & Asia", difference(europe, intersection(g20, asia))),
+    ("Europe - Germany - France", difference(europe, ['Germany', 'France'])),
+    ("Europe - (Germany - France)", difference(europe, ['Germany'])),
+    ("Asia - China + China", union(difference(asia, ['China']), ['China'])),
+    ("Asia - (China + China)", difference(asia, ['China'])),
+]
+for expression, expected in PRECEDENCE:
+    check(expression, expected)
+print(f"Precedence:           {len(PRECEDENCE)} expressions checked")
+
+# ============================================================================
+# 3. NAMES
+# ============================================================================
+
+NAMES = [
+    ("Guinea-Bissau", ['Guinea-Bissau']),
+    ("Guinea - Guinea-Bissau", ['Guinea']),
+    ("Micronesia (country) + Fiji", ['Micronesia (country)', 'Fiji']),
+    ("germany PLUS france", ['Germany', 'France']),
+    ("'Bosnia and Herzegovina' + \"Germany\"", ['Bosnia and Herzegovina', 'Germany']),
+]
+for expression, expected in NAMES:
+    check(expression, expected)
+print(f"Names:                {len(NAMES)} expressions checked")
+
+# ============================================================================
+# 4. ERRORS
+# ============================================================================
+
+algebra.define('Loop A', 'Loop B + Germany')
+algebra.define('Loop B', 'Loop A - France')
+algebra.define('Self', 'Self & Europe')
+algebra.define('Typo list', ['Germany', 'Czech Republic'])
+ERRORS = [
+    ('Loop A', 'Circular'),
+    ('Europe + Loop B', 'Circular'),
+    ('Self', 'Circular'),
+    ('Europe + Atlantis', 'Unknown region or country'),
+    ('Typo list', 'Unknown countries'),
+    ('Typo list - Germany', 'Unknown countries'),
+    ('Europe +', 'Expected a region or country'),
+    ('(Europe + Asia', "Missing ')'"),
+    ('Europe Asia', 'Unexpected'),
+]
+for expression, message in ERRORS:
+    error = raises(algebra.members, expression)
+    if error is None or message not in error:
+        failures.append(f"'{expression}': expected ValueError '{message}...', got {error!r}")
+if raises(algebra.aggregate, 'Typo list', METRIC) is None:
+    failures.append("aggregate() of a list with an unknown member did not raise")
+print(f"Errors:               {len(ERRORS) + 1} invalid definitions and expressions raise")
+
+# ============================================================================
+# 5. CONFIGURED REGIONS AND AGGREGATES
+# ============================================================================
+
+rows = df.set_index(['country', 'year'])[METRIC]
+configured = user_regions()
+for name, definition in configured.items():
+    error = raises(algebra.members, name)
+    if error:
+        failures.append(f"regions.json '{name}': {error}")
+        continue
+    members = algebra.members(name)
+    if isinstance(definition, list) and members != list(dict.fromkeys(definition)):
+        failures.append(f"regions.json '{name}': {len(members)} of {len(definition)} members resolved")
+
+    series = algebra.aggregate(name, METRIC)
+    member_rows = rows[rows.index.get_level_values('country').isin(members)].dropna()
+    expected = member_rows.groupby(level='year').sum()
+    years = np.array(list(series), dtype=np.int64)
+    if not np.array_equal(years, expected.index.to_numpy()) or \
+            not np.allclose(list(series.values()), expected.to_numpy(), rtol=1e-12, atol=0):
+        failures.append(f"regions.json '{name}': aggregate of {METRIC} differs from the members' sum")
+
+before = algebra.cache_info()
+algebra.aggregate('EU - Germany', METRIC)
+algebra.aggregate('EU minus Germany', METRIC)
+after = algebra.cache_info()
+if after.hits - before.hits != 2:
+    failures.append(f"equivalent expressions of 'EU minus Germany' made {after.hits - before.hits} cache hits (expected 2)")
+print(f"Configured regions:   {len(configured)} resolved and aggregated ({METRIC})")
+print()
+
+if failures:
+    print(f"✗ FAIL: {len(failures)} checks failed")
+    for failure in failures[:20]:
+        print(f"  - {failure}")
+    sys.exit(1)
+
+print("✓ PASS: Region expressions evaluate as specified and reject unknown members")
@@ -0,0 +1,165 @@
+"""
+Validate the in-process pipeline runner (run_pipeline.py)
+
+In a scratch directory, with the benchmark's synthetic OWID dataset as the
+OWID cache:
+1. Command line: --dry-run and --demand-model parse; a missing or unknown
+   --demand-model exits with status 1 instead of raising
+2. main() writes every output; each consumer re-run the way its script
+   does (re-reading the JSON written by the stages before it) reproduces
+   the runner's output exactly (ignoring generation timestamps), for both
+   demand models
+3. --dry-run writes nothing, and a stage that fails leaves no output
+   behind
+
+Nothing under public/data or the repo's calculated_cagrs.json is touched.
+"""
+
+import contextlib
+import io
+import json
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import run_pipeline as runner
+from benchmark_pipeline import generate_synthetic_owid, write_synthetic_inputs
+
+# Metadata keys that differ between runs
+TIMESTAMP_KEYS = {'generated_at', 'date_generated'}
+
+# Output path globals of run_pipeline redirected to the scratch tree
+OUTPUT_GLOBALS = ['FF_GROWTH_FILE', 'SECTORAL_FILE', 'PROJECTIONS_FILE', 'CAGRS_FILE']
+USEFUL_FILE = 'useful_energy_timeseries.json'
+SERVICES_FILE = 'exergy_services_timeseries.json'
+
+if sys.platform == 'win32':
+    sys.stdout.reconfigure(encoding='utf-8')
+
+def use_output_dir(directory):
+    """Point run_pipeline's outputs at directory"""
+    directory.mkdir(parents=True, exist_ok=True)
+    runner.SERVICES_DATA_DIR = directory
+    for name in OUTPUT_GLOBALS:
+        setattr(runner, name, directory / getattr(runner, name).name)
+
+def without_timestamps(value):
+    if isinstance(value, dict):
+        return {key: without_timestamps(item) for key, item in value.items() if key not in TIMESTAMP_KEYS}
+    if isinstance(value, list):
+        return [without_timestamps(item) for item in value]
+    return value
+
+def read_json(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+def quietly(function, *args):
+    with contextlib.redirect_stdout(io.StringIO()):
+        return function(*args)
+
+def exit_status(args):
+    """Exit status of parse_args(args) (None if it returned)"""
+    try:
+        quietly(runner.parse_args, args)
+    except SystemExit as e:
+        return e.code
+    return None
+
+def script_outputs(directory, demand_model):
+    """Consumer outputs recomputed from the files, as the separate scripts do"""
+    useful = read_json(directory / USEFUL_FILE)
+    services = read_json(directory / SERVICES_FILE)
+    cagrs = json.loads(json.dumps(quietly(runner.historical_cagrs.calculate_cagrs, useful['data'])))
+    return {
+        runner.FF_GROWTH_FILE: runner.ff_growth.compute_ff_growth(useful['data'], useful['metadata']['generated_at']),
+        runner.SECTORAL_FILE: quietly(runner.sectoral.build_sectoral_timeseries, services['data'],
+                                      runner.sectoral.load_json_file(str(runner.SECTORAL_INPUT_FILE))),
+        runner.CAGRS_FILE: cagrs,
+        runner.PROJECTIONS_FILE: quietly(runner.DEMAND_MODELS[demand_model], useful['data'], cagrs),
+    }
+
+print("=" * 80)
+print("VALIDATION REPORT: In-Process Pipeline Runner vs Separate Scripts")
+print("=" * 80)
+print()
+
+failures = []
+
+# ============================================================================
+# 1. COMMAND LINE
+# ============================================================================
+
+VALID_ARGS = [([], (False, runner.DEFAULT_DEMAND_MODEL)),
+              (['--dry-run'], (True, runner.DEFAULT_DEMAND_MODEL)),
+              (['--demand-model', 'v1', '--dry-run'], (True, 'v1'))]
+INVALID_ARGS = [['--demand-model'], ['--demand-model', '--dry-run'], ['--demand-model', 'v0']]
+
+for args, expected in VALID_ARGS:
+    if quietly(runner.parse_args, args) != expected:
+        failures.append(f"parse_args({args}) != {expected}")
+for args in INVALID_ARGS:
+    status = exit_status(args)
+    if status != 1:
+        failures.append(f"parse_args({args}): exit status {status} (expected 1)")
+print(f"Command line:         {len(VALID_ARGS)} valid, {len(INVALID_ARGS)} invalid argument lists checked")
+
+with tempfile.TemporaryDirectory(prefix='run_pipeline_validate_') as tmp:
+    root = Path(tmp)
+    _, runner.OWID_CACHE_PATH = write_synthetic_inputs(generate_synthetic_owid(), root / 'downloads')
+
+    # ========================================================================
+    # 2. RUNNER OUTPUTS = SCRIPT CHAIN
+    # ========================================================================
+
+    for demand_model in runner.DEMAND_MODELS:
+        directory = root / demand_model
+        use_output_dir(directory)
+        start = time.perf_counter()
+        quietly(runner.main, ['--demand-model', demand_model])
+        elapsed = time.perf_counter() - start
+
+        for path, expected in script_outputs(directory, demand_model).items():
+            if not path.exists():
+                failures.append(f"{demand_model}: {path.name} not written")
+            elif without_timestamps(read_json(path)) != without_timestamps(json.loads(json.dumps(expected))):
+                failures.append(f"{demand_model}: {path.name} differs from its script re-run on the written files")
+        print(f"Demand model {demand_model}:      {len(list(directory.iterdir()))} files written "
+              f"({elapsed:.2f} s), consumers re-run from the files")
+
+    # ========================================================================
+    # 3. DRY RUN AND FAILING STAGES WRITE NOTHING
+    # ========================================================================
+
+    use_output_dir(root / 'dry-run')
+    quietly(runner.main, ['--dry-run'])
+    written = list((root / 'dry-run').iterdir())
+    if written:
+        failures.append(f"--dry-run wrote {[path.name for path in written]}")
+
+    def failing_model(timeseries, cagrs):
+        raise RuntimeError("projection stage failed")
+
+    use_output_dir(root / 'failing')
+    runner.DEMAND_MODELS['failing'] = failing_model
+    try:
+        quietly(runner.main, ['--demand-model', 'failing'])
+        failures.append("a failing projection stage did not raise")
+    except RuntimeError:
+        pass
+    finally:
+        del runner.DEMAND_MODELS['failing']
+    written = list((root / 'failing').iterdir())
+    if written:
+        failures.append(f"failing stage left {[path.name for path in written]} behind")
+print("Dry run and failure:  no files written")
+print()
+
+if failures:
+    print(f"✗ FAIL: {len(failures)} checks failed")
+    for failure in failures:
+        print(f"  - {failure}")
+    sys.exit(1)
+
+print("✓ PASS: In-process runner writes what the separate scripts would")
@@ -0,0 +1,155 @@
+"""
+Validate scenario inheritance (scenario_sets.py)
+
+1. Every user-defined scenario in config/scenarios.json resolves to its
+   parent's resolved definition plus its own overrides: dict fields merged
+   per technology, every other overridden field replaced, every other
+   field inherited unchanged
+2. In a scratch copy of scenarios.json with an override-free child added
+   for every scenario, each child resolves to its parent's fields and
+   projects (run_scenario_set) to exactly its parent's timeseries (apart
+   from the scenario label)
+3. Every user-defined scenario that overrides an engine input projects
+   to a different timeseries than its parent
+4. A scratch scenario named like a built-in and inheriting from it
+   resolves to the built-in plus its overrides (no circular inheritance)
+   and projects differently from the built-in
+
+The real config/scenarios.json is not modified.
+"""
+
+import json
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import projection_engine_v4 as engine
+from config_registry import REGISTRY
+from scenario_sets import (MERGED_FIELDS, SCENARIO_FIELDS, SCENARIOS_FILE, builtin_definition, list_scenarios,
+                           resolve_scenario, run_scenario_set)
+
+COPY_SUFFIX = '_Copy'
+
+# A user scenario shadowing a built-in of the same name
+SHADOWED = {'Conservative': {'parent': 'Conservative', 'description': 'Conservative with slower demand growth',
+                             'demand_growth_rate': 0.006}}
+
+# Record keys that name the scenario rather than describe its projection
+LABEL_KEYS = {'scenario'}
+
+if sys.platform == 'win32':
+    sys.stdout.reconfigure(encoding='utf-8')
+
+def expected_definition(overrides, parent_definition):
+    """Parent fields with the overrides applied"""
+    expected = {}
+    for field in SCENARIO_FIELDS:
+        if field not in overrides:
+            expected[field] = parent_definition[field]
+        elif field in MERGED_FIELDS:
+            expected[field] = {**parent_definition[field], **overrides[field]}
+        else:
+            expected[field] = overrides[field]
+    return expected
+
+def without_labels(timeseries):
+    return [{key: value for key, value in record.items() if key not in LABEL_KEYS} for record in timeseries]
+
+def inheritance_failures(user_scenarios):
+    """Resolved definitions that differ from parent + overrides"""
+    found = []
+    for scenario, overrides in user_scenarios.items():
+        parent = overrides.get('parent', 'Baseline')
+        definition = resolve_scenario(scenario)
+        parent_definition = builtin_definition(parent) if parent == scenario else resolve_scenario(parent)
+        expected = expected_definition(overrides, parent_definition)
+        for field in SCENARIO_FIELDS:
+            if definition[field] != expected[field]:
+                found.append(f"{scenario} {field}: {definition[field]!r} vs parent {parent} + overrides "
+                             f"{expected[field]!r}")
+        if (definition['name'], definition['parent']) != (scenario, parent):
+            found.append(f"{scenario}: resolved as {definition['name']} (parent {definition['parent']})")
+    return found
+
+print("=" * 80)
+print("VALIDATION REPORT: Scenario Inheritance")
+print("=" * 80)
+print()
+
+failures = []
+
+# ============================================================================
+# 1. USER-DEFINED SCENARIOS = PARENT + OVERRIDES
+# ============================================================================
+
+config = REGISTRY.get(SCENARIOS_FILE) or {}
+user_scenarios = config.get('scenarios', {})
+failures.extend(inheritance_failures(user_scenarios))
+for scenario, overrides in user_scenarios.items():
+    fields = [field for field in SCENARIO_FIELDS if field in overrides]
+    print(f"  {scenario:<36} <- {overrides.get('parent', 'Baseline'):<26} overrides {', '.join(fields)}")
+print()
+
+# ============================================================================
+# 2. OVERRIDE-FREE CHILDREN PROJECT LIKE THEIR PARENTS
+# ============================================================================
+
+parents = list_scenarios()
+start = time.perf_counter()
+projections = run_scenario_set(parents, workers=1)
+projection_time = time.perf_counter() - start
+
+search_dirs = list(REGISTRY.search_dirs)
+with tempfile.TemporaryDirectory(prefix='scenario_sets_validate_') as tmp:
+    config_dir = Path(tmp)
+    copies = {f'{parent}{COPY_SUFFIX}': {'parent': parent, 'description': f'Copy of {parent}'} for parent in parents}
+    with open(config_dir / SCENARIOS_FILE, 'w') as f:
+        json.dump({**config, 'scenarios': {**user_scenarios, **copies, **SHADOWED}}, f, indent=2)
+    REGISTRY.search_dirs = [config_dir] + search_dirs
+    REGISTRY.invalidate()
+
+    try:
+        failures.extend(inheritance_failures(copies))
+        failures.extend(inheritance_failures(SHADOWED))
+        start = time.perf_counter()
+        scratch = run_scenario_set(parents + list(copies), workers=1)
+        scratch_time = time.perf_counter() - start
+    finally:
+        REGISTRY.search_dirs = search_dirs
+        REGISTRY.invalidate()
+        engine.get_compiled_parameters(revalidate=True)
+
+for copy, overrides in copies.items():
+    if without_labels(scratch[copy]) != without_labels(scratch[overrides['parent']]):
+        failures.append(f"{copy}: projection differs from its parent {overrides['parent']}")
+
+# ============================================================================
+# 3. OVERRIDES CHANGE THE PROJECTION
+# ============================================================================
+
+for scenario, overrides in user_scenarios.items():
+    if any(field in overrides for field in SCENARIO_FIELDS) and \
+            without_labels(projections[scenario]) == without_labels(projections[overrides.get('parent', 'Baseline')]):
+        failures.append(f"{scenario}: overrides leave the projection equal to its parent")
+
+# ============================================================================
+# 4. USER SCENARIOS SHADOWING A BUILT-IN
+# ============================================================================
+
+for scenario in SHADOWED:
+    if without_labels(scratch[scenario]) == without_labels(projections[scenario]):
+        failures.append(f"{scenario}: shadowing scenario projects like the built-in")
+
+print(f"Scenarios projected:  {len(projections)} defined, {len(scratch)} in the scratch config "
+      f"({len(copies)} override-free copies, {len(SHADOWED)} shadowed built-in)")
+print(f"run_scenario_set():   {projection_time * 1000:8.1f} ms defined, {scratch_time * 1000:.1f} ms scratch")
+print()
+
+if failures:
+    print(f"✗ FAIL: {len(failures)} checks failed")
+    for failure in failures[:20]:
+        print(f"  - {failure}")
+    sys.exit(1)
+
+print("✓ PASS: Inherited scenarios resolve and project as their parent plus overrides")
@@ -0,0 +1,90 @@
+"""
+Validate the vectorized projection engine against the scalar ProjectionEngine
+
+Runs both paths for every scenario and compares every record field.
+Values must agree to floating-point rounding (relative 1e-12); keys,
+key order, years and scenario labels must match exactly.
+"""
+
+import math
+import sys
+import time
+
+from projection_engine_v4 import SCENARIOS, COST_PROJECTIONS, ProjectionEngine
+from projection_engine_vectorized import project_scenarios_vectorized
+from learning_by_deployment import solve_scenarios
+
+REL_TOL = 1e-12
+ABS_TOL = 1e-12
+
+print("=" * 80)
+print("VALIDATION REPORT: Vectorized vs Scalar Projection Engine")
+print("=" * 80)
+print()
+
+start = time.perf_counter()
+scalar = {scenario: ProjectionEngine(scenario).project_timeseries() for scenario in SCENARIOS}
+scalar_time = time.perf_counter() - start
+
+start = time.perf_counter()
+vectorized = project_scenarios_vectorized(SCENARIOS)
+vectorized_time = time.perf_counter() - start
+
+failures = []
+max_rel_diff = 0.0
+cells = 0
+
+for scenario in SCENARIOS:
+    if len(scalar[scenario]) != len(vectorized[scenario]):
+        failures.append(f"{scenario}: {len(scalar[scenario])} vs {len(vectorized[scenario])} records")
+        continue
+
+    for expected, actual in zip(scalar[scenario], vectorized[scenario]):
+        if list(expected.keys()) != list(actual.keys()):
+            failures.append(f"{scenario} {expected['year']}: key mismatch")
+            continue
+
+        for key, value in expected.items():
+            cells += 1
+            other = actual[key]
+            if isinstance(value, str) or key == 'year':
+                if value != other:
+                    failures.append(f"{scenario} {expected['year']} {key}: {value!r} vs {other!r}")
+                continue
+            if type(value) is not type(other):
+                failures.append(f"{scenario} {expected['year']} {key}: type {type(value).__name__} vs {type(other).__name__}")
+            if not math.isclose(value, other, rel_tol=REL_TOL, abs_tol=ABS_TOL):
+                failures.append(f"{scenario} {expected['year']} {key}: {value} vs {other}")
+            if value != 0:
+                max_rel_diff = max(max_rel_diff, abs(value - other) / abs(value))
+
+# Learning-curve costs (ProjectionEngine.get_costs) on the coupled deployment path
+solution = solve_scenarios(SCENARIOS)
+cost_params = solution['cost_params']
+costs = solution['costs']
+for s, scenario in enumerate(SCENARIOS):
+    engine = ProjectionEngine(scenario)
+    for y, year in enumerate(cost_params['years']):
+        expected_costs = engine.get_costs(int(year))
+        for c, tech in enumerate(cost_params['cost_technologies']):
+            cells += 1
+            expected = expected_costs[COST_PROJECTIONS[tech]['output']]
+            actual = float(costs[s, c, y])
+            if not math.isclose(expected, actual, rel_tol=REL_TOL, abs_tol=ABS_TOL):
+                failures.append(f"{scenario} {year} {tech} cost: {expected} vs {actual}")
+
+print(f"Scenarios compared: {', '.join(SCENARIOS)}")
+print(f"Values compared:    {cells}")
+print(f"Max relative diff:  {max_rel_diff:.2e} (tolerance {REL_TOL:.0e})")
+print()
+print(f"Scalar engine:      {scalar_time * 1000:8.2f} ms")
+print(f"Vectorized engine:  {vectorized_time * 1000:8.2f} ms")
+print()
+
+if failures:
+    print(f"✗ FAIL: {len(failures)} mismatches")
+    for failure in failures[:20]:
+        print(f"  - {failure}")
+    sys.exit(1)
+
+print("✓ PASS: Vectorized engine matches scalar engine")
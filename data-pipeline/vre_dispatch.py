@@ -0,0 +1,265 @@
+#!/usr/bin/env python3
+"""
+VRE Dispatch - vectorized 8760-hour dispatch of solar, wind and storage
+
+Simulates a year of hourly operation for a batch of system cells (e.g.
+every scenario × year of one region) that share the same hourly profiles
+but differ in VRE penetration, solar/wind mix and storage build-out.
+Everything is evaluated on [batch × day × hour] arrays; there is no
+per-hour Python loop, so the full cost cube (scenarios × regions × years)
+simulates in well under a second.
+
+Per cell:
+- VRE output = penetration × annual demand, split between the solar and
+  wind profiles by solar_share
+- Residual load = demand - VRE; surplus hours feed storage, the rest is curtailed
+- Storage cycles within each day: daily discharge is limited by the energy
+  charged that day (after round-trip losses), its energy capacity and the
+  deficit it can serve at its power rating; it is dispatched against the
+  day's highest-deficit hours (peak shaving to a common level, found by
+  bisection on [batch × day] arrays)
+- Firming = the residual load left after storage (capacity = its peak)
+
+The intraday balance ignores charge/discharge ordering within a day and
+any inter-day carry-over; it is a screening model for integration costs,
+not a unit-commitment model.
+
+Profiles are normalized: solar and wind are hourly capacity factors and
+demand has a mean of 1, so energies are in hours of average load and
+capacities in multiples of average load. A local CSV with columns
+solar,wind,demand (8760 rows) in config/vre_profiles/<region>.csv replaces
+the synthetic profile of that region.
+"""
+
+import numpy as np
+from pathlib import Path
+
+# ============================================================================
+# CONFIGURATION
+# ============================================================================
+
+HOURS_PER_YEAR = 8760
+DAYS_PER_YEAR = 365
+PROFILE_DIR = Path(__file__).parent / 'config' / 'vre_profiles'
+PROFILE_SEED = 8760
+
+DEFAULT_ROUND_TRIP_EFFICIENCY = 0.85
+PEAK_SHAVING_ITERATIONS = 20
+
+# Synthetic profile shape per cost region
+#   solar_cf / wind_cf:     annual mean capacity factors
+#   solar_seasonality:      summer/winter swing of solar output
+#   wind_seasonality:       winter/summer swing of wind output
+#   demand_seasonality:     seasonal swing of demand (>0 winter peak, <0 summer peak)
+#   demand_daily:           evening-peak amplitude of the daily demand shape
+#   southern:               southern hemisphere (seasons shifted by half a year)
+REGION_PROFILES = {
+    'Global':        {'solar_cf': 0.20, 'wind_cf': 0.34, 'solar_seasonality': 0.25, 'wind_seasonality': 0.15, 'demand_seasonality': 0.05, 'demand_daily': 0.20, 'southern': False},
+    'China':         {'solar_cf': 0.17, 'wind_cf': 0.30, 'solar_seasonality': 0.35, 'wind_seasonality': 0.20, 'demand_seasonality': 0.08, 'demand_daily': 0.18, 'southern': False},
+    'India':         {'solar_cf': 0.21, 'wind_cf': 0.28, 'solar_seasonality': 0.15, 'wind_seasonality': -0.40, 'demand_seasonality': -0.10, 'demand_daily': 0.22, 'southern': False},
+    'United States': {'solar_cf': 0.22, 'wind_cf': 0.38, 'solar_seasonality': 0.35, 'wind_seasonality': 0.20, 'demand_seasonality': -0.08, 'demand_daily': 0.22, 'southern': False},
+    'Europe':        {'solar_cf': 0.13, 'wind_cf': 0.36, 'solar_seasonality': 0.60, 'wind_seasonality': 0.35, 'demand_seasonality': 0.15, 'demand_daily': 0.20, 'southern': False},
+    'Japan':         {'solar_cf': 0.15, 'wind_cf': 0.28, 'solar_seasonality': 0.35, 'wind_seasonality': 0.25, 'demand_seasonality': 0.05, 'demand_daily': 0.20, 'southern': False},
+    'Middle East':   {'solar_cf': 0.25, 'wind_cf': 0.30, 'solar_seasonality': 0.20, 'wind_seasonality': -0.10, 'demand_seasonality': -0.20, 'demand_daily': 0.15, 'southern': False},
+    'Africa':        {'solar_cf': 0.24, 'wind_cf': 0.30, 'solar_seasonality': 0.10, 'wind_seasonality': 0.10, 'demand_seasonality': -0.05, 'demand_daily': 0.25, 'southern': False},
+    'South America': {'solar_cf': 0.22, 'wind_cf': 0.40, 'solar_seasonality': 0.20, 'wind_seasonality': 0.15, 'demand_seasonality': -0.05, 'demand_daily': 0.20, 'southern': True},
+    'Australia':     {'solar_cf': 0.23, 'wind_cf': 0.35, 'solar_seasonality': 0.35, 'wind_seasonality': 0.15, 'demand_seasonality': -0.08, 'demand_daily': 0.22, 'southern': True},
+}
+
+# ============================================================================
+# HOURLY PROFILES
+# ============================================================================
+
+def synthetic_profiles(region='Global'):
+    """
+    Deterministic hourly solar, wind and demand profiles for a region
+
+    Returns:
+        {'solar', 'wind', 'demand'}: arrays of shape (DAYS_PER_YEAR, 24);
+        solar/wind are capacity factors with the region's annual mean,
+        demand has a mean of 1
+    """
+    shape = REGION_PROFILES.get(region, REGION_PROFILES['Global'])
+    rng = np.random.default_rng(PROFILE_SEED + sorted(REGION_PROFILES).index(region)
+                                if region in REGION_PROFILES else PROFILE_SEED)
+
+    day = np.arange(DAYS_PER_YEAR)[:, None]
+    hour = np.arange(24)[None, :]
+    # +1 around the local summer solstice, -1 in winter
+    season = np.cos(2 * np.pi * (day - 172) / DAYS_PER_YEAR)
+    if shape['southern']:
+        season = -season
+
+    # Solar: daylight arc whose length and height follow the season, daily cloudiness
+    day_length = 12 + 3 * season * min(1.0, 2 * shape['solar_seasonality'])
+    daylight = np.clip((hour + 0.5 - (12 - day_length / 2)) / day_length, 0, 1)
+    cloudiness = np.clip(rng.normal(1.0, 0.25, (DAYS_PER_YEAR, 1)), 0.2, 1.3)
+    solar = np.sin(np.pi * daylight) * (1 + shape['solar_seasonality'] * season) * cloudiness
+
+    # Wind: multi-day weather systems (smoothed noise), winter/summer swing, mild night peak
+    weather = np.convolve(rng.normal(0, 1, HOURS_PER_YEAR + 95), np.ones(96) / np.sqrt(96), mode='valid')
+    weather = weather[:HOURS_PER_YEAR].reshape(DAYS_PER_YEAR, 24)
+    wind = np.clip(1 + 0.5 * weather - shape['wind_seasonality'] * season
+                   + 0.1 * np.cos(2 * np.pi * (hour - 3) / 24), 0.02, None)
+
+    # Demand: daytime plateau with evening peak, seasonal heating/cooling, weekends
+    daily = (1 + 0.12 * np.sin(np.pi * np.clip((hour - 6) / 16, 0, 1))
+             + shape['demand_daily'] * np.exp(-0.5 * ((hour - 19) / 2) ** 2))
+    weekly = np.where(day % 7 >= 5, 0.93, 1.0)
+    demand = daily * weekly * (1 - shape['demand_seasonality'] * season) * rng.normal(1.0, 0.02, (DAYS_PER_YEAR, 1))
+
+    return {
+        'solar': _scale_capacity_factor(solar, shape['solar_cf']),
+        'wind': _scale_capacity_factor(wind, shape['wind_cf']),
+        'demand': demand / demand.mean(),
+    }
+
+def _scale_capacity_factor(profile, mean_cf):
+    """Scale a profile to the target mean while keeping every hour within [0, 1]"""
+    scaled = profile * (mean_cf / profile.mean())
+    for _ in range(20):
+        clipped = np.minimum(scaled, 1.0)
+        if clipped.mean() >= mean_cf * (1 - 1e-9):
+            break
+        scaled = scaled * (mean_cf / clipped.mean())
+    return np.minimum(scaled, 1.0)
+
+def load_profile_file(path):
+    """Hourly profiles from a CSV with a header row and solar,wind,demand columns (8760 rows)"""
+    data = np.genfromtxt(path, delimiter=',', names=True)
+    missing = {'solar', 'wind', 'demand'} - set(data.dtype.names)
+    if missing:
+        raise ValueError(f"Profile file {path} is missing columns: {sorted(missing)}")
+    if len(data) != HOURS_PER_YEAR:
+        raise ValueError(f"Profile file {path} has {len(data)} rows, expected {HOURS_PER_YEAR}")
+
+    demand = data['demand'].reshape(DAYS_PER_YEAR, 24)
+    return {
+        'solar': np.clip(data['solar'], 0, 1).reshape(DAYS_PER_YEAR, 24),
+        'wind': np.clip(data['wind'], 0, 1).reshape(DAYS_PER_YEAR, 24),
+        'demand': demand / demand.mean(),
+    }
+
+_PROFILE_CACHE = {}
+
+def profile_path(region):
+    return PROFILE_DIR / f"{region.lower().replace(' ', '_')}.csv"
+
+def get_profiles(region='Global'):
+    """Profiles of a region: config/vre_profiles/<region>.csv if present, else synthetic"""
+    path = profile_path(region)
+    key = (region, path.stat().st_mtime_ns if path.exists() else None)
+    if key not in _PROFILE_CACHE:
+        _PROFILE_CACHE[key] = load_profile_file(path) if key[1] is not None else synthetic_profiles(region)
+    return _PROFILE_CACHE[key]
+
+def clear_profile_cache():
+    """Drop the loaded profiles (the next get_profiles() reloads them)"""
+    _PROFILE_CACHE.clear()
+
+# ============================================================================
+# DISPATCH
+# ============================================================================
+
+def _peak_shaving(deficit, power, discharge):
+    """
+    Hourly discharge that lowers each day's deficit peaks to a common level
+
+    Bisects the shaving level per [batch, day] so that the hourly discharge
+    clip(deficit - level, 0, power) sums to the day's discharge energy.
+    Only days with a discharge are solved.
+    """
+    hourly = np.zeros_like(deficit)
+    active = discharge > 0
+    if not active.any():
+        return hourly
+
+    day_deficit = deficit[active]
+    day_power = np.broadcast_to(power, deficit.shape)[active]
+    target = discharge[active]
+
+    low = np.zeros(len(target))
+    high = day_deficit.max(axis=1)
+    for _ in range(PEAK_SHAVING_ITERATIONS):
+        level = (low + high) / 2
+        above = np.clip(day_deficit - level[:, None], 0, day_power).sum(axis=1) > target
+        low = np.where(above, level, low)
+        high = np.where(above, high, level)
+
+    # Scale the bracketing solution to the exact daily energy
+    shaved = np.clip(day_deficit - high[:, None], 0, day_power)
+    total = shaved.sum(axis=1)
+    scale = np.divide(target, total, out=np.zeros_like(target), where=total > 0)
+    hourly[active] = shaved * scale[:, None]
+    return hourly
+
+def _safe_divisor(values):
+    """Divisor with non-positive entries replaced by inf (ratio 0)"""
+    return np.where(values > 0, values, np.inf)
+
+def simulate_dispatch(profiles, vre_penetration, solar_share, storage_power, storage_hours,
+                      round_trip_efficiency=DEFAULT_ROUND_TRIP_EFFICIENCY):
+    """
+    Hourly dispatch of a batch of cells sharing one set of profiles
+
+    Args:
+        profiles: get_profiles() output
+        vre_penetration: [batch] VRE share of annual demand
+        solar_share: [batch] solar share of VRE energy
+        storage_power: [batch] storage power in multiples of average load
+        storage_hours: [batch] storage duration at rated power (hours)
+
+    Returns:
+        Dict of [batch] arrays:
+        - vre_capacity         VRE nameplate (multiples of average load)
+        - curtailment_share    curtailed share of VRE output
+        - storage_throughput   storage discharge as share of VRE output
+        - storage_cycles       full-equivalent storage cycles per year
+        - firming_energy_share residual (firmed) share of annual demand
+        - firming_capacity     peak residual load after storage (multiples of average load)
+        - capacity_credit      peak-load reduction by VRE + storage, per unit VRE capacity
+        - firm_utilization     capacity factor of the firming fleet
+        - ramp_intensity       mean hourly change of the firmed residual, per unit firming capacity
+    """
+    penetration = np.asarray(vre_penetration, dtype=float)[:, None, None]
+    solar_share = np.asarray(solar_share, dtype=float)[:, None, None]
+    power = np.asarray(storage_power, dtype=float)[:, None, None]
+    energy = power * np.asarray(storage_hours, dtype=float)[:, None, None]
+
+    solar, wind, demand = profiles['solar'], profiles['wind'], profiles['demand']
+    solar_capacity = penetration * solar_share / solar.mean()
+    wind_capacity = penetration * (1 - solar_share) / wind.mean()
+    vre = solar_capacity * solar + wind_capacity * wind
+
+    residual = demand - vre
+    surplus = np.maximum(-residual, 0)
+    deficit = np.maximum(residual, 0)
+
+    # Intraday storage cycle
+    charge_available = np.minimum(surplus, power).sum(axis=2)
+    discharge_hours = np.minimum(deficit, power)
+    discharge_available = discharge_hours.sum(axis=2)
+    discharge = np.minimum(np.minimum(charge_available * round_trip_efficiency, energy[:, :, 0]), discharge_available)
+    charge = discharge / round_trip_efficiency
+
+    firmed = deficit - _peak_shaving(deficit, power, discharge)
+
+    vre_energy = penetration[:, 0, 0] * HOURS_PER_YEAR
+    curtailed = surplus.sum(axis=(1, 2)) - charge.sum(axis=1)
+    discharged = discharge.sum(axis=1)
+    firmed_flat = firmed.reshape(len(firmed), -1)
+    firming_energy = firmed_flat.sum(axis=1)
+    firming_capacity = firmed_flat.max(axis=1)
+    vre_capacity = (solar_capacity + wind_capacity)[:, 0, 0]
+
+    return {
+        'vre_capacity': vre_capacity,
+        'curtailment_share': curtailed / _safe_divisor(vre_energy),
+        'storage_throughput': discharged / _safe_divisor(vre_energy),
+        'storage_cycles': discharged / _safe_divisor(energy[:, 0, 0]),
+        'firming_energy_share': firming_energy / HOURS_PER_YEAR,
+        'firming_capacity': firming_capacity,
+        'capacity_credit': (demand.max() - firming_capacity) / _safe_divisor(vre_capacity),
+        'firm_utilization': firming_energy / _safe_divisor(firming_capacity * HOURS_PER_YEAR),
+        'ramp_intensity': np.abs(np.diff(firmed_flat, axis=1)).mean(axis=1) / _safe_divisor(firming_capacity),
+    }
@@ -15,27 +15,21 @@ Data Sources:
 import pandas as pd
 import numpy as np
 from datetime import datetime
+from pathlib import Path
 import json
+import sys
+
+sys.path.insert(0, str(Path(__file__).resolve().parent / 'global-energy-services' / 'data-pipeline'))
+from dimensions import SOURCES
+
+# Paths relative to the working directory (global-energy-services)
+HISTORICAL_FILE = 'public/data/useful_energy_timeseries.json'
+OUTPUT_FILE = 'public/data/demand_growth_projections.json'
 
 # ============================================================================
 # 1. HISTORICAL DATA FOUNDATION (1960-2024)
 # ============================================================================
 
-# Efficiency factors for converting primary to useful energy
-# Source: RMI "Inefficiency Trap" 2023, IEA energy balances
-# v1.6 CRITICAL corrections: Nuclear 25% (thermal method), hydro 85%, biomass 50/50 split
-EFFICIENCY_FACTORS = {
-    'oil': 0.30,      # Transport-heavy: ICE vehicles ~25-30% (will rise to 35% by 2030 with EVs)
-    'gas': 0.50,      # Industrial heating, power generation
-    'coal': 0.32,     # Power generation, industrial heat
-    'nuclear': 0.25,  # Thermal method: thermal-to-electric 33% × T&D 90% × end-use 85% ≈ 25% (CORRECTED from 0.75)
-    'hydro': 0.85,    # Direct electricity: generation 90% × T&D 92% × end-use 85% ≈ 70%, but minimal conversion losses at source ≈ 85%
-    'wind': 0.75,     # Direct electricity with transmission/distribution/end-use losses (T&D 92% × end-use 85% ≈ 75%)
-    'solar': 0.75,    # Direct electricity with transmission/distribution/end-use losses (T&D 92% × end-use 85% ≈ 75%)
-    'biomass_traditional': 0.26,  # Traditional uses (50% of biomass per IEA, not 25%), low efficiency
-    'biomass_modern': 0.38        # Modern bioenergy (50% of biomass per IEA, not 75%), higher efficiency
-}
-
 # Sector allocation (% of total useful energy by sector)
 # Source: IEA WEO 2024 Annex A
 SECTOR_ALLOCATION = {
@@ -63,19 +57,24 @@ class EnergyDemandModel:
         self.projections = {}
         self.scenarios = ['Baseline (STEPS)', 'Accelerated (APS)', 'Net-Zero (NZE)']
 
-    def load_historical_baseline(self):
+    def load_historical_baseline(self, timeseries=None):
         """
         Load and process historical data (1960-2024)
         Uses actual data from useful_energy_timeseries.json as foundation
+
+        Args:
+            timeseries: 'data' list of useful_energy_timeseries.json
+                        (default: read from HISTORICAL_FILE)
         """
         print("Loading historical baseline...")
 
         try:
-            with open('public/data/useful_energy_timeseries.json', 'r') as f:
-                data = json.load(f)
+            if timeseries is None:
+                with open(HISTORICAL_FILE, 'r') as f:
+                    timeseries = json.load(f)['data']
 
             # Convert to DataFrame
-            df = pd.DataFrame(data['data'])
+            df = pd.DataFrame(timeseries)
 
             # Calculate totals
             df['total_useful_ej'] = df['fossil_useful_ej'] + df['clean_useful_ej']
@@ -210,20 +209,6 @@ class EnergyDemandModel:
         projections = []
         anchor_years = sorted(anchors.keys())
 
-        # Get 2024 source breakdown for projection
-        sources_2024 = {
-            'coal': 52.82,
-            'oil': 59.715,
-            'gas': 74.301,
-            'nuclear': 2.488,
-            'hydro': 13.522,
-            'wind': 6.743,
-            'solar': 5.753,
-            'biomass': 13.978,
-            'geothermal': 0.24,
-            'other': 0
-        }
-
         for year in range(start_year, end_year + 1):
             # Interpolate between anchor points for smooth trajectory
             total_useful_ej = interpolate(year, anchor_years, {y: anchors[y]['total'] for y in anchor_years})
@@ -233,46 +218,8 @@ class EnergyDemandModel:
             # Ensure values are consistent (may have small rounding errors)
             total_useful_ej = fossil_useful_ej + clean_useful_ej
 
-            years_from_base = year - 2024
-
             # Project individual sources based on IEA WEO 2024 STEPS trends
-            sources_proj = {}
-
-            # Fossil sources - declining shares
-            sources_proj['coal'] = sources_2024['coal'] * ((0.97) ** years_from_base)  # -3%/yr (fastest decline)
-            sources_proj['oil'] = sources_2024['oil'] * ((0.988) ** years_from_base)   # -1.2%/yr
-            sources_proj['gas'] = sources_2024['gas'] * ((0.995) ** years_from_base)   # -0.5%/yr (slowest decline)
-
-            # Calculate total fossil and scale to match interpolated fossil total
-            total_fossil_proj = sources_proj['coal'] + sources_proj['oil'] + sources_proj['gas']
-            if total_fossil_proj > 0:
-                fossil_scale = fossil_useful_ej / total_fossil_proj
-                sources_proj['coal'] *= fossil_scale
-                sources_proj['oil'] *= fossil_scale
-                sources_proj['gas'] *= fossil_scale
-
-            # Clean sources - rapid growth
-            sources_proj['wind'] = sources_2024['wind'] * ((1.12) ** years_from_base)      # +12%/yr
-            sources_proj['solar'] = sources_2024['solar'] * ((1.15) ** years_from_base)    # +15%/yr
-            sources_proj['hydro'] = sources_2024['hydro'] * ((1.02) ** years_from_base)    # +2%/yr
-            sources_proj['nuclear'] = sources_2024['nuclear'] * ((1.03) ** years_from_base) # +3%/yr
-            sources_proj['biomass'] = sources_2024['biomass'] * ((1.01) ** years_from_base) # +1%/yr
-            sources_proj['geothermal'] = sources_2024['geothermal'] * ((1.08) ** years_from_base) # +8%/yr
-            sources_proj['other'] = 0
-
-            # Calculate total clean and scale to match interpolated clean total
-            total_clean_proj = (sources_proj['wind'] + sources_proj['solar'] +
-                               sources_proj['hydro'] + sources_proj['nuclear'] +
-                               sources_proj['biomass'] + sources_proj['geothermal'] +
-                               sources_proj['other'])
-            if total_clean_proj > 0:
-                clean_scale = clean_useful_ej / total_clean_proj
-                sources_proj['wind'] *= clean_scale
-                sources_proj['solar'] *= clean_scale
-                sources_proj['hydro'] *= clean_scale
-                sources_proj['nuclear'] *= clean_scale
-                sources_proj['biomass'] *= clean_scale
-                sources_proj['geothermal'] *= clean_scale
+            sources_proj = self._calculate_sources(year, fossil_useful_ej, clean_useful_ej)
 
             projections.append({
                 'year': year,
@@ -299,30 +246,31 @@ class EnergyDemandModel:
         sources_proj = {}
 
         # Fossil sources
-        sources_proj['coal'] = sources_2024['coal'] * ((0.97) ** years_from_base)
-        sources_proj['oil'] = sources_2024['oil'] * ((0.988) ** years_from_base)
-        sources_proj['gas'] = sources_2024['gas'] * ((0.995) ** years_from_base)
+        sources_proj['coal'] = sources_2024['coal'] * ((0.97) ** years_from_base)  # -3%/yr (fastest decline)
+        sources_proj['oil'] = sources_2024['oil'] * ((0.988) ** years_from_base)   # -1.2%/yr
+        sources_proj['gas'] = sources_2024['gas'] * ((0.995) ** years_from_base)   # -0.5%/yr (slowest decline)
 
-        total_fossil_proj = sources_proj['coal'] + sources_proj['oil'] + sources_proj['gas']
+        fossil_sources = SOURCES.select(fossil=True)
+        total_fossil_proj = sum([sources_proj[s] for s in fossil_sources])
         if total_fossil_proj > 0:
             fossil_scale = fossil_useful_ej / total_fossil_proj
-            sources_proj['coal'] *= fossil_scale
-            sources_proj['oil'] *= fossil_scale
-            sources_proj['gas'] *= fossil_scale
+            for s in fossil_sources:
+                sources_proj[s] *= fossil_scale
 
         # Clean sources
-        sources_proj['wind'] = sources_2024['wind'] * ((1.12) ** years_from_base)
-        sources_proj['solar'] = sources_2024['solar'] * ((1.15) ** years_from_base)
-        sources_proj['hydro'] = sources_2024['hydro'] * ((1.02) ** years_from_base)
-        sources_proj['nuclear'] = sources_2024['nuclear'] * ((1.03) ** years_from_base)
-        sources_proj['biomass'] = sources_2024['biomass'] * ((1.01) ** years_from_base)
-        sources_proj['geothermal'] = sources_2024['geothermal'] * ((1.08) ** years_from_base)
+        sources_proj['wind'] = sources_2024['wind'] * ((1.12) ** years_from_base)      # +12%/yr
+        sources_proj['solar'] = sources_2024['solar'] * ((1.15) ** years_from_base)    # +15%/yr
+        sources_proj['hydro'] = sources_2024['hydro'] * ((1.02) ** years_from_base)    # +2%/yr
+        sources_proj['nuclear'] = sources_2024['nuclear'] * ((1.03) ** years_from_base) # +3%/yr
+        sources_proj['biomass'] = sources_2024['biomass'] * ((1.01) ** years_from_base) # +1%/yr
+        sources_proj['geothermal'] = sources_2024['geothermal'] * ((1.08) ** years_from_base) # +8%/yr
         sources_proj['other'] = 0
 
-        total_clean_proj = sum([sources_proj[s] for s in ['wind', 'solar', 'hydro', 'nuclear', 'biomass', 'geothermal', 'other']])
+        clean_sources = SOURCES.select(fossil=False)
+        total_clean_proj = sum([sources_proj[s] for s in clean_sources + ['other']])
         if total_clean_proj > 0:
             clean_scale = clean_useful_ej / total_clean_proj
-            for s in ['wind', 'solar', 'hydro', 'nuclear', 'biomass', 'geothermal']:
+            for s in clean_sources:
                 sources_proj[s] *= clean_scale
 
         return sources_proj
@@ -453,16 +401,20 @@ class EnergyDemandModel:
 
         return pd.DataFrame(projections)
 
-    def run_all_scenarios(self):
+    def run_all_scenarios(self, timeseries=None, save=True):
         """
         Run all three scenarios and combine results
+
+        Args:
+            timeseries: Historical useful energy timeseries (default: read from HISTORICAL_FILE)
+            save: Write the projections to OUTPUT_FILE
         """
         print("\n" + "="*80)
         print("RUNNING COMPREHENSIVE ENERGY SERVICES DEMAND MODEL")
         print("="*80)
 
         # Load historical baseline
-        self.load_historical_baseline()
+        self.load_historical_baseline(timeseries)
 
         if self.historical_data is None:
             print("ERROR: Could not load historical data")
@@ -479,17 +431,15 @@ class EnergyDemandModel:
         self.projections = all_projections
 
         # Save to JSON for web app
-        self.save_projections()
+        if save:
+            self.save_projections()
 
         return all_projections
 
-    def save_projections(self):
+    def projection_output(self):
         """
-        Save projections to JSON format for web application
+        Projections in the format expected by the web application
         """
-        output_file = 'public/data/demand_growth_projections.json'
-
-        # Convert to format expected by web app
         output_data = {
             'metadata': {
                 'model': 'Comprehensive Energy Services Demand Model',
@@ -523,6 +473,15 @@ class EnergyDemandModel:
                 'data': scenario_data.to_dict('records')
             })
 
+        return output_data
+
+    def save_projections(self):
+        """
+        Save projections to JSON format for web application
+        """
+        output_file = OUTPUT_FILE
+        output_data = self.projection_output()
+
         # Write to file
         with open(output_file, 'w') as f:
             json.dump(output_data, f, indent=2)
@@ -24,17 +24,33 @@ import pandas as pd
 from datetime import datetime
 from pathlib import Path
 import os
+import sys
+
+sys.path.insert(0, str(Path(__file__).resolve().parent / 'data-pipeline'))
+sys.path.insert(0, str(Path(__file__).resolve().parent / 'global-energy-services' / 'data-pipeline'))
+from config_registry import REGISTRY
+from dimensions import SOURCES
+from energy_balance import EnergyBalance, percent
+from scenario_sets import scenario_dimension
+
+SCENARIOS = scenario_dimension().select(builtin=True)
 
 class LearningCurveProjectionModel:
     """
     v4.0 Projection Model with learning curves and improved scenarios.
     """
 
-    def __init__(self):
+    def __init__(self, historical=None, cagrs=None):
+        """
+        Args:
+            historical: Historical useful energy timeseries ('data' list of
+                        useful_energy_timeseries.json; default: config registry)
+            cagrs: Historical CAGRs (calculated_cagrs.json content; default: config registry)
+        """
         self.base_year = 2024
 
         # Load configurations
-        self._load_configurations()
+        self._load_configurations(historical, cagrs)
 
         print("Learning Curve Projection Model v4.0 Initialized")
         print("=" * 80)
@@ -44,27 +60,19 @@ class LearningCurveProjectionModel:
         print("Scenarios: Conservative | Baseline | Optimistic")
         print()
 
-    def _load_configurations(self):
-        """Load all configuration files."""
-        # Try multiple paths for compatibility
-        base_paths = [
-            'global-energy-services',
-            'global-energy-tracker',
-            '.'
-        ]
-
+    def _load_configurations(self, historical=None, cagrs=None):
+        """Load all configuration files (via the shared config registry)."""
         # Load historical CAGRs
-        cagr_path = 'calculated_cagrs.json'
-        if os.path.exists(cagr_path):
-            with open(cagr_path, 'r') as f:
-                cagrs = json.load(f)
+        if cagrs is None:
+            cagrs = REGISTRY.get('calculated_cagrs.json')
+        if cagrs is not None:
             self.total_cagr = cagrs['total']
             self.fossil_cagr_historical = cagrs['fossil']
             self.clean_cagr = cagrs['clean']
             self.source_cagrs = cagrs['sources']
         else:
             # Fallback defaults
-            print(f"Warning: {cagr_path} not found, using defaults")
+            print("Warning: calculated_cagrs.json not found, using defaults")
             self.total_cagr = 0.01593
             self.fossil_cagr_historical = 0.01165
             self.clean_cagr = 0.03706
@@ -75,17 +83,11 @@ class LearningCurveProjectionModel:
             }
 
         # Load 2024 baseline
-        baseline_loaded = False
-        for base_path in base_paths:
-            useful_path = f'{base_path}/public/data/useful_energy_timeseries.json'
-            if os.path.exists(useful_path):
-                with open(useful_path, 'r') as f:
-                    historical = json.load(f)
-                    self.baseline_2024 = next(d for d in historical['data'] if d['year'] == 2024)
-                    baseline_loaded = True
-                    break
-
-        if not baseline_loaded:
+        if historical is None:
+            historical = (REGISTRY.get('useful_energy_timeseries.json') or {}).get('data')
+        if historical is not None:
+            self.baseline_2024 = next(d for d in historical if d['year'] == 2024)
+        else:
             # Fallback baseline
             print("Warning: Could not load historical data, using defaults")
             self.baseline_2024 = {
@@ -100,19 +102,12 @@ class LearningCurveProjectionModel:
             }
 
         # Load exergy factors
-        exergy_loaded = False
-        for base_path in base_paths:
-            exergy_path = f'{base_path}/data-pipeline/source_sector_allocation.json'
-            if os.path.exists(exergy_path):
-                with open(exergy_path, 'r') as f:
-                    allocation_data = json.load(f)
-                    self.exergy_factors = {}
-                    for source, data in allocation_data['source_to_sector_allocation'].items():
-                        self.exergy_factors[source] = data['weighted_exergy_factor']
-                    exergy_loaded = True
-                    break
-
-        if not exergy_loaded:
+        allocation_data = REGISTRY.get('source_sector_allocation.json')
+        if allocation_data is not None:
+            self.exergy_factors = {}
+            for source, data in allocation_data['source_to_sector_allocation'].items():
+                self.exergy_factors[source] = data['weighted_exergy_factor']
+        else:
             # Fallback exergy factors
             self.exergy_factors = {
                 'coal': 0.78, 'oil': 0.82, 'gas': 0.46,
@@ -121,22 +116,14 @@ class LearningCurveProjectionModel:
             }
 
         # Load learning curves config (optional)
-        learning_path = 'data-pipeline/config/learning_curves.json'
-        if os.path.exists(learning_path):
-            with open(learning_path, 'r') as f:
-                self.learning_curves = json.load(f)
+        self.learning_curves = REGISTRY.get('learning_curves.json')
+        if self.learning_curves is not None:
             print("✓ Loaded learning curves configuration")
-        else:
-            self.learning_curves = None
 
         # Load manufacturing capacity config (optional)
-        capacity_path = 'data-pipeline/config/manufacturing_capacity.json'
-        if os.path.exists(capacity_path):
-            with open(capacity_path, 'r') as f:
-                self.manufacturing_capacity = json.load(f)
+        self.manufacturing_capacity = REGISTRY.get('manufacturing_capacity.json')
+        if self.manufacturing_capacity is not None:
             print("✓ Loaded manufacturing capacity configuration")
-        else:
-            self.manufacturing_capacity = None
 
     def logistic_scurve(self, t, L, k, t0, y0):
         """
@@ -243,83 +230,96 @@ class LearningCurveProjectionModel:
         # 2024 baseline values
         sources_2024 = self.baseline_2024['sources_useful_ej']
 
-        projections = []
-
-        for year in range(start_year, end_year + 1):
-            years_from_base = year - self.base_year
-
-            sources_useful = {}
-
-            # COAL: Decline from 2025
-            sources_useful['coal'] = sources_2024['coal'] * ((1 + params['coal_decline']) ** years_from_base)
-
-            # OIL: Peak then decline
-            if year <= params['oil_peak_year']:
-                years_to_peak = year - self.base_year
-                sources_useful['oil'] = sources_2024['oil'] * ((1 + self.source_cagrs['oil']) ** years_to_peak)
-            else:
-                oil_peak = sources_2024['oil'] * ((1 + self.source_cagrs['oil']) ** (params['oil_peak_year'] - self.base_year))
-                years_past_peak = year - params['oil_peak_year']
-                sources_useful['oil'] = oil_peak * ((1 + params['oil_decline']) ** years_past_peak)
-
-            # GAS: Bridge fuel - grow then decline
-            if year <= params['gas_peak_year']:
-                years_to_peak = year - self.base_year
-                sources_useful['gas'] = sources_2024['gas'] * ((1 + 0.008) ** years_to_peak)  # Slow growth
-            else:
-                gas_peak = sources_2024['gas'] * ((1 + 0.008) ** (params['gas_peak_year'] - self.base_year))
-                years_past_peak = year - params['gas_peak_year']
-                sources_useful['gas'] = gas_peak * ((1 + params['gas_decline']) ** years_past_peak)
-
-            # WIND: S-curve saturation
-            wind_raw = self.logistic_scurve(years_from_base, params['wind_L'], params['wind_k'], params['wind_t0'], sources_2024['wind'])
-            wind_baseline = self.logistic_scurve(0, params['wind_L'], params['wind_k'], params['wind_t0'], sources_2024['wind'])
-            sources_useful['wind'] = wind_raw - wind_baseline + sources_2024['wind']
-
-            # SOLAR: S-curve saturation
-            solar_raw = self.logistic_scurve(years_from_base, params['solar_L'], params['solar_k'], params['solar_t0'], sources_2024['solar'])
-            solar_baseline = self.logistic_scurve(0, params['solar_L'], params['solar_k'], params['solar_t0'], sources_2024['solar'])
-            sources_useful['solar'] = solar_raw - solar_baseline + sources_2024['solar']
-
-            # OTHER CLEAN: Growth rates
-            sources_useful['nuclear'] = sources_2024['nuclear'] * ((1 + params['nuclear_growth']) ** years_from_base)
-            sources_useful['hydro'] = sources_2024['hydro'] * ((1 + params['hydro_growth']) ** years_from_base)
-            sources_useful['biomass'] = sources_2024['biomass'] * ((1 + params['biomass_growth']) ** years_from_base)
-            sources_useful['geothermal'] = sources_2024['geothermal'] * ((1 + params['geothermal_growth']) ** years_from_base)
-
-            # AGGREGATES (USEFUL ENERGY)
-            fossil_sources = ['coal', 'oil', 'gas']
-            clean_sources = ['nuclear', 'hydro', 'wind', 'solar', 'geothermal', 'biomass']
-
-            fossil_useful = sum(sources_useful[s] for s in fossil_sources)
-            clean_useful = sum(sources_useful[s] for s in clean_sources)
-            total_useful = fossil_useful + clean_useful
-
-            # ENERGY SERVICES (USEFUL × EXERGY FACTORS)
-            sources_services = {}
-            for source, useful_ej in sources_useful.items():
-                exergy_factor = self.exergy_factors.get(source, 1.0)
-                sources_services[source] = useful_ej * exergy_factor
-
-            fossil_services = sum(sources_services[s] for s in fossil_sources)
-            clean_services = sum(sources_services[s] for s in clean_sources)
-            total_services = fossil_services + clean_services
+        # Every projection year at once: [year] arrays per source
+        years = np.arange(start_year, end_year + 1)
+        years_from_base = years - self.base_year
+
+        sources_useful = {}
+
+        # COAL: Decline from 2025
+        sources_useful['coal'] = sources_2024['coal'] * ((1 + params['coal_decline']) ** years_from_base)
+
+        # OIL: Peak then decline
+        oil_peak = sources_2024['oil'] * ((1 + self.source_cagrs['oil']) ** (params['oil_peak_year'] - self.base_year))
+        sources_useful['oil'] = np.where(
+            years <= params['oil_peak_year'],
+            sources_2024['oil'] * ((1 + self.source_cagrs['oil']) ** years_from_base),
+            oil_peak * ((1 + params['oil_decline']) ** (years - params['oil_peak_year'])))
+
+        # GAS: Bridge fuel - grow then decline
+        gas_peak = sources_2024['gas'] * ((1 + 0.008) ** (params['gas_peak_year'] - self.base_year))
+        sources_useful['gas'] = np.where(
+            years <= params['gas_peak_year'],
+            sources_2024['gas'] * ((1 + 0.008) ** years_from_base),  # Slow growth
+            gas_peak * ((1 + params['gas_decline']) ** (years - params['gas_peak_year'])))
+
+        # WIND: S-curve saturation
+        wind_raw = self.logistic_scurve(years_from_base, params['wind_L'], params['wind_k'], params['wind_t0'], sources_2024['wind'])
+        wind_baseline = self.logistic_scurve(np.zeros_like(years_from_base), params['wind_L'], params['wind_k'], params['wind_t0'], sources_2024['wind'])
+        sources_useful['wind'] = wind_raw - wind_baseline + sources_2024['wind']
+
+        # SOLAR: S-curve saturation
+        solar_raw = self.logistic_scurve(years_from_base, params['solar_L'], params['solar_k'], params['solar_t0'], sources_2024['solar'])
+        solar_baseline = self.logistic_scurve(np.zeros_like(years_from_base), params['solar_L'], params['solar_k'], params['solar_t0'], sources_2024['solar'])
+        sources_useful['solar'] = solar_raw - solar_baseline + sources_2024['solar']
+
+        # OTHER CLEAN: Growth rates
+        sources_useful['nuclear'] = sources_2024['nuclear'] * ((1 + params['nuclear_growth']) ** years_from_base)
+        sources_useful['hydro'] = sources_2024['hydro'] * ((1 + params['hydro_growth']) ** years_from_base)
+        sources_useful['biomass'] = sources_2024['biomass'] * ((1 + params['biomass_growth']) ** years_from_base)
+        sources_useful['geothermal'] = sources_2024['geothermal'] * ((1 + params['geothermal_growth']) ** years_from_base)
+
+        # USEFUL ENERGY and ENERGY SERVICES (USEFUL × EXERGY FACTORS) as a [scenario × year × source] balance
+        sources = list(sources_useful)
+        useful = np.stack([sources_useful[source] for source in sources], axis=-1)[None]
+        exergy = np.array([self.exergy_factors.get(source, 1.0) for source in sources])
+        balance = EnergyBalance([scenario_name], years, sources, useful=useful, services=useful * exergy)
+
+        # AGGREGATES
+        fossil_sources = SOURCES.select(fossil=True)
+        clean_sources = SOURCES.select(fossil=False)
+
+        fossil_useful = balance.total('useful', fossil_sources)[0]
+        clean_useful = balance.total('useful', clean_sources)[0]
+        total_useful = fossil_useful + clean_useful
+        fossil_services = balance.total('services', fossil_sources)[0]
+        clean_services = balance.total('services', clean_sources)[0]
+        total_services = fossil_services + clean_services
+
+        # Output records (JSON shape)
+        columns = {
+            'total_useful_ej': total_useful,
+            'fossil_useful_ej': fossil_useful,
+            'clean_useful_ej': clean_useful,
+            'fossil_share_percent': percent(fossil_useful, total_useful),
+            'clean_share_percent': percent(clean_useful, total_useful),
+            'total_services_ej': total_services,
+            'fossil_services_ej': fossil_services,
+            'clean_services_ej': clean_services,
+            'fossil_services_share_percent': percent(fossil_services, total_services),
+            'clean_services_share_percent': percent(clean_services, total_services),
+        }
+        columns = {key: values.tolist() for key, values in columns.items()}
+        useful_rows = balance.useful[0].tolist()
+        services_rows = balance.services[0].tolist()
 
+        projections = []
+        for y, year in enumerate(years.tolist()):
             projections.append({
                 'year': year,
                 'scenario': scenario_name,
-                'total_useful_ej': round(total_useful, 2),
-                'fossil_useful_ej': round(fossil_useful, 2),
-                'clean_useful_ej': round(clean_useful, 2),
-                'fossil_share_percent': round((fossil_useful / total_useful) * 100, 2),
-                'clean_share_percent': round((clean_useful / total_useful) * 100, 2),
-                'sources_useful_ej': {k: round(v, 3) for k, v in sources_useful.items()},
-                'total_services_ej': round(total_services, 2),
-                'fossil_services_ej': round(fossil_services, 2),
-                'clean_services_ej': round(clean_services, 2),
-                'fossil_services_share_percent': round((fossil_services / total_services) * 100, 2),
-                'clean_services_share_percent': round((clean_services / total_services) * 100, 2),
-                'sources_services_ej': {k: round(v, 3) for k, v in sources_services.items()}
+                'total_useful_ej': round(columns['total_useful_ej'][y], 2),
+                'fossil_useful_ej': round(columns['fossil_useful_ej'][y], 2),
+                'clean_useful_ej': round(columns['clean_useful_ej'][y], 2),
+                'fossil_share_percent': round(columns['fossil_share_percent'][y], 2),
+                'clean_share_percent': round(columns['clean_share_percent'][y], 2),
+                'sources_useful_ej': {k: round(v, 3) for k, v in zip(sources, useful_rows[y])},
+                'total_services_ej': round(columns['total_services_ej'][y], 2),
+                'fossil_services_ej': round(columns['fossil_services_ej'][y], 2),
+                'clean_services_ej': round(columns['clean_services_ej'][y], 2),
+                'fossil_services_share_percent': round(columns['fossil_services_share_percent'][y], 2),
+                'clean_services_share_percent': round(columns['clean_services_share_percent'][y], 2),
+                'sources_services_ej': {k: round(v, 3) for k, v in zip(sources, services_rows[y])}
             })
 
         # Print summary
@@ -338,24 +338,8 @@ class LearningCurveProjectionModel:
 
         return projections
 
-    def save_projections(self, all_scenarios):
-        """Save projections to JSON file."""
-        # Try multiple output paths
-        output_paths = [
-            'global-energy-services/public/data/demand_growth_projections.json',
-            'global-energy-tracker/public/data/demand_growth_projections.json'
-        ]
-
-        output_file = None
-        for path in output_paths:
-            if os.path.exists(os.path.dirname(path)):
-                output_file = path
-                break
-
-        if output_file is None:
-            output_file = output_paths[0]
-            os.makedirs(os.path.dirname(output_file), exist_ok=True)
-
+    def projection_output(self, all_scenarios):
+        """Projections file content ({scenario: projections} → JSON structure)."""
         output_data = {
             'metadata': {
                 'model': 'Learning Curve Projection Model v4.0',
@@ -399,6 +383,28 @@ class LearningCurveProjectionModel:
             }
             output_data['scenarios'].append(scenario_data)
 
+        return output_data
+
+    def save_projections(self, all_scenarios):
+        """Save projections to JSON file."""
+        # Try multiple output paths
+        output_paths = [
+            'global-energy-services/public/data/demand_growth_projections.json',
+            'global-energy-tracker/public/data/demand_growth_projections.json'
+        ]
+
+        output_file = None
+        for path in output_paths:
+            if os.path.exists(os.path.dirname(path)):
+                output_file = path
+                break
+
+        if output_file is None:
+            output_file = output_paths[0]
+            os.makedirs(os.path.dirname(output_file), exist_ok=True)
+
+        output_data = self.projection_output(all_scenarios)
+
         with open(output_file, 'w') as f:
             json.dump(output_data, f, indent=2)
 
@@ -419,10 +425,7 @@ def main():
     model = LearningCurveProjectionModel()
 
     # Generate all three scenarios
-    all_scenarios = {}
-    all_scenarios['Conservative'] = model.calculate_scenario('Conservative')
-    all_scenarios['Baseline'] = model.calculate_scenario('Baseline')
-    all_scenarios['Optimistic'] = model.calculate_scenario('Optimistic')
+    all_scenarios = {name: model.calculate_scenario(name) for name in SCENARIOS}
 
     model.save_projections(all_scenarios)
 
@@ -15,86 +15,106 @@ import os
 if sys.platform == 'win32':
     sys.stdout.reconfigure(encoding='utf-8')
 
-def calculate_ff_growth(data_path):
+def ff_growth_record(prev_year, curr_year):
+    """FF_growth entry of curr_year relative to prev_year (useful energy timeseries entries)"""
+    # Calculate changes
+    delta_fossil = curr_year['fossil_useful_ej'] - prev_year['fossil_useful_ej']
+    delta_clean = curr_year['clean_useful_ej'] - prev_year['clean_useful_ej']
+    delta_total = curr_year['total_useful_ej'] - prev_year['total_useful_ej']
+
+    # Calculate FF_growth
+    # If total is growing, what % is coming from fossil?
+    if delta_total > 0:
+        ff_growth_pct = (delta_fossil / delta_total) * 100
+    elif delta_total < 0:
+        # If total is shrinking, we still calculate the ratio
+        ff_growth_pct = (delta_fossil / delta_total) * 100
+    else:
+        # No change
+        ff_growth_pct = 0
+
+    # Calculate net change (simplified version without displacement data)
+    # For now, we'll just track FF_growth
+    # Later we'll add displacement rate: net_change = ff_growth + displacement_rate
+
+    return {
+        'year': curr_year['year'],
+        'delta_total_ej': round(delta_total, 2),
+        'delta_fossil_ej': round(delta_fossil, 2),
+        'delta_clean_ej': round(delta_clean, 2),
+        'ff_growth_pct': round(ff_growth_pct, 1),
+        'clean_growth_pct': round(100 - ff_growth_pct, 1) if delta_total > 0 else 0,
+    }
+
+def add_rolling_averages(results, indices):
+    """Set the 5-year rolling average FF_growth of the given result indices"""
+    for i in indices:
+        start_idx = max(0, i - 4)
+        window = results[start_idx:i + 1]
+
+        avg_ff_growth = sum(r['ff_growth_pct'] for r in window) / len(window)
+        results[i]['ff_growth_5yr_avg'] = round(avg_ff_growth, 1)
+
+def patch_ff_growth(results, timeseries, years):
     """
-    Calculate FF_growth for each year
+    Recompute the FF_growth entries affected by changed useful energy years
+
+    A changed year affects its own entry and the next year's (deltas), and
+    the rolling averages of the following four entries. Falls back to a
+    full recompute when years were added or removed.
+
+    Args:
+        results: 'data' list of ff_growth_timeseries.json (patched in place)
+        timeseries: Updated 'data' list of useful_energy_timeseries.json
+        years: Changed useful energy years
     """
-    print("=" * 60)
-    print("FF_GROWTH CALCULATOR")
-    print("=" * 60)
-    print()
+    if [r['year'] for r in results] != [entry['year'] for entry in timeseries[1:]]:
+        results[:] = [ff_growth_record(timeseries[i - 1], timeseries[i]) for i in range(1, len(timeseries))]
+        add_rolling_averages(results, range(len(results)))
+        return
 
-    # Load the useful energy data
-    print("Loading useful energy data...")
-    with open(data_path, 'r', encoding='utf-8') as f:
-        energy_data = json.load(f)
+    index = {entry['year']: i for i, entry in enumerate(timeseries)}
+    changed = sorted({i for year in years if year in index for i in (index[year], index[year] + 1)
+                      if 1 <= i < len(timeseries)})
+    for i in changed:
+        results[i - 1] = ff_growth_record(timeseries[i - 1], timeseries[i])
 
-    timeseries = energy_data['data']
-    print(f"✓ Loaded {len(timeseries)} years of data")
-    print()
+    rolling = sorted({j for i in changed for j in range(i - 1, min(i + 4, len(results)))})
+    add_rolling_averages(results, rolling)
+
+def compute_ff_growth(timeseries, generated_at):
+    """
+    FF_growth output (ff_growth_timeseries.json content) of a useful energy timeseries
 
+    Args:
+        timeseries: 'data' list of useful_energy_timeseries.json
+        generated_at: generated_at of the useful energy output
+    """
     # Calculate year-over-year changes
-    results = []
-    for i in range(1, len(timeseries)):
-        prev_year = timeseries[i - 1]
-        curr_year = timeseries[i]
-
-        # Calculate changes
-        delta_fossil = curr_year['fossil_useful_ej'] - prev_year['fossil_useful_ej']
-        delta_clean = curr_year['clean_useful_ej'] - prev_year['clean_useful_ej']
-        delta_total = curr_year['total_useful_ej'] - prev_year['total_useful_ej']
-
-        # Calculate FF_growth
-        # If total is growing, what % is coming from fossil?
-        if delta_total > 0:
-            ff_growth_pct = (delta_fossil / delta_total) * 100
-        elif delta_total < 0:
-            # If total is shrinking, we still calculate the ratio
-            ff_growth_pct = (delta_fossil / delta_total) * 100
-        else:
-            # No change
-            ff_growth_pct = 0
-
-        # Calculate net change (simplified version without displacement data)
-        # For now, we'll just track FF_growth
-        # Later we'll add displacement rate: net_change = ff_growth + displacement_rate
-
-        results.append({
-            'year': curr_year['year'],
-            'delta_total_ej': round(delta_total, 2),
-            'delta_fossil_ej': round(delta_fossil, 2),
-            'delta_clean_ej': round(delta_clean, 2),
-            'ff_growth_pct': round(ff_growth_pct, 1),
-            'clean_growth_pct': round(100 - ff_growth_pct, 1) if delta_total > 0 else 0,
-        })
+    results = [ff_growth_record(timeseries[i - 1], timeseries[i]) for i in range(1, len(timeseries))]
 
     # Calculate rolling averages (5-year)
-    for i in range(len(results)):
-        start_idx = max(0, i - 4)
-        window = results[start_idx:i + 1]
+    add_rolling_averages(results, range(len(results)))
 
-        avg_ff_growth = sum(r['ff_growth_pct'] for r in window) / len(window)
-        results[i]['ff_growth_5yr_avg'] = round(avg_ff_growth, 1)
-
-    # Save results
-    output_path = os.path.join(os.path.dirname(data_path), 'ff_growth_timeseries.json')
-
-    output_data = {
+    return {
         'metadata': {
             'description': 'FF_growth and related metrics over time',
             'formula': 'FF_growth = (ΔFossil_useful) / (ΔTotal_useful) × 100%',
-            'generated_at': energy_data['metadata']['generated_at'],
+            'generated_at': generated_at,
         },
         'data': results
     }
 
+def save_ff_growth(output_data, output_path):
+    """Write ff_growth_timeseries.json"""
     with open(output_path, 'w', encoding='utf-8') as f:
         json.dump(output_data, f, indent=2, ensure_ascii=False)
 
     print(f"✓ Saved results to: {output_path}")
     print()
 
-    # Print summary
+def print_summary(results):
+    """Print recent, 5-year and historical FF_growth"""
     print("=" * 60)
     print("FF_GROWTH SUMMARY")
     print("=" * 60)
@@ -129,6 +149,31 @@ def calculate_ff_growth(data_path):
     print("✓ FF_growth calculation complete!")
     print("=" * 60)
 
+def calculate_ff_growth(data_path):
+    """
+    Calculate FF_growth for each year
+    """
+    print("=" * 60)
+    print("FF_GROWTH CALCULATOR")
+    print("=" * 60)
+    print()
+
+    # Load the useful energy data
+    print("Loading useful energy data...")
+    with open(data_path, 'r', encoding='utf-8') as f:
+        energy_data = json.load(f)
+
+    timeseries = energy_data['data']
+    print(f"✓ Loaded {len(timeseries)} years of data")
+    print()
+
+    output_data = compute_ff_growth(timeseries, energy_data['metadata']['generated_at'])
+
+    # Save results
+    save_ff_growth(output_data, os.path.join(os.path.dirname(data_path), 'ff_growth_timeseries.json'))
+
+    print_summary(output_data['data'])
+
     return output_data
 
 if __name__ == '__main__':
@@ -8,6 +8,8 @@ import os
 import sys
 from datetime import datetime
 
+from owid_cache import load_owid_cache
+
 # Fix encoding for Windows console
 if sys.platform == 'win32':
     sys.stdout.reconfigure(encoding='utf-8')
@@ -19,15 +21,8 @@ def load_efficiency_factors():
         return json.load(f)
 
 def load_owid_data():
-    """Load Our World in Data energy dataset"""
-    filepath = os.path.join('downloads', 'owid_energy_latest.json')
-    if not os.path.exists(filepath):
-        print(f"✗ Data file not found: {filepath}")
-        print("  Run fetch_data.py first to download the data.")
-        return None
-
-    with open(filepath, 'r', encoding='utf-8') as f:
-        return json.load(f)
+    """Load Our World in Data energy dataset (typed columnar cache from fetch_data.py)"""
+    return load_owid_cache()
 
 def calculate_useful_energy_for_source(final_energy_ej, source, efficiency_factors):
     """
@@ -42,14 +37,13 @@ def calculate_useful_energy_for_source(final_energy_ej, source, efficiency_facto
     useful_energy = final_energy_ej * factor
     return useful_energy
 
-def safe_float(value):
-    """Safely convert string to float"""
-    if value is None or value == '':
-        return 0.0
-    try:
-        return float(value)
-    except (ValueError, TypeError):
-        return 0.0
+
+# OWID columns read per year (TWh)
+OWID_COLUMNS = [
+    'oil_consumption', 'gas_consumption', 'coal_consumption',
+    'nuclear_electricity', 'hydro_electricity', 'wind_electricity', 'solar_electricity',
+    'other_renewable_exc_biofuel_electricity', 'biofuel_consumption'
+]
 
 def process_global_data(data, efficiency_factors):
     """
@@ -59,20 +53,11 @@ def process_global_data(data, efficiency_factors):
         print("✗ Global data not found in dataset")
         return None
 
-    world_data = data['World']['data']
-
     # Process each year
     results = []
 
-    for record in world_data:
-        year_str = record.get('year')
-        if not year_str:
-            continue
-
-        try:
-            year = int(year_str)
-        except (ValueError, TypeError):
-            continue
+    for record in data.records('World', OWID_COLUMNS):
+        year = record['year']
 
         if year < 1965:  # Start from 1965 for consistency
             continue
@@ -84,21 +69,21 @@ def process_global_data(data, efficiency_factors):
 
         # Get final energy by source from OWID data
         # For fossil fuels: use consumption (= primary energy)
-        oil_twh = safe_float(record.get('oil_consumption'))
-        gas_twh = safe_float(record.get('gas_consumption'))
-        coal_twh = safe_float(record.get('coal_consumption'))
+        oil_twh = record['oil_consumption']
+        gas_twh = record['gas_consumption']
+        coal_twh = record['coal_consumption']
 
         # For renewables that generate electricity: use ELECTRICITY output, not inflated 'consumption'
         # OWID inflates renewable 'consumption' using substitution method - we want actual electricity
-        nuclear_twh = safe_float(record.get('nuclear_electricity'))  # Changed from consumption
-        hydro_twh = safe_float(record.get('hydro_electricity'))      # Changed from consumption
-        wind_twh = safe_float(record.get('wind_electricity'))        # Changed from consumption
-        solar_twh = safe_float(record.get('solar_electricity'))      # Changed from consumption
-        geothermal_twh = safe_float(record.get('other_renewable_exc_biofuel_electricity'))
+        nuclear_twh = record['nuclear_electricity']  # Changed from consumption
+        hydro_twh = record['hydro_electricity']      # Changed from consumption
+        wind_twh = record['wind_electricity']        # Changed from consumption
+        solar_twh = record['solar_electricity']      # Changed from consumption
+        geothermal_twh = record['other_renewable_exc_biofuel_electricity']
 
         # For biomass: need to estimate total (traditional + modern)
         # OWID only shows modern biofuels, traditional biomass is missing
-        biofuel_modern_twh = safe_float(record.get('biofuel_consumption'))
+        biofuel_modern_twh = record['biofuel_consumption']
         # Estimate traditional biomass at ~45 EJ based on IEA data
         traditional_biomass_ej = 45.0
         biomass_twh = biofuel_modern_twh + (traditional_biomass_ej / TWH_TO_EJ)
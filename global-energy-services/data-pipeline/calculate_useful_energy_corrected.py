@@ -3,31 +3,17 @@ CORRECTED Useful Energy Calculator
 Properly handles renewable energy accounting and biomass
 """
 
-import json
-import os
 import sys
 from datetime import datetime
 
+from owid_cache import load_owid_cache
+
 if sys.platform == 'win32':
     sys.stdout.reconfigure(encoding='utf-8')
 
-def safe_float(value):
-    """Safely convert string to float"""
-    if value is None or value == '':
-        return 0.0
-    try:
-        return float(value)
-    except (ValueError, TypeError):
-        return 0.0
-
 def load_owid_data():
-    """Load Our World in Data energy dataset"""
-    filepath = os.path.join('downloads', 'owid_energy_latest.json')
-    if not os.path.exists(filepath):
-        print(f"✗ Data file not found: {filepath}")
-        return None
-    with open(filepath, 'r') as f:
-        return json.load(f)
+    """Load Our World in Data energy dataset (typed columnar cache from fetch_data.py)"""
+    return load_owid_cache()
 
 def calculate_useful_energy_2023():
     """
@@ -41,8 +27,8 @@ def calculate_useful_energy_2023():
 
     TWH_TO_EJ = 0.0036
 
-    for record in data['World']['data']:
-        if record.get('year') != '2023':
+    for record in data.records('World'):
+        if record['year'] != 2023:
             continue
 
         print("="*70)
@@ -51,9 +37,9 @@ def calculate_useful_energy_2023():
 
         # --- FOSSIL FUELS ---
         # Use consumption data, apply system efficiency
-        oil_primary_ej = safe_float(record.get('oil_consumption')) * TWH_TO_EJ
-        gas_primary_ej = safe_float(record.get('gas_consumption')) * TWH_TO_EJ
-        coal_primary_ej = safe_float(record.get('coal_consumption')) * TWH_TO_EJ
+        oil_primary_ej = record['oil_consumption'] * TWH_TO_EJ
+        gas_primary_ej = record['gas_consumption'] * TWH_TO_EJ
+        coal_primary_ej = record['coal_consumption'] * TWH_TO_EJ
 
         # Efficiencies from corrected model
         oil_useful = oil_primary_ej * 0.25   # Transport ~20-25%
@@ -71,8 +57,8 @@ def calculate_useful_energy_2023():
 
         # --- NUCLEAR ---
         # Use thermal input (consumption), convert at 33%
-        nuclear_thermal_ej = safe_float(record.get('nuclear_consumption')) * TWH_TO_EJ
-        nuclear_elec_ej = safe_float(record.get('nuclear_electricity')) * TWH_TO_EJ
+        nuclear_thermal_ej = record['nuclear_consumption'] * TWH_TO_EJ
+        nuclear_elec_ej = record['nuclear_electricity'] * TWH_TO_EJ
 
         # For useful energy: electricity output * T&D * end-use
         # T&D efficiency: ~92%, end-use: ~85%
@@ -87,10 +73,10 @@ def calculate_useful_energy_2023():
         # KEY: Use ELECTRICITY OUTPUT, not inflated 'consumption'
         # Then apply T&D (92%) and end-use efficiency (85%)
 
-        hydro_elec_ej = safe_float(record.get('hydro_electricity')) * TWH_TO_EJ
-        wind_elec_ej = safe_float(record.get('wind_electricity')) * TWH_TO_EJ
-        solar_elec_ej = safe_float(record.get('solar_electricity')) * TWH_TO_EJ
-        geothermal_elec_ej = safe_float(record.get('other_renewable_exc_biofuel_electricity')) * TWH_TO_EJ
+        hydro_elec_ej = record['hydro_electricity'] * TWH_TO_EJ
+        wind_elec_ej = record['wind_electricity'] * TWH_TO_EJ
+        solar_elec_ej = record['solar_electricity'] * TWH_TO_EJ
+        geothermal_elec_ej = record['other_renewable_exc_biofuel_electricity'] * TWH_TO_EJ
 
         # Apply T&D and end-use losses
         td_eff = 0.92
@@ -116,7 +102,7 @@ def calculate_useful_energy_2023():
         # Efficiency: traditional ~20%, modern transport ~20%, modern power ~35%
         # Weighted average: ~25-30%
 
-        biofuel_shown_ej = safe_float(record.get('biofuel_consumption')) * TWH_TO_EJ
+        biofuel_shown_ej = record['biofuel_consumption'] * TWH_TO_EJ
 
         # Estimate total biomass (including traditional)
         # Based on IEA data: traditional biomass ~45 EJ + modern ~5 EJ = 50 EJ
@@ -8,6 +8,7 @@ New in v2.0:
 - Regional efficiency variations
 - Rebound effect modeling
 - Energy services output (exergy-weighted useful energy)
+- Per-entity output for every OWID country and aggregate (vectorized)
 """
 
 import json
@@ -15,10 +16,28 @@ import os
 import sys
 from datetime import datetime
 
+import numpy as np
+
+from dimensions import SOURCES as source_registry, sector_dimension
+from efficiency_cube import cube_from_configs, load_efficiency_cube
+from energy_balance import EnergyBalance, balance_fields, round_array
+from owid_cache import load_owid_cache
+
 # Fix encoding for Windows console
 if sys.platform == 'win32':
     sys.stdout.reconfigure(encoding='utf-8')
 
+# Configuration flags
+ENABLE_TEMPORAL = True  # Use time-varying efficiency
+ENABLE_EXERGY = True    # Calculate energy services
+REBOUND_RATE = 0.07     # 7% rebound effect (Jevons paradox)
+
+# Sector assumed for sources without a sector allocation (electricity)
+UNALLOCATED_SECTOR = 'electricity_generation'
+
+OUTPUT_DIR = '../public/data'
+ENTITY_OUTPUT_FILENAME = 'energy_services_by_entity.json'
+
 def load_json_config(filename):
     """Load JSON configuration file"""
     filepath = filename
@@ -49,16 +68,20 @@ def load_source_allocation():
     """Load source-to-sector allocation mapping"""
     return load_json_config('source_sector_allocation.json')
 
-def load_owid_data():
-    """Load Our World in Data energy dataset"""
-    filepath = os.path.join('downloads', 'owid_energy_latest.json')
-    if not os.path.exists(filepath):
-        print(f"✗ Data file not found: {filepath}")
-        print("  Run fetch_data.py first to download the data.")
-        return None
+def load_configs():
+    """All configuration files used by process_global_data()"""
+    return {
+        'base': load_efficiency_factors(),
+        'temporal': load_temporal_factors(),
+        'regional': load_regional_factors(),
+        'exergy': load_exergy_factors(),
+        'source_allocation': load_source_allocation(),
+        'efficiency_cube': load_efficiency_cube(),
+    }
 
-    with open(filepath, 'r', encoding='utf-8') as f:
-        return json.load(f)
+def load_owid_data():
+    """Load Our World in Data energy dataset (typed columnar cache from fetch_data.py)"""
+    return load_owid_cache()
 
 def get_efficiency_factor(source, year, region='Global', configs=None):
     """
@@ -67,35 +90,15 @@ def get_efficiency_factor(source, year, region='Global', configs=None):
     2. Temporal variations (if year provided)
     3. Base factors (fallback)
 
-    Priority: Regional > Temporal > Base
+    Priority: Regional > Temporal > Base (precomputed in the efficiency cube)
     """
     if configs is None:
         return 0.35
+    return cube_from_configs(configs).factor(source, year, region)
 
-    base_config = configs['base']
-    temporal_config = configs['temporal']
-    regional_config = configs['regional']
-
-    # Check regional override first (regional values are 2024-calibrated)
-    if region != 'Global' and region in regional_config['regional_variations']:
-        regional_values = regional_config['regional_variations'][region]
-        if source in regional_values:
-            return regional_values[source]
-
-    # Use temporal variation if no regional override
-    if year is not None and source in temporal_config['annual_improvement_rates']:
-        base_year = temporal_config['base_year']
-        base_efficiency = temporal_config['base_year_efficiency_1965'][source]
-        improvement_rate = temporal_config['annual_improvement_rates'][source]
-
-        years_elapsed = year - base_year
-        efficiency = base_efficiency + (improvement_rate * years_elapsed)
-
-        return efficiency
-
-    # Fallback to base (2024 values)
-    system_eff = base_config['system_wide_efficiency']
-    return system_eff.get(source, 0.35)
+def unallocated_exergy_factor(source_allocation):
+    """Exergy factor of sources without a sector allocation (UNALLOCATED_SECTOR)"""
+    return sector_dimension(source_allocation).get(UNALLOCATED_SECTOR, 'exergy_factor')
 
 def calculate_exergy_weighted_services(useful_energy_by_source, source_allocation):
     """
@@ -104,6 +107,7 @@ def calculate_exergy_weighted_services(useful_energy_by_source, source_allocatio
     Energy Services = Σ (Useful Energy × Weighted Exergy Factor)
     """
     services_by_source = {}
+    default_factor = unallocated_exergy_factor(source_allocation)
 
     for source, useful_ej in useful_energy_by_source.items():
         if useful_ej <= 0:
@@ -114,22 +118,151 @@ def calculate_exergy_weighted_services(useful_energy_by_source, source_allocatio
         if source in source_allocation['source_to_sector_allocation']:
             exergy_factor = source_allocation['source_to_sector_allocation'][source]['weighted_exergy_factor']
         else:
-            # Default: assume electricity (exergy = 1.0)
-            exergy_factor = 1.0
+            exergy_factor = default_factor
 
         services_ej = useful_ej * exergy_factor
         services_by_source[source] = round(services_ej, 3)
 
     return services_by_source
 
-def safe_float(value):
-    """Safely convert string to float"""
-    if value is None or value == '':
-        return 0.0
-    try:
-        return float(value)
-    except (ValueError, TypeError):
-        return 0.0
+# First year of the output timeseries
+FIRST_YEAR = 1965
+
+# Traditional biomass (EJ/year), constant estimate based on IEA data; only
+# known globally, so it is added to 'World' but not to individual entities
+TRADITIONAL_BIOMASS_EJ = 45.0
+
+# OWID columns read per year (TWh)
+OWID_COLUMNS = [
+    'oil_consumption', 'gas_consumption', 'coal_consumption',
+    'nuclear_electricity', 'hydro_electricity', 'wind_electricity', 'solar_electricity',
+    'other_renewable_exc_biofuel_electricity', 'biofuel_consumption'
+]
+
+def process_year(record, configs, enable_temporal=True, enable_exergy=True, rebound_rate=0.0, region='Global'):
+    """
+    Useful energy and services entries of one year of an entity
+
+    region is 'Global' for 'World' (including traditional biomass) or the
+    OWID entity name (regional efficiency overrides where configured).
+
+    Returns:
+        (useful_entry, services_entry); services_entry is None unless
+        enable_exergy
+    """
+    year = record['year']
+
+    # Extract energy consumption by source (in TWh, need to convert to EJ)
+    # 1 TWh = 0.0036 EJ
+    TWH_TO_EJ = 0.0036
+
+    # Get final energy by source from OWID data
+    # For fossil fuels: use consumption (= primary energy)
+    oil_twh = record['oil_consumption']
+    gas_twh = record['gas_consumption']
+    coal_twh = record['coal_consumption']
+
+    # For renewables that generate electricity: use ELECTRICITY output, not inflated 'consumption'
+    nuclear_twh = record['nuclear_electricity']
+    hydro_twh = record['hydro_electricity']
+    wind_twh = record['wind_electricity']
+    solar_twh = record['solar_electricity']
+    geothermal_twh = record['other_renewable_exc_biofuel_electricity']
+
+    # For biomass: estimate total (traditional + modern)
+    biofuel_modern_twh = record['biofuel_consumption']
+    traditional_biomass_ej = TRADITIONAL_BIOMASS_EJ if region == 'Global' else 0.0
+    biomass_twh = biofuel_modern_twh + (traditional_biomass_ej / TWH_TO_EJ)
+
+    # Convert to EJ (PRIMARY ENERGY)
+    sources_primary_ej = {
+        'oil': oil_twh * TWH_TO_EJ,
+        'gas': gas_twh * TWH_TO_EJ,
+        'coal': coal_twh * TWH_TO_EJ,
+        'nuclear': nuclear_twh * TWH_TO_EJ,
+        'hydro': hydro_twh * TWH_TO_EJ,
+        'wind': wind_twh * TWH_TO_EJ,
+        'solar': solar_twh * TWH_TO_EJ,
+        'biomass': biomass_twh * TWH_TO_EJ,
+        'geothermal': geothermal_twh * TWH_TO_EJ,
+    }
+
+    # TIER 1→2: Calculate USEFUL ENERGY for each source
+    sources_useful_ej = {}
+    for source, primary_ej in sources_primary_ej.items():
+        if primary_ej > 0:
+            # Get efficiency factor (temporal if enabled)
+            if enable_temporal:
+                efficiency = get_efficiency_factor(source, year, region=region, configs=configs)
+            else:
+                efficiency = get_efficiency_factor(source, None, region=region, configs=configs)
+
+            useful_ej = primary_ej * efficiency
+
+            # Apply rebound effect (efficiency improvements lead to increased consumption)
+            # Rebound only applies to efficiency improvements, not the base calculation
+            # For simplicity, we reduce the useful energy by rebound_rate
+            if rebound_rate > 0:
+                useful_ej = useful_ej * (1 - rebound_rate)
+
+            sources_useful_ej[source] = round(useful_ej, 3)
+        else:
+            sources_useful_ej[source] = 0
+
+    # Calculate useful energy totals
+    total_primary_ej = sum(sources_primary_ej.values())
+    total_useful_ej = sum(sources_useful_ej.values())
+
+    # Calculate fossil vs clean (USEFUL ENERGY)
+    fossil_useful_ej = sum(sources_useful_ej[s] for s in FOSSIL_SOURCES)
+    clean_useful_ej = total_useful_ej - fossil_useful_ej
+
+    # Calculate shares (USEFUL ENERGY)
+    fossil_share = (fossil_useful_ej / total_useful_ej * 100) if total_useful_ej > 0 else 0
+    clean_share = 100 - fossil_share
+
+    useful_entry = {
+        'year': year,
+        'total_primary_ej': round(total_primary_ej, 2),
+        'total_useful_ej': round(total_useful_ej, 2),
+        'overall_efficiency': round((total_useful_ej / total_primary_ej * 100) if total_primary_ej > 0 else 0, 1),
+        'sources_useful_ej': sources_useful_ej,
+        'fossil_useful_ej': round(fossil_useful_ej, 2),
+        'clean_useful_ej': round(clean_useful_ej, 2),
+        'fossil_share_percent': round(fossil_share, 1),
+        'clean_share_percent': round(clean_share, 1),
+    }
+
+    # TIER 2→3: Calculate ENERGY SERVICES (exergy-weighted)
+    services_entry = None
+    if enable_exergy:
+        sources_services_ej = calculate_exergy_weighted_services(sources_useful_ej, configs['source_allocation'])
+
+        total_services_ej = sum(sources_services_ej.values())
+
+        # Calculate fossil vs clean (SERVICES)
+        fossil_services_ej = sum(sources_services_ej[s] for s in FOSSIL_SOURCES)
+        clean_services_ej = total_services_ej - fossil_services_ej
+
+        # Calculate shares (SERVICES)
+        fossil_services_share = (fossil_services_ej / total_services_ej * 100) if total_services_ej > 0 else 0
+        clean_services_share = 100 - fossil_services_share
+
+        # Calculate global exergy efficiency (Primary → Services)
+        global_exergy_eff = (total_services_ej / total_primary_ej * 100) if total_primary_ej > 0 else 0
+
+        services_entry = {
+            'year': year,
+            'total_services_ej': round(total_services_ej, 2),
+            'global_exergy_efficiency': round(global_exergy_eff, 1),
+            'sources_services_ej': sources_services_ej,
+            'fossil_services_ej': round(fossil_services_ej, 2),
+            'clean_services_ej': round(clean_services_ej, 2),
+            'fossil_services_share_percent': round(fossil_services_share, 1),
+            'clean_services_share_percent': round(clean_services_share, 1),
+        }
+
+    return useful_entry, services_entry
 
 def process_global_data(data, configs, enable_temporal=True, enable_exergy=True, rebound_rate=0.0):
     """
@@ -144,150 +277,237 @@ def process_global_data(data, configs, enable_temporal=True, enable_exergy=True,
         print("✗ Global data not found in dataset")
         return None
 
-    world_data = data['World']['data']
-    source_allocation = configs['source_allocation']
+    # All years in one EnergyBalance; records are built at the output boundary
+    balance = compute_entity_balance(data, configs, enable_temporal, enable_exergy, rebound_rate, entities=['World'])
+    return balance.to_timeseries(FOSSIL_SOURCES, enable_exergy).get('World', {
+        'useful_energy': [],
+        'energy_services': []
+    })
+
+def _patch_timeseries(timeseries, year, entry):
+    """Replace, insert (year order) or remove (entry None) the entry of a year"""
+    index = next((i for i, existing in enumerate(timeseries) if existing['year'] >= year), len(timeseries))
+    exists = index < len(timeseries) and timeseries[index]['year'] == year
+    if entry is None:
+        if exists:
+            del timeseries[index]
+    elif exists:
+        timeseries[index] = entry
+    else:
+        timeseries.insert(index, entry)
+
+def patch_global_data(results, data, years, configs, enable_temporal=True, enable_exergy=True, rebound_rate=0.0):
+    """
+    Recompute the given 'World' years of process_global_data() results in place
 
-    # Process each year
-    results_useful = []
-    results_services = []
+    Years missing from data are removed; years before FIRST_YEAR are
+    ignored.
 
-    for record in world_data:
-        year_str = record.get('year')
-        if not year_str:
-            continue
+    Returns:
+        Sorted list of the patched years
+    """
+    patched = sorted(year for year in years if year >= FIRST_YEAR)
+    for year in patched:
+        record = data.record('World', year, OWID_COLUMNS)
+        useful_entry, services_entry = (None, None) if record is None else process_year(
+            record, configs, enable_temporal, enable_exergy, rebound_rate)
+        _patch_timeseries(results['useful_energy'], year, useful_entry)
+        if enable_exergy:
+            _patch_timeseries(results['energy_services'], year, services_entry)
+    return patched
+
+# ============================================================================
+# VECTORIZED (ALL ENTITIES)
+# ============================================================================
+# The same three-tier arithmetic as process_year(), as array operations over
+# every OWID entity-year. Values are rounded at the same steps with Python
+# round() semantics, so each entity's records equal process_year() for its
+# region.
+
+TWH_TO_EJ = 0.0036
+
+# Output source order and the OWID column of each source (TWh), from the
+# source registry
+SOURCES = list(source_registry)
+SOURCE_COLUMNS = dict(zip(SOURCES, source_registry.attribute('owid_column').tolist()))
+FOSSIL_SOURCES = source_registry.select(fossil=True)
+
+def entity_region(entity):
+    """Efficiency region of an OWID entity ('World' is the global baseline)"""
+    return 'Global' if entity == 'World' else entity
+
+def efficiency_matrix(entities, years, configs, enable_temporal=True):
+    """
+    Efficiency factor of every row × source, as get_efficiency_factor()
 
-        try:
-            year = int(year_str)
-        except (ValueError, TypeError):
-            continue
+    Args:
+        entities: Entity name of each row
+        years: Year of each row (int array)
 
-        if year < 1965:  # Start from 1965 for consistency
-            continue
+    Returns:
+        float64 array [rows, SOURCES]
+    """
+    regions = np.where(entities == 'World', 'Global', entities)
+    return cube_from_configs(configs).matrix(regions, years, SOURCES, temporal=enable_temporal)
 
-        # Extract energy consumption by source (in TWh, need to convert to EJ)
-        # 1 TWh = 0.0036 EJ
-        TWH_TO_EJ = 0.0036
-
-        # Get final energy by source from OWID data
-        # For fossil fuels: use consumption (= primary energy)
-        oil_twh = safe_float(record.get('oil_consumption'))
-        gas_twh = safe_float(record.get('gas_consumption'))
-        coal_twh = safe_float(record.get('coal_consumption'))
-
-        # For renewables that generate electricity: use ELECTRICITY output, not inflated 'consumption'
-        nuclear_twh = safe_float(record.get('nuclear_electricity'))
-        hydro_twh = safe_float(record.get('hydro_electricity'))
-        wind_twh = safe_float(record.get('wind_electricity'))
-        solar_twh = safe_float(record.get('solar_electricity'))
-        geothermal_twh = safe_float(record.get('other_renewable_exc_biofuel_electricity'))
-
-        # For biomass: estimate total (traditional + modern)
-        biofuel_modern_twh = safe_float(record.get('biofuel_consumption'))
-        traditional_biomass_ej = 45.0  # Constant estimate based on IEA data
-        biomass_twh = biofuel_modern_twh + (traditional_biomass_ej / TWH_TO_EJ)
-
-        # Convert to EJ (PRIMARY ENERGY)
-        sources_primary_ej = {
-            'oil': oil_twh * TWH_TO_EJ,
-            'gas': gas_twh * TWH_TO_EJ,
-            'coal': coal_twh * TWH_TO_EJ,
-            'nuclear': nuclear_twh * TWH_TO_EJ,
-            'hydro': hydro_twh * TWH_TO_EJ,
-            'wind': wind_twh * TWH_TO_EJ,
-            'solar': solar_twh * TWH_TO_EJ,
-            'biomass': biomass_twh * TWH_TO_EJ,
-            'geothermal': geothermal_twh * TWH_TO_EJ,
-        }
+def exergy_factor_array(configs):
+    """Weighted exergy factor of each of SOURCES (UNALLOCATED_SECTOR's where not allocated)"""
+    allocation = configs['source_allocation']['source_to_sector_allocation']
+    default_factor = unallocated_exergy_factor(configs['source_allocation'])
+    return np.array([allocation[source]['weighted_exergy_factor'] if source in allocation else default_factor
+                     for source in SOURCES])
 
-        # TIER 1→2: Calculate USEFUL ENERGY for each source
-        sources_useful_ej = {}
-        for source, primary_ej in sources_primary_ej.items():
-            if primary_ej > 0:
-                # Get efficiency factor (temporal if enabled)
-                if enable_temporal:
-                    efficiency = get_efficiency_factor(source, year, region='Global', configs=configs)
-                else:
-                    efficiency = get_efficiency_factor(source, None, region='Global', configs=configs)
-
-                useful_ej = primary_ej * efficiency
-
-                # Apply rebound effect (efficiency improvements lead to increased consumption)
-                # Rebound only applies to efficiency improvements, not the base calculation
-                # For simplicity, we reduce the useful energy by rebound_rate
-                if rebound_rate > 0:
-                    useful_ej = useful_ej * (1 - rebound_rate)
-
-                sources_useful_ej[source] = round(useful_ej, 3)
-            else:
-                sources_useful_ej[source] = 0
+def _tier_rows(data, configs, enable_temporal=True, enable_exergy=True, rebound_rate=0.0, entities=None):
+    """
+    Primary → useful → services of every entity-year from FIRST_YEAR
 
-        # Calculate useful energy totals
-        total_primary_ej = sum(sources_primary_ej.values())
-        total_useful_ej = sum(sources_useful_ej.values())
+    Returns:
+        (row entities, row years, {tier: [rows, SOURCES]}) with useful and
+        services rounded as process_year()
+    """
+    row_entity = data.row_entities()
+    years = data.column('year').astype(np.int64)
+    keep = years >= FIRST_YEAR
+    if entities is not None:
+        keep &= np.isin(row_entity, list(entities))
+    row_entity, years = row_entity[keep], years[keep]
+
+    twh = np.column_stack([np.nan_to_num(data.column(SOURCE_COLUMNS[source])[keep], nan=0.0)
+                           if SOURCE_COLUMNS[source] in data.columns else np.zeros(len(years))
+                           for source in SOURCES])
+    biomass = SOURCES.index('biomass')
+    traditional_biomass_twh = np.where(row_entity == 'World', TRADITIONAL_BIOMASS_EJ, 0.0) / TWH_TO_EJ
+    twh[:, biomass] = twh[:, biomass] + traditional_biomass_twh
+    primary = twh * TWH_TO_EJ
+
+    # TIER 1→2: useful energy (rebound reduces useful energy by rebound_rate)
+    useful = primary * efficiency_matrix(row_entity, years, configs, enable_temporal)
+    if rebound_rate > 0:
+        useful = useful * (1 - rebound_rate)
+    useful = np.where(primary > 0, round_array(useful, 3), 0.0)
+    tiers = {'primary': primary, 'useful': useful}
+
+    # TIER 2→3: energy services (exergy-weighted)
+    if enable_exergy:
+        tiers['services'] = np.where(useful > 0, round_array(useful * exergy_factor_array(configs), 3), 0.0)
+    return row_entity, years, tiers
+
+def compute_entity_arrays(data, configs, enable_temporal=True, enable_exergy=True, rebound_rate=0.0,
+                          entities=None):
+    """
+    Primary → useful → services for every entity-year from FIRST_YEAR
 
-        # Calculate fossil vs clean (USEFUL ENERGY)
-        fossil_useful_ej = sum(sources_useful_ej[s] for s in ['oil', 'gas', 'coal'])
-        clean_useful_ej = total_useful_ej - fossil_useful_ej
+    Args:
+        data: owid_cache.OwidCache
+        entities: Entity names to include (default: all)
 
-        # Calculate shares (USEFUL ENERGY)
-        fossil_share = (fossil_useful_ej / total_useful_ej * 100) if total_useful_ej > 0 else 0
-        clean_share = 100 - fossil_share
+    Returns:
+        Dict of row arrays: entity, year, primary/useful/services
+        [rows, SOURCES] (useful and services rounded as process_year()),
+        and every rounded output field of process_year()'s entries
+    """
+    row_entity, years, tiers = _tier_rows(data, configs, enable_temporal, enable_exergy, rebound_rate, entities)
+    fossil = [SOURCES.index(source) for source in FOSSIL_SOURCES]
+    arrays = {'entity': row_entity, 'year': years, **tiers}
+    arrays.update(balance_fields(tiers['primary'], tiers['useful'], tiers.get('services'), fossil))
+    return arrays
+
+def compute_entity_balance(data, configs, enable_temporal=True, enable_exergy=True, rebound_rate=0.0,
+                           entities=None):
+    """
+    EnergyBalance [entity × year × SOURCES] of every entity from FIRST_YEAR
 
-        results_useful.append({
-            'year': year,
-            'total_primary_ej': round(total_primary_ej, 2),
-            'total_useful_ej': round(total_useful_ej, 2),
-            'overall_efficiency': round((total_useful_ej / total_primary_ej * 100) if total_primary_ej > 0 else 0, 1),
-            'sources_useful_ej': sources_useful_ej,
-            'fossil_useful_ej': round(fossil_useful_ej, 2),
-            'clean_useful_ej': round(clean_useful_ej, 2),
-            'fossil_share_percent': round(fossil_share, 1),
-            'clean_share_percent': round(clean_share, 1),
-        })
-
-        # TIER 2→3: Calculate ENERGY SERVICES (exergy-weighted)
-        if enable_exergy:
-            sources_services_ej = calculate_exergy_weighted_services(sources_useful_ej, source_allocation)
+    Entities are in cache order; useful and services are rounded as
+    process_year() rounds them.
+    """
+    row_entity, years, tiers = _tier_rows(data, configs, enable_temporal, enable_exergy, rebound_rate, entities)
+    return EnergyBalance.from_rows(row_entity, years, SOURCES, **tiers)
 
-            total_services_ej = sum(sources_services_ej.values())
+def process_all_entities(data, configs, enable_temporal=True, enable_exergy=True, rebound_rate=0.0, entities=None):
+    """
+    Useful energy and services of every OWID entity (countries and aggregates)
 
-            # Calculate fossil vs clean (SERVICES)
-            fossil_services_ej = sum(sources_services_ej[s] for s in ['oil', 'gas', 'coal'])
-            clean_services_ej = total_services_ej - fossil_services_ej
+    'World' uses the global baseline (process_global_data() results); other
+    entities use regional efficiency overrides where configured and exclude
+    traditional biomass.
 
-            # Calculate shares (SERVICES)
-            fossil_services_share = (fossil_services_ej / total_services_ej * 100) if total_services_ej > 0 else 0
-            clean_services_share = 100 - fossil_services_share
+    Returns:
+        {entity: {'useful_energy': [...], 'energy_services': [...]}}
+    """
+    balance = compute_entity_balance(data, configs, enable_temporal, enable_exergy, rebound_rate, entities)
+    return balance.to_timeseries(FOSSIL_SOURCES, enable_exergy)
 
-            # Calculate global exergy efficiency (Primary → Services)
-            global_exergy_eff = (total_services_ej / total_primary_ej * 100) if total_primary_ej > 0 else 0
+def patch_entity_results(entity_data, data, entities, configs, enable_temporal=True, enable_exergy=True,
+                         rebound_rate=0.0):
+    """
+    Recompute the given entities of a saved per-entity dataset in place
 
-            results_services.append({
-                'year': year,
-                'total_services_ej': round(total_services_ej, 2),
-                'global_exergy_efficiency': round(global_exergy_eff, 1),
-                'sources_services_ej': sources_services_ej,
-                'fossil_services_ej': round(fossil_services_ej, 2),
-                'clean_services_ej': round(clean_services_ej, 2),
-                'fossil_services_share_percent': round(fossil_services_share, 1),
-                'clean_services_share_percent': round(clean_services_share, 1),
-            })
+    entity_data is the 'entities' mapping of energy_services_by_entity.json.
+    Entities without rows from FIRST_YEAR are removed; the mapping is kept
+    in cache order, as save_entity_results() writes it.
 
-    return {
-        'useful_energy': results_useful,
-        'energy_services': results_services if enable_exergy else []
+    Returns:
+        Number of recomputed entities
+    """
+    results = process_all_entities(data, configs, enable_temporal, enable_exergy, rebound_rate, entities)
+    iso_codes = {}
+    if 'iso_code' in data.columns:
+        iso_codes = {entity: str(data.series(entity, 'iso_code')[0]) for entity in results}
+
+    patched = set(entities)
+    merged = {}
+    for entity in data.entities:
+        if entity in results:
+            merged[entity] = {'iso_code': iso_codes.get(entity, ''), **results[entity]}
+        elif entity in entity_data and entity not in patched:
+            merged[entity] = entity_data[entity]
+    entity_data.clear()
+    entity_data.update(merged)
+    return len(patched)
+
+def save_entity_results(results, data, output_dir=OUTPUT_DIR, filename=ENTITY_OUTPUT_FILENAME, generated_at=None):
+    """Save the per-entity dataset (energy_services_by_entity.json; generated_at defaults to now)"""
+    os.makedirs(output_dir, exist_ok=True)
+    output_path = os.path.join(output_dir, filename)
+    iso_codes = {}
+    if 'iso_code' in data.columns:
+        iso_codes = {entity: str(data.series(entity, 'iso_code')[0]) if len(data.years(entity)) else ''
+                     for entity in results}
+
+    output = {
+        'metadata': {
+            'generated_at': generated_at or datetime.now().isoformat(),
+            'version': 'v2.0',
+            'description': 'Useful energy and energy services by source for every OWID entity (Exajoules)',
+            'methodology': 'Three-tier framework per entity: Primary Energy → Useful Energy (×efficiency, '
+                           'regional overrides where configured) → Energy Services (×exergy)',
+            'notes': "Traditional biomass (45 EJ) is only known globally and is included in 'World' only",
+            'temporal_efficiency': ENABLE_TEMPORAL,
+            'rebound_rate': REBOUND_RATE,
+            'entities': len(results),
+            'unit': 'Exajoules (EJ)'
+        },
+        'entities': {
+            entity: {'iso_code': iso_codes.get(entity, ''), **series}
+            for entity, series in results.items()
+        }
     }
 
-def save_results(results, base_filename='useful_energy_timeseries'):
-    """Save processed results to JSON files"""
-    output_dir = '../public/data'
+    with open(output_path, 'w', encoding='utf-8') as f:
+        json.dump(output, f, separators=(',', ':'))
+    print(f"✓ Saved per-entity energy services to: {output_path}")
+    return output_path
+
+def save_results(results, base_filename='useful_energy_timeseries', output_dir=OUTPUT_DIR, generated_at=None):
+    """Save processed results to JSON files (generated_at defaults to now)"""
     os.makedirs(output_dir, exist_ok=True)
+    generated_at = generated_at or datetime.now().isoformat()
 
     # Save useful energy timeseries
     useful_output_path = os.path.join(output_dir, f'{base_filename}.json')
     useful_data = {
         'metadata': {
-            'generated_at': datetime.now().isoformat(),
+            'generated_at': generated_at,
             'version': 'v2.0',
             'description': 'Global useful energy by source (Exajoules) - Tier 2: Primary × Efficiency',
             'sources': [
@@ -311,7 +531,7 @@ def save_results(results, base_filename='useful_energy_timeseries'):
         services_output_path = os.path.join(output_dir, 'exergy_services_timeseries.json')
         services_data = {
             'metadata': {
-                'generated_at': datetime.now().isoformat(),
+                'generated_at': generated_at,
                 'version': 'v2.0',
                 'description': 'Global energy services by source (Exajoules) - Tier 3: Useful × Exergy Factor',
                 'sources': [
@@ -417,20 +637,9 @@ def main():
     print("Three-Tier Framework: Primary → Useful → Services")
     print("="*70 + "\n")
 
-    # Configuration flags
-    ENABLE_TEMPORAL = True  # Use time-varying efficiency
-    ENABLE_EXERGY = True    # Calculate energy services
-    REBOUND_RATE = 0.07     # 7% rebound effect (Jevons paradox)
-
     # Load all configuration files
     print("Loading configuration files...")
-    configs = {
-        'base': load_efficiency_factors(),
-        'temporal': load_temporal_factors(),
-        'regional': load_regional_factors(),
-        'exergy': load_exergy_factors(),
-        'source_allocation': load_source_allocation(),
-    }
+    configs = load_configs()
     print("✓ All configurations loaded")
     print(f"  - Temporal efficiency: {'ENABLED' if ENABLE_TEMPORAL else 'DISABLED'}")
     print(f"  - Exergy services: {'ENABLED' if ENABLE_EXERGY else 'DISABLED'}")
@@ -462,6 +671,18 @@ def main():
     # Save results
     save_results(results)
 
+    # Every OWID entity (countries and aggregates), vectorized
+    print("\nCalculating useful energy and services for every entity...")
+    entity_results = process_all_entities(
+        owid_data,
+        configs,
+        enable_temporal=ENABLE_TEMPORAL,
+        enable_exergy=ENABLE_EXERGY,
+        rebound_rate=REBOUND_RATE
+    )
+    print(f"✓ Processed {len(entity_results)} entities")
+    save_entity_results(entity_results, owid_data)
+
     # Print summary
     print_summary(results)
 
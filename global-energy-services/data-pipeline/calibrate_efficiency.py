@@ -4,25 +4,15 @@ Target: 240 EJ useful from 620 EJ primary = 38.7% efficiency
 Fossil share: ~78-80%
 """
 
-import json
-import os
 import sys
 
+from owid_cache import load_owid_cache
+
 if sys.platform == 'win32':
     sys.stdout.reconfigure(encoding='utf-8')
 
-def safe_float(value):
-    if value is None or value == '':
-        return 0.0
-    try:
-        return float(value)
-    except (ValueError, TypeError):
-        return 0.0
-
 def load_owid_data():
-    filepath = os.path.join('downloads', 'owid_energy_latest.json')
-    with open(filepath, 'r') as f:
-        return json.load(f)
+    return load_owid_cache()
 
 def calibrate():
     """
@@ -31,19 +21,19 @@ def calibrate():
     data = load_owid_data()
     TWH_TO_EJ = 0.0036
 
-    for record in data['World']['data']:
-        if record.get('year') != '2023':
+    for record in data.records('World'):
+        if record['year'] != 2023:
             continue
 
         # Get primary energy values
-        oil_primary = safe_float(record.get('oil_consumption')) * TWH_TO_EJ
-        gas_primary = safe_float(record.get('gas_consumption')) * TWH_TO_EJ
-        coal_primary = safe_float(record.get('coal_consumption')) * TWH_TO_EJ
-        nuclear_elec = safe_float(record.get('nuclear_electricity')) * TWH_TO_EJ
-        hydro_elec = safe_float(record.get('hydro_electricity')) * TWH_TO_EJ
-        wind_elec = safe_float(record.get('wind_electricity')) * TWH_TO_EJ
-        solar_elec = safe_float(record.get('solar_electricity')) * TWH_TO_EJ
-        geothermal_elec = safe_float(record.get('other_renewable_exc_biofuel_electricity')) * TWH_TO_EJ
+        oil_primary = record['oil_consumption'] * TWH_TO_EJ
+        gas_primary = record['gas_consumption'] * TWH_TO_EJ
+        coal_primary = record['coal_consumption'] * TWH_TO_EJ
+        nuclear_elec = record['nuclear_electricity'] * TWH_TO_EJ
+        hydro_elec = record['hydro_electricity'] * TWH_TO_EJ
+        wind_elec = record['wind_electricity'] * TWH_TO_EJ
+        solar_elec = record['solar_electricity'] * TWH_TO_EJ
+        geothermal_elec = record['other_renewable_exc_biofuel_electricity'] * TWH_TO_EJ
         biomass_primary = 49.7  # Estimated total
 
         print("="*70)
@@ -0,0 +1,215 @@
+"""
+Dimension Registries - integer codes and metadata for every dimension value
+
+Each dimension (energy sources, end-use sectors, OWID entities, projection
+scenarios) is a Dimension: an ordered list of values with stable integer
+codes (its position), aliases and per-value metadata. Data indexed by
+dimension lives in contiguous arrays along the code axis, so filters and
+joins are integer operations:
+
+    SOURCES.code('coal')                      # 2
+    SOURCES.codes(names)                      # int64 array, -1 for unknown names
+    SOURCES.select(fossil=True)               # ['oil', 'gas', 'coal']
+    useful[:, SOURCES.mask(fossil=True)]      # fossil columns of a [rows, SOURCES] array
+
+Codes are append-only: extend() adds new values after the existing ones, so
+a value keeps its code for the lifetime of a registry.
+
+Registries:
+- SOURCES              energy sources of the three-tier framework
+                       (fossil flag, OWID columns; stage aliases such as
+                       'biofuels' and 'other_renewables')
+- sector_dimension()   end-use sectors of source_sector_allocation.json
+                       (exergy factor)
+- entity_dimension()   entities of an OWID cache in cache order (ISO code,
+                       country flag, continent)
+- scenario_sets.scenario_dimension() in data-pipeline: built-in and
+                       user-defined projection scenarios
+"""
+
+import json
+from pathlib import Path
+
+import numpy as np
+
+CONFIG_DIR = Path(__file__).resolve().parent
+SECTOR_FILE = 'source_sector_allocation.json'
+
+# ============================================================================
+# DIMENSION
+# ============================================================================
+
+class Dimension:
+    """Ordered values of one dimension with stable integer codes and metadata"""
+
+    def __init__(self, name, values=(), aliases=None, **attributes):
+        """
+        Args:
+            name: Dimension name (used in error messages)
+            values: Values in code order
+            aliases: {alias: value} alternative names
+            attributes: Metadata lists aligned with values
+        """
+        self.name = name
+        self.values = []
+        self.index = {}
+        self.aliases = {}
+        self._attributes = {attribute: [] for attribute in attributes}
+        self.extend(values, **attributes)
+        for alias, value in (aliases or {}).items():
+            self.aliases[alias] = self.code(value)
+
+    def extend(self, values, **attributes):
+        """
+        Append values that are not registered yet (existing codes never change)
+
+        Attributes missing for the new values are None.
+        """
+        unknown = set(attributes) - set(self._attributes)
+        if unknown:
+            raise KeyError(f"Unknown {self.name} attributes: {sorted(unknown)}")
+        for i, value in enumerate(values):
+            if value in self.index:
+                continue
+            self.index[value] = len(self.values)
+            self.values.append(value)
+            for attribute, column in self._attributes.items():
+                column.append(attributes[attribute][i] if attribute in attributes else None)
+
+    def __len__(self):
+        return len(self.values)
+
+    def __iter__(self):
+        return iter(self.values)
+
+    def __contains__(self, value):
+        return value in self.index or value in self.aliases
+
+    def __getitem__(self, code):
+        return self.values[code]
+
+    def code(self, value):
+        """Code of a value or alias (KeyError for unknown values)"""
+        if value in self.index:
+            return self.index[value]
+        if value in self.aliases:
+            return self.aliases[value]
+        raise KeyError(f"Unknown {self.name}: {value}")
+
+    def resolve(self, value):
+        """Registered value of a value or alias"""
+        return self.values[self.code(value)]
+
+    def codes(self, values, default=-1):
+        """Codes of an array of values (default for unknown values)"""
+        values = np.asarray(values)
+        unique, inverse = np.unique(values, return_inverse=True)
+        lookup = np.array([self.index.get(value, self.aliases.get(value, default)) for value in unique.tolist()],
+                          dtype=np.int64)
+        return lookup[inverse].reshape(values.shape)
+
+    def attribute(self, attribute):
+        """Metadata of every code as an array"""
+        return np.array(self._attributes[attribute])
+
+    def get(self, value, attribute):
+        """Metadata of one value or alias"""
+        return self._attributes[attribute][self.code(value)]
+
+    def mask(self, **conditions):
+        """Boolean array over codes: attribute == value for every condition"""
+        mask = np.ones(len(self.values), dtype=bool)
+        for attribute, value in conditions.items():
+            mask &= np.array([item == value for item in self._attributes[attribute]], dtype=bool)
+        return mask
+
+    def select(self, **conditions):
+        """Values (in code order) matching every attribute condition"""
+        return [self.values[code] for code in self.mask(**conditions).nonzero()[0].tolist()]
+
+# ============================================================================
+# ENERGY SOURCES
+# ============================================================================
+
+SOURCE_TABLE = [
+    # source       fossil  OWID column (useful energy)                  OWID primary consumption
+    ('oil',        True,   'oil_consumption',                          'oil_consumption'),
+    ('gas',        True,   'gas_consumption',                          'gas_consumption'),
+    ('coal',       True,   'coal_consumption',                         'coal_consumption'),
+    ('nuclear',    False,  'nuclear_electricity',                      'nuclear_consumption'),
+    ('hydro',      False,  'hydro_electricity',                        'hydro_consumption'),
+    ('wind',       False,  'wind_electricity',                         'wind_consumption'),
+    ('solar',      False,  'solar_electricity',                        'solar_consumption'),
+    ('biomass',    False,  'biofuel_consumption',                      'biofuel_consumption'),
+    ('geothermal', False,  'other_renewable_exc_biofuel_electricity',  'other_renewable_consumption'),
+]
+
+# Source names used by the regional, net imports and cost stages
+SOURCE_ALIASES = {
+    'biofuel': 'biomass',
+    'biofuels': 'biomass',
+    'other_renewable': 'geothermal',
+    'other_renewables': 'geothermal',
+}
+
+SOURCES = Dimension(
+    'source',
+    [row[0] for row in SOURCE_TABLE],
+    aliases=SOURCE_ALIASES,
+    fossil=[row[1] for row in SOURCE_TABLE],
+    owid_column=[row[2] for row in SOURCE_TABLE],
+    consumption_column=[row[3] for row in SOURCE_TABLE],
+)
+
+def is_fossil(source):
+    """True for fossil sources (aliases accepted)"""
+    return SOURCES.get(source, 'fossil')
+
+# ============================================================================
+# SECTORS
+# ============================================================================
+
+def sector_dimension(allocation=None):
+    """
+    End-use sectors of source_sector_allocation.json
+
+    Args:
+        allocation: Parsed allocation config (default: read from CONFIG_DIR)
+    """
+    if allocation is None:
+        with open(CONFIG_DIR / SECTOR_FILE, 'r', encoding='utf-8') as f:
+            allocation = json.load(f)
+    sectors = allocation['sector_exergy_mapping']
+    return Dimension(
+        'sector',
+        list(sectors),
+        exergy_factor=[sector['exergy_factor'] for sector in sectors.values()],
+        description=[sector.get('description', '') for sector in sectors.values()],
+    )
+
+# ============================================================================
+# ENTITIES
+# ============================================================================
+
+def entity_dimension(data, continents=None):
+    """
+    Entities of an OWID cache; codes are the cache's entity positions
+
+    OwidCache.row_codes() gives the code of every row, so cache columns
+    join to per-entity arrays without string comparisons.
+
+    Args:
+        data: owid_cache.OwidCache
+        continents: {continent: [countries]} for the continent attribute
+    """
+    iso_codes = ([str(data.series(entity, 'iso_code')[0]) for entity in data.entities]
+                 if 'iso_code' in data.columns else [''] * len(data.entities))
+    continent_of = {country: continent for continent, countries in (continents or {}).items()
+                    for country in countries}
+    return Dimension(
+        'entity',
+        data.entities,
+        iso_code=iso_codes,
+        country=[len(code) == 3 and not code.startswith('OWID') for code in iso_codes],
+        continent=[continent_of.get(entity) for entity in data.entities],
+    )
@@ -0,0 +1,299 @@
+"""
+Efficiency Cube - precomputed primary → useful efficiency factors for every pipeline
+
+Built once from the three efficiency configs:
+- efficiency_factors_corrected.json  system-wide (2024) factor per source
+- efficiency_factors_temporal.json   1965 base + annual improvement per source
+- efficiency_factors_regional.json   2024-calibrated regional overrides
+
+into dense arrays:
+- temporal   [source × region × year]  time-varying factors
+- static     [source × region]         factors without temporal variation
+
+Priority is the same as calculate_useful_energy_v2.get_efficiency_factor():
+regional override > temporal curve > system-wide factor > DEFAULT_EFFICIENCY.
+Values use the same arithmetic, so cube lookups equal the dict lookups.
+
+The arrays are cached in cache/efficiency_cube_<hash>.npz, keyed by a
+SHA-256 of the three config files, so stages load them without parsing the
+JSON; writing a new fingerprint deletes the files of superseded ones.
+Regions without overrides (and 'Global') share the global factors.
+
+Usage:
+    cube = load_efficiency_cube()
+    cube.factor('coal', 2020, 'China')                        # float
+    cube.lookup(['coal', 'gas'], 'Global', np.arange(1965, 2025)[:, None])
+    cube.matrix(row_regions, row_years, ['oil', 'gas'])       # [rows, sources]
+"""
+
+import hashlib
+import json
+import os
+from pathlib import Path
+
+import numpy as np
+
+# ============================================================================
+# CONFIGURATION
+# ============================================================================
+
+CUBE_VERSION = 1
+CONFIG_DIR = Path(__file__).resolve().parent
+CACHE_DIR = CONFIG_DIR / 'cache'
+
+BASE_FILE = 'efficiency_factors_corrected.json'
+TEMPORAL_FILE = 'efficiency_factors_temporal.json'
+REGIONAL_FILE = 'efficiency_factors_regional.json'
+CONFIG_FILES = [BASE_FILE, TEMPORAL_FILE, REGIONAL_FILE]
+
+GLOBAL_REGION = 'Global'
+
+# Fallback for sources without a configured factor
+DEFAULT_EFFICIENCY = 0.35
+
+# Year grid of the temporal cube; other years are evaluated from the curves
+FIRST_YEAR = 1900
+LAST_YEAR = 2100
+
+# ============================================================================
+# BUILD
+# ============================================================================
+
+def _numeric(table):
+    """Source → factor entries of a config table (skips notes/units)"""
+    return {key: value for key, value in table.items()
+            if isinstance(value, (int, float)) and not isinstance(value, bool)}
+
+def build_efficiency_cube(base_config, temporal_config, regional_config):
+    """
+    Dense efficiency arrays from the parsed configs
+
+    Every cell is stored as intercept + slope × (year − base_year): the
+    temporal curve where one is configured, otherwise slope 0 with the
+    regional or system-wide factor as intercept.
+    """
+    system_eff = _numeric(base_config['system_wide_efficiency'])
+    rates = _numeric(temporal_config['annual_improvement_rates'])
+    base_efficiency = temporal_config['base_year_efficiency_1965']
+    regional_variations = regional_config['regional_variations']
+
+    regional_sources = [source for values in regional_variations.values() for source in _numeric(values)]
+    sources = list(dict.fromkeys(list(system_eff) + list(rates) + regional_sources))
+    regions = [GLOBAL_REGION] + [region for region in regional_variations if region != GLOBAL_REGION]
+    years = np.arange(FIRST_YEAR, LAST_YEAR + 1)
+
+    static = np.empty((len(sources), len(regions)))
+    intercept = np.empty((len(sources), len(regions)))
+    slope = np.zeros((len(sources), len(regions)))
+    for s, source in enumerate(sources):
+        static[s, :] = system_eff.get(source, DEFAULT_EFFICIENCY)
+        if source in rates:
+            intercept[s, :] = base_efficiency[source]
+            slope[s, :] = rates[source]
+        else:
+            intercept[s, :] = static[s, :]
+
+        # Regional overrides are 2024-calibrated and constant over time
+        for r, region in enumerate(regions[1:], start=1):
+            regional_values = _numeric(regional_variations[region])
+            if source in regional_values:
+                static[s, r] = intercept[s, r] = regional_values[source]
+                slope[s, r] = 0.0
+
+    base_year = temporal_config['base_year']
+    temporal = intercept[:, :, None] + (slope[:, :, None] * (years - base_year))
+
+    return {
+        'sources': np.array(sources),
+        'regions': np.array(regions),
+        'years': years,
+        'base_year': np.array(base_year),
+        'temporal': temporal,
+        'static': static,
+        'intercept': intercept,
+        'slope': slope,
+    }
+
+# ============================================================================
+# LOOKUPS
+# ============================================================================
+
+class EfficiencyCube:
+    """O(1) scalar and vectorized lookups into the efficiency arrays"""
+
+    def __init__(self, arrays, fingerprint=None):
+        self.fingerprint = fingerprint
+        self.sources = [str(s) for s in arrays['sources']]
+        self.regions = [str(r) for r in arrays['regions']]
+        self.years = np.asarray(arrays['years'])
+        self.first_year = int(self.years[0])
+        self.last_year = int(self.years[-1])
+        self.base_year = int(arrays['base_year'])
+
+        self.temporal = arrays['temporal']
+        self.static = arrays['static']
+        self.intercept = arrays['intercept']
+        self.slope = arrays['slope']
+
+        self.source_index = {s: i for i, s in enumerate(self.sources)}
+        self.region_index = {r: i for i, r in enumerate(self.regions)}
+
+    def _source(self, source):
+        return self.source_index.get(source)
+
+    def _region(self, region):
+        """Index of a region; regions without overrides use the global row"""
+        return self.region_index.get(region, 0)
+
+    def factor(self, source, year=None, region=GLOBAL_REGION):
+        """
+        Efficiency factor of one source
+
+        Args:
+            year: Year of the temporal factor, or None for the static factor
+        """
+        s = self._source(source)
+        if s is None:
+            return DEFAULT_EFFICIENCY
+        r = self._region(region)
+        if year is None:
+            return float(self.static[s, r])
+        if self.first_year <= year <= self.last_year:
+            return float(self.temporal[s, r, int(year) - self.first_year])
+        return float(self.intercept[s, r] + (self.slope[s, r] * (year - self.base_year)))
+
+    def _indices(self, names, index, default):
+        """Integer indices of an array of names (default for unknown names)"""
+        names = np.asarray(names)
+        unique, inverse = np.unique(names, return_inverse=True)
+        codes = np.array([index.get(str(name), default) for name in unique], dtype=np.int64)
+        return codes[inverse].reshape(names.shape)
+
+    def lookup(self, sources, regions=GLOBAL_REGION, years=None):
+        """
+        Efficiency factors for broadcast arrays of sources, regions and years
+
+        Args:
+            sources: Source name(s)
+            regions: Region name(s); unknown regions use the global factors
+            years: Year(s), or None for the static factors
+
+        Returns:
+            float64 array of the broadcast shape
+        """
+        s = self._indices(sources, self.source_index, -1)
+        r = self._indices(regions, self.region_index, 0)
+        known = s >= 0
+        s = np.where(known, s, 0)
+
+        if years is None:
+            values = self.static[s, r]
+        else:
+            years = np.asarray(years, dtype=np.int64)
+            s, r, years = np.broadcast_arrays(s, r, years)
+            on_grid = (years >= self.first_year) & (years <= self.last_year)
+            values = self.temporal[s, r, np.clip(years, self.first_year, self.last_year) - self.first_year]
+            if not on_grid.all():
+                off_grid = self.intercept[s, r] + (self.slope[s, r] * (years - self.base_year))
+                values = np.where(on_grid, values, off_grid)
+            known = np.broadcast_to(known, values.shape)
+        return np.where(known, values, DEFAULT_EFFICIENCY)
+
+    def matrix(self, regions, years, sources, temporal=True):
+        """
+        Efficiency factor of every row × source
+
+        Args:
+            regions: Region of each row
+            years: Year of each row
+            sources: Column sources
+
+        Returns:
+            float64 array [rows, sources]
+        """
+        regions = np.asarray(regions)[:, None]
+        years = np.asarray(years)[:, None] if temporal else None
+        return self.lookup(np.asarray(sources)[None, :], regions, years)
+
+    def factors(self, sources, year=None, region=GLOBAL_REGION):
+        """{source: factor} for one region-year"""
+        return {source: self.factor(source, year, region) for source in sources}
+
+# ============================================================================
+# DISK CACHE
+# ============================================================================
+
+_LOADED = {}
+
+def current_fingerprint(config_dir=CONFIG_DIR):
+    """SHA-256 of the config file contents and the cube layout"""
+    digest = hashlib.sha256()
+    digest.update(f'v{CUBE_VERSION}:{FIRST_YEAR}-{LAST_YEAR}'.encode())
+    for name in CONFIG_FILES:
+        digest.update((Path(config_dir) / name).read_bytes())
+    return digest.hexdigest()
+
+def load_efficiency_cube(config_dir=CONFIG_DIR, use_cache=True):
+    """
+    Load the efficiency cube from the disk cache, building it on a miss
+
+    Cubes are also kept in memory per fingerprint, so every stage of a run
+    shares one instance.
+
+    Args:
+        config_dir: Directory holding the three efficiency configs
+        use_cache: Read/write cache/efficiency_cube_<hash>.npz
+    """
+    fingerprint = current_fingerprint(config_dir)
+    if fingerprint in _LOADED:
+        return _LOADED[fingerprint]
+
+    cache_path = CACHE_DIR / f'efficiency_cube_{fingerprint[:16]}.npz'
+    cube = None
+    if use_cache and cache_path.exists():
+        try:
+            with np.load(cache_path, allow_pickle=False) as cached:
+                cube = EfficiencyCube({key: cached[key] for key in cached.files}, fingerprint)
+        except (OSError, ValueError, KeyError) as e:
+            print(f"Warning: Ignoring unreadable efficiency cube {cache_path.name}: {e}")
+
+    if cube is None:
+        configs = []
+        for name in CONFIG_FILES:
+            with open(Path(config_dir) / name, 'r', encoding='utf-8') as f:
+                configs.append(json.load(f))
+        arrays = build_efficiency_cube(*configs)
+
+        if use_cache:
+            CACHE_DIR.mkdir(parents=True, exist_ok=True)
+            tmp_path = cache_path.with_suffix('.tmp.npz')
+            np.savez(tmp_path, **arrays)
+            os.replace(tmp_path, cache_path)
+            remove_superseded_caches(cache_path)
+        cube = EfficiencyCube(arrays, fingerprint)
+
+    _LOADED[fingerprint] = cube
+    return cube
+
+def remove_superseded_caches(current):
+    """Delete the cube files of other fingerprints (in-progress .tmp files are kept)"""
+    for path in CACHE_DIR.glob('efficiency_cube_*.npz'):
+        if path != current and not path.name.endswith('.tmp.npz'):
+            path.unlink(missing_ok=True)
+
+def clear_loaded_cubes():
+    """Forget the in-memory cubes (the next load reads the disk cache)"""
+    _LOADED.clear()
+
+def cube_from_configs(configs):
+    """
+    Efficiency cube of a loaded config set ({'base', 'temporal', 'regional', ...})
+
+    Uses configs['efficiency_cube'] when present; otherwise builds it from
+    the parsed configs and stores it there for later lookups.
+    """
+    cube = configs.get('efficiency_cube')
+    if cube is None:
+        cube = EfficiencyCube(build_efficiency_cube(configs['base'], configs['temporal'], configs['regional']))
+        configs['efficiency_cube'] = cube
+    return cube
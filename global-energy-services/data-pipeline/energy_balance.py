@@ -0,0 +1,333 @@
+"""
+Energy Balance - struct-of-arrays container for primary, useful and services energy
+
+An EnergyBalance holds each tier as one float64 array [entity × year ×
+source] plus a present mask [entity × year] (the entity has data for the
+year). Stages compute into the arrays, slice, aggregate and derive totals and
+shares on them, and convert to the JSON record shapes only at the output
+boundary (to_timeseries()), instead of building and re-walking per-year
+dicts with nested sources_useful_ej / sources_services_ej.
+
+Sums over sources run left to right in the given source order, as Python
+sum() over a source dict does, so derived values equal the dict-based
+arithmetic.
+
+Usage:
+    balance = EnergyBalance.from_rows(row_entities, row_years, SOURCES, primary=p, useful=u, services=s)
+    balance.sel(entities=['China', 'India'], years=range(2000, 2025))
+    balance.total('useful')                          # [entity, year]
+    balance.share('useful', FOSSIL_SOURCES)          # percent [entity, year]
+    balance.aggregate({'BRICS': [...]})              # summed entities
+    balance.to_timeseries(FOSSIL_SOURCES)            # process_year()-format records
+"""
+
+import numpy as np
+
+TIERS = ('primary', 'useful', 'services')
+
+# ============================================================================
+# ARRAY HELPERS
+# ============================================================================
+
+def round_array(values, digits):
+    """
+    Python round() of every element, vectorized
+
+    np.round() scales, rounds and unscales, which can pick the other
+    neighbour when the scaled value lies within rounding error of a half;
+    those elements are rounded with round() itself, the rest agree exactly.
+    """
+    scale = 10.0 ** digits
+    scaled = values * scale
+    rounded = np.rint(scaled) / scale
+    ambiguous = np.abs(scaled - np.floor(scaled) - 0.5) <= 4 * np.spacing(np.abs(scaled))
+    if ambiguous.any():
+        rounded[ambiguous] = [round(v, digits) for v in values[ambiguous].tolist()]
+    return rounded
+
+def sum_columns(values, columns):
+    """Left-to-right sum of columns (last axis), as Python sum() over a dict of sources"""
+    total = values[..., columns[0]].copy()
+    for column in columns[1:]:
+        total = total + values[..., column]
+    return total
+
+def percent(part, total):
+    """part / total * 100 where total > 0, else 0"""
+    ratio = np.divide(part, total, out=np.zeros_like(total), where=total > 0)
+    return np.where(total > 0, ratio * 100, 0.0)
+
+# ============================================================================
+# ENERGY BALANCE
+# ============================================================================
+
+class EnergyBalance:
+    """Primary, useful and services energy as [entity × year × source] arrays"""
+
+    def __init__(self, entities, years, sources, primary=None, useful=None, services=None, present=None):
+        """
+        Args:
+            entities, years, sources: Axis labels
+            primary, useful, services: [entity, year, source] arrays (None
+                                       for tiers that are not computed)
+            present: [entity, year] mask of entity-years with data
+                     (default: all)
+        """
+        self.entities = list(entities)
+        self.years = np.asarray(years, dtype=np.int64)
+        self.sources = list(sources)
+        self.primary = primary
+        self.useful = useful
+        self.services = services
+        shape = (len(self.entities), len(self.years))
+        self.present = np.ones(shape, dtype=bool) if present is None else np.asarray(present, dtype=bool)
+
+        self.entity_index = {entity: i for i, entity in enumerate(self.entities)}
+        self.source_index = {source: i for i, source in enumerate(self.sources)}
+
+    @classmethod
+    def from_rows(cls, row_entities, row_years, sources, entities=None, **tiers):
+        """
+        Balance from per-row arrays (one row per entity-year)
+
+        Args:
+            row_entities, row_years: Entity and year of each row
+            entities: Entity order (default: order of first appearance)
+            tiers: primary / useful / services [rows, sources] arrays
+        """
+        unknown = set(tiers) - set(TIERS)
+        if unknown:
+            raise KeyError(f"Unknown energy tiers: {sorted(unknown)}")
+        row_entities = np.asarray(row_entities)
+        if entities is None:
+            entities = list(dict.fromkeys(row_entities.tolist()))
+        years, columns = np.unique(np.asarray(row_years, dtype=np.int64), return_inverse=True)
+        index = {entity: i for i, entity in enumerate(entities)}
+        unique, inverse = np.unique(row_entities, return_inverse=True)
+        rows = np.array([index[entity] for entity in unique.tolist()], dtype=np.int64)[inverse]
+
+        shape = (len(entities), len(years), len(sources))
+        arrays = {}
+        for tier, values in tiers.items():
+            if values is not None:
+                arrays[tier] = np.zeros(shape)
+                arrays[tier][rows, columns] = values
+        present = np.zeros(shape[:2], dtype=bool)
+        present[rows, columns] = True
+        return cls(entities, years, sources, present=present, **arrays)
+
+    @property
+    def shape(self):
+        return len(self.entities), len(self.years), len(self.sources)
+
+    def tier(self, tier):
+        """[entity, year, source] array of a tier (KeyError if not computed)"""
+        values = getattr(self, tier) if tier in TIERS else None
+        if values is None:
+            raise KeyError(f"Energy tier not available: {tier}")
+        return values
+
+    def _source_columns(self, sources):
+        return list(range(len(self.sources))) if sources is None else [self.source_index[s] for s in sources]
+
+    # ------------------------------------------------------------------
+    # Selection and aggregation
+    # ------------------------------------------------------------------
+
+    def sel(self, entities=None, years=None, sources=None):
+        """Sub-balance of the given entities, years and sources (copies)"""
+        e = slice(None) if entities is None else [self.entity_index[entity] for entity in entities]
+        if years is None:
+            y = slice(None)
+        else:
+            year_index = {year: i for i, year in enumerate(self.years.tolist())}
+            missing = [year for year in years if year not in year_index]
+            if missing:
+                raise KeyError(f"Years not in balance: {missing}")
+            y = [year_index[year] for year in years]
+        s = self._source_columns(sources)
+
+        def take(values):
+            return None if values is None else values[e][:, y][:, :, s]
+
+        return EnergyBalance(
+            self.entities if entities is None else entities,
+            self.years[y],
+            self.sources if sources is None else sources,
+            take(self.primary), take(self.useful), take(self.services),
+            self.present[e][:, y],
+        )
+
+    def aggregate(self, groups):
+        """
+        Balance of entity groups ({name: [members]}; members summed in order)
+
+        A group-year is present when any member is present; absent member
+        values count as 0. Unknown members are skipped.
+        """
+        members = [[self.entity_index[m] for m in group if m in self.entity_index] for group in groups.values()]
+        shape = (len(groups), len(self.years), len(self.sources))
+        arrays = {tier: np.zeros(shape) for tier in TIERS if getattr(self, tier) is not None}
+        present = np.zeros(shape[:2], dtype=bool)
+        for g, rows in enumerate(members):
+            for row in rows:
+                for tier, values in arrays.items():
+                    values[g] = values[g] + getattr(self, tier)[row]
+                present[g] |= self.present[row]
+        return EnergyBalance(list(groups), self.years, self.sources, present=present, **arrays)
+
+    # ------------------------------------------------------------------
+    # Derived values
+    # ------------------------------------------------------------------
+
+    def total(self, tier, sources=None):
+        """Ordered sum over sources (default: all) -> [entity, year]"""
+        return sum_columns(self.tier(tier), self._source_columns(sources))
+
+    def share(self, tier, sources, of=None):
+        """Percent of the sources in the total of `of` sources (default: all) -> [entity, year]"""
+        return percent(self.total(tier, sources), self.total(tier, of))
+
+    def efficiency(self, output='useful', input='primary'):
+        """Total output / total input in percent -> [entity, year]"""
+        return percent(self.total(output), self.total(input))
+
+    def series(self, entity, tier):
+        """{source: values over years} of one entity (years with data only)"""
+        i = self.entity_index[entity]
+        present = self.present[i]
+        values = self.tier(tier)[i, present]
+        return {source: values[:, s] for s, source in enumerate(self.sources)}
+
+    # ------------------------------------------------------------------
+    # Output boundary
+    # ------------------------------------------------------------------
+
+    def rows(self):
+        """(entity, year, values per tier [rows, sources]) of the present cells, entity-major"""
+        e, y = self.present.nonzero()
+        return e, self.years[y], {tier: getattr(self, tier)[e, y] for tier in TIERS
+                                  if getattr(self, tier) is not None}
+
+    def to_timeseries(self, fossil_sources, enable_exergy=True):
+        """
+        process_year()-format records of every entity with data
+
+        Expects useful/services rounded as process_year() rounds them.
+
+        Returns:
+            {entity: {'useful_energy': [...], 'energy_services': [...]}}
+        """
+        e, years, values = self.rows()
+        fossil = [self.source_index[source] for source in fossil_sources]
+        fields = balance_fields(values['primary'], values['useful'],
+                                values.get('services') if enable_exergy else None, fossil)
+        columns = {key: value.tolist() for key, value in fields.items()}
+        columns['year'] = years.tolist()
+        columns['useful'] = values['useful'].tolist()
+        if enable_exergy:
+            columns['services'] = values['services'].tolist()
+
+        starts = np.flatnonzero(np.r_[True, e[1:] != e[:-1]]).tolist() if len(e) else []
+        bounds = starts + [len(e)]
+        results = {}
+        for start, end in zip(bounds, bounds[1:]):
+            useful_records, services_records = timeseries_records(
+                {key: value[start:end] for key, value in columns.items()}, self.sources, fossil, enable_exergy)
+            results[self.entities[e[start]]] = {'useful_energy': useful_records, 'energy_services': services_records}
+        return results
+
+# ============================================================================
+# RECORD SERIALIZATION
+# ============================================================================
+
+def balance_fields(primary, useful, services, fossil):
+    """
+    Rounded totals, efficiencies and shares of process_year() for rows of
+    [rows, sources] tier values (services None without the services tier)
+
+    Flags mark values that process_year() produces as int zeros.
+    """
+    everything = list(range(primary.shape[-1]))
+    total_primary = sum_columns(primary, everything)
+    total_useful = sum_columns(useful, everything)
+    fossil_useful = sum_columns(useful, fossil)
+    fossil_share = percent(fossil_useful, total_useful)
+
+    fields = {
+        'has_useful': primary > 0,
+        'total_primary_ej': round_array(total_primary, 2),
+        'total_useful_ej': round_array(total_useful, 2),
+        'overall_efficiency': round_array(percent(total_useful, total_primary), 1),
+        'fossil_useful_ej': round_array(fossil_useful, 2),
+        'clean_useful_ej': round_array(total_useful - fossil_useful, 2),
+        'fossil_share_percent': round_array(fossil_share, 1),
+        'clean_share_percent': round_array(100 - fossil_share, 1),
+        'has_primary_total': total_primary > 0,
+        'has_useful_total': total_useful > 0,
+    }
+    if services is not None:
+        total_services = sum_columns(services, everything)
+        fossil_services = sum_columns(services, fossil)
+        fossil_services_share = percent(fossil_services, total_services)
+        fields.update({
+            'has_services': useful > 0,
+            'total_services_ej': round_array(total_services, 2),
+            'global_exergy_efficiency': round_array(percent(total_services, total_primary), 1),
+            'fossil_services_ej': round_array(fossil_services, 2),
+            'clean_services_ej': round_array(total_services - fossil_services, 2),
+            'fossil_services_share_percent': round_array(fossil_services_share, 1),
+            'clean_services_share_percent': round_array(100 - fossil_services_share, 1),
+            'has_services_total': total_services > 0,
+        })
+    return fields
+
+def timeseries_records(columns, sources, fossil, enable_exergy):
+    """
+    process_year()-format records from per-row lists of one entity
+
+    Zeros that process_year() produces as ints (non-positive sources, sums
+    of such sources only, and shares/efficiencies of empty totals) are
+    emitted as ints as well.
+    """
+    def as_number(value, is_float):
+        return value if is_float else int(value)
+
+    useful_records, services_records = [], []
+    for i, year in enumerate(columns['year']):
+        has_useful = columns['has_useful'][i]
+        any_useful = any(has_useful)
+        has_primary_total = columns['has_primary_total'][i]
+        has_useful_total = columns['has_useful_total'][i]
+        useful_records.append({
+            'year': year,
+            'total_primary_ej': columns['total_primary_ej'][i],
+            'total_useful_ej': as_number(columns['total_useful_ej'][i], any_useful),
+            'overall_efficiency': as_number(columns['overall_efficiency'][i], has_primary_total),
+            'sources_useful_ej': {source: value if has else 0
+                                  for source, value, has in zip(sources, columns['useful'][i], has_useful)},
+            'fossil_useful_ej': as_number(columns['fossil_useful_ej'][i], any(has_useful[s] for s in fossil)),
+            'clean_useful_ej': as_number(columns['clean_useful_ej'][i], any_useful),
+            'fossil_share_percent': as_number(columns['fossil_share_percent'][i], has_useful_total),
+            'clean_share_percent': as_number(columns['clean_share_percent'][i], has_useful_total),
+        })
+
+        if enable_exergy:
+            has_services = columns['has_services'][i]
+            any_services = any(has_services)
+            has_services_total = columns['has_services_total'][i]
+            services_records.append({
+                'year': year,
+                'total_services_ej': as_number(columns['total_services_ej'][i], any_services),
+                'global_exergy_efficiency': as_number(columns['global_exergy_efficiency'][i], has_primary_total),
+                'sources_services_ej': {source: value if has else 0
+                                        for source, value, has in zip(sources, columns['services'][i], has_services)},
+                'fossil_services_ej': as_number(columns['fossil_services_ej'][i],
+                                                any(has_services[s] for s in fossil)),
+                'clean_services_ej': as_number(columns['clean_services_ej'][i], any_services),
+                'fossil_services_share_percent': as_number(columns['fossil_services_share_percent'][i],
+                                                           has_services_total),
+                'clean_services_share_percent': as_number(columns['clean_services_share_percent'][i],
+                                                          has_services_total),
+            })
+    return useful_records, services_records
@@ -1,13 +1,28 @@
 """
 Data Fetcher for Global Energy Services Tracker
 Downloads energy data from Our World in Data GitHub repository
+
+The CSV is streamed to disk and parsed in chunks into typed columns
+(owid_cache.py), which downstream scripts load column by column.
 """
 
+import csv
+import gzip
+import hashlib
+import http.client
+import json
 import os
+import shutil
 import sys
+import time
+import urllib.error
 import urllib.request
-import json
 from datetime import datetime
+from itertools import islice
+
+import numpy as np
+
+from owid_cache import STRING_COLUMNS, INT_COLUMNS, OwidCache, cache_path, load_owid_cache, save_owid_cache
 
 # Fix encoding for Windows console
 if sys.platform == 'win32':
@@ -18,68 +33,327 @@ if sys.platform == 'win32':
 OWID_ENERGY_CSV_URL = "https://raw.githubusercontent.com/owid/energy-data/master/owid-energy-data.csv"
 DOWNLOAD_DIR = "downloads"
 CACHE_DIR = "cache"
+SNAPSHOT_DIR = os.path.join(DOWNLOAD_DIR, "snapshots")
+LATEST_POINTER = "latest.json"          # Current snapshot + HTTP validators
+PARTIAL_DOWNLOAD = "download.part"      # Interrupted transfer, resumed with Range
+DOWNLOAD_CHUNK_BYTES = 1 << 20  # Streamed download block size
+PARSE_CHUNK_ROWS = 5000         # CSV rows converted to typed arrays at a time
+REQUEST_TIMEOUT = 60            # Seconds without data before an attempt fails
+MAX_RETRIES = 4
+RETRY_BACKOFF_SECONDS = 2       # Doubled after every failed attempt
 
 def ensure_directories():
     """Create necessary directories if they don't exist"""
     os.makedirs(DOWNLOAD_DIR, exist_ok=True)
     os.makedirs(CACHE_DIR, exist_ok=True)
-    print(f"✓ Directories created: {DOWNLOAD_DIR}, {CACHE_DIR}")
+    os.makedirs(SNAPSHOT_DIR, exist_ok=True)
+    print(f"✓ Directories created: {DOWNLOAD_DIR}, {CACHE_DIR}, {SNAPSHOT_DIR}")
 
-def download_owid_data():
-    """Download Our World in Data energy dataset"""
-    print("Downloading Our World in Data energy dataset...")
+# ============================================================================
+# SNAPSHOT STORE
+# ============================================================================
+# Downloads are stored once per distinct payload as snapshots/<sha256>.csv.
+# snapshots/latest.json points at the current snapshot and keeps the
+# validators (ETag / Last-Modified) for the next conditional request.
+# snapshots/<sha256>.npz keeps the columnar cache of each snapshot so
+# revisions can be diffed (owid_cache.diff_owid_caches).
 
+class IncompleteDownload(IOError):
+    """Transfer ended before the advertised length was received"""
+
+def snapshot_path(snapshot_dir, digest):
+    """Path of the snapshot with the given sha256"""
+    return os.path.join(snapshot_dir, f"{digest}.csv")
+
+def read_json_file(filepath):
+    """JSON content of a file (None if missing or unreadable)"""
     try:
-        # Download CSV data
-        with urllib.request.urlopen(OWID_ENERGY_CSV_URL) as response:
-            csv_data = response.read().decode('utf-8')
+        with open(filepath, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+def write_json_file(filepath, content):
+    """Write JSON atomically"""
+    tmp_filepath = filepath + '.tmp'
+    with open(tmp_filepath, 'w', encoding='utf-8') as f:
+        json.dump(content, f, indent=2)
+    os.replace(tmp_filepath, filepath)
+
+def read_latest(snapshot_dir):
+    """Latest snapshot pointer (None if there is no usable snapshot)"""
+    pointer = read_json_file(os.path.join(snapshot_dir, LATEST_POINTER))
+    if not pointer or not os.path.exists(snapshot_path(snapshot_dir, pointer.get('sha256', ''))):
+        return None
+    return pointer
 
-        # Save raw CSV
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        csv_filename = f"owid_energy_{timestamp}.csv"
-        csv_filepath = os.path.join(DOWNLOAD_DIR, csv_filename)
+def store_snapshot(part_filepath, content_encoding, snapshot_dir):
+    """
+    Decode a completed transfer into the content-addressed store
 
-        with open(csv_filepath, 'w', encoding='utf-8') as f:
-            f.write(csv_data)
+    Returns:
+        (sha256, created); created is False when an identical payload was
+        already stored
+    """
+    tmp_filepath = os.path.join(snapshot_dir, 'snapshot.tmp')
+    digest = hashlib.sha256()
+    opener = gzip.open if content_encoding == 'gzip' else open
+    with opener(part_filepath, 'rb') as source, open(tmp_filepath, 'wb') as target:
+        for block in iter(lambda: source.read(DOWNLOAD_CHUNK_BYTES), b''):
+            digest.update(block)
+            target.write(block)
 
-        # Also save as latest
-        latest_csv_filepath = os.path.join(DOWNLOAD_DIR, "owid_energy_latest.csv")
-        with open(latest_csv_filepath, 'w', encoding='utf-8') as f:
-            f.write(csv_data)
+    sha256 = digest.hexdigest()
+    target_filepath = snapshot_path(snapshot_dir, sha256)
+    created = not os.path.exists(target_filepath)
+    if created:
+        os.replace(tmp_filepath, target_filepath)
+    else:
+        os.remove(tmp_filepath)
+    os.remove(part_filepath)
+    os.remove(part_filepath + '.json')
+    return sha256, created
+
+# ============================================================================
+# CONDITIONAL / RESUMABLE DOWNLOAD
+# ============================================================================
+
+def discard_partial(part_filepath):
+    """Remove a partial transfer and its metadata"""
+    for filepath in (part_filepath, part_filepath + '.json'):
+        if os.path.exists(filepath):
+            os.remove(filepath)
+
+def request_snapshot(url, snapshot_dir, timeout=REQUEST_TIMEOUT):
+    """
+    One conditional, resumable GET of url
+
+    - If-None-Match / If-Modified-Since from the latest pointer (304 -> no change)
+    - Range / If-Range continuing snapshots/download.part from an earlier attempt
+    - Accept-Encoding: gzip (the encoded bytes are stored, decoded once complete)
+
+    Returns:
+        None if not modified, else the response validators:
+        {'etag', 'last_modified', 'content_encoding'}
+
+    Raises:
+        IncompleteDownload, urllib.error.URLError, http.client.HTTPException
+    """
+    part_filepath = os.path.join(snapshot_dir, PARTIAL_DOWNLOAD)
+    part_meta = read_json_file(part_filepath + '.json')
+    if part_meta is None or not os.path.exists(part_filepath):
+        discard_partial(part_filepath)
+        part_meta = None
+
+    headers = {'Accept-Encoding': 'gzip'}
+    latest = read_latest(snapshot_dir)
+    if latest:
+        if latest.get('etag'):
+            headers['If-None-Match'] = latest['etag']
+        if latest.get('last_modified'):
+            headers['If-Modified-Since'] = latest['last_modified']
+
+    offset = os.path.getsize(part_filepath) if part_meta else 0
+    validator = part_meta and (part_meta.get('etag') or part_meta.get('last_modified'))
+    if offset and validator:
+        headers['Range'] = f"bytes={offset}-"
+        headers['If-Range'] = validator
+
+    request = urllib.request.Request(url, headers=headers)
+    try:
+        response = urllib.request.urlopen(request, timeout=timeout)
+    except urllib.error.HTTPError as e:
+        if e.code == 304:
+            discard_partial(part_filepath)
+            return None
+        if e.code == 416:
+            # Partial no longer matches the resource; start over next attempt
+            discard_partial(part_filepath)
+        raise
 
-        # Convert CSV to JSON format for easier processing
-        import csv
-        from io import StringIO
+    with response:
+        content_length = response.headers.get('Content-Length')
+        if response.status == 206 and response.headers.get('Content-Range', '').startswith(f"bytes {offset}-"):
+            mode = 'ab'
+        else:
+            offset = 0
+            mode = 'wb'
+            part_meta = {
+                'url': url,
+                'etag': response.headers.get('ETag'),
+                'last_modified': response.headers.get('Last-Modified'),
+                'content_encoding': response.headers.get('Content-Encoding', 'identity'),
+            }
+            write_json_file(part_filepath + '.json', part_meta)
 
-        reader = csv.DictReader(StringIO(csv_data))
-        data = {}
+        with open(part_filepath, mode) as f:
+            shutil.copyfileobj(response, f, DOWNLOAD_CHUNK_BYTES)
 
-        for row in reader:
-            country = row.get('country', '')
-            if not country:
-                continue
+    received = os.path.getsize(part_filepath) - offset
+    if content_length is not None and received < int(content_length):
+        raise IncompleteDownload(f"received {received} of {content_length} bytes")
+    return part_meta
 
-            if country not in data:
-                data[country] = {'country': country, 'data': []}
+def is_retryable(error):
+    """Network failures and server errors are retried; client errors are not"""
+    if isinstance(error, urllib.error.HTTPError):
+        return error.code >= 500 or error.code == 416
+    return isinstance(error, (urllib.error.URLError, http.client.HTTPException, OSError))
 
-            data[country]['data'].append(row)
+def fetch_snapshot(url, snapshot_dir, retries=MAX_RETRIES, backoff=RETRY_BACKOFF_SECONDS):
+    """
+    Fetch url into the snapshot store, resuming interrupted transfers
 
-        # Save JSON version
-        json_filename = f"owid_energy_{timestamp}.json"
-        json_filepath = os.path.join(DOWNLOAD_DIR, json_filename)
+    Returns:
+        (pointer, changed): the latest pointer after the fetch, and whether
+        it now refers to a different payload than before
+    """
+    os.makedirs(snapshot_dir, exist_ok=True)
+    previous = read_latest(snapshot_dir)
 
-        with open(json_filepath, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=2)
+    for attempt in range(retries + 1):
+        try:
+            part_meta = request_snapshot(url, snapshot_dir)
+            break
+        except Exception as e:
+            if attempt == retries or not is_retryable(e):
+                raise
+            delay = backoff * 2 ** attempt
+            print(f"  Download attempt {attempt + 1} failed ({e}); retrying in {delay:g}s")
+            time.sleep(delay)
 
-        latest_json_filepath = os.path.join(DOWNLOAD_DIR, "owid_energy_latest.json")
-        with open(latest_json_filepath, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=2)
+    now = datetime.now().isoformat(timespec='seconds')
+    if part_meta is None:
+        pointer = dict(previous, checked_at=now)
+        write_json_file(os.path.join(snapshot_dir, LATEST_POINTER), pointer)
+        return pointer, False
 
-        print(f"✓ Downloaded {len(data)} country records")
-        print(f"✓ Saved CSV to: {csv_filepath}")
-        print(f"✓ Saved JSON to: {json_filepath}")
-        print(f"✓ Latest copies saved")
+    part_filepath = os.path.join(snapshot_dir, PARTIAL_DOWNLOAD)
+    sha256, created = store_snapshot(part_filepath, part_meta['content_encoding'], snapshot_dir)
+    pointer = {
+        'url': url,
+        'sha256': sha256,
+        'size': os.path.getsize(snapshot_path(snapshot_dir, sha256)),
+        'etag': part_meta['etag'],
+        'last_modified': part_meta['last_modified'],
+        'fetched_at': now,
+        'checked_at': now,
+    }
+    write_json_file(os.path.join(snapshot_dir, LATEST_POINTER), pointer)
+    return pointer, previous is None or previous['sha256'] != sha256
 
+# ============================================================================
+# COLUMNAR CACHE
+# ============================================================================
+
+def link_or_copy(source, target):
+    """Point target at source's content (hard link where supported)"""
+    if os.path.exists(target):
+        os.remove(target)
+    try:
+        os.link(source, target)
+    except OSError:
+        shutil.copyfile(source, target)
+
+def to_float_column(values):
+    """Strings to float64, NaN for blank or unparsable values"""
+    strings = np.array(values, dtype=str)
+    strings[strings == ''] = 'nan'
+    try:
+        return strings.astype(np.float64)
+    except ValueError:
+        column = np.full(len(strings), np.nan)
+        for i, value in enumerate(strings):
+            try:
+                column[i] = float(value)
+            except ValueError:
+                pass
+        return column
+
+def parse_owid_csv(csv_filepath, chunk_rows=PARSE_CHUNK_ROWS):
+    """
+    Parse the OWID CSV in chunks into typed columns
+
+    Rows without a country or year are dropped (as before, when rows were
+    grouped by country).
+
+    Returns:
+        {column: array}: str for STRING_COLUMNS, int32 for INT_COLUMNS,
+        float64 (NaN for blanks) otherwise
+    """
+    with open(csv_filepath, 'r', encoding='utf-8', newline='') as f:
+        reader = csv.reader(f)
+        header = next(reader)
+        width = len(header)
+        chunks = {name: [] for name in header}
+
+        while True:
+            rows = list(islice(reader, chunk_rows))
+            if not rows:
+                break
+            rows = [row if len(row) == width else (row + [''] * width)[:width] for row in rows]
+            for name, values in zip(header, zip(*rows)):
+                if name in STRING_COLUMNS:
+                    chunks[name].append(np.array(values, dtype=str))
+                else:
+                    chunks[name].append(to_float_column(values))
+
+    columns = {name: np.concatenate(parts) if parts else np.array([]) for name, parts in chunks.items()}
+
+    keep = (columns['country'] != '') & ~np.isnan(columns['year'])
+    for name in columns:
+        columns[name] = columns[name][keep]
+        if name in INT_COLUMNS:
+            columns[name] = columns[name].astype(np.int32)
+    return columns
+
+def load_snapshot_cache(snapshot_dir, digest):
+    """
+    Columnar cache of a stored snapshot (snapshots/<sha256>.npz)
+
+    Built from the snapshot CSV if it was not kept at fetch time.
+    """
+    snapshot_cache = os.path.join(snapshot_dir, f"{digest}.npz")
+    if not os.path.exists(snapshot_cache):
+        save_owid_cache(parse_owid_csv(snapshot_path(snapshot_dir, digest)), snapshot_cache, source=digest)
+    return OwidCache(snapshot_cache)
+
+def download_owid_data(url=OWID_ENERGY_CSV_URL, download_dir=DOWNLOAD_DIR):
+    """
+    Fetch the Our World in Data energy dataset and build the columnar cache
+
+    Unchanged upstream data (304, or an identical payload) reuses the
+    existing snapshot and cache without re-parsing.
+    """
+    print("Downloading Our World in Data energy dataset...")
+
+    try:
+        snapshot_dir = os.path.join(download_dir, "snapshots")
+        pointer, changed = fetch_snapshot(url, snapshot_dir)
+        csv_filepath = snapshot_path(snapshot_dir, pointer['sha256'])
+        print(f"✓ {'New snapshot' if changed else 'Upstream unchanged, using snapshot'}: {csv_filepath}")
+
+        # Latest CSV points at the current snapshot
+        latest_csv_filepath = os.path.join(download_dir, "owid_energy_latest.csv")
+        if changed or not os.path.exists(latest_csv_filepath):
+            link_or_copy(csv_filepath, latest_csv_filepath)
+
+        # Parse into typed columns unless the cache already matches the snapshot
+        data = load_owid_cache(cache_path(download_dir)) if os.path.exists(cache_path(download_dir)) else None
+        if data is None or data.source != pointer['sha256']:
+            columns = parse_owid_csv(csv_filepath)
+            save_owid_cache(columns, cache_path(download_dir), source=pointer['sha256'])
+            data = load_owid_cache(cache_path(download_dir))
+            print(f"✓ Parsed {len(data)} country records ({len(columns['year'])} rows, {len(columns)} columns)")
+        else:
+            print(f"✓ Columnar cache up to date ({len(data)} country records)")
+
+        # Keep the cache of every snapshot for diffing against later revisions
+        snapshot_cache = os.path.join(snapshot_dir, f"{pointer['sha256']}.npz")
+        if not os.path.exists(snapshot_cache):
+            link_or_copy(data.path, snapshot_cache)
+
+        print(f"✓ Columnar cache: {data.path}")
         return data
 
     except Exception as e:
@@ -98,23 +372,19 @@ def get_data_summary(data):
     print("="*60)
 
     # Get list of countries
-    countries = list(data.keys())
-    print(f"Total entities: {len(countries)}")
+    print(f"Total entities: {len(data)}")
 
     # Sample one country to see available fields
     sample_country = "World"
     if sample_country in data:
-        sample_data = data[sample_country]['data']
-        if sample_data:
-            first_record = sample_data[0]
-            print(f"\nAvailable fields (from {sample_country}):")
-            for key in sorted(first_record.keys()):
-                print(f"  - {key}")
-
-            # Get year range
-            years = [record.get('year') for record in sample_data if record.get('year')]
-            if years:
-                print(f"\nYear range: {min(years)} - {max(years)}")
+        print(f"\nAvailable fields (from {sample_country}):")
+        for key in sorted(data.columns):
+            print(f"  - {key}")
+
+        # Get year range
+        years = data.years(sample_country)
+        if len(years):
+            print(f"\nYear range: {years.min()} - {years.max()}")
 
     print("="*60 + "\n")
 
@@ -17,6 +17,11 @@ import os
 import sys
 from datetime import datetime
 
+# Paths relative to this directory
+SERVICES_FILE = '../public/data/exergy_services_timeseries.json'
+SECTORAL_FILE = '../public/data/sectoral_energy_breakdown_v2.json'
+OUTPUT_FILE = '../public/data/sectoral_energy_timeseries_2004_2024.json'
+
 def load_json_file(filepath):
     """Load JSON file"""
     if not os.path.exists(filepath):
@@ -104,33 +109,17 @@ def adjust_fossil_intensity_historical(base_intensity, year, sector_key):
         # Other sectors: Minimal change
         return base_intensity
 
-def generate_sectoral_timeseries():
-    """Main function to generate sectoral timeseries"""
-
-    print("="*60)
-    print("Sectoral Energy Services Timeseries Generator v2.0")
-    print("="*60)
-
-    # Load input files
-    print("\n📂 Loading input files...")
-
-    # Change to data-pipeline directory
-    script_dir = os.path.dirname(os.path.abspath(__file__))
-    os.chdir(script_dir)
-
-    # Load total energy services timeseries
-    services_file = '../public/data/exergy_services_timeseries.json'
-    services_data = load_json_file(services_file)
-    print(f"  ✓ Loaded {services_file}")
-
-    # Load sectoral breakdown v2
-    sectoral_file = '../public/data/sectoral_energy_breakdown_v2.json'
-    sectoral_data = load_json_file(sectoral_file)
-    print(f"  ✓ Loaded {sectoral_file}")
+def build_sectoral_timeseries(services_timeseries, sectoral_data):
+    """
+    Sectoral timeseries output (sectoral_energy_timeseries_2004_2024.json content)
 
+    Args:
+        services_timeseries: 'data' list of exergy_services_timeseries.json
+        sectoral_data: Parsed sectoral_energy_breakdown_v2.json
+    """
     # Filter data to 2004-2024 range
     print("\n⏱️  Filtering data to 2004-2024 range...")
-    timeseries = [entry for entry in services_data['data'] if 2004 <= entry['year'] <= 2024]
+    timeseries = [entry for entry in services_timeseries if 2004 <= entry['year'] <= 2024]
     print(f"  ✓ {len(timeseries)} years of data")
 
     # Generate sectoral timeseries
@@ -252,15 +241,20 @@ def generate_sectoral_timeseries():
 
     output_data['displacement_summary_2004_2024'] = displacement_by_sector
 
-    # Write output file
+    return output_data
+
+def save_sectoral_timeseries(output_data, output_file):
+    """Write sectoral_energy_timeseries_2004_2024.json"""
     print("\n💾 Writing output file...")
-    output_file = '../public/data/sectoral_energy_timeseries_2004_2024.json'
     with open(output_file, 'w', encoding='utf-8') as f:
         json.dump(output_data, f, indent=2, ensure_ascii=False)
 
     print(f"  ✓ Saved to {output_file}")
 
-    # Print summary statistics
+def print_summary(output_data):
+    """Print 2004 → 2024 summary statistics"""
+    displacement_by_sector = output_data['displacement_summary_2004_2024']
+
     print("\n" + "="*60)
     print("SUMMARY STATISTICS (2004 → 2024)")
     print("="*60)
@@ -291,5 +285,31 @@ def generate_sectoral_timeseries():
     print("✅ Sectoral timeseries generation complete!")
     print("="*60)
 
+def generate_sectoral_timeseries():
+    """Main function to generate sectoral timeseries"""
+
+    print("="*60)
+    print("Sectoral Energy Services Timeseries Generator v2.0")
+    print("="*60)
+
+    # Load input files
+    print("\n📂 Loading input files...")
+
+    # Change to data-pipeline directory
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    os.chdir(script_dir)
+
+    # Load total energy services timeseries
+    services_data = load_json_file(SERVICES_FILE)
+    print(f"  ✓ Loaded {SERVICES_FILE}")
+
+    # Load sectoral breakdown v2
+    sectoral_data = load_json_file(SECTORAL_FILE)
+    print(f"  ✓ Loaded {SECTORAL_FILE}")
+
+    output_data = build_sectoral_timeseries(services_data['data'], sectoral_data)
+    save_sectoral_timeseries(output_data, OUTPUT_FILE)
+    print_summary(output_data)
+
 if __name__ == '__main__':
     generate_sectoral_timeseries()
@@ -0,0 +1,241 @@
+"""
+OWID Columnar Cache - typed, column-oriented storage of the OWID energy dataset
+
+fetch_data.py streams owid-energy-data.csv to disk and parses it in chunks
+into typed columns, stored in downloads/owid_energy_latest.npz:
+- country, iso_code   str
+- year                int32
+- every other column  float64 (NaN for blank or unparsable values)
+
+Rows are grouped by entity and sorted by year, with a country/year index:
+- __entities       entity names, in CSV order
+- __entity_start   first row of each entity (n_entities + 1 offsets)
+- __source         sha256 of the CSV snapshot the cache was built from
+
+Columns are read lazily from the archive, so a stage that needs five
+columns loads five arrays instead of re-parsing the whole dataset.
+
+diff_owid_caches() compares two snapshots cell by cell, so stages can
+recompute only the entity/years a revision touched.
+
+Usage:
+    data = load_owid_cache()
+    for record in data.records('World', ['oil_consumption', 'gas_consumption']):
+        record['year'], record['oil_consumption']   # int, float (blank -> 0.0)
+"""
+
+import os
+
+import numpy as np
+
+# Configuration
+DOWNLOAD_DIR = "downloads"
+CACHE_FILENAME = "owid_energy_latest.npz"
+CACHE_VERSION = 1
+
+STRING_COLUMNS = ['country', 'iso_code']
+INT_COLUMNS = ['year']
+
+COLUMN_PREFIX = 'col__'
+
+def cache_path(directory=DOWNLOAD_DIR):
+    """Path of the latest OWID cache"""
+    return os.path.join(directory, CACHE_FILENAME)
+
+def save_owid_cache(columns, path, source=''):
+    """
+    Write typed columns (see fetch_data.parse_owid_csv) to an .npz cache
+
+    Rows are regrouped by entity (in order of first appearance) and sorted
+    by year; the entity index is stored alongside. source identifies the
+    CSV snapshot (its sha256) so an unchanged download can reuse the cache.
+    The file is replaced atomically.
+    """
+    country = columns['country']
+    entities, first_row, codes = np.unique(country, return_index=True, return_inverse=True)
+    csv_order = np.argsort(first_row)
+    rank = np.empty_like(csv_order)
+    rank[csv_order] = np.arange(len(csv_order))
+
+    order = np.lexsort((columns['year'], rank[codes]))
+    counts = np.bincount(rank[codes], minlength=len(entities))
+
+    arrays = {COLUMN_PREFIX + name: values[order] for name, values in columns.items()}
+    arrays['__entities'] = entities[csv_order]
+    arrays['__entity_start'] = np.concatenate([[0], np.cumsum(counts)])
+    arrays['__columns'] = np.array(list(columns.keys()))
+    arrays['__version'] = np.array(CACHE_VERSION)
+    arrays['__source'] = np.array(source)
+
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        np.savez(f, **arrays)
+    os.replace(tmp_path, path)
+
+def load_owid_cache(path=None):
+    """Open the OWID cache (None if it has not been built yet)"""
+    path = path or cache_path()
+    if not os.path.exists(path):
+        print(f"✗ Data file not found: {path}")
+        print("  Run fetch_data.py first to download the data.")
+        return None
+    return OwidCache(path)
+
+class OwidCache:
+    """Lazily loaded typed columns of the OWID dataset with an entity index"""
+
+    def __init__(self, path):
+        self.path = path
+        self._archive = np.load(path, allow_pickle=False)
+        if int(self._archive['__version']) != CACHE_VERSION:
+            raise ValueError(f"Unsupported OWID cache version in {path}; run fetch_data.py again")
+
+        self.entities = self._archive['__entities'].tolist()
+        self.columns = self._archive['__columns'].tolist()
+        self._entity_start = self._archive['__entity_start']
+        self._entity_index = {entity: i for i, entity in enumerate(self.entities)}
+        self.source = str(self._archive['__source']) if '__source' in self._archive.files else ''
+        self._loaded = {}
+
+    def __contains__(self, entity):
+        return entity in self._entity_index
+
+    def __len__(self):
+        return len(self.entities)
+
+    def column(self, name):
+        """Full column across all entities (KeyError for unknown columns)"""
+        if name not in self._loaded:
+            if name not in self.columns:
+                raise KeyError(f"Column not in OWID cache: {name}")
+            self._loaded[name] = self._archive[COLUMN_PREFIX + name]
+        return self._loaded[name]
+
+    def row_entities(self):
+        """Entity name of every row"""
+        return np.array(self.entities)[self.row_codes()]
+
+    def row_codes(self):
+        """Entity code (position in entities) of every row"""
+        return np.repeat(np.arange(len(self.entities)), np.diff(self._entity_start))
+
+    def rows(self, entity):
+        """Row slice of an entity"""
+        i = self._entity_index[entity]
+        return slice(int(self._entity_start[i]), int(self._entity_start[i + 1]))
+
+    def years(self, entity):
+        """Years of an entity (int array)"""
+        return self.column('year')[self.rows(entity)]
+
+    def series(self, entity, name):
+        """Values of a column for an entity (float64, NaN where blank)"""
+        return self.column(name)[self.rows(entity)]
+
+    def numeric_columns(self):
+        """Names of the float64 columns"""
+        return [name for name in self.columns if name not in STRING_COLUMNS + INT_COLUMNS]
+
+    def record(self, entity, year, columns=None, fill=0.0):
+        """Single-year dict of an entity as in records() (None if the row does not exist)"""
+        if entity not in self._entity_index:
+            return None
+        rows = self.rows(entity)
+        years = self.column('year')[rows]
+        i = int(np.searchsorted(years, year))
+        if i == len(years) or years[i] != year:
+            return None
+
+        row = rows.start + i
+        record = {}
+        for name in (self.numeric_columns() if columns is None else columns):
+            value = float(self.column(name)[row]) if name in self.columns else fill
+            record[name] = fill if np.isnan(value) else value
+        record['year'] = int(year)
+        return record
+
+    def records(self, entity, columns=None, fill=0.0):
+        """
+        Per-year dicts of an entity: {'year': int, column: float}
+
+        Blank values and requested columns missing from the dataset are
+        replaced by fill (0.0, as the former safe_float() conversions did).
+        columns defaults to every numeric column.
+        """
+        if columns is None:
+            columns = self.numeric_columns()
+        rows = self.rows(entity)
+        years = self.column('year')[rows].tolist()
+        values = {}
+        for name in columns:
+            if name in self.columns:
+                series = self.column(name)[rows]
+                values[name] = np.where(np.isnan(series), fill, series).tolist()
+            else:
+                values[name] = [fill] * len(years)
+
+        for i, year in enumerate(years):
+            record = {name: series[i] for name, series in values.items()}
+            record['year'] = year
+            yield record
+
+# ============================================================================
+# SNAPSHOT DIFF
+# ============================================================================
+
+def _row_keys(cache):
+    """Entity and year of every row"""
+    return cache.row_entities(), cache.column('year').astype(np.int64)
+
+def diff_owid_caches(old, new):
+    """
+    Cells that differ between two ingested snapshots
+
+    Rows are matched on (entity, year). A cell is changed when its value
+    differs (blank and a missing column count as equal). Rows present in
+    only one snapshot change in every column.
+
+    Returns:
+        Set of (entity, year, column)
+    """
+    old_entities, old_years = _row_keys(old)
+    new_entities, new_years = _row_keys(new)
+    names = np.union1d(old_entities, new_entities)
+    old_keys = np.searchsorted(names, old_entities) * 100000 + old_years
+    new_keys = np.searchsorted(names, new_entities) * 100000 + new_years
+
+    _, old_common, new_common = np.intersect1d(old_keys, new_keys, assume_unique=True, return_indices=True)
+    old_only = np.setdiff1d(np.arange(len(old_keys)), old_common)
+    new_only = np.setdiff1d(np.arange(len(new_keys)), new_common)
+
+    columns = [name for name in dict.fromkeys(old.columns + new.columns) if name not in ('country', 'year')]
+    changed = set()
+    for entities, years, rows in ((old_entities, old_years, old_only), (new_entities, new_years, new_only)):
+        for row in rows.tolist():
+            changed.update((str(entities[row]), int(years[row]), name) for name in columns)
+
+    for name in columns:
+        blank = '' if name in STRING_COLUMNS else np.nan
+        old_values = old.column(name)[old_common] if name in old.columns else np.full(len(old_common), blank)
+        new_values = new.column(name)[new_common] if name in new.columns else np.full(len(new_common), blank)
+        differs = old_values != new_values
+        if name not in STRING_COLUMNS:
+            differs &= ~(np.isnan(old_values) & np.isnan(new_values))
+        for row in new_common[differs].tolist():
+            changed.add((str(new_entities[row]), int(new_years[row]), name))
+    return changed
+
+def changed_rows(cells, columns=None, entities=None):
+    """
+    Entity-years with a changed cell in any of the given columns
+
+    Returns:
+        {entity: [years]} (sorted), limited to the given entities/columns
+    """
+    columns = None if columns is None else set(columns)
+    entities = None if entities is None else set(entities)
+    rows = {}
+    for entity, year, column in cells:
+        if (columns is None or column in columns) and (entities is None or entity in entities):
+            rows.setdefault(entity, set()).add(year)
+    return {entity: sorted(years) for entity, years in rows.items()}
@@ -7,6 +7,8 @@ import json
 import os
 import sys
 
+from owid_cache import load_owid_cache
+
 if sys.platform == 'win32':
     sys.stdout.reconfigure(encoding='utf-8')
 
@@ -156,18 +158,16 @@ def check_owid_vs_iea():
     print("="*70)
 
     # Load OWID data
-    filepath = os.path.join('downloads', 'owid_energy_latest.json')
-    with open(filepath, 'r') as f:
-        data = json.load(f)
+    data = load_owid_cache()
 
-    if 'World' not in data:
+    if not data or 'World' not in data:
         print("✗ World data not found")
         return
 
     # Find 2023
-    for record in data['World']['data']:
-        if record.get('year') == '2023':
-            primary = float(record.get('primary_energy_consumption', 0) or 0)
+    for record in data.records('World'):
+        if record['year'] == 2023:
+            primary = record['primary_energy_consumption']
             print(f"\n   OWID Primary Energy (2023): {primary * 0.0036:.1f} EJ")
             print(f"   IEA Primary Energy (2023):  ~600 EJ")
             print(f"   Difference: {(primary * 0.0036 - 600):+.1f} EJ")
@@ -0,0 +1,83 @@
+"""
+Validate the vectorized per-entity services calculation against process_year()
+
+Runs process_all_entities() and the scalar process_year() for every OWID
+entity-year of the downloaded dataset (fetch_data.py) and compares the
+records as JSON, so values, rounding, key order and int/float types must
+match exactly. 'World' must also equal process_global_data().
+"""
+
+import contextlib
+import io
+import json
+import sys
+import time
+
+from calculate_useful_energy_v2 import (ENABLE_EXERGY, ENABLE_TEMPORAL, FIRST_YEAR, OWID_COLUMNS, REBOUND_RATE,
+                                        entity_region, load_configs, process_all_entities, process_global_data,
+                                        process_year)
+from owid_cache import load_owid_cache
+
+if sys.platform == 'win32':
+    sys.stdout.reconfigure(encoding='utf-8')
+
+print("=" * 80)
+print("VALIDATION REPORT: Vectorized vs Scalar Useful Energy & Services (all entities)")
+print("=" * 80)
+print()
+
+data = load_owid_cache()
+if data is None:
+    sys.exit(1)
+configs = load_configs()
+options = dict(enable_temporal=ENABLE_TEMPORAL, enable_exergy=ENABLE_EXERGY, rebound_rate=REBOUND_RATE)
+
+start = time.perf_counter()
+vectorized = process_all_entities(data, configs, **options)
+vectorized_time = time.perf_counter() - start
+
+start = time.perf_counter()
+scalar = {}
+for entity in data.entities:
+    useful, services = [], []
+    for record in data.records(entity, OWID_COLUMNS):
+        if record['year'] < FIRST_YEAR:
+            continue
+        useful_entry, services_entry = process_year(record, configs, region=entity_region(entity), **options)
+        useful.append(useful_entry)
+        if services_entry is not None:
+            services.append(services_entry)
+    if useful:
+        scalar[entity] = {'useful_energy': useful, 'energy_services': services}
+scalar_time = time.perf_counter() - start
+
+failures = []
+if sorted(scalar) != sorted(vectorized):
+    failures.append(f"entities differ: {len(scalar)} scalar vs {len(vectorized)} vectorized")
+for entity in scalar:
+    for series in ['useful_energy', 'energy_services']:
+        expected = scalar[entity][series]
+        actual = vectorized.get(entity, {}).get(series)
+        if json.dumps(expected) != json.dumps(actual):
+            failures.append(f"{entity} {series}")
+
+with contextlib.redirect_stdout(io.StringIO()):
+    global_results = process_global_data(data, configs, **options)
+if 'World' in vectorized and json.dumps(global_results) != json.dumps(vectorized['World']):
+    failures.append("World differs from process_global_data()")
+
+records = sum(len(series['useful_energy']) for series in scalar.values())
+print(f"Entities compared:  {len(scalar)}")
+print(f"Entity-years:       {records}")
+print()
+print(f"Scalar path:        {scalar_time * 1000:8.2f} ms")
+print(f"Vectorized path:    {vectorized_time * 1000:8.2f} ms")
+print()
+
+if failures:
+    print(f"✗ FAIL: {len(failures)} mismatches")
+    for failure in failures[:20]:
+        print(f"  - {failure}")
+    sys.exit(1)
+
+print("✓ PASS: Vectorized per-entity services match the scalar calculation")
@@ -0,0 +1,176 @@
+"""
+Fetch Validation Script
+Runs fetch_data.py against a local stand-in for the OWID server
+
+The stand-in serves a small OWID-shaped CSV with ETag / Last-Modified
+validators, gzip transfer encoding and byte ranges, and can drop a
+connection part-way through a response.
+
+Checks:
+1. First fetch stores one snapshot, points latest at it and builds the cache
+2. Unchanged upstream answers 304; no new snapshot, cache not rebuilt
+3. Interrupted transfer resumes with a Range request and a matching payload
+4. gzip and identity transfers store the same decoded snapshot
+5. Changed upstream adds a snapshot; reverting to an old payload deduplicates
+"""
+
+import contextlib
+import gzip
+import hashlib
+import io
+import os
+import sys
+import tempfile
+import threading
+from email.utils import formatdate
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from fetch_data import download_owid_data, fetch_snapshot, read_latest, snapshot_path
+
+if sys.platform == 'win32':
+    sys.stdout.reconfigure(encoding='utf-8')
+
+SAMPLE_CSV = (
+    "country,year,iso_code,oil_consumption,gas_consumption\n"
+    "World,2022,,52000.5,40000\n"
+    "World,2023,,53000.25,\n"
+    "France,2023,FRA,800,400.5\n"
+)
+
+class StandInServer:
+    """Local OWID stand-in with request logging and fault injection"""
+
+    def __init__(self, body):
+        self.requests = []
+        self.drop_after = None   # Close the next response after this many bytes
+        self.gzip = True         # Honour Accept-Encoding: gzip
+        self.set_body(body)
+
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, format, *args):
+                pass
+
+            def do_GET(self):
+                server.requests.append(dict(self.headers))
+                if self.headers.get('If-None-Match') == server.etag:
+                    self.send_response(304)
+                    self.end_headers()
+                    return
+
+                gzipped = server.gzip and 'gzip' in self.headers.get('Accept-Encoding', '')
+                payload = server.gzip_body if gzipped else server.body
+                start = 0
+                range_header = self.headers.get('Range')
+                if range_header and self.headers.get('If-Range') == server.etag:
+                    start = int(range_header.split('=')[1].rstrip('-'))
+
+                if start:
+                    self.send_response(206)
+                    self.send_header('Content-Range', f"bytes {start}-{len(payload) - 1}/{len(payload)}")
+                else:
+                    self.send_response(200)
+                self.send_header('ETag', server.etag)
+                self.send_header('Last-Modified', server.last_modified)
+                if gzipped:
+                    self.send_header('Content-Encoding', 'gzip')
+                self.send_header('Content-Length', str(len(payload) - start))
+                self.end_headers()
+
+                chunk = payload[start:]
+                if server.drop_after is not None:
+                    chunk = chunk[:server.drop_after]
+                    server.drop_after = None
+                    self.close_connection = True
+                self.wfile.write(chunk)
+
+        self.httpd = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.url = f"http://127.0.0.1:{self.httpd.server_address[1]}/owid-energy-data.csv"
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+
+    def set_body(self, body):
+        self.body = body.encode('utf-8')
+        self.gzip_body = gzip.compress(self.body, mtime=0)
+        self.etag = '"' + hashlib.sha256(self.body).hexdigest()[:16] + '"'
+        self.last_modified = formatdate(usegmt=True)
+
+    def close(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+def snapshot_files(snapshot_dir):
+    return sorted(name for name in os.listdir(snapshot_dir) if name.endswith('.csv'))
+
+def check(label, passed, results):
+    print(f"  {'✓' if passed else '✗'} {label}")
+    results.append(passed)
+
+def validate_fetch():
+    results = []
+    server = StandInServer(SAMPLE_CSV)
+    sample_sha256 = hashlib.sha256(server.body).hexdigest()
+
+    with tempfile.TemporaryDirectory() as download_dir:
+        snapshot_dir = os.path.join(download_dir, 'snapshots')
+
+        print("\n1. First fetch")
+        with contextlib.redirect_stdout(io.StringIO()):
+            data = download_owid_data(server.url, download_dir)
+        check("one snapshot stored", snapshot_files(snapshot_dir) == [f"{sample_sha256}.csv"], results)
+        check("latest points at it", read_latest(snapshot_dir)['sha256'] == sample_sha256, results)
+        check("cache built from it", data is not None and data.source == sample_sha256, results)
+        check("typed values parsed", [r['gas_consumption'] for r in data.records('World')] == [40000.0, 0.0], results)
+
+        print("\n2. Unchanged upstream")
+        cache_mtime = os.path.getmtime(os.path.join(download_dir, 'owid_energy_latest.npz'))
+        with contextlib.redirect_stdout(io.StringIO()):
+            data = download_owid_data(server.url, download_dir)
+        check("conditional request sent", server.requests[-1].get('If-None-Match') == server.etag, results)
+        check("no new snapshot", snapshot_files(snapshot_dir) == [f"{sample_sha256}.csv"], results)
+        check("cache reused", os.path.getmtime(data.path) == cache_mtime, results)
+
+        print("\n3. Interrupted transfer")
+        server.set_body(SAMPLE_CSV + "France,2022,FRA,790,390\n")
+        server.drop_after = 40
+        with contextlib.redirect_stdout(io.StringIO()):
+            pointer, changed = fetch_snapshot(server.url, snapshot_dir, backoff=0)
+        check("resumed with a Range request", server.requests[-1].get('Range') == 'bytes=40-', results)
+        check("payload matches upstream",
+              open(snapshot_path(snapshot_dir, pointer['sha256']), 'rb').read() == server.body, results)
+        check("reported as changed", changed, results)
+
+        print("\n4. gzip and identity transfers")
+        check("gzip requested", 'gzip' in server.requests[-1].get('Accept-Encoding', ''), results)
+        with tempfile.TemporaryDirectory() as identity_dir:
+            server.gzip = False
+            with contextlib.redirect_stdout(io.StringIO()):
+                identity_pointer, _ = fetch_snapshot(server.url, identity_dir)
+            server.gzip = True
+        check("same decoded snapshot", identity_pointer['sha256'] == pointer['sha256'], results)
+
+        print("\n5. Changed and reverted upstream")
+        server.set_body(SAMPLE_CSV)
+        with contextlib.redirect_stdout(io.StringIO()):
+            pointer, changed = fetch_snapshot(server.url, snapshot_dir)
+        check("latest back on the first payload", pointer['sha256'] == sample_sha256 and changed, results)
+        check("identical payload deduplicated", len(snapshot_files(snapshot_dir)) == 2, results)
+        check("no partial transfer left", not os.path.exists(os.path.join(snapshot_dir, 'download.part')), results)
+
+    server.close()
+    return all(results)
+
+def main():
+    print("="*60)
+    print("FETCH VALIDATION (local stand-in server)")
+    print("="*60)
+
+    passed = validate_fetch()
+
+    print("\n" + "="*60)
+    print("✓ PASS: Fetch behaves as expected" if passed else "✗ FAIL: See checks above")
+    print("="*60)
+    sys.exit(0 if passed else 1)
+
+if __name__ == "__main__":
+    main()
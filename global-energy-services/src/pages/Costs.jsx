@@ -5,6 +5,7 @@ import {
   XAxis, YAxis, CartesianGrid, Tooltip, Legend, ResponsiveContainer, Cell
 } from 'recharts';
 import { ENERGY_COLORS, getSourceName } from '../utils/colors';
+import { getCostScenarios, getCostRegions, getCostYears, getYearRecord, getRegionTimeseries } from '../utils/costData';
 import { downloadChartAsPNG, downloadDataAsCSV, ChartExportButtons } from '../utils/chartExport';
 import ChartFullscreenModal from '../components/ChartFullscreenModal';
 import FullscreenButton from '../components/FullscreenButton';
@@ -42,8 +43,9 @@ export default function Costs() {
       });
   }, []);
 
-  const scenarios = useMemo(() => costData ? Object.keys(costData.scenarios) : [], [costData]);
-  const allRegions = useMemo(() => costData ? Object.keys(costData.scenarios[scenario]?.regions || {}) : [], [costData, scenario]);
+  const scenarios = useMemo(() => getCostScenarios(costData), [costData]);
+  const allRegions = useMemo(() => getCostRegions(costData), [costData]);
+  const sccScenario = sccEnabled ? sccLevel : 'none';
   const sources = useMemo(() => ['solar', 'wind', 'nuclear', 'gas', 'coal', 'hydro', 'oil', 'biofuels', 'other_renewables'], []);
 
   // Source selection handlers - FIXED LOGIC
@@ -97,8 +99,8 @@ export default function Costs() {
   const primaryRegion = selectedRegions[0] || 'Global';
   const timeseriesData = useMemo(() => {
     if (!costData) return [];
-    return costData.scenarios[scenario]?.regions[primaryRegion]?.timeseries || [];
-  }, [costData, scenario, primaryRegion]);
+    return getRegionTimeseries(costData, scenario, primaryRegion, sccScenario);
+  }, [costData, scenario, primaryRegion, sccScenario]);
 
   // Prepare chart data: System LCOES Trends over time (primary region)
   const lcoesTrendsData = useMemo(() => {
@@ -122,7 +124,7 @@ export default function Costs() {
     return timeseriesData.map(yearData => {
       const point = { year: yearData.year };
       scenarios.forEach(scen => {
-        const scenData = costData.scenarios[scen]?.regions[primaryRegion]?.timeseries.find(y => y.year === yearData.year);
+        const scenData = getYearRecord(costData, scen, primaryRegion, yearData.year, sccScenario);
         if (scenData && scenData.sources[comparisonSource]) {
           const baseCost = scenData.sources[comparisonSource].base_lcoe_mwh + scenData.sources[comparisonSource].total_system_cost_mwh;
           const sccCost = sccEnabled ? scenData.sources[comparisonSource].scc_cost_mwh : 0;
@@ -131,7 +133,7 @@ export default function Costs() {
       });
       return point;
     });
-  }, [timeseriesData, scenarios, costData, primaryRegion, comparisonSource, sccEnabled]);
+  }, [timeseriesData, scenarios, costData, primaryRegion, comparisonSource, sccEnabled, sccScenario]);
 
   // Prepare chart data: Cost breakdown for latest year (stacked bar)
   const latestYear = useMemo(() => timeseriesData[timeseriesData.length - 1], [timeseriesData]);
@@ -161,8 +163,8 @@ export default function Costs() {
     if (!costData) return [];
     const data = [];
     selectedRegions.forEach(regionName => {
-      const regionData = costData.scenarios[scenario]?.regions[regionName];
-      const yearData = regionData?.timeseries[regionData.timeseries.length - 1];
+      const years = getCostYears(costData);
+      const yearData = getYearRecord(costData, scenario, regionName, years[years.length - 1], sccScenario);
       if (yearData) {
         const dataPoint = { region: regionName };
         sources.forEach(source => {
@@ -176,7 +178,7 @@ export default function Costs() {
       }
     });
     return data;
-  }, [costData, scenario, selectedRegions, sources, sccEnabled]);
+  }, [costData, scenario, selectedRegions, sources, sccEnabled, sccScenario]);
 
   // Early return after all hooks are defined
   if (loading || !costData) {
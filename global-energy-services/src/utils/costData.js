@@ -0,0 +1,105 @@
+/**
+ * Full system cost data accessors
+ *
+ * full_system_costs.json is stored in factorized form: a base cube per
+ * scenario, integration costs per region and side tables for regional
+ * multipliers, SCC scenarios and service conversions. These helpers rebuild
+ * per-cell records on demand for any SCC scenario, mirroring
+ * data-pipeline/cost_accessor.py.
+ */
+
+const round = (value, digits) => {
+  const factor = 10 ** digits;
+  return Math.round(value * factor) / factor;
+};
+
+const valueAt = (value, index) => (Array.isArray(value) ? value[index] : value);
+
+export const getCostScenarios = (data) => data?.dimensions?.scenarios || [];
+
+export const getCostRegions = (data) => data?.dimensions?.regions || [];
+
+export const getCostYears = (data) => data?.dimensions?.years || [];
+
+export const getYearIndex = (data, year) => {
+  const years = getCostYears(data);
+  const index = year - years[0];
+  return years[index] === year ? index : -1;
+};
+
+export const getSccCost = (data, source, sccScenario = 'none') => {
+  if (sccScenario === 'none') return 0;
+  const scc = data.scc_scenarios[sccScenario];
+  return scc ? scc.value * (data.carbon_intensity[source] || 0) : 0;
+};
+
+export const getCostCell = (data, scenario, region, year, source, sccScenario = 'none') => {
+  const index = getYearIndex(data, year);
+  const scenarioData = data?.scenarios?.[scenario];
+  const regionData = scenarioData?.regions?.[region];
+  const sourceCosts = regionData?.system_costs?.[source];
+  if (index < 0 || !sourceCosts) return null;
+
+  const baseLcoe = scenarioData.base_lcoe_mwh[source][index];
+  const systemCosts = {};
+  let totalSystemCost = 0;
+  Object.entries(sourceCosts).forEach(([component, value]) => {
+    systemCosts[component] = valueAt(value, index);
+    totalSystemCost += systemCosts[component];
+  });
+  const sccCost = getSccCost(data, source, sccScenario);
+  const totalLcoes = (baseLcoe + totalSystemCost + sccCost) * data.regional_multipliers[region];
+  const rebound = scenarioData.rebound_multiplier[index];
+
+  const serviceUnits = {};
+  Object.entries(data.service_conversions).forEach(([service, conversion]) => {
+    const adjustedMwhPerUnit = conversion.mwh_per_unit * rebound;
+    serviceUnits[service] = {
+      value: round(totalLcoes * adjustedMwhPerUnit, 2),
+      label: conversion.label,
+      description: conversion.description,
+      mwh_per_unit: round(adjustedMwhPerUnit, 4)
+    };
+  });
+
+  return {
+    base_lcoe_mwh: round(baseLcoe, 2),
+    system_costs: Object.fromEntries(Object.entries(systemCosts).map(([k, v]) => [k, round(v, 2)])),
+    total_system_cost_mwh: round(totalSystemCost, 2),
+    scc_cost_mwh: round(sccCost, 2),
+    total_lcoes_mwh: round(totalLcoes, 2),
+    capacity_factor: data.capacity_factor[source][index],
+    carbon_intensity_tco2_mwh: data.carbon_intensity[source] || 0,
+    rebound_multiplier: round(rebound, 3),
+    service_units: serviceUnits
+  };
+};
+
+export const getYearRecord = (data, scenario, region, year, sccScenario = 'none') => {
+  const index = getYearIndex(data, year);
+  const scenarioData = data?.scenarios?.[scenario];
+  const regionData = scenarioData?.regions?.[region];
+  if (index < 0 || !regionData) return null;
+
+  const dispatch = {};
+  Object.entries(regionData.dispatch).forEach(([metric, values]) => {
+    dispatch[metric] = values[index];
+  });
+
+  const sources = {};
+  data.dimensions.sources.forEach(source => {
+    sources[source] = getCostCell(data, scenario, region, year, source, sccScenario);
+  });
+
+  return {
+    year,
+    vre_penetration: scenarioData.vre_penetration[index],
+    dispatch,
+    sources
+  };
+};
+
+export const getRegionTimeseries = (data, scenario, region, sccScenario = 'none') => {
+  if (!data?.scenarios?.[scenario]?.regions?.[region]) return [];
+  return getCostYears(data).map(year => getYearRecord(data, scenario, region, year, sccScenario));
+};